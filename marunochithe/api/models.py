@@ -49,6 +49,17 @@ class CodebaseSearchRequest(BaseModel):
     query: str
     limit: Optional[int] = Field(default=5, ge=1, le=50)
     file_types: Optional[List[str]] = None  # e.g., [".py", ".js"]
+    repos: Optional[List[str]] = None  # Shard names or paths (default: all)
+    mode: Literal["vector", "keyword", "hybrid", "graph", "substring", "regex"] = "hybrid"
+
+
+class CodebaseSymbolSearchRequest(BaseModel):
+    """Typo-tolerant symbol name search request (search-as-you-type)."""
+    query: str = Field(min_length=1, max_length=200)
+    limit: Optional[int] = Field(default=20, ge=1, le=100)
+    language: Optional[str] = None  # e.g., "python"
+    repos: Optional[List[str]] = None  # Shard names or paths (default: all)
+    max_distance: Optional[int] = Field(default=None, ge=0, le=3)  # Default: by query length
 
 
 class CodebaseSearchResult(BaseModel):
@@ -66,6 +77,20 @@ class CodebaseSearchResponse(BaseModel):
     total: int
 
 
+class CodebaseBatchSearchRequest(BaseModel):
+    """Batched codebase search request."""
+    queries: List[str] = Field(min_length=1, max_length=100)
+    limit: Optional[int] = Field(default=5, ge=1, le=50)
+    mode: Literal["vector", "keyword", "hybrid", "graph", "substring", "regex"] = "hybrid"
+    repos: Optional[List[str]] = None  # Shard names or paths (default: all)
+
+
+class CodebaseBatchSearchResponse(BaseModel):
+    """Batched codebase search response, one entry per query."""
+    results: List[CodebaseSearchResponse]
+    total_queries: int
+
+
 class HealthResponse(BaseModel):
     """Health check response."""
     status: Literal["healthy", "degraded", "unhealthy"]
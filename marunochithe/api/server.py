@@ -1,10 +1,12 @@
 """FastAPI server with OpenAI-compatible endpoints."""
 
+import asyncio
 import json
 import time
 import uuid
 from contextlib import asynccontextmanager
-from typing import AsyncIterator, Union, Dict, Optional
+from pathlib import Path
+from typing import AsyncIterator, Union, Dict, List, Optional
 
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import StreamingResponse
@@ -22,12 +24,15 @@ from ..observability import (
 )
 from ..core.inference import InferenceEngine, ModelSize
 from ..code_understanding import (
-    CodeParser,
-    CodeChunker,
     CodebaseIndexer,
     KeywordIndexer,
     HybridSearcher,
     CodebaseWatcher,
+    SearchResult,
+    ShardManager,
+    SnapshotError,
+    create_embedding_provider,
+    read_snapshot_header,
 )
 from .benchai_client import BenchAIClient
 from .models import (
@@ -39,7 +44,10 @@ from .models import (
     HealthResponse,
     CodebaseSearchRequest,
     CodebaseSearchResponse,
+    CodebaseBatchSearchRequest,
+    CodebaseBatchSearchResponse,
     CodebaseSearchResult,
+    CodebaseSymbolSearchRequest,
     SyncRequest,
     SyncResponse,
     ShareRequest,
@@ -55,7 +63,13 @@ engine: InferenceEngine = None
 # Global code understanding components
 code_indexer: CodebaseIndexer = None
 hybrid_searcher: HybridSearcher = None
-code_watcher: CodebaseWatcher = None
+shard_manager: ShardManager = None
+
+# Filesystem watchers, keyed by resolved codebase root
+code_watchers: Dict[str, CodebaseWatcher] = {}
+
+# Background full reindexes started by /v1/codebase/refresh
+_reindex_tasks = set()
 
 # Global BenchAI client for multi-agent integration
 benchai_client: BenchAIClient = None
@@ -64,7 +78,7 @@ benchai_client: BenchAIClient = None
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Initialize and cleanup resources."""
-    global engine, code_indexer, hybrid_searcher, code_watcher, benchai_client
+    global engine, code_indexer, hybrid_searcher, shard_manager, benchai_client
 
     logger.info("Starting MarunochiAI server...")
 
@@ -89,17 +103,56 @@ async def lifespan(app: FastAPI):
     try:
         logger.info("Initializing code understanding components...")
 
-        # Create indexers
-        code_indexer = CodebaseIndexer(collection_name="marunochithe_codebase")
-        keyword_indexer = KeywordIndexer()
-
-        # Create hybrid searcher
-        hybrid_searcher = HybridSearcher(
-            vector_indexer=code_indexer,
-            keyword_indexer=keyword_indexer,
-            rrf_k=60
+        # One embedding model, shared by every indexer
+        indexer_kwargs = dict(
+            num_workers=settings.indexer.workers,
+            read_workers=settings.indexer.vector_read_workers,
+            discovery_workers=settings.indexer.discovery_workers,
+            vector_backend=settings.indexer.vector_backend,
+            exact_search_max_chunks=settings.indexer.exact_search_max_chunks,
+            exact_search_dtype=settings.indexer.exact_search_dtype,
+            vector_quantization=settings.indexer.vector_quantization,
+            chunk_cache_size=settings.indexer.chunk_cache_size,
+            embedding_provider=create_embedding_provider(
+                provider=settings.embedding.provider,
+                model_name=settings.embedding.model,
+                device=settings.embedding.device,
+                batch_size=settings.embedding.batch_size,
+                ollama_host=settings.ollama.host,
+            ),
         )
 
+        if settings.indexer.shard_by_repo:
+            # One collection and FTS5 database per repository
+            shard_manager = ShardManager(
+                max_open_shards=settings.indexer.max_open_shards,
+                keyword_read_connections=settings.indexer.keyword_read_connections,
+                **indexer_kwargs
+            )
+            hybrid_searcher = HybridSearcher(
+                shard_manager=shard_manager,
+                rrf_k=60,
+                result_cache_size=settings.indexer.result_cache_size
+            )
+        else:
+            # Create indexers (the vector indexer keeps the keyword index in sync)
+            keyword_indexer = KeywordIndexer(
+                read_connections=settings.indexer.keyword_read_connections
+            )
+            code_indexer = CodebaseIndexer(
+                collection_name="marunochithe_codebase",
+                keyword_indexer=keyword_indexer,
+                **indexer_kwargs
+            )
+
+            # Create hybrid searcher
+            hybrid_searcher = HybridSearcher(
+                vector_indexer=code_indexer,
+                keyword_indexer=keyword_indexer,
+                rrf_k=60,
+                result_cache_size=settings.indexer.result_cache_size
+            )
+
         logger.info("Code understanding components ready")
     except Exception as e:
         logger.warning(f"Code understanding initialization failed: {e}")
@@ -163,9 +216,23 @@ async def lifespan(app: FastAPI):
 
     logger.info("Shutting down MarunochiAI server...")
 
-    # Cleanup code watcher if running
-    if code_watcher:
-        code_watcher.stop_watching()
+    # Cleanup code watchers if running
+    for watcher in code_watchers.values():
+        watcher.stop_watching()
+
+    # Stop rebuilds still in progress (the current generation stays live)
+    for task in list(_reindex_tasks):
+        task.cancel()
+    if _reindex_tasks:
+        await asyncio.gather(*_reindex_tasks, return_exceptions=True)
+
+    # Close index databases
+    if code_indexer:
+        await code_indexer.close()
+    if hybrid_searcher and hybrid_searcher.keyword_indexer:
+        await hybrid_searcher.keyword_indexer.close()
+    if shard_manager:
+        await shard_manager.close()
 
 
 # Create FastAPI app
@@ -264,13 +331,37 @@ async def observability_metrics() -> Dict:
     - Error rates
     - A2A task statistics
     - BenchAI client metrics
+    - Vector store executor queue depth and wait times
     - Recent requests (last 10)
     - Uptime information
     """
     metrics = get_metrics()
+    stats = metrics.get_stats()
+
+    if code_indexer:
+        stats["vector_store"] = _vector_store_metrics(code_indexer)
+    elif shard_manager:
+        stats["vector_store"] = {
+            "shards": {
+                shard.name: _vector_store_metrics(shard.indexer)
+                for shard in shard_manager.open_shards()
+            },
+            "max_open_shards": shard_manager.max_open_shards,
+        }
+
     return {
         "status": "ok",
-        **metrics.get_stats()
+        **stats
+    }
+
+
+def _vector_store_metrics(indexer: CodebaseIndexer) -> Dict:
+    """Executor and backend metrics of one indexer."""
+    return {
+        "collection": indexer.collection_name,
+        "generation": indexer.active_collection_name,
+        "executors": indexer.get_executor_stats(),
+        "backend": indexer.get_vector_backend_stats(),
     }
 
 
@@ -487,6 +578,9 @@ async def index_codebase(codebase_path: str, watch: bool = False) -> Dict:
     """
     Index entire codebase for semantic search.
 
+    With per-repository sharding, the codebase is indexed into its own
+    shard, created on first use.
+
     Args:
         codebase_path: Path to codebase directory
         watch: If True, start filesystem watcher for incremental updates
@@ -494,9 +588,7 @@ async def index_codebase(codebase_path: str, watch: bool = False) -> Dict:
     Returns:
         Statistics about indexing operation
     """
-    global code_indexer, code_watcher
-
-    if not code_indexer:
+    if not code_indexer and not shard_manager:
         raise HTTPException(
             status_code=503,
             detail="Code understanding not initialized"
@@ -505,26 +597,31 @@ async def index_codebase(codebase_path: str, watch: bool = False) -> Dict:
     try:
         logger.info(f"Indexing codebase: {codebase_path}")
 
-        # Index codebase
-        result = await code_indexer.index_codebase(codebase_path)
-
-        # Start watcher if requested
-        if watch and not code_watcher:
-            logger.info("Starting filesystem watcher...")
-
-            parser = CodeParser()
-            chunker = CodeChunker()
-            keyword_indexer = hybrid_searcher.keyword_indexer
-
-            code_watcher = CodebaseWatcher(
-                codebase_path=codebase_path,
-                vector_indexer=code_indexer,
-                keyword_indexer=keyword_indexer,
-                debounce_ms=500
-            )
+        async with _open_index(codebase_path, create=True) as indexer:
+            # Index codebase
+            result = await indexer.index_codebase(codebase_path)
+            if shard_manager:
+                result['shard'] = indexer.collection_name
+
+            # Start watcher if requested
+            root = str(Path(codebase_path).resolve())
+            if watch and root not in code_watchers:
+                logger.info("Starting filesystem watcher...")
+
+                # A watched shard must stay open
+                if shard_manager:
+                    await shard_manager.pin(codebase_path)
+
+                watcher = CodebaseWatcher(
+                    codebase_path=codebase_path,
+                    vector_indexer=indexer,
+                    keyword_indexer=indexer.keyword_indexer,
+                    debounce_ms=500
+                )
 
-            await code_watcher.start_watching()
-            result['watcher_started'] = True
+                await watcher.start_watching()
+                code_watchers[root] = watcher
+                result['watcher_started'] = True
 
         return result
 
@@ -555,40 +652,138 @@ async def codebase_search(
     try:
         logger.debug(f"Searching codebase: {request.query}")
 
-        # Perform hybrid search
+        # Hybrid by default; substring/regex for exact code fragments
         results = await hybrid_searcher.search(
             query=request.query,
-            mode="hybrid",
-            limit=request.limit
+            mode=request.mode,
+            limit=request.limit,
+            repos=request.repos
         )
 
-        # Convert to API response format
-        search_results = [
-            CodebaseSearchResult(
-                filepath=r.filepath,
-                content=r.content,
-                similarity=r.similarity,
-                metadata={
-                    'name': r.name,
-                    'language': r.language.value,
-                    'chunk_type': r.chunk_type,
-                    'line_range': list(r.line_range),
-                }
-            )
-            for r in results
-        ]
+        return _to_search_response(request.query, results)
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Search failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/v1/codebase/search/batch", tags=["Code Understanding"])
+async def codebase_search_batch(
+    request: CodebaseBatchSearchRequest
+) -> CodebaseBatchSearchResponse:
+    """
+    Run many code searches in one request.
+
+    All queries are embedded together and answered by one vector query
+    and one keyword query, so a batch costs about one search's latency.
+
+    Args:
+        request: Queries and shared search parameters
+
+    Returns:
+        One result list per query, in request order
+    """
+    if not hybrid_searcher:
+        raise HTTPException(
+            status_code=503,
+            detail="Code understanding not initialized"
+        )
+
+    try:
+        logger.debug(f"Batch searching codebase: {len(request.queries)} queries")
+
+        batches = await hybrid_searcher.search_many(
+            queries=request.queries,
+            mode=request.mode,
+            limit=request.limit,
+            repos=request.repos
+        )
+
+        return CodebaseBatchSearchResponse(
+            results=[
+                _to_search_response(query, results)
+                for query, results in zip(request.queries, batches)
+            ],
+            total_queries=len(request.queries)
+        )
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Batch search failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/v1/codebase/symbols", tags=["Code Understanding"])
+async def codebase_symbols(
+    request: CodebaseSymbolSearchRequest
+) -> CodebaseSearchResponse:
+    """
+    Find symbols by name, tolerating typos and incomplete names.
+
+    Args:
+        request: Symbol search request with the name as typed
+
+    Returns:
+        Matching definitions, closest names first, with the qualified name
+        and edit distance in metadata
+    """
+    if not hybrid_searcher:
+        raise HTTPException(
+            status_code=503,
+            detail="Code understanding not initialized"
+        )
 
-        return CodebaseSearchResponse(
+    try:
+        results = await hybrid_searcher.search_symbols(
             query=request.query,
-            results=search_results,
-            total=len(search_results)
+            limit=request.limit,
+            filter_language=request.language,
+            repos=request.repos,
+            max_distance=request.max_distance
         )
 
+        response = _to_search_response(request.query, results)
+        for item, result in zip(response.results, results):
+            item.metadata.update(result.metadata)
+        return response
+
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
-        logger.error(f"Search failed: {e}")
+        logger.error(f"Symbol search failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def _to_search_response(
+    query: str,
+    results: List[SearchResult]
+) -> CodebaseSearchResponse:
+    """Convert SearchResult objects to the API response format."""
+    search_results = [
+        CodebaseSearchResult(
+            filepath=r.filepath,
+            content=r.content,
+            similarity=r.similarity,
+            metadata={
+                'name': r.name,
+                'language': r.language.value,
+                'chunk_type': r.chunk_type,
+                'line_range': list(r.line_range),
+            }
+        )
+        for r in results
+    ]
+
+    return CodebaseSearchResponse(
+        query=query,
+        results=search_results,
+        total=len(search_results)
+    )
+
+
 @app.get("/v1/codebase/stats", tags=["Code Understanding"])
 async def codebase_stats() -> Dict:
     """
@@ -607,7 +802,7 @@ async def codebase_stats() -> Dict:
         stats = await hybrid_searcher.get_stats()
 
         # Add watcher status
-        stats['watcher_running'] = code_watcher is not None and code_watcher._running
+        stats['watcher_running'] = any(w._running for w in code_watchers.values())
 
         return stats
 
@@ -617,17 +812,25 @@ async def codebase_stats() -> Dict:
 
 
 @app.post("/v1/codebase/refresh", tags=["Code Understanding"])
-async def refresh_index(filepath: Optional[str] = None) -> Dict:
+async def refresh_index(
+    filepath: Optional[str] = None,
+    codebase_path: Optional[str] = None
+) -> Dict:
     """
     Refresh code index for a file or entire codebase.
 
+    A full refresh rebuilds the index in the background into a new
+    generation; search keeps serving the current one until it is swapped.
+
     Args:
         filepath: Specific file to refresh, or None for full refresh
+        codebase_path: Codebase to rebuild (default: the last one indexed;
+            required with per-repository sharding)
 
     Returns:
         Refresh operation result
     """
-    if not code_indexer:
+    if not code_indexer and not shard_manager:
         raise HTTPException(
             status_code=503,
             detail="Code understanding not initialized"
@@ -637,28 +840,168 @@ async def refresh_index(filepath: Optional[str] = None) -> Dict:
         if filepath:
             # Refresh single file
             logger.info(f"Refreshing index for: {filepath}")
-            result = await code_indexer.index_file(filepath)
+            async with _open_index(filepath) as indexer:
+                result = await indexer.index_file(filepath)
             return {
                 'filepath': filepath,
                 'chunks_indexed': result.get('indexed_chunks', 0),
                 'duration_ms': result.get('duration_ms', 0)
             }
         else:
-            # Full refresh - clear and reindex
-            logger.info("Performing full index refresh")
-            await code_indexer.clear_index()
+            # Full refresh - rebuild into a shadow generation
+            if not codebase_path and code_indexer:
+                codebase_path = code_indexer.last_codebase_path
+            if not codebase_path:
+                raise HTTPException(
+                    status_code=400,
+                    detail="No codebase indexed yet; pass codebase_path"
+                )
+
+            async with _open_index(codebase_path) as indexer:
+                if indexer.reindex_running:
+                    return {
+                        'status': 'already_running',
+                        'codebase_path': codebase_path,
+                    }
+                generation = indexer.active_collection_name
+
+            logger.info(f"Performing full index refresh of {codebase_path}")
+            task = asyncio.create_task(_run_reindex(codebase_path))
+            _reindex_tasks.add(task)
+            task.add_done_callback(_reindex_tasks.discard)
 
-            # Note: User needs to call /index again with codebase path
             return {
-                'status': 'cleared',
-                'message': 'Index cleared. Call /v1/codebase/index to reindex.'
+                'status': 'reindexing',
+                'codebase_path': codebase_path,
+                'generation': generation,
+                'message': 'Search keeps using the current index until the rebuild completes.'
             }
 
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Refresh failed: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/v1/codebase/snapshot/export", tags=["Code Understanding"])
+async def export_snapshot(
+    output_path: str,
+    codebase_path: Optional[str] = None,
+    dtype: str = "float32"
+) -> Dict:
+    """
+    Export a codebase's index to a snapshot file for warm starts elsewhere.
+
+    Args:
+        output_path: Snapshot file to write (on the server)
+        codebase_path: Codebase whose index to export (required with
+            per-repository sharding)
+        dtype: Stored embedding precision, "float32" or "float16"
+
+    Returns:
+        Path, chunk/file counts and snapshot size
+    """
+    if not code_indexer and not shard_manager:
+        raise HTTPException(
+            status_code=503,
+            detail="Code understanding not initialized"
+        )
+    if shard_manager and not codebase_path:
+        raise HTTPException(status_code=400, detail="codebase_path is required")
+
+    try:
+        async with _open_index(codebase_path) as indexer:
+            return await indexer.export_snapshot(output_path, root=codebase_path, dtype=dtype)
+
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Snapshot export failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@app.post("/v1/codebase/snapshot/import", tags=["Code Understanding"])
+async def import_snapshot(
+    snapshot_path: str,
+    root: Optional[str] = None,
+    index_changes: bool = True
+) -> Dict:
+    """
+    Load a snapshot instead of indexing a codebase from scratch.
+
+    Args:
+        snapshot_path: Snapshot file (on the server)
+        root: Where the codebase lives on this machine (default: the
+            root it was exported from)
+        index_changes: Afterwards, incrementally index files that differ
+            from the snapshot
+
+    Returns:
+        Import statistics, plus 'index' stats when index_changes is set
+    """
+    if not code_indexer and not shard_manager:
+        raise HTTPException(
+            status_code=503,
+            detail="Code understanding not initialized"
+        )
+
+    try:
+        header = await asyncio.to_thread(read_snapshot_header, snapshot_path)
+        codebase_path = root or header['root']
+
+        async with _open_index(codebase_path, create=True) as indexer:
+            result = await indexer.import_snapshot(snapshot_path, root=root)
+            if index_changes and Path(codebase_path).is_dir():
+                result['index'] = await indexer.index_codebase(codebase_path)
+
+        return result
+
+    except SnapshotError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    except Exception as e:
+        logger.error(f"Snapshot import failed: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+async def _run_reindex(codebase_path: str) -> None:
+    """Run a full reindex in the background and log its outcome."""
+    try:
+        async with _open_index(codebase_path) as indexer:
+            result = await indexer.reindex_codebase(codebase_path)
+        logger.info(
+            f"Full reindex complete: {result['total_chunks']} chunks, "
+            f"generation {result['generation']}, {result['duration_ms']}ms"
+        )
+    except Exception as e:
+        logger.error(f"Full reindex failed: {e}")
+
+
+@asynccontextmanager
+async def _open_index(repo: str, create: bool = False) -> AsyncIterator[CodebaseIndexer]:
+    """
+    Get the indexer serving a repository or file path.
+
+    Without sharding this is the global indexer; with sharding, the
+    repository's shard is held open while the context is active.
+
+    Raises:
+        KeyError: If sharding is on and no shard matches (and not create)
+    """
+    if shard_manager is None:
+        yield code_indexer
+        return
+
+    async with shard_manager.acquire(repo, create=create) as shard:
+        yield shard.indexer
+
+
 # A2A Integration Endpoints
 
 
@@ -1022,7 +1365,11 @@ async def agent_card(request: Request):
             "health": f"{base_url}/health",
             "chat": f"{base_url}/v1/chat/completions",
             "search": f"{base_url}/v1/codebase/search",
+            "search_batch": f"{base_url}/v1/codebase/search/batch",
+            "symbols": f"{base_url}/v1/codebase/symbols",
             "index": f"{base_url}/v1/codebase/index",
+            "snapshot_export": f"{base_url}/v1/codebase/snapshot/export",
+            "snapshot_import": f"{base_url}/v1/codebase/snapshot/import",
             "stats": f"{base_url}/v1/codebase/stats",
             "sync_receive": f"{base_url}/v1/sync/receive",
             "sync_share": f"{base_url}/v1/sync/share",
@@ -1049,8 +1396,12 @@ async def root():
             "chat": "/v1/chat/completions",
             "codebase_index": "/v1/codebase/index",
             "codebase_search": "/v1/codebase/search",
+            "codebase_search_batch": "/v1/codebase/search/batch",
+            "codebase_symbols": "/v1/codebase/symbols",
             "codebase_stats": "/v1/codebase/stats",
             "codebase_refresh": "/v1/codebase/refresh",
+            "codebase_snapshot_export": "/v1/codebase/snapshot/export",
+            "codebase_snapshot_import": "/v1/codebase/snapshot/import",
             "storage_stats": "/v1/storage/stats",
             "circuits": "/v1/resilience/circuits",
             "metrics": "/v1/observability/metrics",
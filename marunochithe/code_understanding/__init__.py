@@ -13,8 +13,25 @@ from .parser import CodeParser
 from .chunker import CodeChunker
 from .indexer import CodebaseIndexer
 from .keyword_indexer import KeywordIndexer
+from .shard_manager import Shard, ShardManager
 from .hybrid_searcher import HybridSearcher
 from .watcher import CodebaseWatcher
+from .embeddings import (
+    EmbeddingProvider,
+    EmbeddingCache,
+    OnnxEmbeddingProvider,
+    SentenceTransformerEmbeddingProvider,
+    OllamaEmbeddingProvider,
+    create_embedding_provider,
+)
+from .file_discovery import FileDiscovery
+from .exact_search import ExactVectorIndex
+from .mmap_store import MmapVectorIndex
+from .snapshot import IndexSnapshot, SnapshotError, read_snapshot_header
+from .chunk_cache import ChunkCache
+from .result_cache import SearchResultCache
+from .code_graph import CodeGraph
+from .symbol_index import SymbolIndex
 
 __all__ = [
     'CodeChunk',
@@ -28,6 +45,24 @@ __all__ = [
     'CodeChunker',
     'CodebaseIndexer',
     'KeywordIndexer',
+    'Shard',
+    'ShardManager',
     'HybridSearcher',
     'CodebaseWatcher',
+    'EmbeddingProvider',
+    'EmbeddingCache',
+    'OnnxEmbeddingProvider',
+    'SentenceTransformerEmbeddingProvider',
+    'OllamaEmbeddingProvider',
+    'create_embedding_provider',
+    'FileDiscovery',
+    'ExactVectorIndex',
+    'MmapVectorIndex',
+    'IndexSnapshot',
+    'SnapshotError',
+    'read_snapshot_header',
+    'ChunkCache',
+    'SearchResultCache',
+    'CodeGraph',
+    'SymbolIndex',
 ]
@@ -0,0 +1,122 @@
+"""
+Bounded LRU of chunk documents and metadata, keyed by chunk ID.
+
+Search results are hydrated from ChromaDB by chunk ID; popular chunks
+are hydrated over and over. The cache keeps recently returned chunks in
+memory and is invalidated by the indexer whenever chunks are written or
+deleted.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Tuple
+
+
+# (document, metadata) of one chunk
+ChunkRecord = Tuple[str, Dict]
+
+
+class ChunkCache:
+    """
+    Thread-safe LRU of chunk records.
+
+    Writes run on the vector store's write lane while lookups run on the
+    event loop, so every invalidation bumps a version: records fetched
+    before an invalidation are not cached, as they may already be stale.
+    """
+
+    def __init__(self, max_entries: int = 4096):
+        """
+        Initialize ChunkCache.
+
+        Args:
+            max_entries: Chunks kept before the least recently used is
+                evicted (0 disables caching)
+        """
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[str, ChunkRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, chunk_ids: Iterable[str]) -> Tuple[Dict[str, ChunkRecord], List[str], int]:
+        """
+        Look up chunks.
+
+        Args:
+            chunk_ids: Chunk IDs
+
+        Returns:
+            (cached records by ID, IDs to fetch, version to pass to put_many)
+        """
+        found: Dict[str, ChunkRecord] = {}
+        missing: List[str] = []
+
+        with self._lock:
+            for chunk_id in chunk_ids:
+                record = self._entries.get(chunk_id)
+                if record is None:
+                    missing.append(chunk_id)
+                else:
+                    self._entries.move_to_end(chunk_id)
+                    found[chunk_id] = record
+
+            self.hits += len(found)
+            self.misses += len(missing)
+            return found, missing, self._version
+
+    def put_many(self, records: Dict[str, ChunkRecord], version: int) -> None:
+        """
+        Cache fetched chunks, unless the cache was invalidated meanwhile.
+
+        Args:
+            records: Records by chunk ID
+            version: Version returned by the get_many() that missed them
+        """
+        if not self.max_entries:
+            return
+
+        with self._lock:
+            if version != self._version:
+                return
+
+            for chunk_id, record in records.items():
+                self._entries[chunk_id] = record
+                self._entries.move_to_end(chunk_id)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, chunk_ids: Iterable[str]) -> None:
+        """
+        Drop chunks that were rewritten or deleted.
+
+        Args:
+            chunk_ids: Chunk IDs
+        """
+        with self._lock:
+            self._version += 1
+            for chunk_id in chunk_ids:
+                self._entries.pop(chunk_id, None)
+
+    def clear(self) -> None:
+        """Drop every chunk."""
+        with self._lock:
+            self._version += 1
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            {'entries': int, 'max_entries': int, 'hits': int, 'misses': int}
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
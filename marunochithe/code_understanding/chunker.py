@@ -1,10 +1,10 @@
 """Hierarchical code chunking for semantic indexing."""
 
 from pathlib import Path
-from typing import List
+from typing import Dict, List
 from loguru import logger
 
-from .models import CodeChunk, ParsedFile, ChunkType, Language
+from .models import CodeChunk, ParsedFile, ChunkType, Language, make_chunk_id
 
 
 class CodeChunker:
@@ -68,6 +68,8 @@ class CodeChunker:
             method_chunks = self._create_method_chunks(parsed, file_chunk.id, mtime)
             chunks.extend(method_chunks)
 
+            self._disambiguate_ids(chunks)
+
             logger.debug(
                 f"Created {len(chunks)} chunks from {parsed.filepath}: "
                 f"1 file, {len(class_chunks)} classes, {len(method_chunks)} methods"
@@ -115,13 +117,18 @@ class CodeChunker:
         if len(content) > self.CHUNK_SIZES['file']:
             content = content[:self.CHUNK_SIZES['file']] + '\n...'
 
+        name = Path(parsed.filepath).name
+
         return CodeChunk(
+            id=make_chunk_id(parsed.filepath, ChunkType.FILE, name, content),
             content=content,
             filepath=parsed.filepath,
             language=parsed.language,
             chunk_type=ChunkType.FILE,
-            name=Path(parsed.filepath).name,
+            name=name,
+            qualified_name=name,
             dependencies=parsed.imports,
+            imports=parsed.imported_modules,
             line_range=(1, len(parsed.raw_content.split('\n'))),
             last_modified=mtime,
         )
@@ -162,12 +169,14 @@ class CodeChunker:
                 content = '\n'.join(overview_lines)
 
             chunk = CodeChunk(
+                id=make_chunk_id(parsed.filepath, ChunkType.CLASS, cls.name, content),
                 content=content,
                 filepath=parsed.filepath,
                 language=parsed.language,
                 chunk_type=ChunkType.CLASS,
                 parent_id=parent_id,
                 name=cls.name,
+                qualified_name=cls.name,
                 docstring=cls.docstring,
                 dependencies=parsed.imports,
                 line_range=(cls.start_line, cls.end_line),
@@ -197,7 +206,8 @@ class CodeChunker:
         # Standalone functions
         for func in parsed.functions:
             chunk = self._create_function_chunk(
-                func, lines, parsed, parent_id, mtime, ChunkType.FUNCTION
+                func, lines, parsed, parent_id, mtime, ChunkType.FUNCTION,
+                func.name
             )
             if chunk:
                 chunks.append(chunk)
@@ -206,7 +216,8 @@ class CodeChunker:
         for cls in parsed.classes:
             for method in cls.methods:
                 chunk = self._create_function_chunk(
-                    method, lines, parsed, parent_id, mtime, ChunkType.METHOD
+                    method, lines, parsed, parent_id, mtime, ChunkType.METHOD,
+                    f"{cls.name}.{method.name}"
                 )
                 if chunk:
                     chunks.append(chunk)
@@ -220,7 +231,8 @@ class CodeChunker:
         parsed: ParsedFile,
         parent_id: str,
         mtime: float,
-        chunk_type: ChunkType
+        chunk_type: ChunkType,
+        qualified_name: str
     ) -> CodeChunk:
         """Create chunk for a single function/method."""
         # Extract function content
@@ -238,19 +250,41 @@ class CodeChunker:
             content = '\n'.join(truncated_lines)
 
         return CodeChunk(
+            id=make_chunk_id(parsed.filepath, chunk_type, qualified_name, content),
             content=content,
             filepath=parsed.filepath,
             language=parsed.language,
             chunk_type=chunk_type,
             parent_id=parent_id,
             name=func.name,
+            qualified_name=qualified_name,
             signature=func.signature,
             docstring=func.docstring,
             dependencies=parsed.imports,
+            calls=func.calls,
             line_range=(func.start_line, func.end_line),
             last_modified=mtime,
         )
 
+    def _disambiguate_ids(self, chunks: List[CodeChunk]) -> None:
+        """
+        Give identical chunks (same name and content, e.g. a redefined
+        function) distinct IDs by numbering repeat occurrences.
+        """
+        occurrences: Dict[str, int] = {}
+
+        for chunk in chunks:
+            seen = occurrences.get(chunk.id, 0)
+            occurrences[chunk.id] = seen + 1
+
+            if seen:
+                chunk.id = make_chunk_id(
+                    chunk.filepath,
+                    chunk.chunk_type,
+                    f"{chunk.qualified_name}#{seen}",
+                    chunk.content
+                )
+
     async def chunk_files(self, parsed_files: List[ParsedFile]) -> List[CodeChunk]:
         """
         Chunk multiple files.
@@ -0,0 +1,525 @@
+"""
+Import/call graph of indexed chunks, for relationship-aware search.
+
+Each chunk stores the names it calls and (for file chunks) the modules it
+imports. The keyword index keeps those references in a table, resolves
+them to edges between chunks and stores the edges keyed by the chunk
+they come from. A write re-resolves only the chunks whose references it
+can affect (see KeywordIndexer._update_graph).
+
+Searches read the edges from compressed sparse row arrays built once
+from the edge table, so expanding a search's top hits to their callers,
+callees, importers and imports is a few array slices. Writes do not
+rebuild the arrays: updated() overrides the adjacency of the chunks
+whose edges changed.
+
+Edges:
+- call:     function/method -> functions, methods and classes of that name
+            (same-file definitions win; names defined too often are skipped)
+- import:   file -> files of the imported module
+- contains: class/function -> its file, method -> its class
+
+All edges are followed in both directions.
+"""
+
+import copy
+import itertools
+import os
+from collections import Counter
+from typing import AsyncContextManager, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiosqlite
+import numpy as np
+
+CALL_WEIGHT = 1.0
+IMPORT_WEIGHT = 0.5
+CONTAINS_WEIGHT = 0.5
+
+# Names defined more often than this are too ambiguous to link calls to
+MAX_CALL_TARGETS = 8
+
+CALLABLE_TYPES = ('function', 'method', 'class')
+
+_PYTHON_EXTENSIONS = ('.py',)
+_JS_EXTENSIONS = ('.js', '.jsx', '.ts', '.tsx')
+
+# (source, target, weight) of one edge, nodes being chunk table rowids
+EdgeRow = Tuple[int, int, float]
+
+# (source, target, weight, 1 if added or -1 if removed) of one changed edge
+EdgeChange = Tuple[int, int, float, int]
+
+# Nodes per query, well below SQLite's host parameter limit
+_QUERY_BATCH = 400
+
+
+def graph_references(
+    filepath: str,
+    language: str,
+    chunk_type: str,
+    calls: Optional[str],
+    imports: Optional[str]
+) -> List[Tuple[str, str]]:
+    """
+    The (kind, name) references a chunk's edges are resolved from.
+
+    Kinds:
+    - call:    a called name
+    - module:  an absolute Python import
+    - path:    a file a relative import may refer to
+    - defines: a dotted name a Python file can be imported as
+
+    Args:
+        filepath: Chunk's file
+        language: Chunk's language
+        chunk_type: Chunk's type
+        calls: Space-separated called names, or None
+        imports: Space-separated imported modules, or None
+
+    Returns:
+        (kind, name) tuples
+    """
+    references = [('call', name) for name in (calls or '').split()]
+
+    for module in (imports or '').split():
+        if language == 'python' and not module.startswith('.'):
+            references.append(('module', module))
+        else:
+            references.extend(
+                ('path', path) for path in import_candidates(module, filepath, language)
+            )
+
+    if chunk_type == 'file':
+        references.extend(('defines', module) for module in python_module_names(filepath))
+
+    return references
+
+
+def python_module_names(filepath: str) -> List[str]:
+    """
+    Every dotted name a Python file can be imported as, e.g. "a/b/c.py"
+    is "c", "b.c" and "a.b.c".
+
+    Args:
+        filepath: File path
+
+    Returns:
+        Dotted names (empty for non-Python files)
+    """
+    stem, ext = os.path.splitext(filepath)
+    if ext not in _PYTHON_EXTENSIONS:
+        return []
+
+    parts = stem.strip(os.sep).split(os.sep)
+    if parts[-1] == '__init__':
+        parts.pop()
+    return ['.'.join(parts[i:]) for i in range(len(parts))]
+
+
+def import_candidates(module: str, filepath: str, language: str) -> List[str]:
+    """
+    Files a relative import may refer to.
+
+    Args:
+        module: Module as written in the importing file
+        filepath: Importing file
+        language: Language of the importing file
+
+    Returns:
+        Candidate file paths (empty for package imports, which point
+        outside the codebase)
+    """
+    if language == 'python':
+        if not module.startswith('.'):
+            return []
+
+        dots = len(module) - len(module.lstrip('.'))
+        base = os.path.dirname(filepath)
+        for _ in range(dots - 1):
+            base = os.path.dirname(base)
+        rest = module[dots:].replace('.', os.sep)
+        base = os.path.join(base, rest) if rest else base
+        return [base + '.py', os.path.join(base, '__init__.py')]
+
+    if module.startswith('.'):
+        base = os.path.normpath(os.path.join(os.path.dirname(filepath), module))
+        return [base] + [base + ext for ext in _JS_EXTENSIONS] + [
+            os.path.join(base, 'index' + ext) for ext in _JS_EXTENSIONS
+        ]
+
+    return []
+
+
+def qualified_parent(qualified_name: Optional[str]) -> Optional[str]:
+    """Qualified name of a method's class ("User.save" -> "User"), or None."""
+    if not qualified_name or '.' not in qualified_name:
+        return None
+    return qualified_name.rsplit('.', 1)[0]
+
+
+def _top(values: np.ndarray, k: int) -> np.ndarray:
+    """Positions of the k largest values, largest first."""
+    if len(values) > k:
+        positions = np.argpartition(-values, k)[:k]
+    else:
+        positions = np.arange(len(values))
+    return positions[np.argsort(-values[positions], kind='stable')]
+
+
+class CodeGraph:
+    """
+    Undirected, weighted chunk graph in CSR form, by chunk table rowid.
+
+    `indptr` holds where each rowid's edges start in `indices` (the
+    neighbors) and `weights`; every edge is stored in both directions.
+    Edge weights are normalized per node when followed, so expansion
+    spreads each seed's weight over its neighbors and hubs (large files,
+    common helpers) do not dominate.
+
+    The arrays are never modified; nodes whose edges changed since
+    build() have their current edges in `changes` (see updated()).
+    """
+
+    def __init__(
+        self,
+        reader: Callable[[], AsyncContextManager[aiosqlite.Connection]],
+        metadata_table: str,
+        indptr: np.ndarray,
+        indices: np.ndarray,
+        weights: np.ndarray
+    ):
+        """
+        Initialize CodeGraph (use KeywordIndexer.get_graph).
+
+        Args:
+            reader: Borrows a connection to the keyword index, for chunk IDs
+            metadata_table: Chunk table
+            indptr: Offsets of each rowid's edges in indices and weights
+            indices: Neighbor rowids
+            weights: Edge weights
+        """
+        self._reader = reader
+        self.metadata_table = metadata_table
+        self.indptr = indptr
+        self.indices = indices
+        self.weights = weights
+
+        # (neighbors, weights) of each node whose edges changed since build()
+        self.changes: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the CSR arrays in bytes."""
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    @classmethod
+    def build(
+        cls,
+        reader: Callable[[], AsyncContextManager[aiosqlite.Connection]],
+        metadata_table: str,
+        edges: Iterable[EdgeRow]
+    ) -> "CodeGraph":
+        """
+        Pack stored edges into CSR arrays.
+
+        Args:
+            reader: Borrows a connection to the keyword index
+            metadata_table: Chunk table
+            edges: (source, target, weight) rows of the edge table
+
+        Returns:
+            CodeGraph over the edges, followed in both directions
+        """
+        rows = np.fromiter(itertools.chain.from_iterable(edges), dtype=np.float64).reshape(-1, 3)
+        sources = rows[:, 0].astype(np.int64)
+        targets = rows[:, 1].astype(np.int64)
+
+        src = np.concatenate([sources, targets])
+        dst = np.concatenate([targets, sources])
+        weight = np.concatenate([rows[:, 2], rows[:, 2]]).astype(np.float32)
+
+        order = np.argsort(src, kind='stable')
+        src, dst, weight = src[order], dst[order], weight[order]
+
+        n = int(src[-1]) + 1 if len(src) else 0
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(src, minlength=n), out=indptr[1:])
+
+        dtype = np.int32 if n <= np.iinfo(np.int32).max else np.int64
+        return cls(reader, metadata_table, indptr, dst.astype(dtype), weight)
+
+    def updated(self, edges: Iterable[EdgeChange]) -> "CodeGraph":
+        """
+        Graph with edges added and removed.
+
+        Args:
+            edges: Changed edges, as written to the edge table
+
+        Returns:
+            New CodeGraph sharing this one's arrays
+        """
+        # Net change per node; edges a write removes and adds back cancel
+        deltas: Dict[int, Counter] = {}
+        for source, target, weight, change in edges:
+            for node, neighbor in ((source, target), (target, source)):
+                deltas.setdefault(node, Counter())[(neighbor, weight)] += change
+
+        graph = copy.copy(self)
+        graph.changes = dict(self.changes)
+
+        for node, delta in deltas.items():
+            if not any(delta.values()):
+                continue
+
+            neighbors, weights = self._node_edges(node)
+            kept = np.ones(len(neighbors), dtype=bool)
+            added: List[Tuple[int, float]] = []
+            for (neighbor, weight), count in delta.items():
+                if count > 0:
+                    added.extend([(neighbor, weight)] * count)
+                elif count < 0:
+                    matches = np.flatnonzero(
+                        kept & (neighbors == neighbor) & (weights == np.float32(weight))
+                    )
+                    kept[matches[:-count]] = False
+
+            graph.changes[node] = (
+                np.concatenate([
+                    neighbors[kept],
+                    np.array([neighbor for neighbor, _ in added], dtype=neighbors.dtype),
+                ]),
+                np.concatenate([
+                    weights[kept],
+                    np.array([weight for _, weight in added], dtype=np.float32),
+                ]),
+            )
+
+        return graph
+
+    def _node_edges(self, node: int) -> Tuple[np.ndarray, np.ndarray]:
+        """(neighbors, weights) of one node."""
+        if node in self.changes:
+            return self.changes[node]
+        if node >= len(self.indptr) - 1:
+            return np.zeros(0, dtype=self.indices.dtype), np.zeros(0, dtype=np.float32)
+        start, end = self.indptr[node], self.indptr[node + 1]
+        return self.indices[start:end], self.weights[start:end]
+
+    async def neighbors(self, chunk_id: str) -> List[str]:
+        """
+        Get the chunks directly related to a chunk.
+
+        Args:
+            chunk_id: Chunk ID
+
+        Returns:
+            Related chunk IDs (empty if the chunk is unknown)
+        """
+        async with self._reader() as db:
+            nodes = await self._nodes(db, [chunk_id])
+            if not nodes:
+                return []
+            _, neighbors, _ = self._edges(np.array(list(nodes.values()), dtype=np.int64))
+            neighbors = neighbors.tolist()
+            chunks = await self._chunks(db, neighbors)
+
+        return [chunks[neighbor][0] for neighbor in neighbors if neighbor in chunks]
+
+    async def expand(
+        self,
+        seeds: Sequence[str],
+        limit: int,
+        hops: int = 2,
+        decay: float = 0.5,
+        language: Optional[str] = None,
+        max_frontier: int = 256,
+        max_degree: int = 1000
+    ) -> List[Tuple[str, float]]:
+        """
+        Rank chunks by their relationships to a ranked list of seeds.
+
+        Each seed spreads weight 1/rank over its edges, for up to `hops`
+        steps, keeping `decay` of it per extra step. Seeds only score by
+        being related to other seeds.
+
+        Args:
+            seeds: Chunk IDs, best first
+            limit: Maximum results
+            hops: Steps to follow edges
+            decay: Weight kept per step beyond the first
+            language: Only return chunks in this language
+            max_frontier: Nodes expanded per step, by weight
+            max_degree: Nodes with more edges are scored but not expanded;
+                spread that thin, their weight ranks nothing and following
+                them would dominate the cost
+
+        Returns:
+            (chunk_id, score) tuples, highest score first
+        """
+        async with self._reader() as db:
+            nodes = await self._nodes(db, seeds)
+
+            frontier: Dict[int, float] = {}
+            for rank, chunk_id in enumerate(seeds, start=1):
+                node = nodes.get(chunk_id)
+                if node is not None and node not in frontier:
+                    frontier[node] = 1.0 / rank
+
+            frontier_nodes = np.fromiter(frontier, dtype=np.int64, count=len(frontier))
+            frontier_weights = np.fromiter(frontier.values(), dtype=np.float64, count=len(frontier))
+
+            scored_nodes: List[np.ndarray] = []
+            scored_weights: List[np.ndarray] = []
+            factor = 1.0
+
+            for _ in range(hops):
+                if not len(frontier_nodes):
+                    break
+
+                owners, neighbors, weights = self._edges(frontier_nodes, max_degree)
+                totals = np.bincount(owners, weights=weights, minlength=len(frontier_nodes))
+                spread = frontier_weights[owners] * weights / totals[owners]
+
+                frontier_nodes, reached = np.unique(neighbors, return_inverse=True)
+                frontier_weights = np.bincount(
+                    reached, weights=spread, minlength=len(frontier_nodes)
+                )
+
+                scored_nodes.append(frontier_nodes)
+                scored_weights.append(frontier_weights * factor)
+
+                factor *= decay
+                if len(frontier_nodes) > max_frontier:
+                    top = np.argpartition(-frontier_weights, max_frontier)[:max_frontier]
+                    frontier_nodes, frontier_weights = frontier_nodes[top], frontier_weights[top]
+
+            if not scored_nodes:
+                return []
+
+            scores = np.bincount(
+                np.concatenate(scored_nodes), weights=np.concatenate(scored_weights)
+            )
+            scored = np.flatnonzero(scores)
+
+            # Sorting every scored node would cost more than expanding; the
+            # best few suffice unless the language filter drops most of them
+            best = scored[_top(scores[scored], _QUERY_BATCH)]
+            results = await self._ranked_chunks(db, best, scores, limit, language)
+            if len(results) < limit and len(scored) > len(best):
+                rest = scored[np.argsort(-scores[scored], kind='stable')]
+                rest = rest[~np.isin(rest, best)]
+                results += await self._ranked_chunks(
+                    db, rest, scores, limit - len(results), language
+                )
+
+        return results
+
+    async def _ranked_chunks(
+        self,
+        db: aiosqlite.Connection,
+        nodes: np.ndarray,
+        scores: np.ndarray,
+        limit: int,
+        language: Optional[str]
+    ) -> List[Tuple[str, float]]:
+        """(chunk ID, score) of the first `limit` nodes passing the language filter."""
+        results = []
+        for i in range(0, len(nodes), _QUERY_BATCH):
+            batch = nodes[i:i + _QUERY_BATCH].tolist()
+            chunks = await self._chunks(db, batch)
+
+            for node in batch:
+                if node not in chunks:
+                    continue
+                chunk_id, chunk_language = chunks[node]
+                if language is not None and chunk_language != language:
+                    continue
+                results.append((chunk_id, float(scores[node])))
+                if len(results) == limit:
+                    return results
+
+        return results
+
+    def _edges(
+        self,
+        nodes: np.ndarray,
+        max_degree: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Edges of nodes, as (position in nodes, neighbor, weight) arrays.
+
+        Args:
+            nodes: Chunk table rowids
+            max_degree: Leave out the edges of nodes with more edges
+
+        Returns:
+            Arrays of one entry per edge, grouped by node
+        """
+        starts = np.zeros(len(nodes), dtype=np.int64)
+        counts = np.zeros(len(nodes), dtype=np.int64)
+        packed = nodes < len(self.indptr) - 1
+        starts[packed] = self.indptr[nodes[packed]]
+        counts[packed] = self.indptr[nodes[packed] + 1] - starts[packed]
+
+        changed = [i for i, node in enumerate(nodes.tolist()) if node in self.changes]
+        counts[changed] = 0
+        if max_degree is not None:
+            counts[counts > max_degree] = 0
+            changed = [i for i in changed if len(self.changes[int(nodes[i])][0]) <= max_degree]
+
+        # Slices of the arrays, concatenated without a Python loop
+        owners = np.repeat(np.arange(len(nodes)), counts)
+        offsets = np.cumsum(counts) - counts
+        positions = np.arange(len(owners)) + np.repeat(starts - offsets, counts)
+        neighbors = self.indices[positions]
+        weights = self.weights[positions]
+
+        if changed:
+            owner_parts, neighbor_parts, weight_parts = [owners], [neighbors], [weights]
+            for i in changed:
+                node_neighbors, node_weights = self.changes[int(nodes[i])]
+                owner_parts.append(np.full(len(node_neighbors), i))
+                neighbor_parts.append(node_neighbors)
+                weight_parts.append(node_weights)
+            owners = np.concatenate(owner_parts)
+            neighbors = np.concatenate(neighbor_parts)
+            weights = np.concatenate(weight_parts)
+
+        return owners, neighbors, weights
+
+    async def _nodes(self, db: aiosqlite.Connection, chunk_ids: Sequence[str]) -> Dict[str, int]:
+        """Chunk table rowids of chunks, by chunk ID (unknown chunks are left out)."""
+        nodes: Dict[str, int] = {}
+        chunk_ids = list(dict.fromkeys(chunk_ids))
+
+        for i in range(0, len(chunk_ids), _QUERY_BATCH):
+            batch = chunk_ids[i:i + _QUERY_BATCH]
+            cursor = await db.execute(f"""
+                SELECT chunk_id, id FROM {self.metadata_table}
+                WHERE chunk_id IN ({','.join('?' * len(batch))})
+            """, batch)
+            nodes.update(await cursor.fetchall())
+
+        return nodes
+
+    async def _chunks(
+        self,
+        db: aiosqlite.Connection,
+        nodes: Sequence[int]
+    ) -> Dict[int, Tuple[str, str]]:
+        """(chunk ID, language) of nodes (deleted chunks are left out)."""
+        chunks: Dict[int, Tuple[str, str]] = {}
+        nodes = list(dict.fromkeys(nodes))
+
+        for i in range(0, len(nodes), _QUERY_BATCH):
+            batch = nodes[i:i + _QUERY_BATCH]
+            cursor = await db.execute(f"""
+                SELECT id, chunk_id, language FROM {self.metadata_table}
+                WHERE id IN ({','.join('?' * len(batch))})
+            """, batch)
+            chunks.update(
+                (node, (chunk_id, language))
+                for node, chunk_id, language in await cursor.fetchall()
+            )
+
+        return chunks
@@ -0,0 +1,68 @@
+"""
+Identifier-aware tokenization for the FTS5 keyword index.
+
+SQLite's built-in tokenizers treat `getUserById` as one opaque word and
+`get_user_by_id` as four prose words. Text is therefore expanded before
+it reaches FTS5: every compound identifier is kept whole and followed by
+its parts (camelCase, snake_case and digit boundaries). Queries are split
+the same way by query_compiler, so both the exact identifier and its words
+match.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+# FTS5 tokenizer for expanded text: '_' is part of a token, so snake_case
+# identifiers survive whole next to their split parts
+FTS5_TOKENIZE = "porter unicode61 tokenchars '_'"
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+# Words inside an identifier: "HTTPServer2" -> HTTP, Server, 2
+_PART = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|[0-9]+")
+
+
+def split_identifier(identifier: str) -> List[str]:
+    """
+    Split an identifier into lowercase words.
+
+    Args:
+        identifier: e.g. "getUserById", "parse_HTTP2_header"
+
+    Returns:
+        e.g. ["get", "user", "by", "id"], ["parse", "http", "2", "header"]
+    """
+    return list(_split(identifier))
+
+
+@lru_cache(maxsize=65536)
+def _split(identifier: str) -> Tuple[str, ...]:
+    # Identifiers repeat heavily across a codebase
+    return tuple(part.lower() for part in _PART.findall(identifier))
+
+
+def expand_identifiers(text: str) -> str:
+    """
+    Append the parts of every compound identifier to a text.
+
+    Args:
+        text: Code or prose
+
+    Returns:
+        The original text, followed by the split parts of each compound
+        identifier occurrence
+    """
+    if not text:
+        return text
+
+    parts: List[str] = []
+    for identifier in _IDENTIFIER.findall(text):
+        words = _split(identifier)
+        if len(words) > 1:
+            parts.extend(words)
+
+    if not parts:
+        return text
+    return f"{text}\n{' '.join(parts)}"
+
@@ -0,0 +1,334 @@
+"""
+Embedding providers and a persistent content-hash embedding cache.
+
+Providers turn chunk text into vectors in batches. EmbeddingCache stores
+every vector keyed by (model id, sha256 of the text), so re-indexing
+unchanged code - or switching back to a previously used model - costs
+no embedding compute.
+"""
+
+import hashlib
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiosqlite
+import numpy as np
+from loguru import logger
+
+
+def content_hash(text: str) -> str:
+    """Return the sha256 hex digest of chunk text."""
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingProvider(ABC):
+    """
+    Batched text embedding model.
+
+    `embed` is blocking and is run on the vector store executor.
+    """
+
+    #: Identifies model and provider; part of the embedding cache key
+    model_id: str
+
+    def __init__(self, batch_size: int = 32):
+        """
+        Initialize provider.
+
+        Args:
+            batch_size: Texts per inference call
+        """
+        self.batch_size = max(1, batch_size)
+
+    @abstractmethod
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed one batch of at most `batch_size` texts."""
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        """
+        Embed texts in batches of `batch_size`.
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            One vector per text, in input order
+        """
+        vectors: List[List[float]] = []
+        for i in range(0, len(texts), self.batch_size):
+            vectors.extend(self._embed_batch(list(texts[i:i + self.batch_size])))
+        return vectors
+
+
+class OnnxEmbeddingProvider(EmbeddingProvider):
+    """
+    all-MiniLM-L6-v2 on CPU via ONNX Runtime.
+
+    This is the model ChromaDB uses by default, so collections built
+    before providers were configurable stay compatible.
+    """
+
+    model_id = "onnx:all-MiniLM-L6-v2"
+
+    def __init__(self, batch_size: int = 32):
+        super().__init__(batch_size)
+
+        from chromadb.utils.embedding_functions.onnx_mini_lm_l6_v2 import ONNXMiniLM_L6_V2
+
+        self._model = ONNXMiniLM_L6_V2(preferred_providers=["CPUExecutionProvider"])
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        return [np.asarray(v, dtype=np.float32).tolist() for v in self._model(texts)]
+
+
+class SentenceTransformerEmbeddingProvider(EmbeddingProvider):
+    """Any sentence-transformers model (requires `sentence-transformers`)."""
+
+    def __init__(
+        self,
+        model_name: str = "all-MiniLM-L6-v2",
+        device: str = "cpu",
+        batch_size: int = 32
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            model_name: Hugging Face model name or local path
+            device: Torch device ("cpu", "cuda", "mps")
+            batch_size: Texts per inference call
+        """
+        super().__init__(batch_size)
+
+        try:
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "sentence-transformers is not installed; "
+                "install it or use the 'onnx' embedding provider"
+            ) from e
+
+        self.model_id = f"sentence-transformers:{model_name}"
+        self._model = SentenceTransformer(model_name, device=device)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        vectors = self._model.encode(
+            texts,
+            batch_size=self.batch_size,
+            normalize_embeddings=True,
+            convert_to_numpy=True,
+        )
+        return vectors.astype(np.float32).tolist()
+
+
+class OllamaEmbeddingProvider(EmbeddingProvider):
+    """Embedding model served by Ollama (e.g. nomic-embed-text)."""
+
+    def __init__(
+        self,
+        model_name: str = "nomic-embed-text",
+        host: str = "http://localhost:11434",
+        batch_size: int = 32
+    ):
+        """
+        Initialize provider.
+
+        Args:
+            model_name: Ollama embedding model
+            host: Ollama server endpoint
+            batch_size: Texts per request
+        """
+        super().__init__(batch_size)
+
+        import ollama
+
+        self.model_id = f"ollama:{model_name}"
+        self.model_name = model_name
+        self._client = ollama.Client(host=host)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        response = self._client.embed(model=self.model_name, input=texts)
+        return [list(v) for v in response['embeddings']]
+
+
+def create_embedding_provider(
+    provider: str = "onnx",
+    model_name: Optional[str] = None,
+    device: str = "cpu",
+    batch_size: int = 32,
+    ollama_host: str = "http://localhost:11434"
+) -> EmbeddingProvider:
+    """
+    Create an embedding provider by name.
+
+    Args:
+        provider: "onnx", "sentence-transformers" or "ollama"
+        model_name: Model for sentence-transformers/ollama (ignored for onnx)
+        device: Torch device for sentence-transformers
+        batch_size: Texts per inference call
+        ollama_host: Ollama server endpoint
+
+    Returns:
+        EmbeddingProvider instance
+    """
+    if provider == "onnx":
+        return OnnxEmbeddingProvider(batch_size=batch_size)
+
+    if provider == "sentence-transformers":
+        return SentenceTransformerEmbeddingProvider(
+            model_name=model_name or "all-MiniLM-L6-v2",
+            device=device,
+            batch_size=batch_size,
+        )
+
+    if provider == "ollama":
+        return OllamaEmbeddingProvider(
+            model_name=model_name or "nomic-embed-text",
+            host=ollama_host,
+            batch_size=batch_size,
+        )
+
+    raise ValueError(f"Unknown embedding provider: {provider}")
+
+
+class EmbeddingCache:
+    """
+    Persistent embedding cache keyed by (model id, content hash).
+
+    Vectors are stored as float32 blobs.
+    """
+
+    # Keep IN (...) lists under SQLite's bound parameter limit
+    _LOOKUP_BATCH = 500
+
+    def __init__(self, db_path: str):
+        """
+        Initialize EmbeddingCache.
+
+        Args:
+            db_path: Path to the SQLite cache database
+        """
+        self.db_path = db_path
+
+        # Create parent directory
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db = None
+        self._initialized = False
+
+    async def _ensure_initialized(self) -> None:
+        """Ensure database is initialized."""
+        if self._initialized:
+            return
+
+        await self._init_db()
+        self._initialized = True
+
+    async def _init_db(self) -> None:
+        """Initialize cache schema."""
+        try:
+            self.db = await aiosqlite.connect(self.db_path)
+
+            # Entries can always be recomputed; skip per-commit fsync
+            await self.db.execute("PRAGMA journal_mode=WAL")
+            await self.db.execute("PRAGMA synchronous=NORMAL")
+
+            await self.db.execute("""
+                CREATE TABLE IF NOT EXISTS embeddings (
+                    model_id TEXT,
+                    content_hash TEXT,
+                    vector BLOB,
+                    PRIMARY KEY (model_id, content_hash)
+                ) WITHOUT ROWID
+            """)
+
+            await self.db.commit()
+            logger.debug(f"Initialized embedding cache at {self.db_path}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize embedding cache: {e}")
+            raise
+
+    async def get_many(
+        self,
+        model_id: str,
+        hashes: Iterable[str]
+    ) -> Dict[str, List[float]]:
+        """
+        Look up cached vectors.
+
+        Args:
+            model_id: Embedding model ID
+            hashes: Content hashes to look up
+
+        Returns:
+            Mapping of content hash to vector, for hashes that are cached
+        """
+        await self._ensure_initialized()
+
+        hashes = list(hashes)
+        found: Dict[str, List[float]] = {}
+
+        for i in range(0, len(hashes), self._LOOKUP_BATCH):
+            batch = hashes[i:i + self._LOOKUP_BATCH]
+            placeholders = ",".join("?" * len(batch))
+
+            cursor = await self.db.execute(f"""
+                SELECT content_hash, vector FROM embeddings
+                WHERE model_id = ? AND content_hash IN ({placeholders})
+            """, (model_id, *batch))
+
+            for digest, blob in await cursor.fetchall():
+                found[digest] = np.frombuffer(blob, dtype=np.float32).tolist()
+
+        return found
+
+    async def put_many(
+        self,
+        model_id: str,
+        items: Sequence[Tuple[str, Sequence[float]]]
+    ) -> None:
+        """
+        Store vectors.
+
+        Args:
+            model_id: Embedding model ID
+            items: (content hash, vector) pairs
+        """
+        if not items:
+            return
+
+        await self._ensure_initialized()
+
+        await self.db.executemany("""
+            INSERT OR REPLACE INTO embeddings (model_id, content_hash, vector)
+            VALUES (?, ?, ?)
+        """, [
+            (model_id, digest, np.asarray(vector, dtype=np.float32).tobytes())
+            for digest, vector in items
+        ])
+
+        await self.db.commit()
+
+    async def clear(self, model_id: Optional[str] = None) -> None:
+        """
+        Remove cached vectors.
+
+        Args:
+            model_id: Only remove vectors of this model (default: all)
+        """
+        await self._ensure_initialized()
+
+        if model_id is None:
+            await self.db.execute("DELETE FROM embeddings")
+        else:
+            await self.db.execute("DELETE FROM embeddings WHERE model_id = ?", (model_id,))
+        await self.db.commit()
+
+    async def close(self) -> None:
+        """Close database connection."""
+        if self.db:
+            await self.db.close()
+            self.db = None
+            self._initialized = False
@@ -0,0 +1,351 @@
+"""
+Code file discovery shared by the indexer and the watcher.
+
+Walks a codebase with os.scandir, pruning excluded and ignored
+directories before descending into them, and honoring .gitignore and
+.ignore files at every level.
+"""
+
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple, Union
+
+from loguru import logger
+
+
+DEFAULT_CODE_EXTENSIONS = frozenset({'.py', '.js', '.ts', '.tsx', '.jsx'})
+
+DEFAULT_EXCLUDED_DIRS = frozenset({
+    '.venv', 'venv', '__pycache__', '.git', 'node_modules',
+    '.pytest_cache', 'dist', 'build', '.mypy_cache', '.ruff_cache',
+    'env', '.tox', 'htmlcov', '.coverage', '.eggs'
+})
+
+# Read in this order, so .ignore rules override .gitignore ones
+IGNORE_FILENAMES = ('.gitignore', '.ignore')
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    """One compiled .gitignore pattern, scoped to the directory of its file."""
+    base: str            # Directory of the ignore file, relative to root ('' for root)
+    regex: Pattern
+    negate: bool
+    dir_only: bool
+
+    def matches(self, rel_path: str, is_dir: bool) -> bool:
+        """Check a root-relative, '/'-separated path against this rule."""
+        if self.dir_only and not is_dir:
+            return False
+
+        if self.base:
+            if not rel_path.startswith(self.base + '/'):
+                return False
+            rel_path = rel_path[len(self.base) + 1:]
+
+        return self.regex.match(rel_path) is not None
+
+
+def _translate(pattern: str) -> str:
+    """Translate a gitignore glob (without leading/trailing slash) to a regex."""
+    out = []
+    i, n = 0, len(pattern)
+
+    while i < n:
+        c = pattern[i]
+
+        if pattern.startswith('**/', i):
+            out.append('(?:.*/)?')
+            i += 3
+        elif pattern.startswith('/**', i) and i + 3 == n:
+            out.append('/.*')
+            i += 3
+        elif pattern.startswith('**', i):
+            out.append('.*')
+            i += 2
+        elif c == '*':
+            out.append('[^/]*')
+            i += 1
+        elif c == '?':
+            out.append('[^/]')
+            i += 1
+        elif c == '[':
+            end = pattern.find(']', i + 1)
+            if end == -1:
+                out.append(re.escape(c))
+                i += 1
+            else:
+                body = pattern[i + 1:end]
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                out.append(f'[{body}]')
+                i = end + 1
+        elif c == '\\' and i + 1 < n:
+            out.append(re.escape(pattern[i + 1]))
+            i += 2
+        else:
+            out.append(re.escape(c))
+            i += 1
+
+    return ''.join(out)
+
+
+def parse_ignore_lines(lines: Iterable[str], base: str = '') -> List[IgnoreRule]:
+    """
+    Compile gitignore-style lines.
+
+    Args:
+        lines: Lines of a .gitignore/.ignore file
+        base: Directory containing the file, relative to the walk root
+
+    Returns:
+        Compiled rules, in file order
+    """
+    rules = []
+
+    for line in lines:
+        line = line.rstrip('\n').rstrip('\r')
+        if not line.strip() or line.startswith('#'):
+            continue
+
+        # Trailing spaces are ignored unless escaped
+        if not line.endswith('\\ '):
+            line = line.rstrip(' ')
+
+        negate = line.startswith('!')
+        if negate:
+            line = line[1:]
+        elif line.startswith('\\!') or line.startswith('\\#'):
+            line = line[1:]
+
+        dir_only = line.endswith('/')
+        line = line.rstrip('/')
+        if not line:
+            continue
+
+        # A slash anywhere but the end anchors the pattern to `base`
+        anchored = '/' in line
+        line = line.lstrip('/')
+
+        regex = _translate(line)
+        if not anchored:
+            regex = '(?:.*/)?' + regex
+
+        rules.append(IgnoreRule(
+            base=base,
+            regex=re.compile(f'^{regex}$'),
+            negate=negate,
+            dir_only=dir_only,
+        ))
+
+    return rules
+
+
+def is_ignored(rules: Iterable[IgnoreRule], rel_path: str, is_dir: bool) -> bool:
+    """
+    Apply rules gitignore-style: the last matching rule wins.
+
+    Args:
+        rules: Rules from the root down to the path's directory
+        rel_path: Root-relative, '/'-separated path
+        is_dir: Whether the path is a directory
+
+    Returns:
+        True if the path is ignored
+    """
+    ignored = False
+    for rule in rules:
+        if rule.matches(rel_path, is_dir):
+            ignored = not rule.negate
+    return ignored
+
+
+class FileDiscovery:
+    """
+    Find code files under a root directory.
+
+    Excluded directory names are pruned without being listed, and
+    .gitignore/.ignore files are honored at every level.
+    """
+
+    def __init__(
+        self,
+        root: Union[str, Path],
+        extensions: Optional[Iterable[str]] = None,
+        excluded_dirs: Optional[Iterable[str]] = None,
+        use_ignore_files: bool = True
+    ):
+        """
+        Initialize FileDiscovery.
+
+        Args:
+            root: Root directory
+            extensions: File extensions to include (default: .py, .js, .ts, .tsx, .jsx)
+            excluded_dirs: Directory names never descended into
+            use_ignore_files: Honor .gitignore and .ignore files
+        """
+        self.root = Path(root).resolve()
+        self.extensions = frozenset(extensions or DEFAULT_CODE_EXTENSIONS)
+        self.excluded_dirs = frozenset(
+            DEFAULT_EXCLUDED_DIRS if excluded_dirs is None else excluded_dirs
+        )
+        self.use_ignore_files = use_ignore_files
+
+        # Rules found directly in each directory, keyed by relative dir
+        self._dir_rules: Dict[str, Tuple[IgnoreRule, ...]] = {}
+
+    def find_files(self, max_workers: int = 1) -> List[Path]:
+        """
+        Walk the root and return matching files.
+
+        Args:
+            max_workers: Threads listing directories concurrently
+
+        Returns:
+            Sorted list of file paths
+        """
+        files: List[Path] = []
+        frontier: List[Tuple[str, Tuple[IgnoreRule, ...]]] = [('', ())]
+
+        if max_workers <= 1:
+            while frontier:
+                rel_dir, rules = frontier.pop()
+                dir_files, subdirs = self._scan_dir(rel_dir, rules)
+                files.extend(dir_files)
+                frontier.extend(subdirs)
+        else:
+            # Breadth-first, one level of directories at a time
+            with ThreadPoolExecutor(
+                max_workers=max_workers,
+                thread_name_prefix="file-discovery",
+            ) as pool:
+                while frontier:
+                    next_frontier = []
+                    for dir_files, subdirs in pool.map(
+                        lambda item: self._scan_dir(*item), frontier
+                    ):
+                        files.extend(dir_files)
+                        next_frontier.extend(subdirs)
+                    frontier = next_frontier
+
+        return sorted(files)
+
+    def matches(self, filepath: Union[str, Path]) -> bool:
+        """
+        Check a single file against extensions, excluded dirs and ignore rules.
+
+        Args:
+            filepath: Path to file
+
+        Returns:
+            True if the file would be discovered by find_files
+        """
+        path = Path(filepath)
+        if path.suffix not in self.extensions:
+            return False
+
+        try:
+            parts = path.resolve().relative_to(self.root).parts
+        except ValueError:
+            # Outside root
+            return False
+
+        if any(part in self.excluded_dirs for part in parts[:-1]):
+            return False
+
+        if not self.use_ignore_files:
+            return True
+
+        # Check each ancestor directory, then the file, with the rules
+        # that apply at that depth
+        rules: Tuple[IgnoreRule, ...] = ()
+        for depth in range(len(parts)):
+            rel_path = '/'.join(parts[:depth + 1])
+            is_dir = depth < len(parts) - 1
+            rules = rules + self._load_rules('/'.join(parts[:depth]))
+
+            if is_ignored(rules, rel_path, is_dir):
+                return False
+
+        return True
+
+    def clear_cache(self) -> None:
+        """Forget cached ignore files (call when one changes)."""
+        self._dir_rules.clear()
+
+    def _load_rules(self, rel_dir: str) -> Tuple[IgnoreRule, ...]:
+        """Read and cache the ignore files of one directory."""
+        cached = self._dir_rules.get(rel_dir)
+        if cached is not None:
+            return cached
+
+        directory = self.root / rel_dir if rel_dir else self.root
+        rules: List[IgnoreRule] = []
+
+        for name in IGNORE_FILENAMES:
+            try:
+                with open(directory / name, encoding='utf-8', errors='replace') as f:
+                    rules.extend(parse_ignore_lines(f, base=rel_dir))
+            except FileNotFoundError:
+                continue
+            except OSError as e:
+                logger.warning(f"Failed to read {directory / name}: {e}")
+
+        result = tuple(rules)
+        self._dir_rules[rel_dir] = result
+        return result
+
+    def _scan_dir(
+        self,
+        rel_dir: str,
+        parent_rules: Tuple[IgnoreRule, ...]
+    ) -> Tuple[List[Path], List[Tuple[str, Tuple[IgnoreRule, ...]]]]:
+        """
+        List one directory.
+
+        Args:
+            rel_dir: Directory relative to root ('' for root)
+            parent_rules: Ignore rules inherited from ancestors
+
+        Returns:
+            (matching files, [(subdirectory, its inherited rules)])
+        """
+        rules = parent_rules
+        if self.use_ignore_files:
+            rules = parent_rules + self._load_rules(rel_dir)
+
+        directory = self.root / rel_dir if rel_dir else self.root
+        files: List[Path] = []
+        subdirs: List[Tuple[str, Tuple[IgnoreRule, ...]]] = []
+
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+
+                    try:
+                        # Don't follow directory symlinks (avoids cycles)
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in self.excluded_dirs:
+                                continue
+                            if rules and is_ignored(rules, rel_path, True):
+                                continue
+                            subdirs.append((rel_path, rules))
+
+                        elif entry.is_file():
+                            if os.path.splitext(entry.name)[1] not in self.extensions:
+                                continue
+                            if rules and is_ignored(rules, rel_path, False):
+                                continue
+                            files.append(Path(entry.path))
+
+                    except OSError:
+                        continue
+
+        except OSError as e:
+            logger.warning(f"Failed to list {directory}: {e}")
+
+        return files, subdirs
@@ -4,18 +4,25 @@ Hybrid Search with Reciprocal Rank Fusion (RRF).
 Combines three search strategies for optimal code retrieval:
 1. Vector search (ChromaDB semantic similarity)
 2. Keyword search (SQLite FTS5 BM25)
-3. Graph search (code relationships via imports/calls)
+3. Graph search (code relationships via imports/calls, mode="graph")
 
 Research shows hybrid search improves NDCG@10 by 42% over pure vector search.
 """
 
 import asyncio
-from typing import List, Dict, Optional, Set, Tuple
+import dataclasses
+import json
+import re
+from typing import Hashable, List, Dict, Optional, Set, Tuple
 from loguru import logger
 
 from .models import SearchResult, Language
 from .indexer import CodebaseIndexer
 from .keyword_indexer import KeywordIndexer
+from .shard_manager import ShardManager
+from .code_graph import CodeGraph
+from .query_compiler import is_symbol_query
+from .result_cache import SearchResultCache
 
 
 class HybridSearcher:
@@ -30,9 +37,12 @@ class HybridSearcher:
 
     def __init__(
         self,
-        vector_indexer: CodebaseIndexer,
+        vector_indexer: Optional[CodebaseIndexer] = None,
         keyword_indexer: Optional[KeywordIndexer] = None,
-        rrf_k: int = 60
+        rrf_k: int = 60,
+        shard_manager: Optional[ShardManager] = None,
+        result_cache_size: int = 1024,
+        result_cache: Optional[SearchResultCache] = None
     ):
         """
         Initialize hybrid searcher.
@@ -41,10 +51,23 @@ class HybridSearcher:
             vector_indexer: ChromaDB semantic indexer
             keyword_indexer: Optional SQLite FTS5 keyword indexer
             rrf_k: RRF constant (default 60 from research)
+            shard_manager: Per-repository shards; when given, searches fan
+                out to the shards instead of using vector_indexer
+            result_cache_size: Search results kept until the indexes they
+                came from are written to (0 disables the cache)
+            result_cache: Cache to share instead of creating one
         """
+        if vector_indexer is None and shard_manager is None:
+            raise ValueError("HybridSearcher needs a vector_indexer or a shard_manager")
+
         self.vector_indexer = vector_indexer
         self.keyword_indexer = keyword_indexer
         self.rrf_k = rrf_k
+        self.shard_manager = shard_manager
+        self.result_cache = result_cache or SearchResultCache(result_cache_size)
+
+        # Failed searches return no results, which must not be cached
+        self._search_failures = 0
 
     async def search(
         self,
@@ -52,24 +75,126 @@ class HybridSearcher:
         mode: str = "hybrid",
         limit: int = 5,
         filter_metadata: Optional[Dict] = None,
-        filter_language: Optional[str] = None
+        filter_language: Optional[str] = None,
+        repos: Optional[List[str]] = None
     ) -> List[SearchResult]:
         """
         Search with multiple strategies and fuse results.
 
         Args:
             query: Search query
-            mode: "vector", "keyword", "graph", or "hybrid"
+            mode: "vector", "keyword", "hybrid" (identifier queries like
+                "UserService.get" are answered by exact symbol lookup when
+                defined), "graph" (hybrid plus code related to the best
+                hits by imports and calls), or "substring"/"regex" (exact
+                matches of a literal or regex in chunk content)
             limit: Maximum results to return
             filter_metadata: ChromaDB metadata filters
             filter_language: Language filter for keyword search
+            repos: Shards to search, by name or path (default: all;
+                only used with a shard manager)
 
         Returns:
             List of SearchResult ordered by fused relevance
         """
+        if mode == "regex":
+            # Fail fast, rather than once per shard
+            self._check_regex(query)
+
+        if self.shard_manager is not None:
+            results = await self._search_shards(
+                [query], mode, limit, filter_metadata, filter_language, repos
+            )
+            return results[0]
+
+        key = self._cache_key(query, mode, limit, filter_metadata, filter_language)
+        generation = self._write_generation()
+
+        results = self.result_cache.get(key, generation)
+        if results is None:
+            failures = self._failure_count()
+            results = await self._search_index(
+                query, mode, limit, filter_metadata, filter_language
+            )
+            if self._failure_count() == failures:
+                self.result_cache.put(key, generation, results)
+
+        return results
+
+    async def search_symbols(
+        self,
+        query: str,
+        limit: int = 20,
+        filter_language: Optional[str] = None,
+        repos: Optional[List[str]] = None,
+        max_distance: Optional[int] = None
+    ) -> List[SearchResult]:
+        """
+        Typo-tolerant search of symbol names, for search-as-you-type.
+
+        Matches chunk names and qualified names case-insensitively, whole
+        or by prefix, within a small edit distance (see
+        KeywordIndexer.search_symbols). Needs no embedding.
+
+        Args:
+            query: Symbol name as typed, e.g. "hybridsearch" or "CodebaseIndxer"
+            limit: Maximum results
+            filter_language: Language filter
+            repos: Shards to search, by name or path (default: all;
+                only used with a shard manager)
+            max_distance: Edit budget (default: by query length)
+
+        Returns:
+            List of SearchResult, closest names first
+
+        Raises:
+            ValueError: If there is no keyword index to search
+        """
+        if self.shard_manager is None:
+            if not self.keyword_indexer:
+                raise ValueError("symbol search needs a keyword index")
+            return await self.keyword_indexer.search_symbols(
+                query, limit, filter_language, max_distance
+            )
+
+        names = self._shard_names(repos)
+
+        async def search_shard(name: str) -> List[SearchResult]:
+            async with self.shard_manager.acquire(name) as shard:
+                return await shard.keyword_indexer.search_symbols(
+                    query, limit, filter_language, max_distance
+                )
+
+        results = []
+        for name, shard_results in zip(names, await asyncio.gather(
+            *(search_shard(name) for name in names),
+            return_exceptions=True
+        )):
+            if isinstance(shard_results, Exception):
+                logger.error(f"Symbol search of shard {name} failed: {shard_results}")
+                continue
+            results.extend(shard_results)
+
+        # Similarities come from edit distances, so they compare across shards
+        results.sort(key=lambda r: r.similarity, reverse=True)
+        return results[:limit]
+
+    async def _search_index(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        filter_metadata: Optional[Dict],
+        filter_language: Optional[str]
+    ) -> List[SearchResult]:
+        """Run one search against this searcher's indexes, bypassing the result cache."""
         if mode == "vector":
             return await self._vector_search(query, limit, filter_metadata)
 
+        elif mode in ("substring", "regex"):
+            results = await self._pattern_search(query, mode, limit, filter_language)
+            return await self._enrich_search_results(results)
+
         elif mode == "keyword":
             if not self.keyword_indexer:
                 logger.warning("Keyword indexer not available, falling back to vector")
@@ -77,12 +202,290 @@ class HybridSearcher:
             results = await self._keyword_search(query, limit * 4, filter_language)
             return await self._enrich_search_results(results[:limit])
 
-        elif mode == "hybrid":
-            return await self._hybrid_search(query, limit, filter_metadata, filter_language)
+        elif mode in ("hybrid", "graph"):
+            if mode == "hybrid":
+                # Identifiers are answered by symbol lookup when defined
+                results = await self._symbol_search(
+                    query, limit, filter_metadata, filter_language
+                )
+                if results:
+                    return results
+
+            return await self._hybrid_search(
+                query, limit, filter_metadata, filter_language, graph=mode == "graph"
+            )
 
         else:
             raise ValueError(f"Unknown search mode: {mode}")
 
+    async def search_many(
+        self,
+        queries: List[str],
+        mode: str = "hybrid",
+        limit: int = 5,
+        filter_metadata: Optional[Dict] = None,
+        filter_language: Optional[str] = None,
+        repos: Optional[List[str]] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Run several searches at once.
+
+        Queries are embedded in one batch, answered by one vectorized
+        vector query and one FTS5 round-trip, then fused per query.
+
+        Args:
+            queries: Search queries
+            mode: "vector", "keyword", "hybrid", "graph", "substring" or "regex"
+            limit: Maximum results per query
+            filter_metadata: ChromaDB metadata filters
+            filter_language: Language filter for keyword search
+            repos: Shards to search, by name or path (default: all;
+                only used with a shard manager)
+
+        Returns:
+            One list of SearchResult per query, in input order
+        """
+        if not queries:
+            return []
+
+        if mode == "regex":
+            for query in queries:
+                self._check_regex(query)
+
+        if self.shard_manager is not None:
+            return await self._search_shards(
+                queries, mode, limit, filter_metadata, filter_language, repos
+            )
+
+        keys = [
+            self._cache_key(query, mode, limit, filter_metadata, filter_language)
+            for query in queries
+        ]
+        generation = self._write_generation()
+
+        results = [self.result_cache.get(key, generation) for key in keys]
+        missing = [i for i, cached in enumerate(results) if cached is None]
+
+        if missing:
+            failures = self._failure_count()
+            fresh = await self._search_index_many(
+                [queries[i] for i in missing], mode, limit, filter_metadata, filter_language
+            )
+            cacheable = self._failure_count() == failures
+            for i, query_results in zip(missing, fresh):
+                if cacheable:
+                    self.result_cache.put(keys[i], generation, query_results)
+                results[i] = query_results
+
+        return results
+
+    async def _search_index_many(
+        self,
+        queries: List[str],
+        mode: str,
+        limit: int,
+        filter_metadata: Optional[Dict],
+        filter_language: Optional[str]
+    ) -> List[List[SearchResult]]:
+        """Run searches against this searcher's indexes, bypassing the result cache."""
+        if mode == "vector":
+            return await self._vector_search_many(queries, limit, filter_metadata)
+
+        elif mode in ("substring", "regex"):
+            return list(await asyncio.gather(*(
+                self._search_index(query, mode, limit, filter_metadata, filter_language)
+                for query in queries
+            )))
+
+        elif mode == "keyword":
+            if not self.keyword_indexer:
+                logger.warning("Keyword indexer not available, falling back to vector")
+                return await self._vector_search_many(queries, limit, filter_metadata)
+            keyword_results = await self._keyword_search_many(
+                queries, limit * 4, filter_language
+            )
+            return list(await asyncio.gather(*(
+                self._enrich_search_results(results[:limit])
+                for results in keyword_results
+            )))
+
+        elif mode in ("hybrid", "graph"):
+            results: List[List[SearchResult]] = [[] for _ in queries]
+            if mode == "hybrid":
+                results = list(await asyncio.gather(*(
+                    self._symbol_search(query, limit, filter_metadata, filter_language)
+                    for query in queries
+                )))
+
+            pending = [i for i, symbol_results in enumerate(results) if not symbol_results]
+            if not pending:
+                return results
+
+            candidate_limit = limit * 4
+            pending_queries = [queries[i] for i in pending]
+
+            vector_results, keyword_results, graph = await asyncio.gather(
+                self._vector_search_many(pending_queries, candidate_limit, filter_metadata),
+                self._keyword_search_many(pending_queries, candidate_limit, filter_language),
+                self._get_graph(mode, filter_metadata),
+            )
+
+            fused = await asyncio.gather(*(
+                self._fuse_results(vector, keyword, limit, graph, filter_language)
+                for vector, keyword in zip(vector_results, keyword_results)
+            ))
+            for i, query_results in zip(pending, fused):
+                results[i] = query_results
+
+            logger.info(
+                f"Batched {mode} search: {len(queries)} queries "
+                f"({len(queries) - len(pending)} answered by symbol lookup)"
+            )
+            return results
+
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+
+    def _cache_key(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        filter_metadata: Optional[Dict],
+        filter_language: Optional[str]
+    ) -> Hashable:
+        """Result cache key of a search of this searcher's indexes."""
+        if mode not in ("substring", "regex"):
+            # Whitespace is insignificant to embeddings and FTS5 alike
+            query = ' '.join(query.split())
+
+        filters = json.dumps(filter_metadata, sort_keys=True) if filter_metadata else None
+        return (
+            self.vector_indexer.collection_name, query, mode, limit, filters, filter_language
+        )
+
+    def _write_generation(self) -> Tuple[int, Optional[int]]:
+        """Write generations of the indexes behind this searcher's results."""
+        keyword = self.keyword_indexer.write_generation if self.keyword_indexer else None
+        return (self.vector_indexer.write_generation, keyword)
+
+    def _failure_count(self) -> int:
+        """Searches so far that failed softly, returning no results."""
+        failures = self._search_failures + self.vector_indexer.search_failures
+        if self.keyword_indexer:
+            failures += self.keyword_indexer.search_failures
+        return failures
+
+    async def _search_shards(
+        self,
+        queries: List[str],
+        mode: str,
+        limit: int,
+        filter_metadata: Optional[Dict],
+        filter_language: Optional[str],
+        repos: Optional[List[str]]
+    ) -> List[List[SearchResult]]:
+        """
+        Search shards in parallel and merge each query's results with RRF.
+
+        Args:
+            queries: Search queries
+            mode: Search mode (see search_many)
+            limit: Maximum results per query
+            filter_metadata: ChromaDB metadata filters
+            filter_language: Language filter for keyword search
+            repos: Shards to search (default: all registered shards)
+
+        Returns:
+            One list of SearchResult per query, in input order
+        """
+        names = self._shard_names(repos)
+
+        async def search_shard(name: str) -> List[List[SearchResult]]:
+            async with self.shard_manager.acquire(name) as shard:
+                searcher = HybridSearcher(
+                    vector_indexer=shard.indexer,
+                    keyword_indexer=shard.keyword_indexer,
+                    rrf_k=self.rrf_k,
+                    result_cache=self.result_cache
+                )
+                return await searcher.search_many(
+                    queries, mode, limit, filter_metadata, filter_language
+                )
+
+        shard_results = []
+        for name, results in zip(names, await asyncio.gather(
+            *(search_shard(name) for name in names),
+            return_exceptions=True
+        )):
+            if isinstance(results, Exception):
+                logger.error(f"Search of shard {name} failed: {results}")
+                continue
+            shard_results.append(results)
+
+        logger.info(f"Sharded search: {len(queries)} queries over {len(shard_results)} shards")
+
+        return [
+            self._merge_shard_results([results[i] for results in shard_results], limit)
+            for i in range(len(queries))
+        ]
+
+    def _shard_names(self, repos: Optional[List[str]]) -> List[str]:
+        """
+        Resolve the shards to search.
+
+        Args:
+            repos: Repository names or paths (default: all registered shards)
+
+        Returns:
+            Shard names, without duplicates
+        """
+        if repos is None:
+            return list(self.shard_manager.list_shards())
+
+        names = []
+        for repo in repos:
+            name = self.shard_manager.resolve(repo)
+            if name is None:
+                logger.warning(f"No index shard for {repo}")
+            elif name not in names:
+                names.append(name)
+        return names
+
+    def _merge_shard_results(
+        self,
+        shard_results: List[List[SearchResult]],
+        limit: int
+    ) -> List[SearchResult]:
+        """
+        Merge one query's per-shard rankings with RRF.
+
+        Args:
+            shard_results: Ranked results from each shard
+            limit: Final result count
+
+        Returns:
+            Top results, with fused scores as similarity
+        """
+        if len(shard_results) <= 1:
+            return shard_results[0][:limit] if shard_results else []
+
+        by_id: Dict[str, SearchResult] = {}
+        for results in shard_results:
+            for result in results:
+                by_id.setdefault(result.chunk_id, result)
+
+        fused_scores = self._rrf_fusion(
+            [[(r.chunk_id, r.similarity) for r in results] for results in shard_results],
+            k=self.rrf_k
+        )
+        ranked = sorted(fused_scores.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+        return [
+            dataclasses.replace(by_id[chunk_id], similarity=score)
+            for chunk_id, score in ranked
+        ]
+
     async def _vector_search(
         self,
         query: str,
@@ -111,8 +514,47 @@ class HybridSearcher:
 
         except Exception as e:
             logger.error(f"Vector search failed: {e}")
+            self._search_failures += 1
             return []
 
+    async def _pattern_search(
+        self,
+        query: str,
+        mode: str,
+        limit: int,
+        filter_language: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Substring or regex search via the trigram index.
+
+        Args:
+            query: Literal substring or regex
+            mode: "substring" or "regex"
+            limit: Maximum results
+            filter_language: Language filter
+
+        Returns:
+            List of (chunk_id, match count) tuples
+        """
+        if not self.keyword_indexer:
+            raise ValueError(f"{mode} search needs a keyword index")
+
+        if mode == "regex":
+            results = await self.keyword_indexer.search_regex(query, limit, filter_language)
+        else:
+            results = await self.keyword_indexer.search_substring(query, limit, filter_language)
+
+        logger.debug(f"{mode.capitalize()} search returned {len(results)} results")
+        return results
+
+    @staticmethod
+    def _check_regex(pattern: str) -> None:
+        """Raise ValueError for an invalid regex."""
+        try:
+            re.compile(pattern)
+        except re.error as e:
+            raise ValueError(f"Invalid regex {pattern!r}: {e}") from e
+
     async def _keyword_search(
         self,
         query: str,
@@ -144,14 +586,77 @@ class HybridSearcher:
 
         except Exception as e:
             logger.error(f"Keyword search failed: {e}")
+            self._search_failures += 1
             return []
 
+    async def _vector_search_many(
+        self,
+        queries: List[str],
+        limit: int,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Batched semantic vector search via ChromaDB.
+
+        Args:
+            queries: Search queries
+            limit: Maximum results per query
+            filter_metadata: Metadata filters
+
+        Returns:
+            One list of SearchResult per query
+        """
+        try:
+            return await self.vector_indexer.search_many(
+                queries=queries,
+                limit=limit,
+                filter_metadata=filter_metadata
+            )
+
+        except Exception as e:
+            logger.error(f"Batched vector search failed: {e}")
+            self._search_failures += 1
+            return [[] for _ in queries]
+
+    async def _keyword_search_many(
+        self,
+        queries: List[str],
+        limit: int,
+        filter_language: Optional[str] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Batched BM25 keyword search via SQLite FTS5.
+
+        Args:
+            queries: Search queries
+            limit: Maximum results per query
+            filter_language: Language filter
+
+        Returns:
+            One list of (chunk_id, bm25_score) tuples per query
+        """
+        if not self.keyword_indexer:
+            return [[] for _ in queries]
+
+        try:
+            return await self.keyword_indexer.search_many(
+                queries=queries,
+                limit=limit,
+                filter_language=filter_language
+            )
+
+        except Exception as e:
+            logger.error(f"Batched keyword search failed: {e}")
+            self._search_failures += 1
+            return [[] for _ in queries]
+
     async def _hybrid_search(
         self,
         query: str,
         limit: int,
         filter_metadata: Optional[Dict] = None,
-        filter_language: Optional[str] = None
+        filter_language: Optional[str] = None,
+        graph: bool = False
     ) -> List[SearchResult]:
         """
         Hybrid search with RRF fusion.
@@ -159,14 +664,16 @@ class HybridSearcher:
         Process:
         1. Run vector and keyword search in parallel
         2. Get top-N candidates from each (N = limit * 4)
-        3. Apply Reciprocal Rank Fusion
-        4. Return top-K results
+        3. With graph=True, rank code related to the best candidates
+        4. Apply Reciprocal Rank Fusion
+        5. Return top-K results
 
         Args:
             query: Search query
             limit: Final result count
             filter_metadata: Vector search filters
-            filter_language: Keyword search language filter
+            filter_language: Keyword (and graph) search language filter
+            graph: Fuse a third ranking from the import/call graph
 
         Returns:
             Fused and ranked search results
@@ -177,10 +684,12 @@ class HybridSearcher:
         # Run searches in parallel
         vector_task = self._vector_search(query, candidate_limit, filter_metadata)
         keyword_task = self._keyword_search(query, candidate_limit, filter_language)
+        graph_task = self._get_graph("graph" if graph else "hybrid", filter_metadata)
 
-        vector_results, keyword_results = await asyncio.gather(
+        vector_results, keyword_results, code_graph = await asyncio.gather(
             vector_task,
             keyword_task,
+            graph_task,
             return_exceptions=True
         )
 
@@ -191,31 +700,124 @@ class HybridSearcher:
         if isinstance(keyword_results, Exception):
             logger.error(f"Keyword search failed: {keyword_results}")
             keyword_results = []
+        if isinstance(code_graph, Exception):
+            logger.error(f"Code graph unavailable: {code_graph}")
+            code_graph = None
+
+        results = await self._fuse_results(
+            vector_results, keyword_results, limit, code_graph, filter_language
+        )
+
+        logger.info(
+            f"{'Graph' if graph else 'Hybrid'} search: {len(vector_results)} vector + "
+            f"{len(keyword_results)} keyword → {len(results)} fused results"
+        )
+
+        return results
 
+    async def _fuse_results(
+        self,
+        vector_results: List[SearchResult],
+        keyword_results: List[Tuple[str, float]],
+        limit: int,
+        graph: Optional[CodeGraph] = None,
+        filter_language: Optional[str] = None
+    ) -> List[SearchResult]:
+        """
+        Fuse one query's vector and keyword candidates with RRF.
+
+        Args:
+            vector_results: Vector search results
+            keyword_results: (chunk_id, bm25_score) tuples
+            limit: Final result count
+            graph: Code graph; when given, chunks related to the best
+                candidates are fused in as a third ranking
+            filter_language: Language of graph-ranked chunks
+
+        Returns:
+            Top fused results
+        """
         # Convert to ranking lists
         vector_ranking = [(r.chunk_id, r.similarity) for r in vector_results]
         keyword_ranking = keyword_results
+        rankings = [vector_ranking, keyword_ranking]
+
+        if graph is not None:
+            # Seeds: the candidates as hybrid search would rank them
+            seed_scores = self._rrf_fusion(rankings, k=self.rrf_k)
+            seeds = sorted(seed_scores, key=seed_scores.get, reverse=True)[:limit * 4]
+            try:
+                rankings.append(
+                    await graph.expand(seeds, limit * 4, language=filter_language)
+                )
+            except Exception as e:
+                logger.error(f"Graph expansion failed: {e}")
+                self._search_failures += 1
 
         # Apply RRF fusion
-        fused_scores = self._rrf_fusion(
-            [vector_ranking, keyword_ranking],
-            k=self.rrf_k
-        )
+        fused_scores = self._rrf_fusion(rankings, k=self.rrf_k)
 
         # Sort by fused score
         sorted_ids = sorted(fused_scores.items(), key=lambda x: x[1], reverse=True)
         top_ids = [chunk_id for chunk_id, _ in sorted_ids[:limit]]
 
         # Get full SearchResult objects for top IDs
-        results = await self._get_results_by_ids(top_ids, fused_scores)
+        return await self._get_results_by_ids(top_ids, fused_scores)
 
-        logger.info(
-            f"Hybrid search: {len(vector_results)} vector + {len(keyword_results)} keyword "
-            f"→ {len(results)} fused results"
-        )
+    async def _symbol_search(
+        self,
+        query: str,
+        limit: int,
+        filter_metadata: Optional[Dict],
+        filter_language: Optional[str]
+    ) -> List[SearchResult]:
+        """
+        Answer an identifier-shaped query from the keyword index's symbol
+        lookup, skipping embedding, FTS5 and fusion.
+
+        Returns:
+            Definitions of the symbol, or [] if the query is not a symbol,
+            nothing defines it, or metadata filters must be applied
+        """
+        if not self.keyword_indexer or filter_metadata or not is_symbol_query(query):
+            return []
 
+        results = await self.keyword_indexer.lookup_symbol(
+            query.strip(), limit, filter_language
+        )
+        if results:
+            logger.debug(f"Symbol lookup: '{query}' → {len(results)} definitions")
         return results
 
+    async def _get_graph(
+        self,
+        mode: str,
+        filter_metadata: Optional[Dict]
+    ) -> Optional[CodeGraph]:
+        """
+        Code graph for a search, or None if the mode does not use it.
+
+        Graph neighbors cannot be checked against ChromaDB metadata
+        filters, so filtered searches leave them out.
+        """
+        if mode != "graph":
+            return None
+
+        if not self.keyword_indexer:
+            logger.warning("Keyword indexer not available, searching without the code graph")
+            return None
+
+        if filter_metadata:
+            logger.debug("Metadata filters given, searching without the code graph")
+            return None
+
+        try:
+            return await self.keyword_indexer.get_graph()
+        except Exception as e:
+            logger.error(f"Code graph unavailable: {e}")
+            self._search_failures += 1
+            return None
+
     def _rrf_fusion(
         self,
         rankings: List[List[Tuple[str, float]]],
@@ -270,43 +872,35 @@ class HybridSearcher:
         Returns:
             List of SearchResult with fused similarity scores
         """
-        # Query vector indexer for full results
-        # We'll do a dummy search to get the collection, then filter by IDs
-        # This is a workaround; ideally we'd have a get_by_ids method
+        try:
+            chunks = await self.vector_indexer.get_chunks(chunk_ids)
+        except Exception as e:
+            logger.warning(f"Failed to get results for {len(chunk_ids)} chunks: {e}")
+            self._search_failures += 1
+            return []
 
         results = []
         for chunk_id in chunk_ids:
-            try:
-                # Get chunk from ChromaDB
-                collection = self.vector_indexer.collection
-                res = collection.get(
-                    ids=[chunk_id],
-                    include=['metadatas', 'documents']
-                )
-
-                if res and res['ids'] and len(res['ids']) > 0:
-                    metadata = res['metadatas'][0]
-                    content = res['documents'][0]
-                    fused_score = scores.get(chunk_id, 0.0)
-
-                    result = SearchResult(
-                        chunk_id=chunk_id,
-                        filepath=metadata.get('filepath', ''),
-                        name=metadata.get('name', ''),
-                        content=content,
-                        language=Language(metadata.get('language', 'unknown')),
-                        chunk_type=metadata.get('chunk_type', 'file'),
-                        line_range=(
-                            metadata.get('line_start', 0),
-                            metadata.get('line_end', 0)
-                        ),
-                        similarity=fused_score,
-                    )
-                    results.append(result)
+            if chunk_id not in chunks:
+                continue
 
+            content, metadata = chunks[chunk_id]
+            try:
+                results.append(SearchResult(
+                    chunk_id=chunk_id,
+                    filepath=metadata.get('filepath', ''),
+                    name=metadata.get('name', ''),
+                    content=content,
+                    language=Language(metadata.get('language', 'unknown')),
+                    chunk_type=metadata.get('chunk_type', 'file'),
+                    line_range=(
+                        metadata.get('line_start', 0),
+                        metadata.get('line_end', 0)
+                    ),
+                    similarity=scores.get(chunk_id, 0.0),
+                ))
             except Exception as e:
                 logger.warning(f"Failed to get result for {chunk_id}: {e}")
-                continue
 
         return results
 
@@ -336,6 +930,22 @@ class HybridSearcher:
         """
         stats = {}
 
+        if self.shard_manager is not None:
+            # Only open shards are reported, so stats don't open every shard
+            stats['shards'] = self.shard_manager.get_stats()
+            stats['shard_stats'] = {}
+            for open_shard in self.shard_manager.open_shards():
+                async with self.shard_manager.acquire(open_shard.name) as shard:
+                    stats['shard_stats'][shard.name] = {
+                        'root': shard.root,
+                        'vector': await shard.indexer.get_stats(),
+                        'keyword': await shard.keyword_indexer.get_stats(),
+                    }
+            stats['rrf_k'] = self.rrf_k
+            stats['fusion_enabled'] = True
+            stats['result_cache'] = self.result_cache.get_stats()
+            return stats
+
         # Vector index stats
         vector_stats = await self.vector_indexer.get_stats()
         stats['vector'] = vector_stats
@@ -347,5 +957,6 @@ class HybridSearcher:
 
         stats['rrf_k'] = self.rrf_k
         stats['fusion_enabled'] = self.keyword_indexer is not None
+        stats['result_cache'] = self.result_cache.get_stats()
 
         return stats
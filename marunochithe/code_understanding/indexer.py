@@ -1,16 +1,65 @@
 """Semantic code indexing with ChromaDB."""
 
 import asyncio
+import copy
+import json
+import os
+import shutil
 import time
+from contextlib import AsyncExitStack, asynccontextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
 from loguru import logger
+import numpy as np
 import chromadb
 from chromadb.config import Settings
 
-from .models import CodeChunk, SearchResult, Language
+from .models import CodeChunk, ChunkType, SearchResult, Language
 from .parser import CodeParser
 from .chunker import CodeChunker
+from .pipeline import ParseChunkPipeline
+from .file_discovery import FileDiscovery
+from .manifest import FileEntry, IndexManifest, hash_file
+from .keyword_indexer import KeywordIndexer
+from .vector_executor import VectorStoreExecutor
+from .exact_search import ExactVectorIndex
+from .chunk_cache import ChunkCache, ChunkRecord
+from .result_cache import next_generation
+from .mmap_store import MmapVectorIndex
+from .snapshot import IndexSnapshot, SnapshotError, read_snapshot, write_snapshot
+from .embeddings import (
+    EmbeddingCache,
+    EmbeddingProvider,
+    OnnxEmbeddingProvider,
+    content_hash,
+)
+
+# Seconds an old generation is kept after a reindex swap, so searches
+# already running against it can finish
+GENERATION_GRACE_SECONDS = 5.0
+
+# HNSW settings of collections that hold the embeddings
+# (from BenchAI's optimized configuration)
+HNSW_METADATA = {
+    "hnsw:space": "cosine",           # Cosine similarity
+    "hnsw:construction_ef": 200,      # Higher = better quality index
+    "hnsw:M": 32,                     # Max edges per node
+    "hnsw:search_ef": 100,            # Search accuracy
+    "hnsw:batch_size": 10000,         # Batch insert size
+}
+
+# With the mmap backend the vectors live only in the mmap store; ChromaDB
+# keeps documents and metadata, with a one-dimensional placeholder vector
+# per chunk in the smallest HNSW graph it allows
+MMAP_COLLECTION_METADATA = {
+    "hnsw:space": "cosine",
+    "hnsw:construction_ef": 4,
+    "hnsw:M": 2,
+    "hnsw:search_ef": 1,
+    "hnsw:batch_size": 10000,
+    "embedding_store": "mmap",
+}
+PLACEHOLDER_EMBEDDING = [1.0]
 
 
 class CodebaseIndexer:
@@ -23,7 +72,18 @@ class CodebaseIndexer:
     def __init__(
         self,
         collection_name: str = "marunochithe_codebase",
-        persist_directory: Optional[str] = None
+        persist_directory: Optional[str] = None,
+        num_workers: Optional[int] = None,
+        keyword_indexer: Optional[KeywordIndexer] = None,
+        batch_size: int = 512,
+        read_workers: int = 4,
+        embedding_provider: Optional[EmbeddingProvider] = None,
+        discovery_workers: int = 1,
+        vector_backend: str = "auto",
+        exact_search_max_chunks: int = 100_000,
+        exact_search_dtype: str = "float32",
+        vector_quantization: str = "int8",
+        chunk_cache_size: int = 4096
     ):
         """
         Initialize CodebaseIndexer.
@@ -31,15 +91,84 @@ class CodebaseIndexer:
         Args:
             collection_name: Name for the ChromaDB collection
             persist_directory: Directory to persist the database (default: ~/MarunochiAI/data/chroma)
+            num_workers: Parse/chunk worker processes (default: number of CPUs)
+            keyword_indexer: Optional FTS5 indexer kept in sync with the vector index
+            batch_size: Chunks per flush to the vector and keyword stores
+            read_workers: Threads serving vector queries (writes use one
+                dedicated thread so searches never wait behind bulk inserts)
+            embedding_provider: Model used to embed chunks and queries
+                (default: all-MiniLM-L6-v2 via ONNX on CPU)
+            discovery_workers: Threads listing directories while finding
+                code files (helps on network filesystems)
+            vector_backend: "chroma" (HNSW), "exact" (brute-force matrix
+                search), "mmap" (memory-mapped quantized store with
+                full-precision rescoring; the vectors are kept out of
+                ChromaDB) or "auto" (exact while the collection has at most
+                `exact_search_max_chunks` chunks)
+            exact_search_max_chunks: Size limit for the exact backend in auto mode
+            exact_search_dtype: Exact backend storage, "float32" or "float16"
+            vector_quantization: Codes scanned by the mmap backend, "none",
+                "int8" or "binary"
+            chunk_cache_size: Chunks kept in memory for hydrating search
+                results by ID (0 disables the cache)
         """
         self.collection_name = collection_name
         self.persist_directory = persist_directory or str(
             Path.home() / "MarunochiAI" / "data" / "chroma"
         )
+        self.keyword_indexer = keyword_indexer
+        self.batch_size = batch_size
+        self.discovery_workers = discovery_workers
+        self.last_codebase_path: Optional[str] = None
+
+        # Physical collection currently serving `collection_name`; full
+        # reindexes build a new generation and switch to it when done
+        self.active_collection_name = self._read_active_name()
+        self._reindex_lock = asyncio.Lock()
+        self._cleanup_tasks = set()
+
+        # Manifest of indexed files lives next to the vector store
+        self.manifest = self._open_manifest(self.active_collection_name)
 
         # Initialize components
         self.parser = CodeParser()
         self.chunker = CodeChunker()
+        self.pipeline = ParseChunkPipeline(
+            self.parser,
+            self.chunker,
+            num_workers=num_workers
+        )
+
+        # ChromaDB calls block, so they run on dedicated thread pools
+        self.executor = VectorStoreExecutor(read_workers=read_workers)
+
+        # Embeddings are computed here rather than by ChromaDB, so they
+        # can be cached by content hash across re-indexes and models
+        self.embedding_provider = embedding_provider or OnnxEmbeddingProvider()
+        self.embedding_cache = EmbeddingCache(
+            str(Path(self.persist_directory) / "embedding_cache.db")
+        )
+        self._needs_full_reindex = False
+
+        if vector_backend not in ("auto", "chroma", "exact", "mmap"):
+            raise ValueError(f"Unknown vector backend: {vector_backend}")
+
+        # ChromaDB stays the store of record; the exact and mmap indexes
+        # are copies of its embeddings, loaded on first search
+        self.vector_backend = vector_backend
+        self.exact_search_max_chunks = exact_search_max_chunks
+        self.exact_search_dtype = exact_search_dtype
+        self.vector_quantization = vector_quantization
+        self.vector_index: Optional[ExactVectorIndex] = None
+
+        # Documents and metadata of recently returned chunks
+        self.chunk_cache = ChunkCache(chunk_cache_size)
+
+        # Changes on every write, for caches of search results
+        self.write_generation = next_generation()
+
+        # Searches that failed and returned no results (see HybridSearcher)
+        self.search_failures = 0
 
         # Initialize ChromaDB client
         self._init_chroma()
@@ -59,96 +188,217 @@ class CodebaseIndexer:
                 )
             )
 
-            # Get or create collection with optimized HNSW settings
-            # These settings are from BenchAI's optimized configuration
-            self.collection = self.client.get_or_create_collection(
-                name=self.collection_name,
-                metadata={
-                    "hnsw:space": "cosine",           # Cosine similarity
-                    "hnsw:construction_ef": 200,      # Higher = better quality index
-                    "hnsw:M": 32,                     # Max edges per node
-                    "hnsw:search_ef": 100,            # Search accuracy
-                    "hnsw:batch_size": 10000,         # Batch insert size
-                }
+            self.collection = self._open_collection(self.active_collection_name)
+
+            # Vectors from another model can't be mixed in; start over.
+            # Collections created before the key existed used ChromaDB's
+            # default model, which is the ONNX provider.
+            collection_metadata = self.collection.metadata or {}
+            stored_model = collection_metadata.get(
+                "embedding_model", OnnxEmbeddingProvider.model_id
             )
+            # Likewise when switching to or from the mmap backend, which
+            # keeps the vectors outside ChromaDB (the embedding cache
+            # makes the rebuild cheap)
+            stored_store = collection_metadata.get("embedding_store", "chroma")
+            store = "mmap" if self._mmap_store_of_record else "chroma"
+
+            if stored_model != self.embedding_provider.model_id or stored_store != store:
+                logger.warning(
+                    f"Collection {self.active_collection_name} was built with {stored_model} "
+                    f"({stored_store} vectors), now using {self.embedding_provider.model_id} "
+                    f"({store} vectors); rebuilding index"
+                )
+                self.client.delete_collection(name=self.active_collection_name)
+                self._needs_full_reindex = True
+                self._init_chroma()
+                return
 
-            logger.info(f"Initialized ChromaDB collection: {self.collection_name}")
+            logger.info(f"Initialized ChromaDB collection: {self.active_collection_name}")
             logger.info(f"Persist directory: {self.persist_directory}")
 
         except Exception as e:
             logger.error(f"Failed to initialize ChromaDB: {e}")
             raise
 
+    def _open_collection(self, name: str):
+        """Get or create a collection laid out for the vector backend."""
+        metadata = MMAP_COLLECTION_METADATA if self._mmap_store_of_record else HNSW_METADATA
+        return self.client.get_or_create_collection(
+            name=name,
+            metadata={**metadata, "embedding_model": self.embedding_provider.model_id}
+        )
+
+    @property
+    def _mmap_store_of_record(self) -> bool:
+        """Whether embeddings live only in the mmap store, not in ChromaDB."""
+        return self.vector_backend == "mmap"
+
     async def index_codebase(
         self,
         codebase_path: str,
-        file_extensions: Optional[List[str]] = None
+        file_extensions: Optional[List[str]] = None,
+        on_progress: Optional[Callable] = None
     ) -> Dict:
         """
-        Index entire codebase.
+        Index entire codebase incrementally.
 
         Process:
         1. Find all code files
-        2. Parse each file with CodeParser
-        3. Chunk files hierarchically with CodeChunker
-        4. Generate embeddings (ChromaDB handles this)
-        5. Batch insert to ChromaDB
+        2. Compare size/mtime/content hash against the manifest and
+           keep only added and changed files; drop deleted files
+        3. Parse and chunk files across worker processes
+           (CodeParser + CodeChunker, see ParseChunkPipeline)
+        4. Every `batch_size` chunks, embed them with the configured
+           EmbeddingProvider (reusing vectors from the EmbeddingCache by
+           content hash) and flush to ChromaDB and the keyword index
+
+        Chunks are streamed rather than collected, so peak memory is
+        bounded by the batch size instead of the size of the codebase.
 
         Args:
             codebase_path: Path to codebase root
             file_extensions: File extensions to index (default: .py, .js, .ts, .tsx, .jsx)
+            on_progress: Optional async callback, awaited with a progress
+                dict after every flushed batch
 
         Returns:
             {
                 'total_files': int,
                 'total_chunks': int,
                 'indexed_chunks': int,
+                'added_files': int,
+                'changed_files': int,
+                'unchanged_files': int,
+                'deleted_files': int,
                 'duration_ms': int,
             }
         """
         start_time = time.time()
+        self.last_codebase_path = codebase_path
 
         # Default file extensions
         if file_extensions is None:
             file_extensions = ['.py', '.js', '.ts', '.tsx', '.jsx']
 
         # Find all code files
-        code_files = self._find_code_files(codebase_path, file_extensions)
+        code_files = await asyncio.to_thread(
+            self._find_code_files, codebase_path, file_extensions
+        )
         logger.info(f"Found {len(code_files)} code files in {codebase_path}")
 
-        # Parse and chunk all files
-        all_chunks: List[CodeChunk] = []
-        successful_files = 0
+        await self._discard_stale_index()
+
+        # Diff against the manifest
+        known = await self.manifest.load_files()
+        pending: Dict[str, FileEntry] = {}
+        seen = set()
+        added_files = 0
+        changed_files = 0
+        unchanged_files = 0
+
+        for path in code_files:
+            filepath = str(path.resolve())
+            seen.add(filepath)
 
-        for filepath in code_files:
             try:
-                # Parse file
-                parsed = await self.parser.parse_file_cached(str(filepath))
-                if parsed is None:
-                    continue
-
-                # Chunk file
-                chunks = await self.chunker.chunk_file(parsed)
-                all_chunks.extend(chunks)
-                successful_files += 1
-
-            except Exception as e:
-                logger.warning(f"Failed to process {filepath}: {e}")
+                entry, status = await self._check_file(filepath, known.get(filepath))
+            except OSError as e:
+                logger.warning(f"Failed to stat {filepath}: {e}")
+                continue
+
+            if status == 'unchanged':
+                unchanged_files += 1
                 continue
 
-        logger.info(f"Successfully parsed {successful_files}/{len(code_files)} files")
-        logger.info(f"Generated {len(all_chunks)} total chunks")
+            if status == 'added':
+                added_files += 1
+            else:
+                changed_files += 1
+            pending[filepath] = entry
+
+        # Files that disappeared from under this root
+        root = str(Path(codebase_path).resolve())
+        deleted = [
+            filepath for filepath in known
+            if filepath not in seen
+            and filepath.startswith(root + os.sep)
+            and Path(filepath).suffix in file_extensions
+        ]
+        for filepath in deleted:
+            await self.delete_file(filepath)
+
+        logger.info(
+            f"Manifest diff: {added_files} added, {changed_files} changed, "
+            f"{unchanged_files} unchanged, {len(deleted)} deleted"
+        )
+
+        # Parse, chunk and flush added/changed files in fixed-size batches
+        buffer: List[Tuple[FileEntry, List[CodeChunk]]] = []
+        buffered_chunks = 0
+        total_chunks = 0
+        indexed = 0
+        successful_files = 0
+        processed_files = 0
+
+        async def flush() -> None:
+            nonlocal buffer, buffered_chunks, indexed
+
+            indexed += await self._flush_batch(buffer)
+            buffer = []
+            buffered_chunks = 0
+
+            logger.info(
+                f"Indexed {processed_files}/{len(pending)} files, "
+                f"{indexed}/{total_chunks} chunks"
+            )
+            if on_progress:
+                await on_progress({
+                    'processed_files': processed_files,
+                    'pending_files': len(pending),
+                    'total_chunks': total_chunks,
+                    'indexed_chunks': indexed,
+                })
+
+        async with AsyncExitStack() as stack:
+            if self.keyword_indexer and not known and pending:
+                # Cold index: build the FTS5 index in one pass at the end
+                await stack.enter_async_context(self.keyword_indexer.bulk_load())
+
+            async for batch in self.pipeline.iter_batches(list(pending)):
+                for filepath, chunks in batch:
+                    processed_files += 1
+                    if chunks is None:
+                        continue
+
+                    buffer.append((pending[filepath], chunks))
+                    buffered_chunks += len(chunks)
+                    total_chunks += len(chunks)
+                    successful_files += 1
+
+                    if buffered_chunks >= self.batch_size:
+                        await flush()
 
-        # Index chunks in ChromaDB
-        indexed = await self._index_chunks_batch(all_chunks)
+            if buffer:
+                await flush()
+
+        logger.info(f"Successfully parsed {successful_files}/{len(pending)} files")
+        logger.info(f"Generated {total_chunks} total chunks")
+
+        if self.vector_index is not None and (pending or deleted):
+            await self.executor.write(self._flush_vector_index)
 
         duration_ms = int((time.time() - start_time) * 1000)
 
         return {
             'total_files': len(code_files),
             'successful_files': successful_files,
-            'total_chunks': len(all_chunks),
+            'total_chunks': total_chunks,
             'indexed_chunks': indexed,
+            'added_files': added_files,
+            'changed_files': changed_files,
+            'unchanged_files': unchanged_files,
+            'deleted_files': len(deleted),
             'duration_ms': duration_ms,
         }
 
@@ -169,9 +419,6 @@ class CodebaseIndexer:
         start_time = time.time()
 
         try:
-            # Delete existing chunks for this file
-            await self.delete_file(filepath)
-
             # Parse file
             parsed = await self.parser.parse_file(filepath)
             if parsed is None:
@@ -185,8 +432,8 @@ class CodebaseIndexer:
             # Chunk file
             chunks = await self.chunker.chunk_file(parsed)
 
-            # Index chunks
-            indexed = await self._index_chunks_batch(chunks)
+            # Replace existing chunks for this file
+            indexed = await self.replace_file_chunks(parsed.filepath, chunks)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
@@ -205,6 +452,35 @@ class CodebaseIndexer:
                 'error': str(e)
             }
 
+    async def replace_file_chunks(self, filepath: str, chunks: List[CodeChunk]) -> int:
+        """
+        Replace the indexed chunks of a file and record it in the manifest.
+
+        Chunk IDs are derived from content, so this is a diff: only new
+        chunks are embedded, chunks that still exist just get their
+        metadata refreshed, and chunks that are gone are deleted.
+
+        Args:
+            filepath: Absolute path to file
+            chunks: New chunks for the file
+
+        Returns:
+            Number of chunks indexed
+        """
+        await self._discard_stale_index()
+
+        old_ids = await self.manifest.get_chunk_ids(filepath)
+        if not old_ids:
+            # Not in the manifest; use whatever the collection holds
+            old_ids = await self._get_file_chunk_ids(filepath)
+
+        indexed = await self._sync_chunks(old_ids, chunks)
+        if indexed == len(chunks):
+            entry, _status = await self._check_file(filepath, None)
+            await self.manifest.record_file(entry, chunks)
+
+        return indexed
+
     async def delete_file(self, filepath: str) -> None:
         """
         Remove all chunks for a file from the index.
@@ -213,15 +489,20 @@ class CodebaseIndexer:
             filepath: Path to file
         """
         try:
-            # Query for chunks with this filepath
-            results = self.collection.get(
-                where={"filepath": filepath}
-            )
+            # Chunks recorded in the manifest
+            chunk_ids = set(await self.manifest.remove_file(filepath))
+
+            # Plus anything indexed outside the manifest (e.g. by the watcher)
+            chunk_ids.update(await self._get_file_chunk_ids(filepath))
 
-            if results and results['ids']:
+            if chunk_ids:
                 # Delete chunks
-                self.collection.delete(ids=results['ids'])
-                logger.debug(f"Deleted {len(results['ids'])} chunks for {filepath}")
+                await self._open_vector_store()
+                await self.executor.write(self._delete_vectors, list(chunk_ids))
+                logger.debug(f"Deleted {len(chunk_ids)} chunks for {filepath}")
+
+            if self.keyword_indexer:
+                await self.keyword_indexer.delete_file(filepath)
 
         except Exception as e:
             logger.warning(f"Failed to delete file {filepath}: {e}")
@@ -246,52 +527,182 @@ class CodebaseIndexer:
         Returns:
             List of SearchResult with similarity scores
         """
+        results = await self.search_many([query], limit, filter_metadata)
+        return results[0]
+
+    async def search_many(
+        self,
+        queries: List[str],
+        limit: int = 5,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Semantic vector search for several queries at once.
+
+        All queries are embedded in one batch and answered by a single
+        vectorized ChromaDB query.
+
+        Args:
+            queries: Natural language or code queries
+            limit: Max results per query
+            filter_metadata: Filter applied to every query
+
+        Returns:
+            One list of SearchResult per query, in input order
+        """
+        if not queries:
+            return []
+
         try:
+            # Metadata filters are applied by ChromaDB, except for mmap
+            # collections, whose vectors ChromaDB does not hold
+            if filter_metadata is None or self._mmap_store_of_record:
+                vector_index = await self._get_vector_index()
+                if vector_index is not None:
+                    return await self._vector_index_search_many(
+                        vector_index, queries, limit, filter_metadata
+                    )
+
             # Query ChromaDB
-            results = self.collection.query(
-                query_texts=[query],
+            results = await self.executor.read(
+                self.collection.query,
+                query_embeddings=await self._embed_queries(queries),
                 n_results=limit,
                 where=filter_metadata,
                 include=['metadatas', 'documents', 'distances']
             )
 
+            if not results or not results['ids']:
+                return [[] for _ in queries]
+
             # Convert to SearchResult objects
-            search_results = []
-
-            if results and results['ids'] and len(results['ids']) > 0:
-                ids = results['ids'][0]
-                metadatas = results['metadatas'][0]
-                documents = results['documents'][0]
-                distances = results['distances'][0]
-
-                for i, chunk_id in enumerate(ids):
-                    metadata = metadatas[i]
-                    content = documents[i]
-                    distance = distances[i]
-
-                    # Convert distance to similarity score (0-1, higher is better)
-                    # ChromaDB uses cosine distance, so similarity = 1 - distance
-                    similarity = 1.0 - distance
-
-                    search_results.append(SearchResult(
-                        chunk_id=chunk_id,
-                        filepath=metadata.get('filepath', ''),
-                        name=metadata.get('name', ''),
-                        content=content,
-                        language=Language(metadata.get('language', 'unknown')),
-                        chunk_type=metadata.get('chunk_type', 'file'),
-                        line_range=(
-                            metadata.get('line_start', 0),
-                            metadata.get('line_end', 0)
-                        ),
-                        similarity=similarity,
-                    ))
-
-            return search_results
+            return [
+                self._to_search_results(
+                    results['ids'][i],
+                    results['metadatas'][i],
+                    results['documents'][i],
+                    results['distances'][i]
+                )
+                for i in range(len(queries))
+            ]
 
         except Exception as e:
             logger.error(f"Search failed: {e}")
-            return []
+            self.search_failures += 1
+            return [[] for _ in queries]
+
+    async def _vector_index_search_many(
+        self,
+        vector_index: ExactVectorIndex,
+        queries: List[str],
+        limit: int,
+        filter_metadata: Optional[Dict] = None
+    ) -> List[List[SearchResult]]:
+        """
+        Answer queries from the exact or mmap index, hydrating hits via get_chunks().
+
+        Args:
+            vector_index: Loaded index
+            queries: Search queries
+            limit: Max results per query
+            filter_metadata: ChromaDB filter; only matching chunks are scored
+
+        Returns:
+            One list of SearchResult per query
+        """
+        allowed = None
+        if filter_metadata is not None:
+            matching = await self.executor.read(
+                self.collection.get, where=filter_metadata, include=[]
+            )
+            allowed = matching['ids']
+
+        hits = await self.executor.read(
+            vector_index.search, await self._embed_queries(queries), limit, allowed
+        )
+
+        hit_ids = list(dict.fromkeys(chunk_id for query_hits in hits for chunk_id, _ in query_hits))
+        if not hit_ids:
+            return [[] for _ in queries]
+
+        by_id = await self.get_chunks(hit_ids)
+
+        results = []
+        for query_hits in hits:
+            query_hits = [(chunk_id, score) for chunk_id, score in query_hits if chunk_id in by_id]
+            results.append(self._to_search_results(
+                [chunk_id for chunk_id, _ in query_hits],
+                [by_id[chunk_id][1] for chunk_id, _ in query_hits],
+                [by_id[chunk_id][0] for chunk_id, _ in query_hits],
+                [1.0 - score for _, score in query_hits]
+            ))
+
+        return results
+
+    def _to_search_results(
+        self,
+        ids: List[str],
+        metadatas: List[Dict],
+        documents: List[str],
+        distances: List[float]
+    ) -> List[SearchResult]:
+        """Convert one query's ChromaDB results to SearchResult objects."""
+        search_results = []
+
+        for chunk_id, metadata, content, distance in zip(ids, metadatas, documents, distances):
+            # Convert distance to similarity score (0-1, higher is better)
+            # ChromaDB uses cosine distance, so similarity = 1 - distance
+            similarity = 1.0 - distance
+
+            search_results.append(SearchResult(
+                chunk_id=chunk_id,
+                filepath=metadata.get('filepath', ''),
+                name=metadata.get('name', ''),
+                content=content,
+                language=Language(metadata.get('language', 'unknown')),
+                chunk_type=metadata.get('chunk_type', 'file'),
+                line_range=(
+                    metadata.get('line_start', 0),
+                    metadata.get('line_end', 0)
+                ),
+                similarity=similarity,
+            ))
+
+        return search_results
+
+    async def get_chunks(self, chunk_ids: List[str]) -> Dict[str, ChunkRecord]:
+        """
+        Get documents and metadata of chunks by ID.
+
+        Recently returned chunks come from the chunk cache; the rest are
+        fetched from ChromaDB in a single call.
+
+        Args:
+            chunk_ids: Chunk IDs
+
+        Returns:
+            {chunk_id: (document, metadata)} for the IDs that exist
+        """
+        found, missing, version = self.chunk_cache.get_many(dict.fromkeys(chunk_ids))
+        if not missing:
+            return found
+
+        res = await self.executor.read(
+            self.collection.get,
+            ids=missing,
+            include=['metadatas', 'documents']
+        )
+
+        fetched = {
+            chunk_id: (document, metadata or {})
+            for chunk_id, document, metadata in zip(
+                res['ids'], res['documents'], res['metadatas']
+            )
+        }
+        self.chunk_cache.put_many(fetched, version)
+
+        found.update(fetched)
+        return found
 
     async def get_stats(self) -> Dict:
         """
@@ -306,38 +717,18 @@ class CodebaseIndexer:
             }
         """
         try:
-            # Get all chunks
-            results = self.collection.get(
-                include=['metadatas']
-            )
-
-            total_chunks = len(results['ids'])
+            await self._discard_stale_index()
 
-            # Count by language
-            languages = {}
-            chunk_types = {}
-            filepaths = set()
+            # Counters in the manifest are maintained on every add/delete
+            stats = await self.manifest.get_stats()
 
-            for metadata in results['metadatas']:
-                # Count languages
-                lang = metadata.get('language', 'unknown')
-                languages[lang] = languages.get(lang, 0) + 1
+            if stats['total_chunks'] == 0:
+                # Collection indexed before the manifest existed
+                count = await self.executor.read(self.collection.count)
+                if count:
+                    return await self._scan_stats()
 
-                # Count chunk types
-                chunk_type = metadata.get('chunk_type', 'unknown')
-                chunk_types[chunk_type] = chunk_types.get(chunk_type, 0) + 1
-
-                # Collect unique filepaths
-                filepath = metadata.get('filepath', '')
-                if filepath:
-                    filepaths.add(filepath)
-
-            return {
-                'total_chunks': total_chunks,
-                'total_files': len(filepaths),
-                'languages': languages,
-                'chunk_types': chunk_types,
-            }
+            return stats
 
         except Exception as e:
             logger.error(f"Failed to get stats: {e}")
@@ -351,17 +742,727 @@ class CodebaseIndexer:
     async def clear_index(self) -> None:
         """Clear all indexed data."""
         try:
-            self.client.delete_collection(name=self.collection_name)
-            logger.info(f"Deleted collection: {self.collection_name}")
+            await self.executor.write(
+                self.client.delete_collection, name=self.active_collection_name
+            )
+            logger.info(f"Deleted collection: {self.active_collection_name}")
+
+            if self.vector_index is not None:
+                await self.executor.write(self.vector_index.clear)
+                self.vector_index = None
+            shutil.rmtree(self._vector_store_path(self.active_collection_name), ignore_errors=True)
 
             # Recreate collection
-            self._init_chroma()
+            await self.executor.write(self._init_chroma)
+            self.chunk_cache.clear()
+            self.write_generation = next_generation()
+
+            # Forget indexed files so the next index_codebase is a full index
+            await self.manifest.clear()
+            if self.keyword_indexer:
+                await self.keyword_indexer.clear_index()
 
         except Exception as e:
             logger.error(f"Failed to clear index: {e}")
 
+    async def reindex_codebase(
+        self,
+        codebase_path: str,
+        file_extensions: Optional[List[str]] = None,
+        on_progress: Optional[Callable] = None
+    ) -> Dict:
+        """
+        Rebuild the whole index without interrupting search.
+
+        Process:
+        1. Index the codebase into a new generation: a shadow ChromaDB
+           collection, manifest and keyword tables (cached embeddings
+           are reused, so unchanged chunks are not re-embedded)
+        2. Swap the shadow in; searches move to it in one step
+        3. Incrementally index changes made while the shadow was built
+        4. Drop the previous generation in the background
+
+        Args:
+            codebase_path: Path to codebase root
+            file_extensions: File extensions to index (default: .py, .js, .ts, .tsx, .jsx)
+            on_progress: Optional async callback, see index_codebase
+
+        Returns:
+            index_codebase stats of the rebuild, plus 'generation' and
+            'catch_up_files' (files re-indexed after the swap)
+
+        Raises:
+            RuntimeError: If a reindex is already running
+        """
+        if self._reindex_lock.locked():
+            raise RuntimeError("A full reindex is already running")
+
+        async with self._reindex_lock:
+            start_time = time.time()
+
+            async with self._new_generation() as shadow:
+                stats = await shadow.index_codebase(
+                    codebase_path, file_extensions, on_progress
+                )
+
+            # Files that changed while the shadow was being built
+            catch_up = await self.index_codebase(codebase_path, file_extensions)
+
+            stats.update({
+                'generation': self.active_collection_name,
+                'catch_up_files': catch_up['added_files'] + catch_up['changed_files']
+                + catch_up['deleted_files'],
+                'duration_ms': int((time.time() - start_time) * 1000),
+            })
+            return stats
+
+    async def export_snapshot(
+        self,
+        path: str,
+        root: Optional[str] = None,
+        dtype: str = "float32"
+    ) -> Dict:
+        """
+        Write the index to a portable snapshot file.
+
+        Args:
+            path: Output file
+            root: Codebase root recorded in the snapshot, so paths can be
+                moved on import (default: the last indexed codebase, else
+                the indexed files' common directory)
+            dtype: Stored embedding precision, "float32" or "float16"
+
+        Returns:
+            {'path': str, 'chunks': int, 'files': int, 'bytes': int, 'duration_ms': int}
+        """
+        start_time = time.time()
+        await self._discard_stale_index()
+
+        files = list((await self.manifest.load_files()).values())
+        await self._open_vector_store()
+
+        # Read on the write lane so no upsert/delete lands mid-export
+        ids, documents, metadatas, embeddings = await self.executor.write(
+            self._read_collection
+        )
+
+        if root is None:
+            root = self.last_codebase_path
+        if root is None and files:
+            root = os.path.commonpath([os.path.dirname(entry.filepath) for entry in files])
+
+        snapshot = IndexSnapshot(
+            embedding_model=self.embedding_provider.model_id,
+            root=str(Path(root).resolve()) if root else "",
+            ids=ids,
+            documents=documents,
+            metadatas=metadatas,
+            embeddings=embeddings,
+            files=files,
+        )
+        size = await asyncio.to_thread(write_snapshot, path, snapshot, dtype)
+
+        logger.info(f"Exported {len(ids)} chunks from {len(files)} files to {path}")
+
+        return {
+            'path': str(path),
+            'chunks': len(ids),
+            'files': len(files),
+            'bytes': size,
+            'duration_ms': int((time.time() - start_time) * 1000),
+        }
+
+    async def import_snapshot(self, path: str, root: Optional[str] = None) -> Dict:
+        """
+        Replace the index with a snapshot, without parsing or embedding.
+
+        The snapshot is loaded into a new generation and swapped in, so
+        search keeps serving the current index meanwhile. Its vectors
+        also seed the embedding cache. Run index_codebase afterwards to
+        pick up files that differ from the snapshot.
+
+        Args:
+            path: Snapshot file
+            root: Codebase root on this machine (default: the snapshot's root)
+
+        Returns:
+            {'chunks': int, 'files': int, 'root': str, 'generation': str, 'duration_ms': int}
+
+        Raises:
+            SnapshotError: If the snapshot is invalid or from another embedding model
+            RuntimeError: If a reindex is already running
+        """
+        if self._reindex_lock.locked():
+            raise RuntimeError("A full reindex is already running")
+
+        start_time = time.time()
+
+        snapshot = await asyncio.to_thread(read_snapshot, path)
+        if snapshot.embedding_model != self.embedding_provider.model_id:
+            raise SnapshotError(
+                f"Snapshot was built with {snapshot.embedding_model}, "
+                f"this index uses {self.embedding_provider.model_id}"
+            )
+        if root:
+            snapshot.remap_root(root)
+
+        async with self._reindex_lock:
+            async with self._new_generation() as shadow:
+                await shadow._load_snapshot(snapshot)
+
+        if snapshot.root:
+            self.last_codebase_path = snapshot.root
+
+        logger.info(
+            f"Imported {len(snapshot.ids)} chunks from {len(snapshot.files)} files "
+            f"from {path}"
+        )
+
+        return {
+            'chunks': len(snapshot.ids),
+            'files': len(snapshot.files),
+            'root': snapshot.root,
+            'generation': self.active_collection_name,
+            'duration_ms': int((time.time() - start_time) * 1000),
+        }
+
+    @property
+    def reindex_running(self) -> bool:
+        """Whether reindex_codebase() is building a new generation."""
+        return self._reindex_lock.locked()
+
+    def get_executor_stats(self) -> Dict:
+        """
+        Get queue depth and wait time for the vector store thread pools.
+
+        Returns:
+            {'read': {...}, 'write': {...}}
+        """
+        return self.executor.get_stats()
+
+    def get_vector_backend_stats(self) -> Dict:
+        """
+        Describe the backend currently answering vector queries.
+
+        Returns:
+            {'configured': str, 'active': 'exact' | 'mmap' | 'chroma', ...}
+        """
+        stats = {
+            'configured': self.vector_backend,
+            'active': 'chroma',
+            'exact_search_max_chunks': self.exact_search_max_chunks,
+        }
+
+        vector_index = self.vector_index
+        if isinstance(vector_index, MmapVectorIndex):
+            stats.update({
+                'active': 'mmap',
+                'chunks': len(vector_index),
+                'quantization': vector_index.quantization,
+                'memory_bytes': vector_index.nbytes,
+                'disk_bytes': vector_index.disk_bytes,
+            })
+        elif vector_index is not None:
+            stats.update({
+                'active': 'exact',
+                'chunks': len(vector_index),
+                'dtype': vector_index.dtype.name,
+                'memory_bytes': vector_index.nbytes,
+            })
+
+        return stats
+
+    async def close(self) -> None:
+        """Close the manifest and embedding cache, and vector store threads."""
+        # Let old generations finish dropping
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+
+        if self.vector_index is not None:
+            await self.executor.write(self._flush_vector_index)
+            self.vector_index.close()
+
+        await self.manifest.close()
+        await self.embedding_cache.close()
+        self.executor.shutdown()
+
     # === Private Methods ===
 
+    async def _scan_stats(self) -> Dict:
+        """
+        Compute statistics by scanning every chunk's metadata (O(N)).
+
+        Returns:
+            Same shape as get_stats()
+        """
+        # Get all chunks
+        results = await self.executor.read(
+            self.collection.get,
+            include=['metadatas']
+        )
+
+        total_chunks = len(results['ids'])
+
+        # Count by language
+        languages = {}
+        chunk_types = {}
+        filepaths = set()
+
+        for metadata in results['metadatas']:
+            # Count languages
+            lang = metadata.get('language', 'unknown')
+            languages[lang] = languages.get(lang, 0) + 1
+
+            # Count chunk types
+            chunk_type = metadata.get('chunk_type', 'unknown')
+            chunk_types[chunk_type] = chunk_types.get(chunk_type, 0) + 1
+
+            # Collect unique filepaths
+            filepath = metadata.get('filepath', '')
+            if filepath:
+                filepaths.add(filepath)
+
+        return {
+            'total_chunks': total_chunks,
+            'total_files': len(filepaths),
+            'languages': languages,
+            'chunk_types': chunk_types,
+        }
+
+    async def _discard_stale_index(self) -> None:
+        """
+        After an embedding model change dropped the collection, forget the
+        manifest (and keyword index) so every file is indexed again.
+        """
+        if not self._needs_full_reindex:
+            return
+
+        await self.manifest.clear()
+        if self.keyword_indexer:
+            await self.keyword_indexer.clear_index()
+        self._needs_full_reindex = False
+
+    def _read_collection(self) -> Tuple[List[str], List[str], List[Dict], np.ndarray]:
+        """
+        Page every chunk out of ChromaDB: (ids, documents, metadatas, embeddings).
+
+        Embeddings of mmap collections come from the mmap store.
+        """
+        mmap_vectors = self._mmap_store_of_record
+        ids: List[str] = []
+        documents: List[str] = []
+        metadatas: List[Dict] = []
+        embeddings = []
+
+        page_size = self.client.get_max_batch_size()
+        offset = 0
+
+        while True:
+            page = self.collection.get(
+                include=['documents', 'metadatas'] + ([] if mmap_vectors else ['embeddings']),
+                limit=page_size,
+                offset=offset
+            )
+            if not page['ids']:
+                break
+
+            ids.extend(page['ids'])
+            documents.extend(page['documents'])
+            metadatas.extend(page['metadatas'])
+            if mmap_vectors:
+                embeddings.append(self.vector_index.get_vectors(page['ids']))
+            else:
+                embeddings.append(np.asarray(page['embeddings'], dtype=np.float32))
+            offset += len(page['ids'])
+
+        if not embeddings:
+            return ids, documents, metadatas, np.empty((0, 0), dtype=np.float32)
+        return ids, documents, metadatas, np.concatenate(embeddings)
+
+    async def _load_snapshot(self, snapshot: IndexSnapshot) -> None:
+        """Bulk-load a snapshot into this (empty) generation."""
+        await self._open_vector_store()
+
+        chunks = [
+            self._chunk_from_metadata(chunk_id, document, metadata)
+            for chunk_id, document, metadata in zip(
+                snapshot.ids, snapshot.documents, snapshot.metadatas
+            )
+        ]
+
+        step = self.client.get_max_batch_size()
+        for i in range(0, len(chunks), step):
+            await self.executor.write(
+                self._upsert_vectors,
+                snapshot.ids[i:i + step],
+                snapshot.documents[i:i + step],
+                snapshot.embeddings[i:i + step],
+                snapshot.metadatas[i:i + step]
+            )
+
+        if self.keyword_indexer and chunks:
+            async with self.keyword_indexer.bulk_load():
+                await self.keyword_indexer.index_chunks(chunks)
+
+        chunks_by_file: Dict[str, List[CodeChunk]] = {}
+        for chunk in chunks:
+            chunks_by_file.setdefault(chunk.filepath, []).append(chunk)
+        await self.manifest.record_files([
+            (entry, chunks_by_file.get(entry.filepath, []))
+            for entry in snapshot.files
+        ])
+
+        await self.embedding_cache.put_many(
+            self.embedding_provider.model_id,
+            [
+                (content_hash(document), vector)
+                for document, vector in zip(snapshot.documents, snapshot.embeddings)
+            ]
+        )
+
+    @asynccontextmanager
+    async def _new_generation(self) -> AsyncIterator["CodebaseIndexer"]:
+        """
+        Yield an empty shadow generation to fill; swap it in when the
+        block completes, or drop it if the block raises.
+
+        The caller must hold the reindex lock.
+        """
+        # Finish dropping the previous generation before making a new one
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+
+        await self.executor.write(self._drop_stale_generations)
+        shadow = await self._create_shadow()
+        logger.info(f"Building index generation {shadow.active_collection_name}")
+
+        try:
+            yield shadow
+
+            # Load the exact/mmap index before the swap, not on the
+            # first search after it
+            await shadow._get_vector_index()
+
+        except Exception:
+            await self._drop_generation(
+                shadow.active_collection_name,
+                shadow.manifest,
+                shadow.vector_index,
+                shadow.keyword_indexer.table_suffix if shadow.keyword_indexer else None,
+                grace_period=0
+            )
+            raise
+
+        old_name, old_vector_index = await self.executor.write(
+            self._swap_generation, shadow
+        )
+        old_manifest = self.manifest
+        self.manifest = shadow.manifest
+
+        old_suffix = None
+        if self.keyword_indexer:
+            old_suffix = await self.keyword_indexer.swap_shadow(shadow.keyword_indexer)
+
+        logger.info(f"Switched to index generation {self.active_collection_name}")
+
+        task = asyncio.create_task(self._drop_generation(
+            old_name, old_manifest, old_vector_index, old_suffix
+        ))
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+
+    def _read_active_name(self) -> str:
+        """Physical collection name recorded by the last reindex swap."""
+        try:
+            pointer = Path(self.persist_directory) / f"{self.collection_name}.active"
+            return json.loads(pointer.read_text())['collection']
+        except (OSError, ValueError, KeyError):
+            return self.collection_name
+
+    def _write_active_name(self) -> None:
+        """Atomically record the active physical collection name."""
+        pointer = Path(self.persist_directory) / f"{self.collection_name}.active"
+        tmp_path = pointer.with_suffix(".active.tmp")
+        tmp_path.write_text(json.dumps({'collection': self.active_collection_name}))
+        os.replace(tmp_path, pointer)
+
+    def _open_manifest(self, name: str) -> IndexManifest:
+        """Manifest of the given physical collection."""
+        return IndexManifest(str(Path(self.persist_directory) / f"{name}.manifest.db"))
+
+    def _vector_store_path(self, name: str) -> Path:
+        """Directory of the mmap vector store of a physical collection."""
+        return Path(self.persist_directory) / f"{name}.vectors"
+
+    def _generation_name(self, generation: int) -> str:
+        """Physical collection name of a generation (0 is the logical name)."""
+        if generation == 0:
+            return self.collection_name
+        return f"{self.collection_name}__g{generation}"
+
+    async def _create_shadow(self) -> "CodebaseIndexer":
+        """
+        Create an empty next generation that shares this indexer's client,
+        thread pools, parser pipeline and embedding cache.
+        """
+        _, _, generation = self.active_collection_name.rpartition("__g")
+        name = self._generation_name(int(generation) + 1 if generation.isdigit() else 1)
+
+        shadow = copy.copy(self)
+        shadow.active_collection_name = name
+        shadow.vector_index = None
+        shadow.chunk_cache = ChunkCache(self.chunk_cache.max_entries)
+        shadow.write_generation = next_generation()
+        shadow._needs_full_reindex = False
+
+        # Files left behind by an interrupted rebuild
+        self._remove_generation_files(name)
+        shadow.manifest = self._open_manifest(name)
+        shadow.collection = await self.executor.write(self._open_collection, name)
+
+        if self.keyword_indexer:
+            shadow.keyword_indexer = await self.keyword_indexer.create_shadow()
+
+        return shadow
+
+    def _swap_generation(self, shadow: "CodebaseIndexer") -> Tuple[str, Optional[ExactVectorIndex]]:
+        """
+        Point this indexer at the shadow's collection (runs on the write
+        lane, so no upsert/delete straddles the swap).
+
+        Returns:
+            (previous physical collection name, previous vector index)
+        """
+        old = (self.active_collection_name, self.vector_index)
+
+        self.active_collection_name = shadow.active_collection_name
+        self.collection = shadow.collection
+        self.vector_index = shadow.vector_index
+        self.chunk_cache.clear()
+        self.write_generation = next_generation()
+        self._write_active_name()
+
+        return old
+
+    async def _drop_generation(
+        self,
+        name: str,
+        manifest: IndexManifest,
+        vector_index: Optional[ExactVectorIndex],
+        keyword_suffix: Optional[str],
+        grace_period: float = GENERATION_GRACE_SECONDS
+    ) -> None:
+        """Delete an inactive generation's collection, manifest, vectors and keyword tables."""
+        try:
+            await asyncio.sleep(grace_period)
+
+            await manifest.close()
+            if vector_index is not None:
+                await self.executor.write(vector_index.clear)
+
+            await self.executor.write(self.client.delete_collection, name=name)
+            self._remove_generation_files(name)
+
+            if keyword_suffix is not None:
+                await self.keyword_indexer.drop_generation(keyword_suffix)
+
+            logger.info(f"Dropped index generation {name}")
+
+        except Exception as e:
+            logger.error(f"Failed to drop index generation {name}: {e}")
+
+    def _drop_stale_generations(self) -> None:
+        """Delete inactive generations left by an interrupted reindex (runs on the write lane)."""
+        prefix = f"{self.collection_name}__g"
+
+        for collection in self.client.list_collections():
+            name = getattr(collection, 'name', collection)
+            if name == self.active_collection_name:
+                continue
+            if name == self.collection_name or name.startswith(prefix):
+                logger.info(f"Deleting stale index generation {name}")
+                self.client.delete_collection(name=name)
+                self._remove_generation_files(name)
+
+    def _remove_generation_files(self, name: str) -> None:
+        """Delete a physical collection's manifest and mmap vector store files."""
+        manifest_path = Path(self.persist_directory) / f"{name}.manifest.db"
+        for path in (manifest_path, Path(f"{manifest_path}-wal"), Path(f"{manifest_path}-shm")):
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+
+        shutil.rmtree(self._vector_store_path(name), ignore_errors=True)
+
+    async def _check_file(
+        self,
+        filepath: str,
+        known: Optional[FileEntry]
+    ) -> Tuple[FileEntry, str]:
+        """
+        Compare a file on disk against its manifest entry.
+
+        Size and mtime are checked first; the content hash is only
+        computed when they differ.
+
+        Args:
+            filepath: Absolute path to file
+            known: Manifest entry, if any
+
+        Returns:
+            (current FileEntry, status) where status is
+            'added', 'changed' or 'unchanged'
+        """
+        stat = os.stat(filepath)
+
+        if known and known.size == stat.st_size and known.mtime == stat.st_mtime:
+            return known, 'unchanged'
+
+        content_hash = await asyncio.to_thread(hash_file, filepath)
+        entry = FileEntry(
+            filepath=filepath,
+            size=stat.st_size,
+            mtime=stat.st_mtime,
+            content_hash=content_hash,
+        )
+
+        if known is None:
+            return entry, 'added'
+
+        if known.content_hash == content_hash:
+            # Touched but not modified
+            await self.manifest.touch_file(entry)
+            return entry, 'unchanged'
+
+        return entry, 'changed'
+
+    async def _flush_batch(
+        self,
+        files: List[Tuple[FileEntry, List[CodeChunk]]]
+    ) -> int:
+        """
+        Replace the chunks of a batch of files and record them in the manifest.
+
+        Args:
+            files: (FileEntry, chunks) for each file in the batch
+
+        Returns:
+            Number of chunks indexed
+        """
+        # Chunks from the previous version of changed files
+        old_ids: List[str] = []
+        for entry, _chunks in files:
+            old_ids.extend(await self.manifest.get_chunk_ids(entry.filepath))
+
+        chunks = [chunk for _entry, file_chunks in files for chunk in file_chunks]
+        indexed = await self._sync_chunks(old_ids, chunks)
+
+        # Only record files whose chunks made it in, so failures are retried
+        if indexed == len(chunks):
+            for entry, file_chunks in files:
+                await self.manifest.record_file(entry, file_chunks)
+
+        return indexed
+
+    async def _sync_chunks(self, old_ids: List[str], chunks: List[CodeChunk]) -> int:
+        """
+        Apply the difference between previously indexed chunk IDs and new
+        chunks to the vector index and the attached keyword index.
+
+        Args:
+            old_ids: IDs currently indexed for the files being replaced
+            chunks: New chunks for those files
+
+        Returns:
+            Number of chunks indexed (new plus unchanged)
+        """
+        old = set(old_ids)
+        new_ids = {chunk.id for chunk in chunks}
+
+        added = [chunk for chunk in chunks if chunk.id not in old]
+        unchanged = [chunk for chunk in chunks if chunk.id in old]
+        removed = [chunk_id for chunk_id in old if chunk_id not in new_ids]
+
+        await self._delete_chunks(removed)
+
+        indexed = await self._index_chunks_batch(added)
+        if self.keyword_indexer and added:
+            await self.keyword_indexer.index_chunks(added)
+
+        indexed += await self._update_chunk_metadata(unchanged)
+
+        logger.debug(
+            f"Chunk diff: {len(added)} new, {len(unchanged)} unchanged, "
+            f"{len(removed)} removed"
+        )
+        return indexed
+
+    async def _update_chunk_metadata(self, chunks: List[CodeChunk]) -> int:
+        """
+        Refresh metadata (line range, parent, mtime) of unchanged chunks
+        without re-embedding them.
+
+        Args:
+            chunks: Chunks whose content is already indexed
+
+        Returns:
+            Number of chunks updated
+        """
+        if not chunks:
+            return 0
+
+        try:
+            await self.executor.write(
+                self._update_vector_metadata,
+                [chunk.id for chunk in chunks],
+                [self._chunk_metadata(chunk) for chunk in chunks]
+            )
+        except Exception as e:
+            logger.error(f"Failed to update {len(chunks)} chunks: {e}")
+            return 0
+
+        if self.keyword_indexer:
+            await self.keyword_indexer.update_chunk_metadata(chunks)
+
+        return len(chunks)
+
+    async def _get_file_chunk_ids(self, filepath: str) -> List[str]:
+        """
+        Get IDs of all chunks the collection holds for a file.
+
+        Args:
+            filepath: Path to file
+
+        Returns:
+            List of chunk IDs
+        """
+        results = await self.executor.write(
+            self.collection.get,
+            where={"filepath": filepath},
+            include=[]
+        )
+        return list(results['ids']) if results and results['ids'] else []
+
+    async def _delete_chunks(self, chunk_ids: List[str]) -> None:
+        """
+        Delete chunks by ID from the vector and keyword indices.
+
+        Args:
+            chunk_ids: IDs of chunks to delete
+        """
+        if not chunk_ids:
+            return
+
+        try:
+            await self._open_vector_store()
+            await self.executor.write(self._delete_vectors, chunk_ids)
+        except Exception as e:
+            logger.warning(f"Failed to delete {len(chunk_ids)} chunks: {e}")
+
+        if self.keyword_indexer:
+            await self.keyword_indexer.delete_chunks(chunk_ids)
+
     def _find_code_files(
         self,
         path: str,
@@ -370,6 +1471,9 @@ class CodebaseIndexer:
         """
         Find all code files in directory.
 
+        Excluded directories are pruned before they are listed, and
+        .gitignore/.ignore rules are honored.
+
         Args:
             path: Directory path
             extensions: File extensions to include
@@ -377,28 +1481,92 @@ class CodebaseIndexer:
         Returns:
             List of file paths
         """
-        excluded_dirs = {
-            '.venv', 'venv', '__pycache__', '.git', 'node_modules',
-            '.pytest_cache', 'dist', 'build', '.mypy_cache', '.ruff_cache'
-        }
+        discovery = FileDiscovery(path, extensions)
+        return discovery.find_files(max_workers=self.discovery_workers)
 
-        code_files = []
-        root_path = Path(path)
+    async def _embed_documents(self, documents: List[str]) -> List[List[float]]:
+        """
+        Embed chunk texts, computing only those missing from the cache.
 
-        for file_path in root_path.rglob('*'):
-            # Skip directories
-            if not file_path.is_file():
-                continue
+        Args:
+            documents: Chunk texts
 
-            # Skip excluded directories
-            if any(excluded in file_path.parts for excluded in excluded_dirs):
-                continue
+        Returns:
+            One vector per document, in input order
+        """
+        model_id = self.embedding_provider.model_id
+        hashes = [content_hash(doc) for doc in documents]
 
-            # Check extension
-            if file_path.suffix in extensions:
-                code_files.append(file_path)
+        vectors = await self.embedding_cache.get_many(model_id, set(hashes))
 
-        return sorted(code_files)
+        # Identical texts are embedded once
+        missing: Dict[str, str] = {}
+        for digest, doc in zip(hashes, documents):
+            if digest not in vectors:
+                missing.setdefault(digest, doc)
+
+        if missing:
+            computed = await self.executor.write(
+                self.embedding_provider.embed, list(missing.values())
+            )
+            new_vectors = list(zip(missing.keys(), computed))
+            await self.embedding_cache.put_many(model_id, new_vectors)
+            vectors.update(new_vectors)
+
+        logger.debug(
+            f"Embedded {len(documents)} chunks with {model_id} "
+            f"({len(documents) - len(missing)} from cache)"
+        )
+        return [vectors[digest] for digest in hashes]
+
+    async def _embed_queries(self, queries: List[str]) -> List[List[float]]:
+        """
+        Embed search queries in one batch on the read lane.
+
+        Args:
+            queries: Search queries
+
+        Returns:
+            One vector per query
+        """
+        return await self.executor.read(self.embedding_provider.embed, list(queries))
+
+    def _chunk_from_metadata(self, chunk_id: str, document: str, metadata: Dict) -> CodeChunk:
+        """Rebuild a CodeChunk from its ChromaDB document and metadata."""
+        return CodeChunk(
+            id=chunk_id,
+            content=document,
+            filepath=metadata.get('filepath', ''),
+            language=Language(metadata.get('language', 'unknown')),
+            chunk_type=ChunkType(metadata.get('chunk_type', 'file')),
+            parent_id=metadata.get('parent_id') or None,
+            name=metadata.get('name', ''),
+            qualified_name=metadata.get('qualified_name', ''),
+            signature=metadata.get('signature') or None,
+            docstring=metadata.get('docstring') or None,
+            calls=metadata.get('calls', '').split(),
+            imports=metadata.get('imports', '').split(),
+            line_range=(metadata.get('line_start', 0), metadata.get('line_end', 0)),
+            last_modified=metadata.get('last_modified', 0.0),
+        )
+
+    def _chunk_metadata(self, chunk: CodeChunk) -> Dict:
+        """ChromaDB metadata for a chunk."""
+        return {
+            'filepath': chunk.filepath,
+            'language': chunk.language.value,
+            'chunk_type': chunk.chunk_type.value,
+            'name': chunk.name,
+            'qualified_name': chunk.qualified_name,
+            'line_start': chunk.line_range[0],
+            'line_end': chunk.line_range[1],
+            'last_modified': chunk.last_modified,
+            'parent_id': chunk.parent_id or '',
+            'signature': chunk.signature or '',
+            'docstring': chunk.docstring or '',
+            'calls': ' '.join(chunk.calls),
+            'imports': ' '.join(chunk.imports),
+        }
 
     async def _index_chunks_batch(self, chunks: List[CodeChunk]) -> int:
         """
@@ -422,27 +1590,23 @@ class CodebaseIndexer:
             for chunk in chunks:
                 ids.append(chunk.id)
                 documents.append(chunk.content)
-
-                # Metadata (ChromaDB stores as dict)
-                metadatas.append({
-                    'filepath': chunk.filepath,
-                    'language': chunk.language.value,
-                    'chunk_type': chunk.chunk_type.value,
-                    'name': chunk.name,
-                    'line_start': chunk.line_range[0],
-                    'line_end': chunk.line_range[1],
-                    'last_modified': chunk.last_modified,
-                    'parent_id': chunk.parent_id or '',
-                    'signature': chunk.signature or '',
-                    'docstring': chunk.docstring or '',
-                })
-
-            # Add to ChromaDB (automatically generates embeddings)
-            self.collection.add(
-                ids=ids,
-                documents=documents,
-                metadatas=metadatas
-            )
+                metadatas.append(self._chunk_metadata(chunk))
+
+            # Embed (reusing cached vectors for unchanged text)
+            embeddings = await self._embed_documents(documents)
+            await self._open_vector_store()
+
+            # Upsert into ChromaDB (IDs are deterministic, so a chunk may
+            # already exist), never exceeding the largest batch the client accepts
+            step = min(self.batch_size, self.client.get_max_batch_size())
+            for i in range(0, len(ids), step):
+                await self.executor.write(
+                    self._upsert_vectors,
+                    ids[i:i + step],
+                    documents[i:i + step],
+                    embeddings[i:i + step],
+                    metadatas[i:i + step]
+                )
 
             logger.info(f"Indexed {len(chunks)} chunks")
             return len(chunks)
@@ -450,3 +1614,241 @@ class CodebaseIndexer:
         except Exception as e:
             logger.error(f"Failed to index chunks: {e}")
             return 0
+
+    def _upsert_vectors(
+        self,
+        ids: List[str],
+        documents: List[str],
+        embeddings: List[List[float]],
+        metadatas: List[Dict]
+    ) -> None:
+        """Upsert into ChromaDB and the loaded vector index (runs on the write lane)."""
+        self.collection.upsert(
+            ids=ids,
+            documents=documents,
+            embeddings=(
+                [PLACEHOLDER_EMBEDDING] * len(ids) if self._mmap_store_of_record else embeddings
+            ),
+            metadatas=metadatas
+        )
+        self.chunk_cache.invalidate(ids)
+
+        vector_index = self.vector_index
+        if vector_index is not None:
+            vector_index.upsert(ids, embeddings)
+        elif self._mmap_store_of_record:
+            # Writers open the store first (see _open_vector_store)
+            raise RuntimeError("mmap vector store is not open")
+
+        self.write_generation = next_generation()
+
+    def _update_vector_metadata(self, ids: List[str], metadatas: List[Dict]) -> None:
+        """Update chunk metadata in ChromaDB (runs on the write lane)."""
+        self.collection.update(ids=ids, metadatas=metadatas)
+        self.chunk_cache.invalidate(ids)
+        self.write_generation = next_generation()
+
+    def _delete_vectors(self, ids: List[str]) -> None:
+        """Delete from ChromaDB and the loaded vector index (runs on the write lane)."""
+        self.collection.delete(ids=ids)
+        self.chunk_cache.invalidate(ids)
+
+        vector_index = self.vector_index
+        if vector_index is not None:
+            vector_index.delete(ids)
+
+        self.write_generation = next_generation()
+
+    async def _get_vector_index(self) -> Optional[ExactVectorIndex]:
+        """
+        Return the exact or mmap index if it should answer queries, loading
+        it on first use and releasing the exact index once the collection
+        crosses the auto-mode size limit.
+
+        Returns:
+            ExactVectorIndex / MmapVectorIndex, or None to query ChromaDB
+        """
+        if self.vector_backend == "chroma":
+            return None
+
+        vector_index = self.vector_index
+        auto = self.vector_backend == "auto"
+
+        if vector_index is None:
+            if auto:
+                count = await self.executor.read(self.collection.count)
+                if count > self.exact_search_max_chunks:
+                    return None
+
+            # Loaded on the write lane so no upsert/delete can interleave
+            vector_index = await self.executor.write(self._load_vector_index)
+            if vector_index is None:
+                vector_index = await self._rebuild_vector_store()
+            return vector_index
+
+        if auto and len(vector_index) > self.exact_search_max_chunks:
+            logger.info(
+                f"Collection {self.active_collection_name} exceeds "
+                f"{self.exact_search_max_chunks} chunks; switching to HNSW search"
+            )
+            self.vector_index = None
+            return None
+
+        return vector_index
+
+    def _load_vector_index(self) -> Optional[ExactVectorIndex]:
+        """
+        Open the mmap store, or build the exact index from ChromaDB's embeddings.
+
+        A flushed mmap store is reused when it was built with the same
+        model and holds as many vectors as the collection.
+
+        Returns:
+            The loaded index, or None if the mmap store must be rebuilt
+            (see _rebuild_vector_store)
+        """
+        if self.vector_index is not None:
+            return self.vector_index
+
+        start_time = time.time()
+
+        if self.vector_backend == "mmap":
+            vector_index = MmapVectorIndex(
+                self._vector_store_path(self.active_collection_name),
+                quantization=self.vector_quantization
+            )
+
+            if (
+                vector_index.open(self._vector_index_meta())
+                and len(vector_index) == self.collection.count()
+            ):
+                self.vector_index = vector_index
+                logger.info(f"Opened vector store with {len(vector_index)} embeddings")
+                return vector_index
+
+            vector_index.close()
+            return None
+
+        vector_index = ExactVectorIndex(dtype=self.exact_search_dtype)
+
+        page_size = self.client.get_max_batch_size()
+        offset = 0
+
+        while True:
+            page = self.collection.get(
+                include=['embeddings'],
+                limit=page_size,
+                offset=offset
+            )
+            if not page['ids']:
+                break
+
+            vector_index.upsert(page['ids'], page['embeddings'])
+            offset += len(page['ids'])
+
+        vector_index.flush(self._vector_index_meta())
+
+        self.vector_index = vector_index
+        logger.info(
+            f"Loaded {len(vector_index)} embeddings into {self.vector_backend} vector index "
+            f"({vector_index.nbytes / 1e6:.1f} MB resident, "
+            f"{(time.time() - start_time) * 1000:.0f}ms)"
+        )
+        return vector_index
+
+    async def _rebuild_vector_store(self) -> ExactVectorIndex:
+        """
+        Recreate a missing or outdated mmap store from the collection's
+        documents; vectors come from the embedding cache where possible.
+
+        Returns:
+            The rebuilt MmapVectorIndex
+        """
+        while True:
+            generation = self.write_generation
+            ids, documents = await self.executor.read(self._read_documents)
+            embeddings = await self._embed_documents(documents) if documents else []
+
+            vector_index = await self.executor.write(
+                self._install_vector_store, generation, ids, embeddings
+            )
+            if vector_index is not None:
+                return vector_index
+
+            logger.debug("Collection changed while rebuilding the vector store; retrying")
+
+    def _read_documents(self) -> Tuple[List[str], List[str]]:
+        """Page every chunk's ID and document out of ChromaDB."""
+        ids: List[str] = []
+        documents: List[str] = []
+
+        page_size = self.client.get_max_batch_size()
+        offset = 0
+
+        while True:
+            page = self.collection.get(
+                include=['documents'],
+                limit=page_size,
+                offset=offset
+            )
+            if not page['ids']:
+                break
+
+            ids.extend(page['ids'])
+            documents.extend(page['documents'])
+            offset += len(page['ids'])
+
+        return ids, documents
+
+    def _install_vector_store(
+        self,
+        generation: int,
+        ids: List[str],
+        embeddings: List[List[float]]
+    ) -> Optional[ExactVectorIndex]:
+        """
+        Write a rebuilt mmap store and make it the loaded index (runs on
+        the write lane).
+
+        Returns:
+            The index, or None if the collection was written to since
+            `generation`, so the vectors may be stale
+        """
+        if self.vector_index is not None:
+            return self.vector_index
+        if self.write_generation != generation:
+            return None
+
+        start_time = time.time()
+
+        vector_index = MmapVectorIndex(
+            self._vector_store_path(self.active_collection_name),
+            quantization=self.vector_quantization
+        )
+        vector_index.clear()
+        vector_index.upsert(ids, embeddings)
+        vector_index.flush(self._vector_index_meta())
+
+        self.vector_index = vector_index
+        logger.info(
+            f"Rebuilt vector store with {len(vector_index)} embeddings "
+            f"({(time.time() - start_time) * 1000:.0f}ms)"
+        )
+        return vector_index
+
+    async def _open_vector_store(self) -> None:
+        """
+        Open (or rebuild) the mmap store before a write, since it is the
+        only copy of the vectors.
+        """
+        if self._mmap_store_of_record and self.vector_index is None:
+            await self._get_vector_index()
+
+    def _flush_vector_index(self) -> None:
+        """Persist the loaded vector index (runs on the write lane)."""
+        if self.vector_index is not None:
+            self.vector_index.flush(self._vector_index_meta())
+
+    def _vector_index_meta(self) -> Dict:
+        """Values a persisted vector index must match to be reused."""
+        return {'embedding_model': self.embedding_provider.model_id}
@@ -1,11 +1,42 @@
 """BM25 keyword search using SQLite FTS5."""
 
 import aiosqlite
+import asyncio
+import copy
+import re
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import AsyncIterator, Callable, Dict, List, Set, Tuple, Optional
 from loguru import logger
 
-from .models import CodeChunk
+from .code_graph import (
+    CALL_WEIGHT,
+    CALLABLE_TYPES,
+    CONTAINS_WEIGHT,
+    IMPORT_WEIGHT,
+    MAX_CALL_TARGETS,
+    CodeGraph,
+    EdgeChange,
+    graph_references,
+    python_module_names,
+    qualified_parent,
+)
+from .code_tokenizer import FTS5_TOKENIZE, expand_identifiers
+from .models import ChunkType, CodeChunk, Language, SearchResult
+from .query_compiler import compile_query, compile_regex, compile_substring
+from .result_cache import next_generation
+from .symbol_index import SymbolIndex, SymbolRow
+
+
+def _original_text(text: Optional[str]) -> Optional[str]:
+    """Undo expand_identifiers() on text stored by older FTS5 tables."""
+    if text and '\n' in text:
+        original = text.rsplit('\n', 1)[0]
+        if expand_identifiers(original) == text:
+            return original
+    return text
 
 
 class KeywordIndexer:
@@ -13,14 +44,48 @@ class KeywordIndexer:
     BM25 keyword search using SQLite FTS5.
 
     Provides fast full-text search as complement to vector search.
+    Content and names pass through the identifier splitting of
+    code_tokenizer, and queries are compiled by query_compiler, so
+    `getUserById` also matches "user id" and vice versa.
+
+    Chunk text and metadata are stored once, in the chunk table; the FTS5
+    table is external-content and holds only the inverted index, kept in
+    sync by triggers.
     """
 
-    def __init__(self, db_path: Optional[str] = None):
+    # Queries combined into one statement by search_many
+    _QUERY_BATCH = 100
+
+    # Candidate rows verified per round by substring/regex search
+    _VERIFY_BATCH = 512
+
+    # Values per IN (...) list when updating the code graph or symbol index
+    _UPDATE_BATCH = 500
+
+    # Changed chunks the symbol index is patched with before it is rebuilt
+    _SYMBOL_CHANGES = 20_000
+
+    # Changed edges the code graph is patched with before it is rebuilt
+    _GRAPH_CHANGES = 200_000
+
+    # Chunks per transaction in bulk-load mode
+    _BULK_COMMIT_ROWS = 50_000
+
+    # Per-connection page cache (negative: KiB) and memory-mapped I/O size
+    _CACHE_SIZE = -16384
+    _MMAP_SIZE = 256 * 1024 * 1024
+
+    def __init__(self, db_path: Optional[str] = None, read_connections: int = 4):
         """
         Initialize KeywordIndexer.
 
+        Writes go through one connection; searches use a pool of read-only
+        connections, which WAL mode lets run while the writer commits.
+
         Args:
             db_path: Path to SQLite database (default: ~/MarunochiAI/data/keyword_index.db)
+            read_connections: Read-only connections opened on demand for
+                searches (0 = search on the write connection)
         """
         self.db_path = db_path or str(
             Path.home() / "MarunochiAI" / "data" / "keyword_index.db"
@@ -31,6 +96,52 @@ class KeywordIndexer:
 
         self.db = None
         self._initialized = False
+        self._owns_db = True
+        self._bulk_loading = False
+        self._bulk_rows = 0
+
+        # Changes on every write, for caches of search results
+        self.write_generation = next_generation()
+
+        # Searches that failed and returned no results (see HybridSearcher)
+        self.search_failures = 0
+
+        # Graph updates share a temp table (see _update_graph)
+        self._graph_lock = asyncio.Lock()
+
+        # Symbol name index with the chunk table it was built from
+        # (see get_symbol_index)
+        self._symbols: Optional[Tuple[str, SymbolIndex]] = None
+        self._symbols_lock = asyncio.Lock()
+
+        # Rowids of chunks written since, by chunk table (shared with
+        # shadows, whose writes go through the same connection)
+        self._symbol_changes: Dict[str, Set[int]] = {}
+
+        # Code graph with the edge table it was built from, and the edges
+        # written since, by edge table (see get_graph)
+        self._graph: Optional[Tuple[str, CodeGraph]] = None
+        self._graph_build_lock = asyncio.Lock()
+        self._graph_changes: Dict[str, List[EdgeChange]] = {}
+
+        # Reader pool (shared with shadows, which are shallow copies)
+        self.read_connections = 0 if self.db_path == ":memory:" else max(0, read_connections)
+        self._readers: List[aiosqlite.Connection] = []
+        self._idle_readers: asyncio.Queue = asyncio.Queue()
+
+        # Tables of the active generation (see create_shadow)
+        self._set_suffix("")
+
+    def _set_suffix(self, suffix: str) -> None:
+        """Point this indexer at the tables of one generation."""
+        self.table_suffix = suffix
+        self.fts_table = f"code_fts{suffix}"
+        self.metadata_table = f"chunk_metadata{suffix}"
+        self.stats_table = f"index_stats{suffix}"
+        self.source_view = f"code_fts_source{suffix}"
+        self.trigram_table = f"code_trigram{suffix}"
+        self.graph_refs_table = f"code_graph_refs{suffix}"
+        self.graph_edges_table = f"code_graph_edges{suffix}"
 
     async def _ensure_initialized(self) -> None:
         """Ensure database is initialized."""
@@ -45,39 +156,63 @@ class KeywordIndexer:
         try:
             self.db = await aiosqlite.connect(self.db_path)
 
-            # Create FTS5 virtual table for full-text search
-            # FTS5 automatically uses BM25 ranking
+            # Readers never block the writer (nor it them) in WAL mode;
+            # the index can be rebuilt from source, so skip per-commit fsync
+            await self.db.execute("PRAGMA journal_mode=WAL")
+            await self.db.execute("PRAGMA synchronous=NORMAL")
+            await self.db.execute("PRAGMA temp_store=MEMORY")
+            await self._tune(self.db)
+
+            # Fire delete triggers for rows removed by INSERT OR REPLACE
+            await self.db.execute("PRAGMA recursive_triggers=ON")
+
+            # Called by the triggers that keep the FTS5 index in sync
+            await self.db.create_function(
+                "expand_identifiers", 1, expand_identifiers, deterministic=True
+            )
+
+            # Used when resolving the code graph (see _resolve_graph)
+            await self.db.create_function(
+                "qualified_parent", 1, qualified_parent, deterministic=True
+            )
             await self.db.execute("""
-                CREATE VIRTUAL TABLE IF NOT EXISTS code_fts USING fts5(
-                    chunk_id UNINDEXED,
-                    content,
-                    filepath UNINDEXED,
-                    name,
-                    language UNINDEXED,
-                    chunk_type UNINDEXED,
-                    tokenize='porter unicode61'
-                )
+                CREATE TEMP TABLE IF NOT EXISTS graph_affected (id INTEGER PRIMARY KEY)
             """)
-
-            # Create metadata table for storing chunk info
             await self.db.execute("""
-                CREATE TABLE IF NOT EXISTS chunk_metadata (
-                    chunk_id TEXT PRIMARY KEY,
-                    filepath TEXT,
-                    name TEXT,
-                    language TEXT,
-                    chunk_type TEXT,
-                    line_start INTEGER,
-                    line_end INTEGER,
-                    last_modified REAL
+                CREATE TEMP TABLE IF NOT EXISTS graph_linkable (name TEXT PRIMARY KEY)
+            """)
+            await self.db.execute("""
+                CREATE TEMP TABLE IF NOT EXISTS graph_resolved (
+                    source INTEGER NOT NULL,
+                    target INTEGER NOT NULL,
+                    weight REAL NOT NULL
                 )
             """)
+            await self.db.execute("""
+                CREATE INDEX IF NOT EXISTS temp.idx_graph_resolved
+                ON graph_resolved (source, target, weight)
+            """)
 
-            # Create index on filepath for fast deletion
+            # Called by the triggers that report writes to the symbol index
+            # and the code graph
+            await self.db.create_function("symbol_changed", 2, self._symbol_changed)
+            await self.db.create_function("graph_changed", 5, self._graph_changed)
+            await self.db.create_function("graph_tracked", 1, self._graph_tracked)
+
+            # Name of the active table generation
             await self.db.execute("""
-                CREATE INDEX IF NOT EXISTS idx_filepath
-                ON chunk_metadata(filepath)
+                CREATE TABLE IF NOT EXISTS fts_generation (
+                    name TEXT PRIMARY KEY,
+                    suffix TEXT NOT NULL
+                )
             """)
+            cursor = await self.db.execute(
+                "SELECT suffix FROM fts_generation WHERE name = 'active'"
+            )
+            row = await cursor.fetchone()
+            self._set_suffix(row[0] if row else "")
+
+            await self._create_tables()
 
             await self.db.commit()
             logger.info(f"Initialized keyword index at {self.db_path}")
@@ -86,6 +221,557 @@ class KeywordIndexer:
             logger.error(f"Failed to initialize keyword index: {e}")
             raise
 
+    async def _tune(self, db: aiosqlite.Connection) -> None:
+        """Apply the cache and mmap pragmas of one connection."""
+        await db.execute(f"PRAGMA cache_size={self._CACHE_SIZE}")
+        await db.execute(f"PRAGMA mmap_size={self._MMAP_SIZE}")
+
+    @asynccontextmanager
+    async def _reader(self) -> AsyncIterator[aiosqlite.Connection]:
+        """
+        Borrow a read-only connection, opening one if the pool is not full.
+
+        Yields:
+            Connection to run SELECTs on
+        """
+        await self._ensure_initialized()
+
+        if not self.read_connections:
+            yield self.db
+            return
+
+        try:
+            db = self._idle_readers.get_nowait()
+        except asyncio.QueueEmpty:
+            if len(self._readers) < self.read_connections:
+                db = await self._open_reader()
+            else:
+                db = await self._idle_readers.get()
+
+        try:
+            yield db
+        finally:
+            self._idle_readers.put_nowait(db)
+
+    async def _open_reader(self) -> aiosqlite.Connection:
+        """Open one read-only pool connection."""
+        uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+
+        # Counted before connecting, so concurrent callers respect the limit
+        db = aiosqlite.connect(uri, uri=True)
+        self._readers.append(db)
+
+        try:
+            await db
+            await self._tune(db)
+        except Exception:
+            self._readers.remove(db)
+            if db._connection is not None:
+                await db.close()
+            raise
+
+        logger.debug(f"Opened keyword index reader {len(self._readers)}/{self.read_connections}")
+        return db
+
+    async def _create_tables(self) -> None:
+        """Create the chunk, FTS5 and stats tables of the current generation."""
+        legacy = await self._has_legacy_layout()
+        if legacy:
+            await self._detach_legacy_tables()
+
+        # One row per chunk, holding the only copy of its text in this
+        # database; `id` is the rowid the FTS5 index refers to
+        await self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.metadata_table} (
+                id INTEGER PRIMARY KEY,
+                chunk_id TEXT NOT NULL UNIQUE,
+                filepath TEXT,
+                name TEXT,
+                language TEXT,
+                chunk_type TEXT,
+                line_start INTEGER,
+                line_end INTEGER,
+                last_modified REAL,
+                content TEXT,
+                qualified_name TEXT,
+                calls TEXT,
+                imports TEXT
+            )
+        """)
+        await self._add_reference_columns()
+
+        await self._create_indexes()
+
+        # The text FTS5 indexes, derived from the chunk table on demand
+        await self.db.execute(f"""
+            CREATE VIEW IF NOT EXISTS {self.source_view} AS
+            SELECT id, expand_identifiers(content) AS content, expand_identifiers(name) AS name
+            FROM {self.metadata_table}
+        """)
+
+        # External-content FTS5 table: only the inverted index is stored,
+        # column values are read through the view
+        # FTS5 automatically uses BM25 ranking
+        await self.db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self.fts_table} USING fts5(
+                content,
+                name,
+                content='{self.source_view}',
+                content_rowid='id',
+                tokenize="{FTS5_TOKENIZE}"
+            )
+        """)
+
+        # Trigram index of the raw content, for substring and regex search
+        cursor = await self.db.execute(f"""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{self.trigram_table}'
+        """)
+        new_trigram_table = await cursor.fetchone() is None
+        await self.db.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {self.trigram_table} USING fts5(
+                content,
+                content='{self.metadata_table}',
+                content_rowid='id',
+                tokenize='trigram'
+            )
+        """)
+        if new_trigram_table:
+            # Backfill chunks indexed before the trigram index existed
+            await self.db.execute(
+                f"INSERT INTO {self.trigram_table} ({self.trigram_table}) VALUES ('rebuild')"
+            )
+
+        new_graph_tables = await self._create_graph_tables()
+
+        await self._init_stats()
+        await self._init_fts_triggers()
+        await self._init_graph_triggers()
+        await self._init_edge_triggers()
+        await self._init_symbol_triggers()
+
+        if legacy:
+            await self._copy_legacy_rows()
+
+        if await self._bulk_load_pending():
+            # Interrupted bulk load: triggers were off, rebuild from the chunk table
+            logger.warning(f"Finishing interrupted keyword index bulk load{self.table_suffix}")
+            await self._finish_bulk_load()
+        elif new_graph_tables:
+            # Backfill chunks indexed before the graph was stored
+            await self._rebuild_graph()
+
+    def _index_columns(self) -> List[Tuple[str, str]]:
+        """(index name, column) of the chunk table's B-tree indexes."""
+        return [
+            # Fast deletion by file
+            (f"idx_filepath{self.table_suffix}", "filepath"),
+            # Symbol lookup (see lookup_symbol)
+            (f"idx_symbol_name{self.table_suffix}", "name"),
+            (f"idx_symbol_qualified{self.table_suffix}", "qualified_name"),
+            # Same-file call resolution (see _resolve_graph)
+            (f"idx_file_symbol{self.table_suffix}", "filepath, name"),
+        ]
+
+    async def _create_indexes(self) -> None:
+        """Create the chunk table's B-tree indexes."""
+        for index, column in self._index_columns():
+            await self.db.execute(f"""
+                CREATE INDEX IF NOT EXISTS {index}
+                ON {self.metadata_table}({column})
+            """)
+
+    async def _init_fts_triggers(self) -> None:
+        """Keep the FTS5 and trigram indexes in sync with the chunk table."""
+        insert = f"""
+            INSERT INTO {self.fts_table} (rowid, content, name)
+            VALUES (NEW.id, expand_identifiers(NEW.content), expand_identifiers(NEW.name));
+        """
+        delete = f"""
+            INSERT INTO {self.fts_table} ({self.fts_table}, rowid, content, name)
+            VALUES ('delete', OLD.id, expand_identifiers(OLD.content), expand_identifiers(OLD.name));
+        """
+
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_fts_insert
+            AFTER INSERT ON {self.metadata_table}
+            BEGIN {insert} END
+        """)
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_fts_delete
+            AFTER DELETE ON {self.metadata_table}
+            BEGIN {delete} END
+        """)
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_fts_update
+            AFTER UPDATE OF content, name ON {self.metadata_table}
+            BEGIN {delete} {insert} END
+        """)
+
+        insert = f"""
+            INSERT INTO {self.trigram_table} (rowid, content) VALUES (NEW.id, NEW.content);
+        """
+        delete = f"""
+            INSERT INTO {self.trigram_table} ({self.trigram_table}, rowid, content)
+            VALUES ('delete', OLD.id, OLD.content);
+        """
+
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_trigram_insert
+            AFTER INSERT ON {self.metadata_table}
+            BEGIN {insert} END
+        """)
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_trigram_delete
+            AFTER DELETE ON {self.metadata_table}
+            BEGIN {delete} END
+        """)
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_trigram_update
+            AFTER UPDATE OF content ON {self.metadata_table}
+            BEGIN {delete} {insert} END
+        """)
+
+    async def _create_graph_tables(self) -> bool:
+        """
+        Create the code graph's reference and edge tables.
+
+        Returns:
+            Whether the tables are new
+        """
+        cursor = await self.db.execute(f"""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{self.graph_edges_table}'
+        """)
+        new = await cursor.fetchone() is None
+
+        # (kind, name) references of each chunk, see graph_references()
+        await self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.graph_refs_table} (
+                source INTEGER NOT NULL,
+                kind TEXT NOT NULL,
+                name TEXT NOT NULL
+            )
+        """)
+        # Edges resolved from them, keyed by the chunk they come from;
+        # chunks are chunk table rowids
+        await self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.graph_edges_table} (
+                source INTEGER NOT NULL,
+                target INTEGER NOT NULL,
+                weight REAL NOT NULL
+            )
+        """)
+
+        for table in (self.graph_refs_table, self.graph_edges_table):
+            await self._create_graph_indexes(table)
+
+        return new
+
+    def _graph_index_columns(self) -> List[Tuple[str, str, str]]:
+        """(index name, table, columns) of the code graph tables' B-tree indexes."""
+        return [
+            (f"idx_graph_refs_source{self.table_suffix}", self.graph_refs_table, "source"),
+            (f"idx_graph_refs_name{self.table_suffix}", self.graph_refs_table, "kind, name"),
+            # Edge indexes cover the table, so updates (see _resolve_graph)
+            # read no table rows
+            (f"idx_graph_edges_source{self.table_suffix}", self.graph_edges_table,
+             "source, target, weight"),
+            (f"idx_graph_edges_target{self.table_suffix}", self.graph_edges_table,
+             "target, source, weight"),
+        ]
+
+    async def _create_graph_indexes(self, table: str) -> None:
+        """Create the B-tree indexes of one code graph table."""
+        for index, indexed_table, columns in self._graph_index_columns():
+            if indexed_table == table:
+                await self.db.execute(
+                    f"CREATE INDEX IF NOT EXISTS {index} ON {table}({columns})"
+                )
+
+    async def _init_graph_triggers(self) -> None:
+        """Drop the references and edges of deleted chunks."""
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_graph_delete
+            AFTER DELETE ON {self.metadata_table}
+            BEGIN
+                DELETE FROM {self.graph_refs_table} WHERE source = OLD.id;
+                DELETE FROM {self.graph_edges_table} WHERE source = OLD.id OR target = OLD.id;
+            END
+        """)
+
+    async def _init_edge_triggers(self) -> None:
+        """
+        Report changed edges to the code graph (see get_graph).
+
+        TEMP, like _init_symbol_triggers, and dropped while the graph is
+        rebuilt (see _rebuild_graph).
+        """
+        for trigger, event, row, change in (
+            ("edge_insert", "INSERT", "NEW", 1),
+            ("edge_delete", "DELETE", "OLD", -1),
+        ):
+            await self.db.execute(f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS {self.graph_edges_table}_{trigger}
+                AFTER {event} ON main.{self.graph_edges_table}
+                BEGIN
+                    SELECT graph_changed(
+                        '{self.graph_edges_table}', {row}.source, {row}.target, {row}.weight,
+                        {change}
+                    );
+                END
+            """)
+
+    async def _init_symbol_triggers(self) -> None:
+        """
+        Report written chunks to the symbol index (see get_symbol_index).
+
+        The triggers are TEMP, like the state they feed: they live as
+        long as this connection.
+        """
+        for trigger, event, row in (
+            ("symbol_insert", "INSERT", "NEW"),
+            ("symbol_delete", "DELETE", "OLD"),
+            ("symbol_update", "UPDATE OF name, qualified_name, language", "NEW"),
+        ):
+            await self.db.execute(f"""
+                CREATE TEMP TRIGGER IF NOT EXISTS {self.metadata_table}_{trigger}
+                AFTER {event} ON main.{self.metadata_table}
+                BEGIN
+                    SELECT symbol_changed('{self.metadata_table}', {row}.id);
+                END
+            """)
+
+    def _symbol_changed(self, table: str, rowid: int) -> None:
+        """Note a written chunk, if a symbol index of its table is kept (connection thread)."""
+        changes = self._symbol_changes.get(table)
+        if changes is None:
+            return
+
+        changes.add(rowid)
+        if len(changes) > self._SYMBOL_CHANGES:
+            # Too many to patch in: rebuilt on the next query instead
+            self._symbol_changes.pop(table, None)
+
+    def _graph_changed(
+        self,
+        table: str,
+        source: int,
+        target: int,
+        weight: float,
+        change: int
+    ) -> None:
+        """Note a changed edge, if a code graph of its table is kept (connection thread)."""
+        changes = self._graph_changes.get(table)
+        if changes is None:
+            return
+
+        changes.append((source, target, weight, change))
+        if len(changes) > self._GRAPH_CHANGES:
+            # Too many to patch in: rebuilt on the next search instead
+            self._graph_changes.pop(table, None)
+
+    def _graph_tracked(self, table: str) -> None:
+        """Report the edges changed from now on (connection thread, see get_graph)."""
+        self._graph_changes[table] = []
+
+    async def _add_reference_columns(self) -> None:
+        """Add the columns the code graph is built from to older chunk tables."""
+        cursor = await self.db.execute(f"PRAGMA table_info({self.metadata_table})")
+        columns = {row[1] for row in await cursor.fetchall()}
+
+        for column in ('qualified_name', 'calls', 'imports'):
+            if column not in columns:
+                await self.db.execute(
+                    f"ALTER TABLE {self.metadata_table} ADD COLUMN {column} TEXT"
+                )
+
+    async def _has_legacy_layout(self) -> bool:
+        """Whether this generation's tables predate the external-content layout."""
+        cursor = await self.db.execute(f"PRAGMA table_info({self.metadata_table})")
+        columns = [row[1] for row in await cursor.fetchall()]
+        return bool(columns) and 'content' not in columns
+
+    async def _detach_legacy_tables(self) -> None:
+        """Move legacy tables aside so the new layout can take their names."""
+        logger.info(f"Migrating keyword index tables{self.table_suffix} to external content")
+
+        for trigger in ("stats_insert", "stats_delete"):
+            await self.db.execute(f"DROP TRIGGER IF EXISTS {self.metadata_table}_{trigger}")
+        await self.db.execute(f"DROP INDEX IF EXISTS idx_filepath{self.table_suffix}")
+
+        # Counters are re-seeded and then kept up by the copy below
+        await self.db.execute(f"DROP TABLE IF EXISTS {self.stats_table}")
+
+        for table in (self.fts_table, self.metadata_table):
+            await self.db.execute(f"DROP TABLE IF EXISTS {table}_legacy")
+            await self.db.execute(f"ALTER TABLE {table} RENAME TO {table}_legacy")
+
+    async def _copy_legacy_rows(self) -> None:
+        """Copy chunks from legacy tables into the new layout, then drop them."""
+        await self.db.create_function("original_text", 1, _original_text, deterministic=True)
+
+        await self.db.execute(f"""
+            INSERT OR REPLACE INTO {self.metadata_table}
+            (chunk_id, filepath, name, language, chunk_type, line_start, line_end,
+             last_modified, content)
+            SELECT m.chunk_id, m.filepath, m.name, m.language, m.chunk_type,
+                   m.line_start, m.line_end, m.last_modified, original_text(f.content)
+            FROM {self.metadata_table}_legacy m
+            JOIN (
+                SELECT chunk_id, MAX(content) AS content
+                FROM {self.fts_table}_legacy
+                GROUP BY chunk_id
+            ) f ON f.chunk_id = m.chunk_id
+        """)
+
+        await self.db.execute(f"DROP TABLE {self.fts_table}_legacy")
+        await self.db.execute(f"DROP TABLE {self.metadata_table}_legacy")
+
+    async def _init_stats(self) -> None:
+        """Create chunk/file counters kept in sync with chunk_metadata by triggers."""
+        cursor = await self.db.execute(f"""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = '{self.stats_table}'
+        """)
+        exists = await cursor.fetchone() is not None
+
+        await self.db.execute(f"""
+            CREATE TABLE IF NOT EXISTS {self.stats_table} (
+                key TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_stats_insert
+            AFTER INSERT ON {self.metadata_table}
+            BEGIN
+                UPDATE {self.stats_table} SET count = count + 1 WHERE key = 'chunks';
+                UPDATE {self.stats_table} SET count = count + 1
+                    WHERE key = 'files'
+                    AND (SELECT COUNT(*) FROM {self.metadata_table} WHERE filepath = NEW.filepath) = 1;
+            END
+        """)
+
+        await self.db.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {self.metadata_table}_stats_delete
+            AFTER DELETE ON {self.metadata_table}
+            BEGIN
+                UPDATE {self.stats_table} SET count = count - 1 WHERE key = 'chunks';
+                UPDATE {self.stats_table} SET count = count - 1
+                    WHERE key = 'files'
+                    AND NOT EXISTS (SELECT 1 FROM {self.metadata_table} WHERE filepath = OLD.filepath);
+            END
+        """)
+
+        if not exists:
+            # Seed counters (backfills databases created before they existed)
+            await self._seed_stats()
+
+    async def _seed_stats(self) -> None:
+        """Recount chunks and files into the stats table."""
+        await self.db.execute(f"DELETE FROM {self.stats_table}")
+        await self.db.execute(f"""
+            INSERT INTO {self.stats_table} (key, count)
+            SELECT 'chunks', COUNT(*) FROM {self.metadata_table}
+            UNION ALL
+            SELECT 'files', COUNT(DISTINCT filepath) FROM {self.metadata_table}
+        """)
+
+    @asynccontextmanager
+    async def bulk_load(self) -> AsyncIterator["KeywordIndexer"]:
+        """
+        Load many chunks at once, e.g. on a first index or a full rebuild.
+
+        Inside the block, chunks go into the chunk table only, committed
+        every `_BULK_COMMIT_ROWS` rows, with the FTS5 and stats triggers
+        and the B-tree indexes dropped. On exit the FTS5 index is built
+        in one pass from the chunk table and optimized, the code graph is
+        resolved, and the triggers, indexes and counters are restored.
+        Searches see the previous FTS5 contents until then.
+
+        Yields:
+            This indexer
+        """
+        await self._ensure_initialized()
+
+        if self._bulk_loading:
+            yield self
+            return
+
+        # Marker, so an interrupted load is finished on the next open
+        await self.db.execute("""
+            INSERT OR REPLACE INTO fts_generation (name, suffix) VALUES (?, ?)
+        """, (f"bulk_load{self.table_suffix}", self.table_suffix))
+
+        for trigger in (
+            "fts_insert", "fts_delete", "fts_update",
+            "trigram_insert", "trigram_delete", "trigram_update",
+            "stats_insert", "stats_delete", "graph_delete",
+            "symbol_insert", "symbol_delete", "symbol_update",
+        ):
+            await self.db.execute(f"DROP TRIGGER IF EXISTS {self.metadata_table}_{trigger}")
+        for index, _ in self._index_columns():
+            await self.db.execute(f"DROP INDEX IF EXISTS {index}")
+        for table in (self.fts_table, self.trigram_table):
+            await self.db.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('automerge', 0)")
+        await self.db.commit()
+
+        self._bulk_loading = True
+        self._bulk_rows = 0
+        start = time.time()
+        logger.info(f"Keyword index bulk load started{self.table_suffix}")
+
+        try:
+            yield self
+        finally:
+            self._bulk_loading = False
+            await self._finish_bulk_load()
+            logger.info(
+                f"Keyword index bulk load finished{self.table_suffix} "
+                f"in {int((time.time() - start) * 1000)}ms"
+            )
+
+    async def _bulk_load_pending(self) -> bool:
+        """Whether a bulk load of this generation has not been finished."""
+        cursor = await self.db.execute(
+            "SELECT 1 FROM fts_generation WHERE name = ?",
+            (f"bulk_load{self.table_suffix}",)
+        )
+        return await cursor.fetchone() is not None
+
+    async def _finish_bulk_load(self) -> None:
+        """Index everything loaded in bulk and restore incremental upkeep."""
+        try:
+            await self._create_indexes()
+
+            # Build each FTS5 index from the chunk table in one pass, then
+            # merge it into a single segment
+            for table in (self.fts_table, self.trigram_table):
+                await self.db.execute(f"INSERT INTO {table} ({table}) VALUES ('rebuild')")
+                await self.db.execute(f"INSERT INTO {table} ({table}) VALUES ('optimize')")
+                await self.db.execute(f"INSERT INTO {table} ({table}, rank) VALUES ('automerge', 4)")
+
+            await self._seed_stats()
+            await self._init_stats()
+            await self._init_fts_triggers()
+
+            await self._rebuild_graph()
+            await self._init_graph_triggers()
+
+            # Chunks loaded in bulk were not reported: rebuild on the next query
+            await self._init_symbol_triggers()
+            self._symbol_changes.pop(self.metadata_table, None)
+
+            await self.db.execute(
+                "DELETE FROM fts_generation WHERE name = ?",
+                (f"bulk_load{self.table_suffix}",)
+            )
+            await self.db.commit()
+            self.write_generation = next_generation()
+
+        except Exception as e:
+            logger.error(f"Failed to finish keyword index bulk load: {e}")
+            raise
+
     async def index_chunk(self, chunk: CodeChunk) -> None:
         """
         Add a single chunk to the keyword index.
@@ -96,36 +782,11 @@ class KeywordIndexer:
         await self._ensure_initialized()
 
         try:
-            # Add to FTS5 table
-            await self.db.execute("""
-                INSERT INTO code_fts (chunk_id, content, filepath, name, language, chunk_type)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
-                chunk.id,
-                chunk.content,
-                chunk.filepath,
-                chunk.name,
-                chunk.language.value,
-                chunk.chunk_type.value
-            ))
+            # The FTS5 index is updated by triggers on the chunk table
+            await self.db.execute(self._insert_statement(), self._row(chunk))
+            await self._add_to_graph([chunk])
 
-            # Add to metadata table
-            await self.db.execute("""
-                INSERT OR REPLACE INTO chunk_metadata
-                (chunk_id, filepath, name, language, chunk_type, line_start, line_end, last_modified)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                chunk.id,
-                chunk.filepath,
-                chunk.name,
-                chunk.language.value,
-                chunk.chunk_type.value,
-                chunk.line_range[0],
-                chunk.line_range[1],
-                chunk.last_modified
-            ))
-
-            await self.db.commit()
+            await self._commit_rows(1)
 
         except Exception as e:
             logger.error(f"Failed to index chunk {chunk.id}: {e}")
@@ -147,48 +808,88 @@ class KeywordIndexer:
             return 0
 
         try:
-            # Batch insert into FTS5
-            await self.db.executemany("""
-                INSERT INTO code_fts (chunk_id, content, filepath, name, language, chunk_type)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, [
-                (
-                    chunk.id,
-                    chunk.content,
-                    chunk.filepath,
-                    chunk.name,
-                    chunk.language.value,
-                    chunk.chunk_type.value
-                )
-                for chunk in chunks
-            ])
+            # The FTS5 index is updated by triggers on the chunk table
+            await self.db.executemany(
+                self._insert_statement(), [self._row(chunk) for chunk in chunks]
+            )
+            await self._add_to_graph(chunks)
 
-            # Batch insert into metadata table
-            await self.db.executemany("""
-                INSERT OR REPLACE INTO chunk_metadata
-                (chunk_id, filepath, name, language, chunk_type, line_start, line_end, last_modified)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            await self._commit_rows(len(chunks))
+            logger.info(f"Indexed {len(chunks)} chunks in keyword index")
+            return len(chunks)
+
+        except Exception as e:
+            logger.error(f"Failed to batch index chunks: {e}")
+            return 0
+
+    async def _commit_rows(self, rows: int) -> None:
+        """Commit written chunks; in bulk-load mode only every _BULK_COMMIT_ROWS rows."""
+        if self._bulk_loading:
+            self._bulk_rows += rows
+            if self._bulk_rows < self._BULK_COMMIT_ROWS:
+                return
+            self._bulk_rows = 0
+
+        await self.db.commit()
+        self.write_generation = next_generation()
+
+    def _insert_statement(self) -> str:
+        """Statement adding (or replacing) a _row() in the chunk table."""
+        return f"""
+            INSERT OR REPLACE INTO {self.metadata_table}
+            (chunk_id, filepath, name, language, chunk_type, line_start, line_end,
+             last_modified, content, qualified_name, calls, imports)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """
+
+    @staticmethod
+    def _row(chunk: CodeChunk) -> Tuple:
+        """Chunk table row of a chunk."""
+        return (
+            chunk.id,
+            chunk.filepath,
+            chunk.name,
+            chunk.language.value,
+            chunk.chunk_type.value,
+            chunk.line_range[0],
+            chunk.line_range[1],
+            chunk.last_modified,
+            chunk.content,
+            chunk.qualified_name,
+            ' '.join(chunk.calls) or None,
+            ' '.join(chunk.imports) or None,
+        )
+
+    async def update_chunk_metadata(self, chunks: List[CodeChunk]) -> None:
+        """
+        Refresh stored metadata of already indexed chunks.
+
+        The FTS5 row is left alone; only line range and mtime can change
+        for a chunk whose content is unchanged.
+
+        Args:
+            chunks: Chunks already present in the index
+        """
+        await self._ensure_initialized()
+
+        if not chunks:
+            return
+
+        try:
+            await self.db.executemany(f"""
+                UPDATE {self.metadata_table}
+                SET line_start = ?, line_end = ?, last_modified = ?
+                WHERE chunk_id = ?
             """, [
-                (
-                    chunk.id,
-                    chunk.filepath,
-                    chunk.name,
-                    chunk.language.value,
-                    chunk.chunk_type.value,
-                    chunk.line_range[0],
-                    chunk.line_range[1],
-                    chunk.last_modified
-                )
+                (chunk.line_range[0], chunk.line_range[1], chunk.last_modified, chunk.id)
                 for chunk in chunks
             ])
 
             await self.db.commit()
-            logger.info(f"Indexed {len(chunks)} chunks in keyword index")
-            return len(chunks)
+            self.write_generation = next_generation()
 
         except Exception as e:
-            logger.error(f"Failed to batch index chunks: {e}")
-            return 0
+            logger.error(f"Failed to update chunk metadata: {e}")
 
     async def search(
         self,
@@ -209,34 +910,43 @@ class KeywordIndexer:
         """
         await self._ensure_initialized()
 
+        # Free text -> valid FTS5 expression (phrases, prefixes, identifier parts)
+        expression = compile_query(query)
+        if expression is None:
+            return []
+
         try:
-            # Build query
-            # FTS5 MATCH syntax: use quotes for phrases, OR/AND for boolean
-            # BM25 ranking is automatic with FTS5
-
-            if filter_language:
-                # Join with metadata table for filtering
-                cursor = await self.db.execute("""
-                    SELECT
-                        fts.chunk_id,
-                        fts.rank AS score
-                    FROM code_fts fts
-                    JOIN chunk_metadata meta ON fts.chunk_id = meta.chunk_id
-                    WHERE code_fts MATCH ?
-                    AND meta.language = ?
-                    ORDER BY rank
-                    LIMIT ?
-                """, (query, filter_language, limit))
-            else:
-                cursor = await self.db.execute("""
-                    SELECT chunk_id, rank AS score
-                    FROM code_fts
-                    WHERE code_fts MATCH ?
-                    ORDER BY rank
-                    LIMIT ?
-                """, (query, limit))
+            async with self._reader() as db:
+                # BM25 ranking is automatic with FTS5
+                if filter_language:
+                    # Join with metadata table for filtering
+                    cursor = await db.execute(f"""
+                        SELECT
+                            meta.chunk_id,
+                            fts.rank AS score
+                        FROM {self.fts_table} fts
+                        JOIN {self.metadata_table} meta ON meta.id = fts.rowid
+                        WHERE {self.fts_table} MATCH ?
+                        AND meta.language = ?
+                        ORDER BY rank
+                        LIMIT ?
+                    """, (expression, filter_language, limit))
+                else:
+                    # Rank inside FTS5 first, then look up IDs of the top hits
+                    cursor = await db.execute(f"""
+                        SELECT meta.chunk_id, hits.score
+                        FROM (
+                            SELECT rowid, rank AS score
+                            FROM {self.fts_table}
+                            WHERE {self.fts_table} MATCH ?
+                            ORDER BY rank
+                            LIMIT ?
+                        ) hits
+                        JOIN {self.metadata_table} meta ON meta.id = hits.rowid
+                        ORDER BY hits.score
+                    """, (expression, limit))
 
-            results = await cursor.fetchall()
+                results = await cursor.fetchall()
 
             # Convert rank (negative BM25 score) to positive scores
             # FTS5 rank is negative (lower is better), convert to positive
@@ -244,8 +954,782 @@ class KeywordIndexer:
 
         except Exception as e:
             logger.error(f"Keyword search failed: {e}")
+            self.search_failures += 1
+            return []
+
+    async def search_many(
+        self,
+        queries: List[str],
+        limit: int = 20,
+        filter_language: Optional[str] = None
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        BM25 keyword search for several queries in one round-trip.
+
+        The compiled queries are combined into a single UNION ALL
+        statement. If it fails as a whole, each query is retried on its own.
+
+        Args:
+            queries: Search queries
+            limit: Maximum results per query
+            filter_language: Optional language filter applied to every query
+
+        Returns:
+            One list of (chunk_id, bm25_score) tuples per query, in input order
+        """
+        await self._ensure_initialized()
+
+        if not queries:
+            return []
+
+        results: List[List[Tuple[str, float]]] = [[] for _ in queries]
+
+        for start in range(0, len(queries), self._QUERY_BATCH):
+            batch = queries[start:start + self._QUERY_BATCH]
+            selects = []
+            params: List = []
+
+            for i, query in enumerate(batch, start=start):
+                expression = compile_query(query)
+                if expression is None:
+                    continue
+
+                if filter_language:
+                    selects.append(f"""
+                        SELECT * FROM (
+                            SELECT ? AS q, meta.chunk_id, fts.rank AS score
+                            FROM {self.fts_table} fts
+                            JOIN {self.metadata_table} meta ON meta.id = fts.rowid
+                            WHERE {self.fts_table} MATCH ?
+                            AND meta.language = ?
+                            ORDER BY rank
+                            LIMIT ?
+                        )
+                    """)
+                    params.extend((i, expression, filter_language, limit))
+                else:
+                    selects.append(f"""
+                        SELECT hits.q, meta.chunk_id, hits.score FROM (
+                            SELECT ? AS q, rowid, rank AS score
+                            FROM {self.fts_table}
+                            WHERE {self.fts_table} MATCH ?
+                            ORDER BY rank
+                            LIMIT ?
+                        ) hits
+                        JOIN {self.metadata_table} meta ON meta.id = hits.rowid
+                    """)
+                    params.extend((i, expression, limit))
+
+            if not selects:
+                continue
+
+            try:
+                async with self._reader() as db:
+                    cursor = await db.execute(
+                        " UNION ALL ".join(selects) + " ORDER BY q, score",
+                        params
+                    )
+                    rows = await cursor.fetchall()
+
+                for i, chunk_id, score in rows:
+                    results[i].append((chunk_id, -score))
+
+            except Exception as e:
+                logger.debug(f"Batched keyword search failed, retrying per query: {e}")
+                for i, query in enumerate(batch, start=start):
+                    results[i] = await self.search(query, limit, filter_language)
+
+        return results
+
+    async def search_substring(
+        self,
+        text: str,
+        limit: int = 20,
+        filter_language: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find chunks containing a literal substring (case-sensitive).
+
+        Args:
+            text: Substring, e.g. "_id_to_" or ".then("
+            limit: Maximum results
+            filter_language: Optional language filter (e.g., "python")
+
+        Returns:
+            List of (chunk_id, occurrences) tuples, most occurrences first
+        """
+        if not text:
             return []
 
+        return await self._verified_search(
+            compile_substring(text),
+            lambda content: content.count(text),
+            limit,
+            filter_language,
+            substring=text
+        )
+
+    async def search_regex(
+        self,
+        pattern: str,
+        limit: int = 20,
+        filter_language: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Find chunks matching a regular expression.
+
+        Candidates are prefiltered with the trigram index using the
+        literals the regex requires; without any, every chunk is scanned.
+
+        Args:
+            pattern: Python regular expression
+            limit: Maximum results
+            filter_language: Optional language filter (e.g., "python")
+
+        Returns:
+            List of (chunk_id, matches) tuples, most matches first
+
+        Raises:
+            ValueError: If the pattern is not a valid regex
+        """
+        expression = compile_regex(pattern)
+        regex = re.compile(pattern)
+
+        return await self._verified_search(
+            expression,
+            lambda content: sum(1 for _ in regex.finditer(content)),
+            limit,
+            filter_language
+        )
+
+    async def _verified_search(
+        self,
+        expression: Optional[str],
+        count_matches: Callable[[str], int],
+        limit: int,
+        filter_language: Optional[str],
+        substring: Optional[str] = None
+    ) -> List[Tuple[str, float]]:
+        """
+        Verify trigram-index candidates against chunk content.
+
+        Args:
+            expression: Trigram MATCH expression, or None to scan all chunks
+            count_matches: Number of matches in a chunk's content
+            limit: Maximum results
+            filter_language: Optional language filter
+            substring: Literal to pre-check with instr() when scanning
+
+        Returns:
+            List of (chunk_id, matches) tuples, most matches first
+        """
+        if expression is not None:
+            sql = f"""
+                SELECT meta.chunk_id, meta.content
+                FROM {self.trigram_table} tri
+                JOIN {self.metadata_table} meta ON meta.id = tri.rowid
+                WHERE {self.trigram_table} MATCH ?
+            """
+            params: List = [expression]
+        else:
+            sql = f"SELECT chunk_id, content FROM {self.metadata_table} meta WHERE 1"
+            params = []
+            if substring is not None:
+                sql += " AND instr(meta.content, ?) > 0"
+                params.append(substring)
+
+        if filter_language:
+            sql += " AND meta.language = ?"
+            params.append(filter_language)
+
+        def verify(rows: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
+            hits = []
+            for chunk_id, content in rows:
+                count = count_matches(content or "")
+                if count:
+                    hits.append((chunk_id, float(count)))
+            return hits
+
+        results: List[Tuple[str, float]] = []
+
+        try:
+            async with self._reader() as db:
+                cursor = await db.execute(sql, params)
+                while len(results) < limit:
+                    rows = await cursor.fetchmany(self._VERIFY_BATCH)
+                    if not rows:
+                        break
+                    # Regexes can be slow; keep them off the event loop
+                    results.extend(await asyncio.to_thread(verify, rows))
+                await cursor.close()
+
+        except Exception as e:
+            logger.error(f"Pattern search failed: {e}")
+            self.search_failures += 1
+            return []
+
+        results.sort(key=lambda hit: hit[1], reverse=True)
+        return results[:limit]
+
+    async def lookup_symbol(
+        self,
+        symbol: str,
+        limit: int = 10,
+        filter_language: Optional[str] = None
+    ) -> List[SearchResult]:
+        """
+        Find the chunks defining a symbol.
+
+        Answered from B-tree indexes on the chunk table, without FTS5 or
+        ChromaDB: chunks named exactly `symbol` (e.g. "parse_file_cached")
+        or qualified as `symbol` (e.g. "UserService.get"), classes and
+        functions before methods and files.
+
+        Args:
+            symbol: Identifier or dotted qualified name (case-sensitive)
+            limit: Maximum results
+            filter_language: Language filter
+
+        Returns:
+            SearchResult per definition, with similarity 1.0
+        """
+        await self._ensure_initialized()
+
+        language_filter = "AND language = ?" if filter_language else ""
+        params = [symbol, symbol] + ([filter_language] if filter_language else []) + [limit]
+
+        try:
+            async with self._reader() as db:
+                cursor = await db.execute(f"""
+                    SELECT chunk_id, filepath, name, content, language, chunk_type,
+                           line_start, line_end
+                    FROM {self.metadata_table}
+                    WHERE (name = ? OR qualified_name = ?) {language_filter}
+                    ORDER BY CASE chunk_type
+                        WHEN 'class' THEN 0 WHEN 'function' THEN 1 WHEN 'method' THEN 2 ELSE 3
+                    END, filepath, line_start
+                    LIMIT ?
+                """, params)
+                rows = await cursor.fetchall()
+
+        except Exception as e:
+            logger.error(f"Symbol lookup failed for '{symbol}': {e}")
+            self.search_failures += 1
+            return []
+
+        return [
+            SearchResult(
+                chunk_id=chunk_id,
+                filepath=filepath or '',
+                name=name or '',
+                content=content or '',
+                similarity=1.0,
+                line_range=(line_start or 0, line_end or 0),
+                language=Language(language or 'unknown'),
+                chunk_type=ChunkType(chunk_type or 'file'),
+            )
+            for chunk_id, filepath, name, content, language, chunk_type, line_start, line_end
+            in rows
+        ]
+
+    async def get_graph(self) -> CodeGraph:
+        """
+        Get the import/call graph of the indexed chunks.
+
+        Built from the edge table once; after that, triggers report the
+        edges each write adds and removes (see _update_graph), and the
+        graph is patched with them in memory (see CodeGraph.updated). It
+        is rebuilt only once more than `_GRAPH_CHANGES` edges have changed.
+
+        Changes are reported as they are written, committed or not, like
+        the symbol index's; expansion skips chunks that are not committed.
+
+        Returns:
+            CodeGraph of the active generation
+        """
+        await self._ensure_initialized()
+
+        async with self._graph_build_lock:
+            table = self.graph_edges_table
+            changes = self._graph_changes.get(table)
+
+            if self._graph is not None and self._graph[0] == table and changes is not None:
+                graph = self._graph[1]
+                if not changes:
+                    return graph
+
+                if len(graph.changes) + len(changes) <= self._GRAPH_CHANGES:
+                    # Taken as a batch: edges written meanwhile stay reported
+                    edges = changes[:]
+                    del changes[:len(edges)]
+
+                    graph = await asyncio.to_thread(graph.updated, edges)
+                    self._graph = (table, graph)
+                    return graph
+
+            # Edges are read, and writes from then on reported, in one
+            # statement: no write can land in between to be counted twice
+            rows = await self.db.execute_fetchall(f"""
+                SELECT source, target, weight FROM {table}
+                UNION ALL
+                SELECT graph_tracked(?), NULL, NULL
+            """, (table,))
+            rows = [row for row in rows if row[1] is not None]
+
+            start = time.perf_counter()
+            graph = await asyncio.to_thread(
+                CodeGraph.build, self._reader, self.metadata_table, rows
+            )
+            logger.info(
+                f"Built code graph: {len(rows)} edges, {graph.nbytes // 1024}KB "
+                f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+            )
+
+            self._graph = (table, graph)
+            return graph
+
+    async def _add_to_graph(self, chunks: List[CodeChunk]) -> None:
+        """Store the references of written chunks and update the edges they affect."""
+        if self._bulk_loading:
+            # Resolved in one pass when the load finishes
+            return
+
+        chunks = list({chunk.id: chunk for chunk in chunks}.values())
+
+        # Replaced rows' references went with them (see _init_graph_triggers)
+        await self.db.executemany(f"""
+            INSERT INTO {self.graph_refs_table} (source, kind, name)
+            SELECT id, ?, ? FROM {self.metadata_table} WHERE chunk_id = ?
+        """, [
+            (kind, name, chunk.id)
+            for chunk in chunks
+            for kind, name in graph_references(
+                chunk.filepath,
+                chunk.language.value,
+                chunk.chunk_type.value,
+                ' '.join(chunk.calls),
+                ' '.join(chunk.imports),
+            )
+        ])
+
+        await self._update_graph(
+            {chunk.filepath for chunk in chunks},
+            [chunk.name for chunk in chunks if chunk.chunk_type.value in CALLABLE_TYPES]
+        )
+
+    async def _graph_keys(self, where: str, params: List) -> Tuple[Set[str], List[str]]:
+        """
+        Files and callable names of the chunks about to be deleted, for
+        _update_graph.
+
+        Args:
+            where: WHERE clause selecting the chunks
+            params: Its parameters
+
+        Returns:
+            (filepaths, names)
+        """
+        cursor = await self.db.execute(f"""
+            SELECT filepath, name, chunk_type FROM {self.metadata_table} WHERE {where}
+        """, params)
+        rows = await cursor.fetchall()
+
+        return (
+            {filepath for filepath, _, _ in rows},
+            [name for _, name, chunk_type in rows if chunk_type in CALLABLE_TYPES]
+        )
+
+    async def _update_graph(self, filepaths: Set[str], names: List[str]) -> None:
+        """
+        Re-resolve the edges a write may have changed: those of the chunks
+        in the written files, of the callers of names defined there and of
+        the importers of those files.
+
+        References to names (or modules) defined too often to link to both
+        before and after the write resolve to nothing either way, and are
+        skipped.
+
+        Args:
+            filepaths: Files chunks were written to or deleted from
+            names: Names of the callable chunks written or deleted
+        """
+        if self._bulk_loading:
+            # Resolved in one pass when the load finishes
+            return
+
+        callable_types = ','.join(f"'{chunk_type}'" for chunk_type in CALLABLE_TYPES)
+        called = await self._linkable(Counter(names), f"""
+            SELECT name, COUNT(*) FROM {self.metadata_table}
+            WHERE chunk_type IN ({callable_types}) AND name IN ({{}})
+            GROUP BY name
+        """)
+        imported = await self._linkable(
+            Counter(module for filepath in filepaths for module in python_module_names(filepath)),
+            f"""
+                SELECT name, COUNT(*) FROM {self.graph_refs_table}
+                WHERE kind = 'defines' AND name IN ({{}})
+                GROUP BY name
+            """
+        )
+
+        async with self._graph_lock:
+            await self.db.execute("DELETE FROM temp.graph_affected")
+
+            for select, values in (
+                (f"SELECT id FROM {self.metadata_table} WHERE filepath IN ({{}})", filepaths),
+                (f"SELECT source FROM {self.graph_refs_table} "
+                 f"WHERE kind = 'call' AND name IN ({{}})", called),
+                (f"SELECT source FROM {self.graph_refs_table} "
+                 f"WHERE kind = 'module' AND name IN ({{}})", imported),
+                (f"SELECT source FROM {self.graph_refs_table} "
+                 f"WHERE kind = 'path' AND name IN ({{}})", filepaths),
+            ):
+                values = list(values)
+                for i in range(0, len(values), self._UPDATE_BATCH):
+                    batch = values[i:i + self._UPDATE_BATCH]
+                    await self.db.execute(
+                        "INSERT OR IGNORE INTO temp.graph_affected "
+                        + select.format(','.join('?' * len(batch))),
+                        batch
+                    )
+
+            await self._resolve_graph()
+
+    async def _linkable(self, changed: Counter, count_query: str) -> List[str]:
+        """
+        Changed names that were or are defined at most MAX_CALL_TARGETS times.
+
+        Args:
+            changed: Definitions written or deleted, by name
+            count_query: (name, definitions) per name, with {} for the names
+
+        Returns:
+            Names whose references need resolving again
+        """
+        names = list(changed)
+        counts = {}
+        for i in range(0, len(names), self._UPDATE_BATCH):
+            batch = names[i:i + self._UPDATE_BATCH]
+            cursor = await self.db.execute(count_query.format(','.join('?' * len(batch))), batch)
+            counts.update(await cursor.fetchall())
+
+        return [name for name in names if counts.get(name, 0) - changed[name] <= MAX_CALL_TARGETS]
+
+    async def _resolve_graph(self, diff: bool = True) -> None:
+        """
+        Replace the edges of the chunks in temp.graph_affected (hold _graph_lock).
+
+        Edges are resolved into temp.graph_resolved and only the
+        difference is written, so edges a write leaves as they were are
+        neither rewritten nor reported to the code graph (see get_graph).
+
+        Args:
+            diff: False to insert straight into the edge table, when it
+                is empty and everything is resolved at once
+        """
+        metadata, refs = self.metadata_table, self.graph_refs_table
+        into = "temp.graph_resolved" if diff else self.graph_edges_table
+        callable_types = ','.join(f"'{chunk_type}'" for chunk_type in CALLABLE_TYPES)
+
+        # Joins run in the order written (CROSS JOIN), from the affected
+        # chunks out, so SQLite never scans all references or chunks
+
+        # contains: methods -> their class, other chunks -> their file
+        await self.db.execute(f"""
+            INSERT INTO {into} (source, target, weight)
+            SELECT id, parent, {CONTAINS_WEIGHT} FROM (
+                SELECT c.id, COALESCE(
+                    (SELECT k.id FROM {metadata} k
+                     WHERE c.chunk_type = 'method' AND k.filepath = c.filepath
+                     AND k.chunk_type = 'class'
+                     AND k.qualified_name = qualified_parent(c.qualified_name)),
+                    (SELECT f.id FROM {metadata} f
+                     WHERE f.filepath = c.filepath AND f.chunk_type = 'file')
+                ) AS parent
+                FROM temp.graph_affected a
+                CROSS JOIN {metadata} c ON c.id = a.id
+                WHERE c.chunk_type != 'file'
+            )
+            WHERE parent IS NOT NULL
+        """)
+
+        # call: same-file definitions win...
+        await self.db.execute(f"""
+            INSERT INTO {into} (source, target, weight)
+            SELECT r.source, d.id, {CALL_WEIGHT}
+            FROM temp.graph_affected a
+            CROSS JOIN {refs} r ON r.source = a.id AND r.kind = 'call'
+            CROSS JOIN {metadata} s ON s.id = r.source
+            CROSS JOIN {metadata} d ON d.filepath = s.filepath AND d.name = r.name
+            WHERE d.chunk_type IN ({callable_types}) AND d.id != r.source
+        """)
+
+        # ...otherwise every definition, unless there are too many. Names
+        # are counted once each, not once per reference
+        await self.db.execute(f"""
+            INSERT INTO temp.graph_linkable (name)
+            SELECT name FROM (
+                SELECT DISTINCT r.name
+                FROM temp.graph_affected a
+                CROSS JOIN {refs} r ON r.source = a.id AND r.kind = 'call'
+            ) AS called
+            WHERE (
+                SELECT COUNT(*) FROM (
+                    SELECT 1 FROM {metadata} c
+                    WHERE c.name = called.name AND c.chunk_type IN ({callable_types})
+                    LIMIT {MAX_CALL_TARGETS + 1}
+                )
+            ) BETWEEN 1 AND {MAX_CALL_TARGETS}
+        """)
+        await self.db.execute(f"""
+            INSERT INTO {into} (source, target, weight)
+            SELECT r.source, d.id, {CALL_WEIGHT}
+            FROM temp.graph_affected a
+            CROSS JOIN {refs} r ON r.source = a.id AND r.kind = 'call'
+            CROSS JOIN temp.graph_linkable n ON n.name = r.name
+            CROSS JOIN {metadata} s ON s.id = r.source
+            CROSS JOIN {metadata} d ON d.name = r.name
+            WHERE d.chunk_type IN ({callable_types})
+            AND NOT EXISTS (
+                SELECT 1 FROM {metadata} l
+                WHERE l.filepath = s.filepath AND l.name = r.name
+                AND l.chunk_type IN ({callable_types})
+            )
+        """)
+
+        # import: Python modules, unless defined by too many files...
+        await self.db.execute(f"""
+            INSERT INTO {into} (source, target, weight)
+            SELECT r.source, d.source, {IMPORT_WEIGHT}
+            FROM temp.graph_affected a
+            CROSS JOIN {refs} r ON r.source = a.id AND r.kind = 'module'
+            CROSS JOIN {refs} d ON d.kind = 'defines' AND d.name = r.name
+            WHERE d.source != r.source
+            AND (
+                SELECT COUNT(*) FROM (
+                    SELECT 1 FROM {refs} c
+                    WHERE c.kind = 'defines' AND c.name = r.name
+                    LIMIT {MAX_CALL_TARGETS + 1}
+                )
+            ) <= {MAX_CALL_TARGETS}
+        """)
+
+        # ...and relative imports
+        await self.db.execute(f"""
+            INSERT INTO {into} (source, target, weight)
+            SELECT r.source, f.id, {IMPORT_WEIGHT}
+            FROM temp.graph_affected a
+            CROSS JOIN {refs} r ON r.source = a.id AND r.kind = 'path'
+            CROSS JOIN {metadata} f ON f.filepath = r.name AND f.chunk_type = 'file'
+            WHERE f.id != r.source
+        """)
+
+        if diff:
+            await self._write_resolved_edges()
+
+        await self.db.execute("DELETE FROM temp.graph_affected")
+        await self.db.execute("DELETE FROM temp.graph_linkable")
+
+    async def _write_resolved_edges(self) -> None:
+        """Make the stored edges of the affected chunks those in temp.graph_resolved."""
+        edges = self.graph_edges_table
+        same_edge = (
+            "{0}.source = {1}.source AND {0}.target = {1}.target AND {0}.weight = {1}.weight"
+        )
+
+        # Edges now resolved a different number of times (almost always:
+        # no longer resolved) are dropped, then every missing one inserted
+        await self.db.execute(f"""
+            DELETE FROM {edges} WHERE rowid IN (
+                SELECT e.rowid
+                FROM temp.graph_affected a
+                CROSS JOIN {edges} e ON e.source = a.id
+                WHERE (
+                    SELECT COUNT(*) FROM temp.graph_resolved r WHERE {same_edge.format('r', 'e')}
+                ) != (
+                    SELECT COUNT(*) FROM {edges} k WHERE {same_edge.format('k', 'e')}
+                )
+            )
+        """)
+        await self.db.execute(f"""
+            INSERT INTO {edges} (source, target, weight)
+            SELECT r.source, r.target, r.weight FROM temp.graph_resolved r
+            WHERE NOT EXISTS (SELECT 1 FROM {edges} e WHERE {same_edge.format('e', 'r')})
+        """)
+        await self.db.execute("DELETE FROM temp.graph_resolved")
+
+    async def _rebuild_graph(self) -> None:
+        """Store every chunk's references and resolve all edges in one pass."""
+        start = time.perf_counter()
+
+        # Indexes are built once the rows are in, as in bulk_load(); the
+        # reference indexes before resolving, which looks references up.
+        # Nothing is reported either: the in-memory graph is rebuilt
+        for index, _, _ in self._graph_index_columns():
+            await self.db.execute(f"DROP INDEX IF EXISTS {index}")
+        for trigger in ("edge_insert", "edge_delete"):
+            await self.db.execute(f"DROP TRIGGER IF EXISTS temp.{self.graph_edges_table}_{trigger}")
+        await self.db.execute(f"DELETE FROM {self.graph_refs_table}")
+        await self.db.execute(f"DELETE FROM {self.graph_edges_table}")
+
+        cursor = await self.db.execute(f"""
+            SELECT id, filepath, language, chunk_type, calls, imports FROM {self.metadata_table}
+        """)
+        await self.db.executemany(f"""
+            INSERT INTO {self.graph_refs_table} (source, kind, name) VALUES (?, ?, ?)
+        """, [
+            (chunk, kind, name)
+            for chunk, filepath, language, chunk_type, calls, imports in await cursor.fetchall()
+            for kind, name in graph_references(filepath or '', language, chunk_type, calls, imports)
+        ])
+        await self._create_graph_indexes(self.graph_refs_table)
+
+        async with self._graph_lock:
+            await self.db.execute("DELETE FROM temp.graph_affected")
+            await self.db.execute(f"""
+                INSERT INTO temp.graph_affected SELECT id FROM {self.metadata_table}
+            """)
+            await self._resolve_graph(diff=False)
+        await self._create_graph_indexes(self.graph_edges_table)
+        await self._init_edge_triggers()
+        self._graph_changes.pop(self.graph_edges_table, None)
+
+        cursor = await self.db.execute(f"SELECT COUNT(*) FROM {self.graph_edges_table}")
+        logger.info(
+            f"Resolved code graph{self.table_suffix}: {(await cursor.fetchone())[0]} edges "
+            f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+        )
+
+    async def get_symbol_index(self) -> SymbolIndex:
+        """
+        Get the trigram index of chunk names and qualified names.
+
+        Built from the chunk table once; after that, triggers report the
+        chunks each write changes and the index is patched with just
+        those (see SymbolIndex.updated). It is rebuilt only once more
+        than `_SYMBOL_CHANGES` chunks have changed.
+
+        Chunks are read on the write connection, which sees every write
+        the triggers have reported, committed or not; search_symbols()
+        skips chunks that are not committed.
+
+        Returns:
+            SymbolIndex of the active generation
+        """
+        await self._ensure_initialized()
+
+        async with self._symbols_lock:
+            table = self.metadata_table
+            changes = self._symbol_changes.get(table)
+
+            if self._symbols is not None and self._symbols[0] == table and changes is not None:
+                symbols = self._symbols[1]
+                if not changes:
+                    return symbols
+
+                if len(symbols.changes) + len(changes) <= self._SYMBOL_CHANGES:
+                    # Taken before the rows are read: chunks written
+                    # meanwhile are reported again
+                    rowids = list(changes)
+                    changes.difference_update(rowids)
+
+                    current: Dict[int, Optional[SymbolRow]] = dict.fromkeys(rowids)
+                    for i in range(0, len(rowids), self._UPDATE_BATCH):
+                        batch = rowids[i:i + self._UPDATE_BATCH]
+                        cursor = await self.db.execute(f"""
+                            SELECT id, name, qualified_name, language FROM {table}
+                            WHERE id IN ({','.join('?' * len(batch))})
+                        """, batch)
+                        current.update((row[0], row) for row in await cursor.fetchall())
+
+                    symbols = await asyncio.to_thread(symbols.updated, current)
+                    self._symbols = (table, symbols)
+                    return symbols
+
+            # Writes from here on are reported
+            self._symbol_changes[table] = set()
+
+            cursor = await self.db.execute(f"""
+                SELECT id, name, qualified_name, language FROM {table}
+            """)
+            rows = await cursor.fetchall()
+
+            start = time.perf_counter()
+            symbols = await asyncio.to_thread(SymbolIndex.build, rows)
+            logger.info(
+                f"Built symbol index: {len(symbols)} names, {symbols.nbytes // 1024}KB "
+                f"in {(time.perf_counter() - start) * 1000:.0f}ms"
+            )
+
+            self._symbols = (table, symbols)
+            return symbols
+
+    async def search_symbols(
+        self,
+        query: str,
+        limit: int = 20,
+        filter_language: Optional[str] = None,
+        max_distance: Optional[int] = None
+    ) -> List[SearchResult]:
+        """
+        Find chunks by symbol name, tolerating typos and incomplete names.
+
+        Names and qualified names match case-insensitively, as a whole or
+        by prefix, within an edit distance that grows with the query
+        (see SymbolIndex.search), so "hybridsearch" finds HybridSearcher
+        and "CodebaseIndxer" finds CodebaseIndexer.
+
+        Args:
+            query: Symbol name as typed
+            limit: Maximum results
+            filter_language: Language filter
+            max_distance: Edit budget (default: by query length)
+
+        Returns:
+            SearchResult per chunk, best first, with the matched
+            'qualified_name' and edit 'distance' in metadata
+        """
+        try:
+            symbols = await self.get_symbol_index()
+            matches = symbols.search(query, limit, max_distance, filter_language)
+            if not matches:
+                return []
+
+            async with self._reader() as db:
+                cursor = await db.execute(f"""
+                    SELECT id, chunk_id, filepath, name, qualified_name, content, language,
+                           chunk_type, line_start, line_end
+                    FROM {self.metadata_table}
+                    WHERE id IN ({','.join('?' * len(matches))})
+                """, [rowid for rowid, _, _ in matches])
+                rows = {row[0]: row[1:] for row in await cursor.fetchall()}
+
+        except Exception as e:
+            logger.error(f"Symbol search failed for '{query}': {e}")
+            self.search_failures += 1
+            return []
+
+        results = []
+        for rowid, distance, whole in matches:
+            row = rows.get(rowid)
+            if row is None:
+                continue
+            (chunk_id, filepath, name, qualified_name, content, language,
+             chunk_type, line_start, line_end) = row
+            results.append(SearchResult(
+                chunk_id=chunk_id,
+                filepath=filepath or '',
+                name=name or '',
+                content=content or '',
+                similarity=SymbolIndex.similarity(distance, whole),
+                line_range=(line_start or 0, line_end or 0),
+                language=Language(language or 'unknown'),
+                chunk_type=ChunkType(chunk_type or 'file'),
+                metadata={'qualified_name': qualified_name or '', 'distance': distance},
+            ))
+
+        return results
+
     async def delete_file(self, filepath: str) -> None:
         """
         Delete all chunks for a file.
@@ -256,42 +1740,60 @@ class KeywordIndexer:
         await self._ensure_initialized()
 
         try:
-            # Get chunk IDs for this file
-            cursor = await self.db.execute("""
-                SELECT chunk_id FROM chunk_metadata
+            filepaths, names = await self._graph_keys("filepath = ?", [filepath])
+
+            # Triggers remove the chunks from the FTS5 index and the graph
+            cursor = await self.db.execute(f"""
+                DELETE FROM {self.metadata_table}
                 WHERE filepath = ?
             """, (filepath,))
+            await self._update_graph(filepaths, names)
+
+            await self.db.commit()
+            self.write_generation = next_generation()
+            if cursor.rowcount:
+                logger.debug(f"Deleted {cursor.rowcount} chunks for {filepath}")
 
-            chunk_ids = [row[0] for row in await cursor.fetchall()]
+        except Exception as e:
+            logger.error(f"Failed to delete file {filepath}: {e}")
 
-            if chunk_ids:
-                # Delete from FTS5 table
-                placeholders = ','.join('?' * len(chunk_ids))
-                await self.db.execute(f"""
-                    DELETE FROM code_fts
-                    WHERE chunk_id IN ({placeholders})
-                """, chunk_ids)
+    async def delete_chunks(self, chunk_ids: List[str]) -> None:
+        """
+        Delete chunks by ID.
 
-                # Delete from metadata table
-                await self.db.execute("""
-                    DELETE FROM chunk_metadata
-                    WHERE filepath = ?
-                """, (filepath,))
+        Args:
+            chunk_ids: IDs of chunks to delete
+        """
+        await self._ensure_initialized()
+
+        if not chunk_ids:
+            return
+
+        try:
+            placeholders = ','.join('?' * len(chunk_ids))
+            filepaths, names = await self._graph_keys(f"chunk_id IN ({placeholders})", chunk_ids)
 
-                await self.db.commit()
-                logger.debug(f"Deleted {len(chunk_ids)} chunks for {filepath}")
+            await self.db.execute(f"""
+                DELETE FROM {self.metadata_table}
+                WHERE chunk_id IN ({placeholders})
+            """, chunk_ids)
+            await self._update_graph(filepaths, names)
+
+            await self.db.commit()
+            self.write_generation = next_generation()
+            logger.debug(f"Deleted {len(chunk_ids)} chunks from keyword index")
 
         except Exception as e:
-            logger.error(f"Failed to delete file {filepath}: {e}")
+            logger.error(f"Failed to delete chunks: {e}")
 
     async def clear_index(self) -> None:
         """Clear all indexed data."""
         await self._ensure_initialized()
 
         try:
-            await self.db.execute("DELETE FROM code_fts")
-            await self.db.execute("DELETE FROM chunk_metadata")
+            await self.db.execute(f"DELETE FROM {self.metadata_table}")
             await self.db.commit()
+            self.write_generation = next_generation()
             logger.info("Cleared keyword index")
 
         except Exception as e:
@@ -310,21 +1812,16 @@ class KeywordIndexer:
         await self._ensure_initialized()
 
         try:
-            # Count total chunks
-            cursor = await self.db.execute("""
-                SELECT COUNT(*) FROM chunk_metadata
-            """)
-            total_chunks = (await cursor.fetchone())[0]
-
-            # Count unique files
-            cursor = await self.db.execute("""
-                SELECT COUNT(DISTINCT filepath) FROM chunk_metadata
-            """)
-            total_files = (await cursor.fetchone())[0]
+            # Counters are maintained by triggers on chunk_metadata
+            async with self._reader() as db:
+                cursor = await db.execute(f"""
+                    SELECT key, count FROM {self.stats_table}
+                """)
+                counts = dict(await cursor.fetchall())
 
             return {
-                'total_chunks': total_chunks,
-                'total_files': total_files,
+                'total_chunks': counts.get('chunks', 0),
+                'total_files': counts.get('files', 0),
             }
 
         except Exception as e:
@@ -334,8 +1831,96 @@ class KeywordIndexer:
                 'total_files': 0,
             }
 
+    async def create_shadow(self) -> "KeywordIndexer":
+        """
+        Create an empty next generation of tables, for a full rebuild.
+
+        The shadow shares this indexer's connection; index into it, then
+        make it live with swap_shadow(). Searches through this indexer keep
+        using the current tables until then.
+
+        Returns:
+            KeywordIndexer bound to the new tables
+        """
+        await self._ensure_initialized()
+
+        generation = int(self.table_suffix[2:]) + 1 if self.table_suffix else 1
+        suffix = f"_g{generation}"
+
+        # Leftovers of an interrupted rebuild
+        await self.drop_generation(suffix)
+
+        shadow = copy.copy(self)
+        shadow._owns_db = False
+        shadow._set_suffix(suffix)
+        shadow.write_generation = next_generation()
+        await shadow._create_tables()
+        await self.db.commit()
+
+        return shadow
+
+    async def swap_shadow(self, shadow: "KeywordIndexer") -> str:
+        """
+        Atomically make a shadow's tables the active generation.
+
+        Args:
+            shadow: Indexer returned by create_shadow()
+
+        Returns:
+            Suffix of the previous generation (pass to drop_generation)
+        """
+        await self._ensure_initialized()
+
+        await self.db.execute("""
+            INSERT OR REPLACE INTO fts_generation (name, suffix) VALUES ('active', ?)
+        """, (shadow.table_suffix,))
+        await self.db.commit()
+
+        old_suffix = self.table_suffix
+        self._set_suffix(shadow.table_suffix)
+        self.write_generation = next_generation()
+        logger.info(f"Keyword index switched to generation '{self.table_suffix}'")
+        return old_suffix
+
+    async def drop_generation(self, suffix: str) -> None:
+        """
+        Drop the tables of an inactive generation.
+
+        Args:
+            suffix: Generation suffix returned by swap_shadow()
+        """
+        await self._ensure_initialized()
+
+        if suffix == self.table_suffix:
+            raise ValueError("Cannot drop the active keyword index generation")
+
+        try:
+            # Triggers and indexes are dropped with their tables
+            await self.db.execute(f"DROP VIEW IF EXISTS code_fts_source{suffix}")
+            for table in (
+                f"code_fts{suffix}", f"code_trigram{suffix}",
+                f"chunk_metadata{suffix}", f"index_stats{suffix}",
+                f"code_graph_refs{suffix}", f"code_graph_edges{suffix}",
+            ):
+                await self.db.execute(f"DROP TABLE IF EXISTS {table}")
+            await self.db.commit()
+            self._symbol_changes.pop(f"chunk_metadata{suffix}", None)
+            self._graph_changes.pop(f"code_graph_edges{suffix}", None)
+
+        except Exception as e:
+            logger.error(f"Failed to drop keyword index generation '{suffix}': {e}")
+
     async def close(self) -> None:
         """Close database connection."""
+        if not self._owns_db:
+            # Shadows share the connection of the indexer that created them
+            return
+
+        for db in self._readers:
+            await db.close()
+        self._readers.clear()
+        self._idle_readers = asyncio.Queue()
+
         if self.db:
             await self.db.close()
             self.db = None
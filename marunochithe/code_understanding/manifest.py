@@ -0,0 +1,381 @@
+"""Persistent content-hash manifest of indexed files."""
+
+import hashlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import aiosqlite
+from loguru import logger
+
+from .models import CodeChunk
+
+
+@dataclass
+class FileEntry:
+    """Manifest record for one indexed file."""
+    filepath: str
+    size: int
+    mtime: float
+    content_hash: str
+
+
+def hash_file(filepath: str) -> str:
+    """Return the sha256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class IndexManifest:
+    """
+    On-disk manifest of path -> (size, mtime, content hash, chunk IDs).
+
+    Lets re-indexing skip unchanged files and remove the exact chunks
+    that belonged to changed or deleted files.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize IndexManifest.
+
+        Args:
+            db_path: Path to the SQLite manifest database
+        """
+        self.db_path = db_path
+
+        # Create parent directory
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+
+        self.db = None
+        self._initialized = False
+
+    async def _ensure_initialized(self) -> None:
+        """Ensure database is initialized."""
+        if self._initialized:
+            return
+
+        await self._init_db()
+        self._initialized = True
+
+    async def _init_db(self) -> None:
+        """Initialize manifest schema."""
+        try:
+            self.db = await aiosqlite.connect(self.db_path)
+
+            # The manifest is a rebuildable cache; skip per-commit fsync
+            await self.db.execute("PRAGMA journal_mode=WAL")
+            await self.db.execute("PRAGMA synchronous=NORMAL")
+
+            # Fire delete triggers for rows removed by INSERT OR REPLACE
+            await self.db.execute("PRAGMA recursive_triggers=ON")
+
+            await self.db.execute("""
+                CREATE TABLE IF NOT EXISTS files (
+                    filepath TEXT PRIMARY KEY,
+                    size INTEGER,
+                    mtime REAL,
+                    content_hash TEXT
+                )
+            """)
+
+            await self.db.execute("""
+                CREATE TABLE IF NOT EXISTS chunks (
+                    chunk_id TEXT PRIMARY KEY,
+                    filepath TEXT,
+                    language TEXT,
+                    chunk_type TEXT
+                )
+            """)
+
+            await self.db.execute("""
+                CREATE INDEX IF NOT EXISTS idx_chunks_filepath
+                ON chunks(filepath)
+            """)
+
+            await self._init_stats()
+
+            await self.db.commit()
+            logger.debug(f"Initialized index manifest at {self.db_path}")
+
+        except Exception as e:
+            logger.error(f"Failed to initialize index manifest: {e}")
+            raise
+
+    async def _init_stats(self) -> None:
+        """
+        Create the aggregate counters table and the triggers that keep it
+        in sync with the chunks table, inside the same transaction.
+        """
+        cursor = await self.db.execute("""
+            SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'stats'
+        """)
+        exists = await cursor.fetchone() is not None
+
+        # kind is 'total' (key 'chunks' or 'files'), 'language' or 'chunk_type'
+        await self.db.execute("""
+            CREATE TABLE IF NOT EXISTS stats (
+                kind TEXT,
+                key TEXT,
+                count INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (kind, key)
+            ) WITHOUT ROWID
+        """)
+
+        await self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS chunks_stats_insert
+            AFTER INSERT ON chunks
+            BEGIN
+                INSERT INTO stats (kind, key, count) VALUES ('total', 'chunks', 1)
+                    ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+                INSERT INTO stats (kind, key, count) VALUES ('language', NEW.language, 1)
+                    ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+                INSERT INTO stats (kind, key, count) VALUES ('chunk_type', NEW.chunk_type, 1)
+                    ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+                INSERT INTO stats (kind, key, count)
+                    SELECT 'total', 'files', 1
+                    WHERE (SELECT COUNT(*) FROM chunks WHERE filepath = NEW.filepath) = 1
+                    ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+            END
+        """)
+
+        await self.db.execute("""
+            CREATE TRIGGER IF NOT EXISTS chunks_stats_delete
+            AFTER DELETE ON chunks
+            BEGIN
+                UPDATE stats SET count = count - 1
+                    WHERE (kind = 'total' AND key = 'chunks')
+                    OR (kind = 'language' AND key = OLD.language)
+                    OR (kind = 'chunk_type' AND key = OLD.chunk_type);
+                UPDATE stats SET count = count - 1
+                    WHERE kind = 'total' AND key = 'files'
+                    AND NOT EXISTS (SELECT 1 FROM chunks WHERE filepath = OLD.filepath);
+            END
+        """)
+
+        if not exists:
+            # Manifest created before counters existed: backfill once
+            await self.db.execute("""
+                INSERT INTO stats (kind, key, count)
+                SELECT 'total', 'chunks', COUNT(*) FROM chunks
+                UNION ALL
+                SELECT 'total', 'files', COUNT(DISTINCT filepath) FROM chunks
+                UNION ALL
+                SELECT 'language', language, COUNT(*) FROM chunks GROUP BY language
+                UNION ALL
+                SELECT 'chunk_type', chunk_type, COUNT(*) FROM chunks GROUP BY chunk_type
+            """)
+
+    async def get_stats(self) -> Dict:
+        """
+        Get aggregate counts of indexed chunks.
+
+        Reads the counters table, so the cost does not grow with the index.
+
+        Returns:
+            {
+                'total_chunks': int,
+                'total_files': int,
+                'languages': {'python': 150, 'javascript': 80},
+                'chunk_types': {'file': 100, 'class': 50, 'method': 200},
+            }
+        """
+        await self._ensure_initialized()
+
+        cursor = await self.db.execute("""
+            SELECT kind, key, count FROM stats WHERE count > 0
+        """)
+
+        stats = {
+            'total_chunks': 0,
+            'total_files': 0,
+            'languages': {},
+            'chunk_types': {},
+        }
+        for kind, key, count in await cursor.fetchall():
+            if kind == 'total':
+                stats[f'total_{key}'] = count
+            elif kind == 'language':
+                stats['languages'][key] = count
+            elif kind == 'chunk_type':
+                stats['chunk_types'][key] = count
+
+        return stats
+
+    async def load_files(self) -> Dict[str, FileEntry]:
+        """
+        Load all file entries.
+
+        Returns:
+            Mapping of filepath to FileEntry
+        """
+        await self._ensure_initialized()
+
+        cursor = await self.db.execute("""
+            SELECT filepath, size, mtime, content_hash FROM files
+        """)
+
+        return {
+            row[0]: FileEntry(filepath=row[0], size=row[1], mtime=row[2], content_hash=row[3])
+            for row in await cursor.fetchall()
+        }
+
+    async def get_file(self, filepath: str) -> Optional[FileEntry]:
+        """
+        Get the entry for a single file.
+
+        Args:
+            filepath: Path to file
+
+        Returns:
+            FileEntry, or None if the file is not in the manifest
+        """
+        await self._ensure_initialized()
+
+        cursor = await self.db.execute("""
+            SELECT filepath, size, mtime, content_hash FROM files
+            WHERE filepath = ?
+        """, (filepath,))
+        row = await cursor.fetchone()
+
+        if row is None:
+            return None
+        return FileEntry(filepath=row[0], size=row[1], mtime=row[2], content_hash=row[3])
+
+    async def get_chunk_ids(self, filepath: str) -> List[str]:
+        """
+        Get IDs of chunks recorded for a file.
+
+        Args:
+            filepath: Path to file
+
+        Returns:
+            List of chunk IDs
+        """
+        await self._ensure_initialized()
+
+        cursor = await self.db.execute("""
+            SELECT chunk_id FROM chunks
+            WHERE filepath = ?
+        """, (filepath,))
+
+        return [row[0] for row in await cursor.fetchall()]
+
+    async def record_file(
+        self,
+        entry: FileEntry,
+        chunks: List[CodeChunk]
+    ) -> None:
+        """
+        Record a file and replace its chunk list.
+
+        Args:
+            entry: File stat and hash
+            chunks: Chunks now indexed for the file
+        """
+        await self._ensure_initialized()
+
+        await self.db.execute("""
+            INSERT OR REPLACE INTO files (filepath, size, mtime, content_hash)
+            VALUES (?, ?, ?, ?)
+        """, (entry.filepath, entry.size, entry.mtime, entry.content_hash))
+
+        await self.db.execute("""
+            DELETE FROM chunks WHERE filepath = ?
+        """, (entry.filepath,))
+
+        await self.db.executemany("""
+            INSERT OR REPLACE INTO chunks (chunk_id, filepath, language, chunk_type)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (chunk.id, chunk.filepath, chunk.language.value, chunk.chunk_type.value)
+            for chunk in chunks
+        ])
+
+        await self.db.commit()
+
+    async def record_files(
+        self,
+        files: List[Tuple[FileEntry, List[CodeChunk]]]
+    ) -> None:
+        """
+        Record many files in one transaction (bulk loads).
+
+        Args:
+            files: (file stat and hash, chunks indexed for it) pairs
+        """
+        await self._ensure_initialized()
+
+        await self.db.executemany("""
+            INSERT OR REPLACE INTO files (filepath, size, mtime, content_hash)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (entry.filepath, entry.size, entry.mtime, entry.content_hash)
+            for entry, _chunks in files
+        ])
+
+        await self.db.executemany("""
+            DELETE FROM chunks WHERE filepath = ?
+        """, [(entry.filepath,) for entry, _chunks in files])
+
+        await self.db.executemany("""
+            INSERT OR REPLACE INTO chunks (chunk_id, filepath, language, chunk_type)
+            VALUES (?, ?, ?, ?)
+        """, [
+            (chunk.id, chunk.filepath, chunk.language.value, chunk.chunk_type.value)
+            for _entry, chunks in files
+            for chunk in chunks
+        ])
+
+        await self.db.commit()
+
+    async def touch_file(self, entry: FileEntry) -> None:
+        """
+        Update size/mtime for a file whose content hash is unchanged.
+
+        Args:
+            entry: File stat and hash
+        """
+        await self._ensure_initialized()
+
+        await self.db.execute("""
+            UPDATE files SET size = ?, mtime = ?
+            WHERE filepath = ?
+        """, (entry.size, entry.mtime, entry.filepath))
+
+        await self.db.commit()
+
+    async def remove_file(self, filepath: str) -> List[str]:
+        """
+        Remove a file from the manifest.
+
+        Args:
+            filepath: Path to file
+
+        Returns:
+            IDs of the chunks that were recorded for the file
+        """
+        chunk_ids = await self.get_chunk_ids(filepath)
+
+        await self.db.execute("DELETE FROM chunks WHERE filepath = ?", (filepath,))
+        await self.db.execute("DELETE FROM files WHERE filepath = ?", (filepath,))
+        await self.db.commit()
+
+        return chunk_ids
+
+    async def clear(self) -> None:
+        """Remove all entries."""
+        await self._ensure_initialized()
+
+        await self.db.execute("DELETE FROM chunks")
+        await self.db.execute("DELETE FROM files")
+        await self.db.commit()
+
+    async def close(self) -> None:
+        """Close database connection."""
+        if self.db:
+            await self.db.close()
+            self.db = None
+            self._initialized = False
@@ -0,0 +1,334 @@
+"""
+Memory-mapped on-disk vector store with int8/binary quantization.
+
+Full-precision vectors live in a memory-mapped file, so the OS page cache
+decides what stays resident. Queries scan compact quantized codes (4x
+smaller for int8, 32x for binary) to pick candidates, then rescore only
+those candidates against the full-precision rows.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+from loguru import logger
+
+from .exact_search import ExactVectorIndex, top_k
+
+
+# Bits set in each byte value, for Hamming distance on packed codes
+_POPCOUNT = np.array([bin(i).count('1') for i in range(256)], dtype=np.uint8)
+
+# Candidates rescored per requested result
+DEFAULT_RESCORE_FACTOR = {"none": 1, "int8": 4, "binary": 16}
+
+
+class MmapVectorIndex(ExactVectorIndex):
+    """
+    ExactVectorIndex whose storage is a set of memory-mapped files.
+
+    Files in `directory`:
+    - vectors.f32: unit-normalized float32 rows
+    - codes.bin: int8 codes or packed sign bits (when quantized)
+    - scales.f32: per-row int8 scale
+    - index.json: row -> chunk ID mapping, written by flush(); removed
+      on the first change after a flush, so a crash leaves no stale header
+    """
+
+    _FORMAT_VERSION = 1
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        quantization: str = "int8",
+        rescore_factor: Optional[int] = None,
+        block_size: int = 16384
+    ):
+        """
+        Initialize MmapVectorIndex.
+
+        Args:
+            directory: Directory holding the store's files
+            quantization: "none", "int8" or "binary"
+            rescore_factor: Candidates rescored per result (default: 4
+                for int8, 16 for binary)
+            block_size: Rows scanned per step (codes are widened to
+                float32 one block at a time, so this bounds query memory)
+        """
+        if quantization not in DEFAULT_RESCORE_FACTOR:
+            raise ValueError(f"Unsupported quantization: {quantization}")
+
+        super().__init__(dtype="float32", block_size=block_size)
+
+        self.directory = Path(directory)
+        self.quantization = quantization
+        self.rescore_factor = rescore_factor or DEFAULT_RESCORE_FACTOR[quantization]
+
+        self._codes = None
+        self._scales = None
+        self._capacity = 0
+        self._clean = False
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes scanned by every query (the part that stays resident)."""
+        if self.quantization == "none":
+            return super().nbytes
+
+        code_bytes = len(self) * self._code_width(self.dim)
+        if self.quantization == "int8":
+            code_bytes += len(self) * 4
+        return code_bytes
+
+    @property
+    def disk_bytes(self) -> int:
+        """Bytes of live rows across the store's files."""
+        full = len(self) * self.dim * 4
+        if self.quantization == "none":
+            return full
+        return full + self.nbytes
+
+    def open(self, meta: Optional[Dict] = None) -> bool:
+        """
+        Load a previously flushed store.
+
+        Args:
+            meta: Values that must match those passed to flush() (e.g.
+                the embedding model)
+
+        Returns:
+            True if the store was loaded, False if it is missing or stale
+        """
+        header_path = self.directory / "index.json"
+
+        try:
+            header = json.loads(header_path.read_text())
+        except (OSError, ValueError):
+            return False
+
+        if (
+            header.get('version') != self._FORMAT_VERSION
+            or header.get('quantization') != self.quantization
+            or header.get('meta') != (meta or {})
+        ):
+            return False
+
+        with self._lock:
+            try:
+                self._open_files(header['capacity'], header['dim'], mode='r+')
+            except (OSError, ValueError) as e:
+                logger.warning(f"Failed to open vector store {self.directory}: {e}")
+                self._close_files()
+                return False
+
+            self._ids = list(header['ids'])
+            self._rows = {chunk_id: row for row, chunk_id in enumerate(self._ids)}
+            self._clean = True
+
+        return True
+
+    def flush(self, meta: Optional[Dict] = None) -> None:
+        """
+        Write dirty pages and the row -> ID header to disk.
+
+        Args:
+            meta: Values checked by open()
+        """
+        with self._lock:
+            if self._matrix is None:
+                return
+
+            for array in (self._matrix, self._codes, self._scales):
+                if array is not None:
+                    array.flush()
+
+            header = {
+                'version': self._FORMAT_VERSION,
+                'quantization': self.quantization,
+                'dim': self.dim,
+                'capacity': self._capacity,
+                'meta': meta or {},
+                'ids': self._ids,
+            }
+
+            tmp_path = self.directory / "index.json.tmp"
+            tmp_path.write_text(json.dumps(header))
+            os.replace(tmp_path, self.directory / "index.json")
+            self._clean = True
+
+    def clear(self) -> None:
+        """Remove all vectors and delete the store's files."""
+        with self._lock:
+            self._close_files()
+            super().clear()
+
+            for name in ("index.json", "vectors.f32", "codes.bin", "scales.f32"):
+                try:
+                    (self.directory / name).unlink()
+                except FileNotFoundError:
+                    pass
+
+    def close(self) -> None:
+        """Release the memory maps (call flush() first to keep the store)."""
+        with self._lock:
+            self._close_files()
+
+    def _search_rows(
+        self,
+        queries: np.ndarray,
+        size: int,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Scan quantized codes for candidates, then rescore at full precision."""
+        if self.quantization == "none":
+            return super()._search_rows(queries, size, k)
+
+        candidates = min(size, k * self.rescore_factor)
+        _, candidate_rows = self._scan_codes(queries, size, candidates)
+
+        best_scores = np.empty((len(queries), k), dtype=np.float32)
+        best_rows = np.empty((len(queries), k), dtype=np.int64)
+
+        for i, (query, rows) in enumerate(zip(queries, candidate_rows)):
+            # Sorted rows keep reads from the mapped file sequential
+            rows = np.sort(rows)
+            scores = self._matrix[rows] @ query
+            scores, rows = top_k(scores[None, :], rows[None, :], k)
+            best_scores[i], best_rows[i] = scores[0], rows[0]
+
+        return best_scores, best_rows
+
+    def _scan_codes(
+        self,
+        queries: np.ndarray,
+        size: int,
+        k: int
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Approximate top-k over the quantized codes."""
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+
+        if self.quantization == "binary":
+            query_codes = np.packbits(queries > 0, axis=1)
+
+        for start in range(0, size, self.block_size):
+            end = min(start + self.block_size, size)
+            codes = self._codes[start:end]
+
+            if self.quantization == "int8":
+                scores = (queries @ codes.astype(np.float32).T) * self._scales[start:end]
+            else:
+                # Fewer differing sign bits = more similar
+                scores = np.stack([
+                    -_POPCOUNT[np.bitwise_xor(codes, query_code)].sum(axis=1, dtype=np.float32)
+                    for query_code in query_codes
+                ])
+
+            rows = np.broadcast_to(np.arange(start, end), scores.shape)
+            scores = np.concatenate([best_scores, scores], axis=1)
+            rows = np.concatenate([best_rows, rows], axis=1)
+            best_scores, best_rows = top_k(scores, rows, k)
+
+        return best_scores, best_rows
+
+    def _allocate(self, capacity: int, dim: int) -> None:
+        """Create empty store files for `capacity` rows."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._open_files(capacity, dim, mode='w+')
+
+    def _write_rows(self, rows: List[int], vectors: np.ndarray) -> None:
+        """Store full-precision rows and their quantized codes."""
+        self._mark_dirty()
+        self._matrix[rows] = vectors
+
+        if self.quantization == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127.0
+            scales[scales == 0] = 1.0
+            self._codes[rows] = np.round(vectors / scales[:, None]).astype(np.int8)
+            self._scales[rows] = scales
+        elif self.quantization == "binary":
+            self._codes[rows] = np.packbits(vectors > 0, axis=1)
+
+    def _move_row(self, src: int, dst: int) -> None:
+        """Copy row `src` over row `dst` in every file."""
+        self._mark_dirty()
+        for array in (self._matrix, self._codes, self._scales):
+            if array is not None:
+                array[dst] = array[src]
+
+    def _reserve(self, capacity: int) -> None:
+        """Grow the files geometrically to hold at least `capacity` rows."""
+        if capacity <= self._capacity:
+            return
+
+        capacity = max(capacity, self._capacity * 2)
+        dim = self.dim
+
+        for array in (self._matrix, self._codes, self._scales):
+            if array is not None:
+                array.flush()
+        self._close_files()
+
+        # Extending the files keeps existing rows in place
+        for name, row_bytes in self._file_layout(dim):
+            with open(self.directory / name, 'r+b') as f:
+                f.truncate(capacity * row_bytes)
+
+        self._open_files(capacity, dim, mode='r+')
+
+    def _open_files(self, capacity: int, dim: int, mode: str) -> None:
+        """Map the store files with room for `capacity` rows."""
+        self._matrix = np.memmap(
+            self.directory / "vectors.f32", dtype=np.float32,
+            mode=mode, shape=(capacity, dim)
+        )
+
+        if self.quantization == "int8":
+            self._codes = np.memmap(
+                self.directory / "codes.bin", dtype=np.int8,
+                mode=mode, shape=(capacity, dim)
+            )
+            self._scales = np.memmap(
+                self.directory / "scales.f32", dtype=np.float32,
+                mode=mode, shape=(capacity,)
+            )
+        elif self.quantization == "binary":
+            self._codes = np.memmap(
+                self.directory / "codes.bin", dtype=np.uint8,
+                mode=mode, shape=(capacity, self._code_width(dim))
+            )
+
+        self._capacity = capacity
+
+    def _close_files(self) -> None:
+        """Drop the memory maps."""
+        self._matrix = None
+        self._codes = None
+        self._scales = None
+        self._capacity = 0
+
+    def _file_layout(self, dim: int) -> List[Tuple[str, int]]:
+        """(file name, bytes per row) for each file in use."""
+        layout = [("vectors.f32", dim * 4)]
+        if self.quantization == "int8":
+            layout += [("codes.bin", dim), ("scales.f32", 4)]
+        elif self.quantization == "binary":
+            layout.append(("codes.bin", self._code_width(dim)))
+        return layout
+
+    def _code_width(self, dim: int) -> int:
+        """Bytes per row of quantized codes."""
+        if self.quantization == "binary":
+            return (dim + 7) // 8
+        return dim
+
+    def _mark_dirty(self) -> None:
+        """Invalidate the on-disk header before the first change after a flush."""
+        if self._clean:
+            try:
+                (self.directory / "index.json").unlink()
+            except FileNotFoundError:
+                pass
+            self._clean = False
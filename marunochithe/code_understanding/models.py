@@ -3,6 +3,7 @@
 from dataclasses import dataclass, field
 from typing import List, Optional, Tuple
 from enum import Enum
+import hashlib
 import uuid
 
 
@@ -32,6 +33,7 @@ class Function:
     signature: Optional[str] = None
     parameters: List[str] = field(default_factory=list)
     return_type: Optional[str] = None
+    calls: List[str] = field(default_factory=list)  # Names of called functions/classes
 
 
 @dataclass
@@ -54,6 +56,7 @@ class ParsedFile:
     functions: List[Function] = field(default_factory=list)
     classes: List[Class] = field(default_factory=list)
     imports: List[str] = field(default_factory=list)
+    imported_modules: List[str] = field(default_factory=list)  # As written, e.g. "..pkg.mod", "./utils"
     top_level_vars: List[str] = field(default_factory=list)
     docstrings: List[str] = field(default_factory=list)
     raw_content: str = ""
@@ -69,9 +72,12 @@ class CodeChunk:
     chunk_type: ChunkType = ChunkType.FILE
     parent_id: Optional[str] = None
     name: str = ""
+    qualified_name: str = ""
     signature: Optional[str] = None
     docstring: Optional[str] = None
     dependencies: List[str] = field(default_factory=list)
+    calls: List[str] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
     line_range: Tuple[int, int] = (0, 0)
     last_modified: float = 0.0
 
@@ -85,14 +91,43 @@ class CodeChunk:
             'chunk_type': self.chunk_type.value,
             'parent_id': self.parent_id,
             'name': self.name,
+            'qualified_name': self.qualified_name,
             'signature': self.signature,
             'docstring': self.docstring,
             'dependencies': self.dependencies,
+            'calls': self.calls,
+            'imports': self.imports,
             'line_range': self.line_range,
             'last_modified': self.last_modified,
         }
 
 
+def make_chunk_id(
+    filepath: str,
+    chunk_type: ChunkType,
+    qualified_name: str,
+    content: str
+) -> str:
+    """
+    Deterministic chunk ID.
+
+    The same chunk of the same file always gets the same ID, so
+    re-indexing can tell unchanged chunks from changed ones.
+
+    Args:
+        filepath: Path to the chunk's file
+        chunk_type: Chunk type
+        qualified_name: Name within the file (e.g. "Class.method")
+        content: Chunk text
+
+    Returns:
+        32-character hex ID
+    """
+    content_hash = hashlib.sha256(content.encode('utf-8')).hexdigest()
+    key = '\0'.join((filepath, ChunkType(chunk_type).value, qualified_name, content_hash))
+    return hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]
+
+
 @dataclass
 class SearchResult:
     """Result from code search."""
@@ -95,6 +95,7 @@ class CodeParser:
             parsed.functions = self._extract_functions(root_node, content, language)
             parsed.classes = self._extract_classes(root_node, content, language)
             parsed.imports = self._extract_imports(root_node, content, language)
+            parsed.imported_modules = self._extract_imported_modules(root_node, content, language)
             parsed.docstrings = self._extract_docstrings(root_node, content, language)
 
             return parsed
@@ -192,6 +193,7 @@ class CodeParser:
                 end_line=node.end_point[0] + 1,
                 docstring=docstring,
                 signature=self._get_node_text(node, source)[:200],  # First 200 chars
+                calls=self._extract_calls(node, source),
             )
         except Exception as e:
             logger.debug(f"Failed to parse function: {e}")
@@ -299,6 +301,92 @@ class CodeParser:
         traverse(node)
         return imports
 
+    def _extract_imported_modules(
+        self,
+        node: Node,
+        source: str,
+        language: LangEnum
+    ) -> List[str]:
+        """
+        Extract imported module names as written.
+
+        Python modules are dotted names (relative ones keep their leading
+        dots; names imported from a module are listed as possible
+        submodules too). JavaScript/TypeScript modules are import and
+        require() specifiers.
+        """
+        modules: Dict[str, None] = {}
+
+        def imported_name(n: Node) -> str:
+            if n.type == 'aliased_import':
+                n = n.child_by_field_name('name')
+            return self._get_node_text(n, source)
+
+        def string_value(n: Node) -> str:
+            return self._get_node_text(n, source).strip('\'"`')
+
+        def traverse(n: Node) -> None:
+            if language == LangEnum.PYTHON:
+                if n.type == 'import_statement':
+                    for name in n.children_by_field_name('name'):
+                        modules[imported_name(name)] = None
+
+                elif n.type == 'import_from_statement':
+                    module = self._get_node_text(n.child_by_field_name('module_name'), source)
+                    modules[module] = None
+                    separator = '' if module.endswith('.') else '.'
+                    for name in n.children_by_field_name('name'):
+                        modules[module + separator + imported_name(name)] = None
+
+            elif n.type in ('import_statement', 'export_statement'):
+                specifier = n.child_by_field_name('source')
+                if specifier is not None:
+                    modules[string_value(specifier)] = None
+
+            elif n.type == 'call_expression':
+                function = n.child_by_field_name('function')
+                arguments = n.child_by_field_name('arguments')
+                if (
+                    function is not None and arguments is not None
+                    and self._get_node_text(function, source) == 'require'
+                ):
+                    for argument in arguments.children:
+                        if argument.type == 'string':
+                            modules[string_value(argument)] = None
+
+            for child in n.children:
+                traverse(child)
+
+        traverse(node)
+        modules.pop('', None)
+        return list(modules)
+
+    def _extract_calls(self, node: Node, source: str) -> List[str]:
+        """Extract names of the functions called and classes instantiated in a node."""
+        calls: Dict[str, None] = {}
+
+        def traverse(n: Node) -> None:
+            callee = None
+            if n.type in ('call', 'call_expression'):
+                callee = n.child_by_field_name('function')
+            elif n.type == 'new_expression':
+                callee = n.child_by_field_name('constructor')
+
+            # obj.method() calls "method"
+            if callee is not None and callee.type == 'attribute':
+                callee = callee.child_by_field_name('attribute')
+            elif callee is not None and callee.type == 'member_expression':
+                callee = callee.child_by_field_name('property')
+
+            if callee is not None and callee.type in ('identifier', 'property_identifier'):
+                calls[self._get_node_text(callee, source)] = None
+
+            for child in n.children:
+                traverse(child)
+
+        traverse(node)
+        return list(calls)
+
     def _extract_docstrings(
         self,
         node: Node,
@@ -0,0 +1,194 @@
+"""
+Multi-process parse/chunk pipeline for codebase indexing.
+
+Tree-sitter parsing and chunking are CPU-bound, so large codebases are
+split into file batches and fanned out across a process pool. Results are
+streamed back to the caller batch by batch as workers finish.
+"""
+
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, Tuple
+
+from loguru import logger
+
+from .models import CodeChunk
+from .parser import CodeParser
+from .chunker import CodeChunker
+
+
+# (filepath, chunks) - chunks is None when the file could not be parsed
+FileResult = Tuple[str, Optional[List[CodeChunk]]]
+
+
+# Per-process state, created once by the pool initializer
+_worker_parser: Optional[CodeParser] = None
+_worker_chunker: Optional[CodeChunker] = None
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def _init_worker() -> None:
+    """Create parser, chunker and event loop for a pool worker."""
+    global _worker_parser, _worker_chunker, _worker_loop
+
+    _worker_parser = CodeParser()
+    _worker_chunker = CodeChunker()
+    _worker_loop = asyncio.new_event_loop()
+
+
+async def _parse_and_chunk(
+    parser: CodeParser,
+    chunker: CodeChunker,
+    filepath: str
+) -> Optional[List[CodeChunk]]:
+    """Parse and chunk a single file."""
+    parsed = await parser.parse_file(filepath)
+    if parsed is None:
+        return None
+
+    return await chunker.chunk_file(parsed)
+
+
+def _process_batch(filepaths: List[str]) -> List[FileResult]:
+    """Parse and chunk a batch of files inside a pool worker."""
+    results: List[FileResult] = []
+
+    for filepath in filepaths:
+        try:
+            chunks = _worker_loop.run_until_complete(
+                _parse_and_chunk(_worker_parser, _worker_chunker, filepath)
+            )
+        except Exception as e:
+            logger.warning(f"Failed to process {filepath}: {e}")
+            chunks = None
+
+        results.append((filepath, chunks))
+
+    return results
+
+
+class ParseChunkPipeline:
+    """
+    Parse and chunk files across multiple processes.
+
+    Small inputs (or num_workers <= 1) are processed in-process, since
+    starting a process pool costs more than it saves.
+    """
+
+    def __init__(
+        self,
+        parser: CodeParser,
+        chunker: CodeChunker,
+        num_workers: Optional[int] = None,
+        batch_size: int = 32,
+        min_parallel_files: int = 64
+    ):
+        """
+        Initialize pipeline.
+
+        Args:
+            parser: Parser used for in-process fallback
+            chunker: Chunker used for in-process fallback
+            num_workers: Worker processes (default: number of CPUs)
+            batch_size: Files sent to a worker per task
+            min_parallel_files: Below this file count, process in-process
+        """
+        self.parser = parser
+        self.chunker = chunker
+        self.num_workers = num_workers if num_workers is not None else (os.cpu_count() or 1)
+        self.batch_size = max(1, batch_size)
+        self.min_parallel_files = min_parallel_files
+
+    def _batches(self, filepaths: Sequence[str]) -> Iterator[List[str]]:
+        """Split filepaths into fixed-size batches."""
+        for i in range(0, len(filepaths), self.batch_size):
+            yield list(filepaths[i:i + self.batch_size])
+
+    async def iter_batches(
+        self,
+        filepaths: Sequence[str]
+    ) -> AsyncIterator[List[FileResult]]:
+        """
+        Stream (filepath, chunks) results in batches.
+
+        Batches are yielded in completion order, not input order.
+
+        Args:
+            filepaths: Files to parse and chunk
+
+        Yields:
+            Lists of (filepath, chunks) tuples
+        """
+        if self.num_workers <= 1 or len(filepaths) < self.min_parallel_files:
+            async for batch in self._iter_serial(filepaths):
+                yield batch
+            return
+
+        async for batch in self._iter_parallel(filepaths):
+            yield batch
+
+    async def _iter_serial(
+        self,
+        filepaths: Sequence[str]
+    ) -> AsyncIterator[List[FileResult]]:
+        """Process files in the current process."""
+        for batch in self._batches(filepaths):
+            results: List[FileResult] = []
+
+            for filepath in batch:
+                try:
+                    # Uncached: the parse cache would pin every file's raw_content
+                    parsed = await self.parser.parse_file(filepath)
+                    chunks = await self.chunker.chunk_file(parsed) if parsed else None
+                except Exception as e:
+                    logger.warning(f"Failed to process {filepath}: {e}")
+                    chunks = None
+
+                results.append((filepath, chunks))
+
+            yield results
+
+    async def _iter_parallel(
+        self,
+        filepaths: Sequence[str]
+    ) -> AsyncIterator[List[FileResult]]:
+        """Fan batches out to a process pool, keeping a bounded number in flight."""
+        loop = asyncio.get_running_loop()
+
+        # spawn avoids forking a process that owns event loop and DB threads
+        pool = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+        )
+        logger.info(
+            f"Parsing {len(filepaths)} files with {self.num_workers} worker processes"
+        )
+
+        batches = self._batches(filepaths)
+        max_in_flight = self.num_workers * 2
+        pending = set()
+
+        def submit_next() -> bool:
+            batch = next(batches, None)
+            if batch is None:
+                return False
+            pending.add(loop.run_in_executor(pool, _process_batch, batch))
+            return True
+
+        try:
+            while len(pending) < max_in_flight and submit_next():
+                pass
+
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for future in done:
+                    submit_next()
+                    yield future.result()
+
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
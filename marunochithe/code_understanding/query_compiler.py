@@ -0,0 +1,229 @@
+"""
+Compile free-text search queries into valid FTS5 expressions.
+
+FTS5 query syntax treats `(`, `:`, `-`, `.`, `*` and quotes as operators,
+so a query like `os.path.join(` or `user-id` is a syntax error when passed
+to MATCH as-is. The compiler keeps what is meant as syntax and quotes
+everything else:
+
+- "exact phrase"      -> "exact phrase"
+- load*               -> "load" *
+- name:getUser        -> name : ("getUser" OR "get user")
+- getUserById         -> ("getUserById" OR "get user by id")
+- a b                 -> "a" AND "b"
+- a OR b, a NOT b     -> operators between terms are kept
+- os.path.join(x)     -> ("os" AND "path" AND "join" AND "x")
+
+Compiled expressions are cached; the SQL statements around them are
+constant, so sqlite3's statement cache reuses their prepared plans.
+
+A query that is a single identifier or qualified name (is_symbol_query)
+can be answered by symbol lookup without FTS5 at all. Plain words such as
+"login" are left to full search even when something is named after them.
+
+Substring and regex searches are compiled for the trigram index instead:
+the literal runs a regex requires become an AND of trigram phrases that
+prefilters candidates, which are then verified against chunk content.
+"""
+
+import re
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    from re import _constants as _sre, _parser as _sre_parse
+except ImportError:  # Python < 3.11
+    import sre_constants as _sre
+    import sre_parse as _sre_parse
+
+from .code_tokenizer import split_identifier
+
+# Columns of code_fts that can be filtered on
+QUERY_COLUMNS = ('content', 'name')
+
+_OPERATORS = frozenset({'AND', 'OR', 'NOT'})
+
+# Quoted phrase (possibly unterminated), or a run of non-space characters
+_ITEM = re.compile(r'"([^"]*)"?|[^\s"]+')
+
+# Tokens as unicode61 (tokenchars '_') sees them
+_TOKEN = re.compile(r'\w+')
+
+_COLUMN_FILTER = re.compile(rf'^({"|".join(QUERY_COLUMNS)}):(.*)$', re.IGNORECASE)
+
+# An identifier or dotted qualified name, e.g. "parse_file" or "UserService.get"
+_SYMBOL = re.compile(r'[A-Za-z_$][\w$]*(?:\.[A-Za-z_$][\w$]*)*')
+
+# What sets an identifier apart from a plain word: a separator, a digit
+# or a camelCase hump ("parse_file", "UserService.get", "base64", "HTTPServer")
+_IDENTIFIER_SHAPE = re.compile(r'[_.$\d]|[a-z][A-Z]|[A-Z]{2}[a-z]')
+
+
+def _quote(text: str) -> str:
+    """Quote a string as an FTS5 string literal."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def _term(token: str) -> str:
+    """Expression matching one token, whole or by identifier parts."""
+    parts = split_identifier(token)
+    if len(parts) < 2:
+        return _quote(token)
+    return f"({_quote(token)} OR {_quote(' '.join(parts))})"
+
+
+def _word(word: str) -> Optional[str]:
+    """Compile one whitespace-separated word."""
+    column = None
+    match = _COLUMN_FILTER.match(word)
+    if match:
+        column, word = match.group(1).lower(), match.group(2)
+
+    prefix = word.endswith('*')
+    tokens = _TOKEN.findall(word)
+    if not tokens:
+        return None
+
+    if prefix and len(tokens) == 1:
+        expr = f"{_quote(tokens[0])} *"
+    else:
+        terms = [_term(token) for token in tokens]
+        expr = terms[0] if len(terms) == 1 else f"({' AND '.join(terms)})"
+
+    return f"{column} : {expr}" if column else expr
+
+
+@lru_cache(maxsize=1024)
+def compile_query(query: str) -> Optional[str]:
+    """
+    Compile a free-text query into an FTS5 MATCH expression.
+
+    Args:
+        query: Free-text search query
+
+    Returns:
+        Valid FTS5 expression, or None if the query has no searchable terms
+    """
+    items: List[str] = []
+
+    for match in _ITEM.finditer(query or ""):
+        if match.group(0).startswith('"'):
+            tokens = _TOKEN.findall(match.group(1))
+            if tokens:
+                items.append(_quote(' '.join(tokens)))
+            continue
+
+        word = match.group(0)
+        if word in _OPERATORS:
+            # Operators need a term on both sides; repeated ones collapse
+            if items and items[-1] not in _OPERATORS:
+                items.append(word)
+            elif items:
+                items[-1] = word
+            continue
+
+        expr = _word(word)
+        if expr:
+            items.append(expr)
+
+    while items and items[-1] in _OPERATORS:
+        items.pop()
+
+    # FTS5 only allows implicit AND between plain phrases, so spell it out
+    parts: List[str] = []
+    for item in items:
+        if parts and item not in _OPERATORS and parts[-1] not in _OPERATORS:
+            parts.append('AND')
+        parts.append(item)
+
+    return ' '.join(parts) or None
+
+
+def is_symbol_query(query: str) -> bool:
+    """
+    Whether a query is a single identifier or qualified name, which
+    symbol lookup can answer.
+
+    Plain words are not: "config" or "authentication" may name a
+    definition, but are more likely asking about a concept.
+
+    Args:
+        query: Search query
+
+    Returns:
+        True for queries like "HybridSearcher" or "UserService.get",
+        False for plain words like "login" or "Config"
+    """
+    query = query.strip()
+    return (
+        _SYMBOL.fullmatch(query) is not None
+        and _IDENTIFIER_SHAPE.search(query) is not None
+    )
+
+
+def compile_substring(text: str) -> Optional[str]:
+    """
+    Compile a literal substring into a trigram-index MATCH expression.
+
+    Args:
+        text: Substring to find, e.g. "_id_to_" or ".then("
+
+    Returns:
+        FTS5 phrase matching the substring (case-insensitively), or None
+        if it is shorter than one trigram
+    """
+    if len(text) < 3:
+        return None
+    return _quote(text)
+
+
+def compile_regex(pattern: str) -> Optional[str]:
+    """
+    Compile a regex into a trigram-index MATCH expression that every match
+    satisfies, built from the literal runs the regex requires.
+
+    Args:
+        pattern: Python regular expression
+
+    Returns:
+        FTS5 expression for prefiltering candidates, or None if the regex
+        requires no literal of three or more characters
+
+    Raises:
+        ValueError: If the pattern is not a valid regex
+    """
+    try:
+        parsed = _sre_parse.parse(pattern)
+    except re.error as e:
+        raise ValueError(f"Invalid regex {pattern!r}: {e}") from e
+
+    runs = sorted({run for run in _literal_runs(list(parsed)) if len(run) >= 3})
+    return ' AND '.join(_quote(run) for run in runs) or None
+
+
+def _literal_runs(items: list) -> List[str]:
+    """Literal strings that any match of a parsed regex must contain."""
+    runs: List[str] = []
+    current: List[str] = []
+
+    def end_run() -> None:
+        if current:
+            runs.append(''.join(current))
+            current.clear()
+
+    for op, arg in items:
+        if op is _sre.LITERAL:
+            current.append(chr(arg))
+        elif op is _sre.SUBPATTERN:
+            end_run()
+            runs.extend(_literal_runs(list(arg[-1])))
+        elif op in (_sre.MAX_REPEAT, _sre.MIN_REPEAT) and arg[0] >= 1:
+            # Required at least once
+            end_run()
+            runs.extend(_literal_runs(list(arg[2])))
+        else:
+            # Alternations, classes, optional parts: nothing required
+            end_run()
+
+    end_run()
+    return runs
@@ -0,0 +1,109 @@
+"""
+Search result cache invalidated by index write generations.
+
+Every indexer carries a write generation that changes on each write.
+Generations come from one process-wide counter, so a value is never
+reused, not even by an index that was closed and reopened. A cached
+result records the generations of the indexes it was computed from and
+is only served while they are unchanged, so a hit is never stale.
+"""
+
+import itertools
+import threading
+from collections import OrderedDict
+from typing import Hashable, List, Optional, Tuple
+
+from .models import SearchResult
+
+
+_generations = itertools.count(1)
+
+
+def next_generation() -> int:
+    """
+    Take a new write generation.
+
+    Returns:
+        Process-wide unique, increasing generation number
+    """
+    return next(_generations)
+
+
+class SearchResultCache:
+    """
+    Thread-safe LRU of search results, keyed by query and options.
+    """
+
+    def __init__(self, max_entries: int = 1024):
+        """
+        Initialize SearchResultCache.
+
+        Args:
+            max_entries: Results kept before the least recently used is
+                evicted (0 disables caching)
+        """
+        self.max_entries = max(0, max_entries)
+        self._entries: "OrderedDict[Hashable, Tuple[Hashable, List[SearchResult]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable, generation: Hashable) -> Optional[List[SearchResult]]:
+        """
+        Look up a result.
+
+        Args:
+            key: Query key
+            generation: Current write generations of the searched indexes
+
+        Returns:
+            Copy of the cached results, or None if missing or outdated
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != generation:
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return list(entry[1])
+
+    def put(self, key: Hashable, generation: Hashable, results: List[SearchResult]) -> None:
+        """
+        Cache a result.
+
+        Args:
+            key: Query key
+            generation: Write generations read before the search started
+            results: Search results
+        """
+        if not self.max_entries:
+            return
+
+        with self._lock:
+            self._entries[key] = (generation, list(results))
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every result."""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> dict:
+        """
+        Get cache statistics.
+
+        Returns:
+            {'entries': int, 'max_entries': int, 'hits': int, 'misses': int}
+        """
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+            }
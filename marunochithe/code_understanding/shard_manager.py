@@ -0,0 +1,292 @@
+"""
+Per-repository index shards.
+
+Each indexed repository gets its own ChromaDB collection, manifest and
+FTS5 database, so one repository's size never slows searches of another.
+Open shards are kept in an LRU; the least recently used idle shard is
+closed when more than `max_open_shards` are open.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional
+
+from loguru import logger
+
+from .indexer import CodebaseIndexer
+from .keyword_indexer import KeywordIndexer
+
+
+@dataclass
+class Shard:
+    """Open index handles of one repository."""
+    name: str
+    root: str
+    indexer: CodebaseIndexer
+    keyword_indexer: KeywordIndexer
+    users: int = 0
+    pinned: bool = False
+
+
+class ShardManager:
+    """
+    Registry of per-repository shards with an LRU of open handles.
+
+    Shards are addressed by repository path or shard name. All shards
+    share one persist directory, so the embedding cache is shared too.
+    """
+
+    def __init__(
+        self,
+        persist_directory: Optional[str] = None,
+        keyword_directory: Optional[str] = None,
+        max_open_shards: int = 8,
+        keyword_read_connections: int = 4,
+        **indexer_kwargs
+    ):
+        """
+        Initialize ShardManager.
+
+        Args:
+            persist_directory: ChromaDB directory shared by all shards
+                (default: ~/MarunochiAI/data/chroma)
+            keyword_directory: Directory of per-shard FTS5 databases
+                (default: ~/MarunochiAI/data/keyword_shards)
+            max_open_shards: Idle shards kept open before the least
+                recently used one is closed
+            keyword_read_connections: Read-only connections per shard's
+                FTS5 database
+            **indexer_kwargs: Passed to every CodebaseIndexer (pass an
+                embedding_provider so shards share one loaded model)
+        """
+        self.persist_directory = persist_directory or str(
+            Path.home() / "MarunochiAI" / "data" / "chroma"
+        )
+        self.keyword_directory = keyword_directory or str(
+            Path.home() / "MarunochiAI" / "data" / "keyword_shards"
+        )
+        self.max_open_shards = max(1, max_open_shards)
+        self.keyword_read_connections = keyword_read_connections
+        self.indexer_kwargs = indexer_kwargs
+
+        Path(self.persist_directory).mkdir(parents=True, exist_ok=True)
+        Path(self.keyword_directory).mkdir(parents=True, exist_ok=True)
+
+        self._registry_path = Path(self.persist_directory) / "shards.json"
+        self._registry: Dict[str, str] = self._load_registry()
+        self._open: "OrderedDict[str, Shard]" = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def shard_name(codebase_path: str) -> str:
+        """
+        Collection name of a repository's shard.
+
+        Args:
+            codebase_path: Repository root
+
+        Returns:
+            'repo_<dirname>_<hash of resolved path>'
+        """
+        root = str(Path(codebase_path).expanduser().resolve())
+        slug = re.sub(r'[^a-zA-Z0-9_-]+', '_', Path(root).name)[:40].strip('_') or "root"
+        digest = hashlib.sha1(root.encode('utf-8')).hexdigest()[:8]
+        return f"repo_{slug}_{digest}"
+
+    def list_shards(self) -> Dict[str, str]:
+        """
+        Get registered shards.
+
+        Returns:
+            {shard_name: repository root}
+        """
+        return dict(self._registry)
+
+    def resolve(self, repo: str) -> Optional[str]:
+        """
+        Find the shard of a shard name, repository root or file path.
+
+        Args:
+            repo: Shard name or path
+
+        Returns:
+            Shard name, or None if no registered shard matches
+        """
+        if repo in self._registry:
+            return repo
+
+        path = str(Path(repo).expanduser().resolve())
+
+        # Deepest registered root containing the path
+        best = None
+        for name, root in self._registry.items():
+            if path == root or path.startswith(root + os.sep):
+                if best is None or len(root) > len(self._registry[best]):
+                    best = name
+        return best
+
+    @asynccontextmanager
+    async def acquire(self, repo: str, create: bool = False) -> AsyncIterator[Shard]:
+        """
+        Open a shard and keep it open while in use.
+
+        Args:
+            repo: Shard name or path
+            create: Register `repo` as a new repository root if unknown
+
+        Yields:
+            The open Shard
+
+        Raises:
+            KeyError: If no shard matches and create is False
+        """
+        shard = await self._open_shard(repo, create)
+        shard.users += 1
+        try:
+            yield shard
+        finally:
+            shard.users -= 1
+            await self._evict()
+
+    async def pin(self, repo: str, create: bool = False) -> Shard:
+        """
+        Open a shard and exempt it from eviction (e.g. while watched).
+
+        Args:
+            repo: Shard name or path
+            create: Register `repo` as a new repository root if unknown
+
+        Returns:
+            The open Shard
+        """
+        shard = await self._open_shard(repo, create)
+        shard.pinned = True
+        return shard
+
+    async def index_codebase(self, codebase_path: str, **kwargs) -> Dict:
+        """
+        Index a repository into its own shard.
+
+        Args:
+            codebase_path: Repository root
+            **kwargs: Passed to CodebaseIndexer.index_codebase
+
+        Returns:
+            index_codebase stats plus 'shard'
+        """
+        async with self.acquire(codebase_path, create=True) as shard:
+            result = await shard.indexer.index_codebase(codebase_path, **kwargs)
+            result['shard'] = shard.name
+            return result
+
+    def get_stats(self) -> Dict:
+        """
+        Get shard registry and LRU statistics.
+
+        Returns:
+            {'shards': {name: root}, 'open_shards': [...], 'max_open_shards': int}
+        """
+        return {
+            'shards': self.list_shards(),
+            'open_shards': list(self._open),
+            'max_open_shards': self.max_open_shards,
+        }
+
+    def open_shards(self) -> List[Shard]:
+        """Currently open shards, least recently used first."""
+        return list(self._open.values())
+
+    async def close(self) -> None:
+        """Close every open shard."""
+        async with self._lock:
+            while self._open:
+                _, shard = self._open.popitem(last=False)
+                await self._close_shard(shard)
+
+    # === Private Methods ===
+
+    async def _open_shard(self, repo: str, create: bool) -> Shard:
+        """Return an open shard, opening (and registering) it if needed."""
+        async with self._lock:
+            name = self.resolve(repo)
+
+            if name is None:
+                if not create:
+                    raise KeyError(f"No index shard for {repo}")
+                name = self.shard_name(repo)
+                self._registry[name] = str(Path(repo).expanduser().resolve())
+                self._save_registry()
+                logger.info(f"Registered index shard {name} for {self._registry[name]}")
+
+            shard = self._open.get(name)
+            if shard is not None:
+                self._open.move_to_end(name)
+                return shard
+
+            keyword_indexer = KeywordIndexer(
+                db_path=str(Path(self.keyword_directory) / f"{name}.db"),
+                read_connections=self.keyword_read_connections
+            )
+            indexer = await asyncio.to_thread(
+                CodebaseIndexer,
+                collection_name=name,
+                persist_directory=self.persist_directory,
+                keyword_indexer=keyword_indexer,
+                **self.indexer_kwargs
+            )
+
+            shard = Shard(
+                name=name,
+                root=self._registry[name],
+                indexer=indexer,
+                keyword_indexer=keyword_indexer,
+            )
+            self._open[name] = shard
+            logger.info(f"Opened index shard {name} ({len(self._open)} open)")
+            return shard
+
+    async def _evict(self) -> None:
+        """Close least recently used idle shards beyond the limit."""
+        async with self._lock:
+            for name in list(self._open):
+                if len(self._open) <= self.max_open_shards:
+                    break
+
+                shard = self._open[name]
+                if shard.users or shard.pinned:
+                    continue
+
+                del self._open[name]
+                await self._close_shard(shard)
+                logger.info(f"Closed idle index shard {name}")
+
+    async def _close_shard(self, shard: Shard) -> None:
+        """Release a shard's handles."""
+        try:
+            await shard.indexer.close()
+            await shard.keyword_indexer.close()
+        except Exception as e:
+            logger.error(f"Failed to close index shard {shard.name}: {e}")
+
+    def _load_registry(self) -> Dict[str, str]:
+        """Read the shard registry."""
+        try:
+            return json.loads(self._registry_path.read_text())
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            logger.warning(f"Failed to read shard registry {self._registry_path}: {e}")
+            return {}
+
+    def _save_registry(self) -> None:
+        """Atomically write the shard registry."""
+        tmp_path = self._registry_path.with_suffix(".json.tmp")
+        tmp_path.write_text(json.dumps(self._registry, indent=2))
+        os.replace(tmp_path, self._registry_path)
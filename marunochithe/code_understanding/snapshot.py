@@ -0,0 +1,201 @@
+"""
+Portable index snapshots.
+
+A snapshot is a zip archive holding everything needed to serve a
+codebase's index without parsing or embedding it again:
+- snapshot.json: format version, embedding model, root, counts
+- embeddings.npy: float32 (or float16) matrix, one row per chunk (stored
+  uncompressed, so it loads with one read)
+- chunks.jsonl: chunk ID, text (the FTS5 content) and metadata per row
+- files.jsonl: manifest entries (size, mtime, content hash)
+"""
+
+import json
+import os
+import time
+import zipfile
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Union
+
+import numpy as np
+
+from .manifest import FileEntry
+
+
+SNAPSHOT_FORMAT_VERSION = 1
+
+
+class SnapshotError(ValueError):
+    """Snapshot is malformed or incompatible with the target index."""
+
+
+@dataclass
+class IndexSnapshot:
+    """Contents of one index snapshot, rows aligned across fields."""
+    embedding_model: str
+    root: str
+    ids: List[str] = field(default_factory=list)
+    documents: List[str] = field(default_factory=list)
+    metadatas: List[Dict] = field(default_factory=list)
+    embeddings: np.ndarray = field(default_factory=lambda: np.empty((0, 0), dtype=np.float32))
+    files: List[FileEntry] = field(default_factory=list)
+    created_at: float = field(default_factory=time.time)
+
+    def remap_root(self, root: str) -> None:
+        """
+        Move every path from the snapshot's root to another root.
+
+        Chunk IDs are kept: they only need to be unique, and the next
+        incremental index replaces a file's chunks only if it changed.
+
+        Args:
+            root: Root directory on this machine
+        """
+        old_root = self.root.rstrip(os.sep)
+        new_root = str(Path(root).expanduser().resolve())
+        if old_root == new_root:
+            return
+
+        def remap(filepath: str) -> str:
+            if filepath == old_root or filepath.startswith(old_root + os.sep):
+                return new_root + filepath[len(old_root):]
+            return filepath
+
+        for metadata in self.metadatas:
+            metadata['filepath'] = remap(metadata.get('filepath', ''))
+        for entry in self.files:
+            entry.filepath = remap(entry.filepath)
+        self.root = new_root
+
+
+def write_snapshot(
+    path: Union[str, Path],
+    snapshot: IndexSnapshot,
+    dtype: str = "float32"
+) -> int:
+    """
+    Write a snapshot atomically.
+
+    Args:
+        path: Output file
+        snapshot: Snapshot contents
+        dtype: Stored embedding precision, "float32" or "float16"
+
+    Returns:
+        Size of the written file in bytes
+    """
+    if dtype not in ("float32", "float16"):
+        raise ValueError(f"Unsupported dtype: {dtype}")
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(path.name + ".tmp")
+
+    header = {
+        'version': SNAPSHOT_FORMAT_VERSION,
+        'embedding_model': snapshot.embedding_model,
+        'root': snapshot.root,
+        'created_at': snapshot.created_at,
+        'chunks': len(snapshot.ids),
+        'files': len(snapshot.files),
+        'dim': int(snapshot.embeddings.shape[1]) if len(snapshot.ids) else 0,
+        'dtype': dtype,
+    }
+
+    with zipfile.ZipFile(tmp_path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr('snapshot.json', json.dumps(header, indent=2))
+
+        # Floats barely compress; storing them keeps loading a plain read
+        info = zipfile.ZipInfo('embeddings.npy', date_time=time.localtime()[:6])
+        info.compress_type = zipfile.ZIP_STORED
+        with archive.open(info, 'w', force_zip64=True) as f:
+            np.save(f, np.ascontiguousarray(snapshot.embeddings, dtype=dtype))
+
+        archive.writestr('chunks.jsonl', ''.join(
+            json.dumps({'id': chunk_id, 'document': document, 'metadata': metadata}) + '\n'
+            for chunk_id, document, metadata in zip(
+                snapshot.ids, snapshot.documents, snapshot.metadatas
+            )
+        ))
+
+        archive.writestr('files.jsonl', ''.join(
+            json.dumps(asdict(entry)) + '\n' for entry in snapshot.files
+        ))
+
+    os.replace(tmp_path, path)
+    return path.stat().st_size
+
+
+def read_snapshot_header(path: Union[str, Path]) -> Dict:
+    """
+    Read only a snapshot's header (version, model, root, counts).
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        Header dict
+
+    Raises:
+        SnapshotError: If the file is not a snapshot of a supported version
+    """
+    try:
+        with zipfile.ZipFile(path) as archive:
+            header = json.loads(archive.read('snapshot.json'))
+    except (OSError, zipfile.BadZipFile, KeyError, ValueError) as e:
+        raise SnapshotError(f"Invalid snapshot {path}: {e}") from e
+
+    if header.get('version') != SNAPSHOT_FORMAT_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot version {header.get('version')} "
+            f"(expected {SNAPSHOT_FORMAT_VERSION})"
+        )
+    return header
+
+
+def read_snapshot(path: Union[str, Path]) -> IndexSnapshot:
+    """
+    Read a snapshot.
+
+    Args:
+        path: Snapshot file
+
+    Returns:
+        IndexSnapshot with float32 embeddings
+
+    Raises:
+        SnapshotError: If the file is not a snapshot of a supported version
+    """
+    header = read_snapshot_header(path)
+
+    try:
+        with zipfile.ZipFile(path) as archive:
+            with archive.open('embeddings.npy') as f:
+                embeddings = np.load(f).astype(np.float32, copy=False)
+
+            chunks = [
+                json.loads(line)
+                for line in archive.read('chunks.jsonl').decode('utf-8').splitlines()
+            ]
+            files = [
+                FileEntry(**json.loads(line))
+                for line in archive.read('files.jsonl').decode('utf-8').splitlines()
+            ]
+
+    except (OSError, zipfile.BadZipFile, KeyError, ValueError) as e:
+        raise SnapshotError(f"Invalid snapshot {path}: {e}") from e
+
+    if len(chunks) != header['chunks'] or len(embeddings) != len(chunks):
+        raise SnapshotError(f"Invalid snapshot {path}: row counts do not match")
+
+    return IndexSnapshot(
+        embedding_model=header['embedding_model'],
+        root=header['root'],
+        ids=[chunk['id'] for chunk in chunks],
+        documents=[chunk['document'] for chunk in chunks],
+        metadatas=[chunk['metadata'] for chunk in chunks],
+        embeddings=embeddings,
+        files=files,
+        created_at=header['created_at'],
+    )
@@ -0,0 +1,440 @@
+"""
+Typo-tolerant symbol name search over a character trigram index.
+
+Every chunk's name and qualified name is a key (lowercased). Keys are
+kept sorted, for exact prefix lookups, and each key's trigrams are
+posted in a compact inverted index. A fuzzy query counts the trigrams
+it shares with each key, keeps the keys sharing enough of them to be
+within the edit budget, and verifies only the best few with a bounded
+edit distance, so a query touches a handful of posting lists rather
+than every symbol.
+
+Queries match whole names and name prefixes, so "hybridsearch" finds
+HybridSearcher and "CodebaseIndxer" finds CodebaseIndexer.
+
+Writes do not rebuild the index: updated() hides the changed chunks'
+entries and indexes their current names separately, in a small index
+searched alongside this one.
+"""
+
+import bisect
+import copy
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+
+# (rowid, name, qualified_name, language) of one chunk
+SymbolRow = Tuple[int, Optional[str], Optional[str], Optional[str]]
+
+# (rowid, edit distance, matched the whole name rather than a prefix)
+SymbolMatch = Tuple[int, int, bool]
+
+# Padding around keys: trigrams at the start of a name are anchored
+_START = '\x01'
+_END = '\x02'
+_SEPARATOR = '\x00'
+
+# Keys verified per fuzzy query, best trigram overlap first
+_MAX_CANDIDATES = 256
+
+# Each edit (or transposition) destroys at most this many query trigrams
+_GRAMS_PER_EDIT = 4
+
+
+def default_max_distance(query: str) -> int:
+    """
+    Edit budget for a query: none for 1-2 characters, one up to 5, else two.
+
+    Args:
+        query: Symbol query
+
+    Returns:
+        Maximum edit distance
+    """
+    if len(query) <= 2:
+        return 0
+    return 1 if len(query) <= 5 else 2
+
+
+def bounded_edit_distance(
+    source: str,
+    target: str,
+    max_distance: int,
+    prefix: bool = False
+) -> Optional[int]:
+    """
+    Optimal string alignment distance, if it is within a bound.
+
+    Insertions, deletions, substitutions and adjacent transpositions cost
+    one each. Only the diagonal band of width 2 * max_distance + 1 is
+    computed, and the computation stops once every cell exceeds the bound.
+
+    Args:
+        source: Query
+        target: Candidate
+        max_distance: Largest distance of interest
+        prefix: Measure against the closest prefix of target instead
+
+    Returns:
+        Distance, or None if it exceeds max_distance
+    """
+    n = len(source)
+    if prefix:
+        target = target[:n + max_distance]
+    m = len(target)
+    if m < n - max_distance or (not prefix and m > n + max_distance):
+        return None
+
+    over = max_distance + 1
+    before: List[int] = []
+    previous = [j if j <= max_distance else over for j in range(m + 1)]
+
+    for i in range(1, n + 1):
+        current = [over] * (m + 1)
+        current[0] = i if i <= max_distance else over
+        best = current[0]
+        char = source[i - 1]
+
+        for j in range(max(1, i - max_distance), min(m, i + max_distance) + 1):
+            distance = previous[j - 1] + (char != target[j - 1])
+            if previous[j] + 1 < distance:
+                distance = previous[j] + 1
+            if current[j - 1] + 1 < distance:
+                distance = current[j - 1] + 1
+            if (
+                i > 1 and j > 1 and char == target[j - 2]
+                and source[i - 2] == target[j - 1] and before[j - 2] + 1 < distance
+            ):
+                distance = before[j - 2] + 1
+            current[j] = min(distance, over)
+            if distance < best:
+                best = distance
+
+        if best > max_distance:
+            return None
+        before, previous = previous, current
+
+    distance = min(previous) if prefix else previous[m]
+    return distance if distance <= max_distance else None
+
+
+def _trigrams(codes: np.ndarray) -> np.ndarray:
+    """Hash each window of three code points to 32 bits (exact below U+0400)."""
+    return (codes[:-2] << 20) ^ (codes[1:-1] << 10) ^ codes[2:]
+
+
+def _code_points(text: str) -> np.ndarray:
+    # Copied: arithmetic on read-only buffer views is many times slower
+    return np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).copy()
+
+
+class SymbolIndex:
+    """
+    Sorted symbol keys with a trigram inverted index.
+
+    Postings are key numbers grouped by trigram (CSR): `grams` holds the
+    distinct trigram hashes, `gram_offsets` where each one's keys start.
+    Hash collisions only add candidates, which verification removes.
+
+    The arrays are never modified; chunks changed since build() are in
+    `changes` and searched through `delta` (see updated()).
+    """
+
+    def __init__(
+        self,
+        keys: List[str],
+        key_lengths: np.ndarray,
+        key_offsets: np.ndarray,
+        rowids: np.ndarray,
+        row_languages: np.ndarray,
+        languages: List[Optional[str]],
+        grams: np.ndarray,
+        gram_offsets: np.ndarray,
+        postings: np.ndarray
+    ):
+        """
+        Initialize SymbolIndex (use SymbolIndex.build).
+
+        Args:
+            keys: Sorted, distinct lowercased symbol names
+            key_lengths: Length of each key
+            key_offsets: Offsets of each key's chunks in rowids
+            rowids: Chunk table rowids
+            row_languages: Language of each rowid, as a position in languages
+            languages: Distinct languages
+            grams: Sorted distinct trigram hashes
+            gram_offsets: Offsets of each trigram's keys in postings
+            postings: Key numbers
+        """
+        self.keys = keys
+        self.key_lengths = key_lengths
+        self.key_offsets = key_offsets
+        self.rowids = rowids
+        self.row_languages = row_languages
+        self.languages = languages
+        self.grams = grams
+        self.gram_offsets = gram_offsets
+        self.postings = postings
+
+        # Current row of each chunk changed since build() (None if
+        # deleted), hidden in the arrays, and the index of those rows
+        self.changes: Dict[int, Optional[SymbolRow]] = {}
+        self.delta: Optional[SymbolIndex] = None
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the index arrays in bytes (keys excluded)."""
+        return sum(
+            array.nbytes for array in (
+                self.key_lengths, self.key_offsets, self.rowids, self.row_languages,
+                self.grams, self.gram_offsets, self.postings,
+            )
+        )
+
+    @classmethod
+    def build(cls, rows: Iterable[SymbolRow]) -> "SymbolIndex":
+        """
+        Index the names and qualified names of chunks.
+
+        Args:
+            rows: One row per chunk
+
+        Returns:
+            SymbolIndex over every named chunk
+        """
+        names: List[str] = []
+        rowids: List[int] = []
+        languages: List[Optional[str]] = []
+        for rowid, name, qualified_name, language in rows:
+            name = (name or '').lower()
+            qualified_name = (qualified_name or '').lower()
+            for key in (name, qualified_name if qualified_name != name else ''):
+                if key:
+                    names.append(key)
+                    rowids.append(rowid)
+                    languages.append(language)
+
+        if not names:
+            return cls([], np.zeros(0, dtype=np.int32), np.zeros(1, dtype=np.int64),
+                       np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int16), [],
+                       np.zeros(0, dtype=np.uint32), np.zeros(1, dtype=np.int64),
+                       np.zeros(0, dtype=np.int32))
+
+        # Sorted distinct keys; each key's chunks in input order
+        keys = sorted(set(names))
+        numbers = {key: number for number, key in enumerate(keys)}
+        owners = np.fromiter((numbers[name] for name in names), dtype=np.int32, count=len(names))
+        key_lengths = np.fromiter((len(key) for key in keys), dtype=np.int32, count=len(keys))
+        by_key = np.argsort(owners, kind='stable')
+        key_offsets = np.zeros(len(keys) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(owners, minlength=len(keys)), out=key_offsets[1:])
+
+        language_codes: Dict[Optional[str], int] = {}
+        row_languages = np.fromiter(
+            (language_codes.setdefault(language, len(language_codes)) for language in languages),
+            dtype=np.int16, count=len(languages)
+        )
+
+        # All keys in one array: "\x01key\x02\x00\x01key\x02\x00..."
+        codes = _code_points(
+            _START + f"{_END}{_SEPARATOR}{_START}".join(keys) + _END + _SEPARATOR
+        )
+        grams = _trigrams(codes)
+        owners = np.repeat(np.arange(len(keys), dtype=np.int32), key_lengths + 3)[:len(grams)]
+
+        # Drop windows spanning two keys
+        spanning = (codes[:-2] == 0) | (codes[1:-1] == 0) | (codes[2:] == 0)
+        grams, owners = grams[~spanning], owners[~spanning]
+
+        # Group by trigram, keys ascending within a group; a key posts each
+        # of its trigrams once
+        pairs = (grams.astype(np.uint64) << 32) | owners.astype(np.uint64)
+        pairs.sort()
+        pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]]]
+        grams = (pairs >> 32).astype(np.uint32)
+        owners = (pairs & 0xFFFFFFFF).astype(np.int32)
+
+        starts = np.flatnonzero(np.r_[True, grams[1:] != grams[:-1]])
+        gram_offsets = np.append(starts, len(grams)).astype(np.int64)
+
+        return cls(
+            keys, key_lengths, key_offsets,
+            np.array(rowids, dtype=np.int64)[by_key], row_languages[by_key], list(language_codes),
+            grams[starts], gram_offsets, owners
+        )
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        max_distance: Optional[int] = None,
+        language: Optional[str] = None
+    ) -> List[SymbolMatch]:
+        """
+        Find symbols whose name, or a prefix of it, is close to a query.
+
+        Whole-name matches rank before prefix matches at the same edit
+        distance, then shorter names first.
+
+        Args:
+            query: Symbol name, possibly misspelled or incomplete
+            limit: Maximum chunks
+            max_distance: Edit budget (default: by query length)
+            language: Only return chunks in this language
+
+        Returns:
+            (rowid, distance, whole-name match) tuples, best first
+        """
+        query = query.strip().lower()
+        if not query or limit <= 0:
+            return []
+
+        if max_distance is None:
+            max_distance = default_max_distance(query)
+
+        # Keys of this index and of the changed chunks, in one ranking;
+        # the changed chunks' entries here are skipped
+        ranked = []
+        for segment, hidden in ((self, self.changes), (self.delta, {})):
+            if segment is None or not segment.keys:
+                continue
+
+            code = None
+            if language is not None:
+                if language not in segment.languages:
+                    continue
+                code = segment.languages.index(language)
+
+            if max_distance <= 0:
+                matches = segment._prefix_matches(query)
+            else:
+                matches = segment._fuzzy_matches(query, max_distance)
+
+            for key, distance, whole in matches:
+                name = segment.keys[key]
+                ranked.append(((distance, not whole, len(name), name), segment, key, code, hidden))
+
+        # Stable: this index's chunks of a key before the changed ones
+        ranked.sort(key=lambda match: match[0])
+
+        results: List[SymbolMatch] = []
+        seen = set()
+        for (distance, partial, _, _), segment, key, code, hidden in ranked:
+            start, end = int(segment.key_offsets[key]), int(segment.key_offsets[key + 1])
+            for i in range(start, end):
+                if code is not None and segment.row_languages[i] != code:
+                    continue
+                rowid = int(segment.rowids[i])
+                if rowid in seen or rowid in hidden:
+                    continue
+                seen.add(rowid)
+                results.append((rowid, distance, not partial))
+                if len(results) == limit:
+                    return results
+
+        return results
+
+    def updated(self, changes: Dict[int, Optional[SymbolRow]]) -> "SymbolIndex":
+        """
+        This index with some chunks changed, without rebuilding it.
+
+        The arrays are shared; only the rows changed since build() are
+        indexed again, so an update costs time in their number rather
+        than in the size of the index.
+
+        Args:
+            changes: Current row of each changed chunk rowid, None if deleted
+
+        Returns:
+            New SymbolIndex
+        """
+        index = copy.copy(self)
+        index.changes = {**self.changes, **changes}
+        index.delta = SymbolIndex.build(row for row in index.changes.values() if row is not None)
+        return index
+
+    def _prefix_matches(self, query: str) -> List[Tuple[int, int, bool]]:
+        """Keys starting with the query, shortest first, from the sorted keys."""
+        start = bisect.bisect_left(self.keys, query)
+        end = bisect.bisect_left(self.keys, query + '\U0010ffff', start)
+        if start == end:
+            return []
+
+        order = np.argsort(self.key_lengths[start:end], kind='stable')[:_MAX_CANDIDATES]
+        return [
+            (key, 0, self.keys[key] == query)
+            for key in (start + order).tolist()
+        ]
+
+    def _fuzzy_matches(self, query: str, max_distance: int) -> List[Tuple[int, int, bool]]:
+        """Keys within the edit budget of the query or one of its prefixes."""
+        # No end padding: a key may continue past the query
+        grams = np.unique(_trigrams(_code_points(_START + query)))
+        if not len(grams):
+            return self._prefix_matches(query)
+
+        slots = np.searchsorted(self.grams, grams)
+        slots = slots[slots < len(self.grams)]
+        slots = slots[np.isin(self.grams[slots], grams)]
+        if not len(slots):
+            return []
+
+        postings = np.concatenate([
+            self.postings[self.gram_offsets[slot]:self.gram_offsets[slot + 1]]
+            for slot in slots.tolist()
+        ])
+        candidates, shared = np.unique(postings, return_counts=True)
+
+        # q-gram lemma: a key within the budget shares enough trigrams
+        required = max(1, len(grams) - _GRAMS_PER_EDIT * max_distance)
+        lengths = self.key_lengths[candidates]
+        keep = (shared >= required) & (lengths >= len(query) - max_distance)
+        candidates, shared, lengths = candidates[keep], shared[keep], lengths[keep]
+
+        if len(candidates) > _MAX_CANDIDATES:
+            order = np.lexsort((np.abs(lengths - len(query)), -shared))[:_MAX_CANDIDATES]
+            candidates = candidates[order]
+
+        matches = []
+        for key in candidates.tolist():
+            name = self.keys[key]
+            if name.startswith(query):
+                matches.append((key, 0, len(name) == len(query)))
+                continue
+
+            whole = None
+            if abs(len(name) - len(query)) <= max_distance:
+                whole = bounded_edit_distance(query, name, max_distance)
+
+            # A prefix may be closer than the whole name (but not exact,
+            # which startswith() ruled out)
+            bound = max_distance if whole is None else whole - 1
+            distance = None
+            if bound > 0:
+                distance = bounded_edit_distance(query, name, bound, prefix=True)
+            if distance is not None:
+                matches.append((key, distance, False))
+            elif whole is not None:
+                matches.append((key, whole, True))
+
+        matches.sort(key=lambda match: (match[1], not match[2], len(self.keys[match[0]]), match[0]))
+        return matches
+
+    @staticmethod
+    def similarity(distance: int, whole: bool) -> float:
+        """
+        Score a match: 1.0 for the exact name, lower per edit and for prefixes.
+
+        Args:
+            distance: Edit distance
+            whole: Whether the whole name matched
+
+        Returns:
+            Similarity in (0, 1]
+        """
+        return 1.0 / (1.0 + distance + (0.0 if whole else 0.5))
+
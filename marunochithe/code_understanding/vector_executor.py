@@ -0,0 +1,149 @@
+"""
+Dedicated thread pools for blocking vector store calls.
+
+ChromaDB's client API is synchronous; calling it from a coroutine blocks
+the event loop for the whole embedding/HNSW operation. VectorStoreExecutor
+moves those calls onto bounded thread pools, with writes and reads in
+separate lanes so searches never queue behind bulk inserts.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict
+
+
+class ExecutorLane:
+    """
+    A bounded thread pool that tracks queue depth and wait time.
+
+    Wait time is measured from submission until a worker picks the
+    call up, i.e. time spent queued behind other calls in this lane.
+    """
+
+    def __init__(self, name: str, max_workers: int):
+        """
+        Initialize lane.
+
+        Args:
+            name: Lane name, used for thread names and stats
+            max_workers: Maximum concurrent calls
+        """
+        self.name = name
+        self.max_workers = max(1, max_workers)
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"vector-{name}",
+        )
+
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._completed = 0
+        self._failed = 0
+        self._wait_ms_total = 0.0
+        self._wait_ms_max = 0.0
+
+    def _run(self, submitted_at: float, fn: Callable[[], Any]) -> Any:
+        """Run a call on a worker thread, recording how long it waited."""
+        wait_ms = (time.perf_counter() - submitted_at) * 1000
+
+        with self._lock:
+            self._queued -= 1
+            self._active += 1
+            self._wait_ms_total += wait_ms
+            self._wait_ms_max = max(self._wait_ms_max, wait_ms)
+
+        failed = False
+        try:
+            return fn()
+        except BaseException:
+            failed = True
+            raise
+        finally:
+            with self._lock:
+                self._active -= 1
+                self._completed += 1
+                if failed:
+                    self._failed += 1
+
+    async def run(self, fn: Callable, *args, **kwargs) -> Any:
+        """
+        Run a blocking call in this lane.
+
+        Args:
+            fn: Blocking callable
+            *args: Positional arguments for fn
+            **kwargs: Keyword arguments for fn
+
+        Returns:
+            Return value of fn
+        """
+        with self._lock:
+            self._queued += 1
+
+        loop = asyncio.get_running_loop()
+        call = functools.partial(fn, *args, **kwargs)
+        return await loop.run_in_executor(
+            self._executor, self._run, time.perf_counter(), call
+        )
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get lane statistics."""
+        with self._lock:
+            started = self._completed + self._active
+            return {
+                "workers": self.max_workers,
+                "queue_depth": self._queued,
+                "active": self._active,
+                "completed": self._completed,
+                "failed": self._failed,
+                "avg_wait_ms": round(self._wait_ms_total / started, 2) if started else 0.0,
+                "max_wait_ms": round(self._wait_ms_max, 2),
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting calls and release worker threads."""
+        self._executor.shutdown(wait=True)
+
+
+class VectorStoreExecutor:
+    """
+    Read and write lanes for vector store calls.
+
+    Writes (add/update/delete) go through a single worker so they stay
+    ordered; reads (query/get) get their own pool.
+    """
+
+    def __init__(self, read_workers: int = 4, write_workers: int = 1):
+        """
+        Initialize executor.
+
+        Args:
+            read_workers: Threads serving queries and lookups
+            write_workers: Threads serving inserts and deletes
+        """
+        self.read_lane = ExecutorLane("read", read_workers)
+        self.write_lane = ExecutorLane("write", write_workers)
+
+    async def read(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking read call in the read lane."""
+        return await self.read_lane.run(fn, *args, **kwargs)
+
+    async def write(self, fn: Callable, *args, **kwargs) -> Any:
+        """Run a blocking write call in the write lane."""
+        return await self.write_lane.run(fn, *args, **kwargs)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get statistics for both lanes."""
+        return {
+            "read": self.read_lane.get_stats(),
+            "write": self.write_lane.get_stats(),
+        }
+
+    def shutdown(self) -> None:
+        """Shut down both lanes."""
+        self.read_lane.shutdown()
+        self.write_lane.shutdown()
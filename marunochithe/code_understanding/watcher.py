@@ -17,6 +17,12 @@ from .parser import CodeParser
 from .chunker import CodeChunker
 from .indexer import CodebaseIndexer
 from .keyword_indexer import KeywordIndexer
+from .file_discovery import (
+    DEFAULT_CODE_EXTENSIONS,
+    DEFAULT_EXCLUDED_DIRS,
+    IGNORE_FILENAMES,
+    FileDiscovery,
+)
 
 
 class CodebaseWatcher:
@@ -32,14 +38,10 @@ class CodebaseWatcher:
     """
 
     # File extensions to watch
-    CODE_EXTENSIONS = {'.py', '.js', '.ts', '.tsx', '.jsx'}
+    CODE_EXTENSIONS = set(DEFAULT_CODE_EXTENSIONS)
 
     # Directories to exclude
-    EXCLUDED_DIRS = {
-        '.venv', 'venv', '__pycache__', '.git', 'node_modules',
-        '.pytest_cache', 'dist', 'build', '.mypy_cache', '.ruff_cache',
-        'env', '.tox', 'htmlcov', '.coverage', '.eggs'
-    }
+    EXCLUDED_DIRS = set(DEFAULT_EXCLUDED_DIRS)
 
     def __init__(
         self,
@@ -69,6 +71,13 @@ class CodebaseWatcher:
         self.parser = CodeParser()
         self.chunker = CodeChunker()
 
+        # Same filtering rules as the indexer's initial scan
+        self.discovery = FileDiscovery(
+            self.codebase_path,
+            self.CODE_EXTENSIONS,
+            self.EXCLUDED_DIRS
+        )
+
         # Watchdog observer
         self.observer: Optional[Observer] = None
         self._running = False
@@ -92,20 +101,15 @@ class CodebaseWatcher:
         if not filepath.is_file():
             return False
 
-        # Check extension
-        if filepath.suffix not in self.CODE_EXTENSIONS:
-            return False
+        # Extension, excluded directories and .gitignore/.ignore rules
+        return self.discovery.matches(filepath)
 
-        # Check for excluded directories
-        try:
-            relative_path = filepath.relative_to(self.codebase_path)
-            if any(excluded in relative_path.parts for excluded in self.EXCLUDED_DIRS):
-                return False
-        except ValueError:
-            # File is outside codebase_path
-            return False
-
-        return True
+    def _owns_keyword_index(self) -> bool:
+        """True if the keyword index is not already synced by the vector indexer."""
+        return (
+            self.keyword_indexer is not None
+            and self.keyword_indexer is not self.vector_indexer.keyword_indexer
+        )
 
     async def start_watching(self) -> None:
         """
@@ -151,6 +155,10 @@ class CodebaseWatcher:
         Args:
             filepath: Path to created file
         """
+        if filepath.name in IGNORE_FILENAMES:
+            self.discovery.clear_cache()
+            return
+
         if not self._should_watch(filepath):
             return
 
@@ -164,6 +172,10 @@ class CodebaseWatcher:
         Args:
             filepath: Path to modified file
         """
+        if filepath.name in IGNORE_FILENAMES:
+            self.discovery.clear_cache()
+            return
+
         if not self._should_watch(filepath):
             return
 
@@ -233,31 +245,41 @@ class CodebaseWatcher:
         start_time = time.time()
 
         try:
-            # Delete old chunks from both indices
             filepath_str = str(filepath)
-            await self.vector_indexer.delete_file(filepath_str)
-            if self.keyword_indexer:
-                await self.keyword_indexer.delete_file(filepath_str)
 
             # Parse file
             parsed = await self.parser.parse_file(filepath_str)
             if parsed is None:
                 logger.warning(f"Failed to parse {filepath}")
+                await self.vector_indexer.delete_file(filepath_str)
+                if self.keyword_indexer:
+                    await self.keyword_indexer.delete_file(filepath_str)
                 return
 
             # Chunk file
             chunks = await self.chunker.chunk_file(parsed)
             if not chunks:
                 logger.warning(f"No chunks generated for {filepath}")
+                # Drop the chunks indexed before the file was emptied
+                await self.vector_indexer.delete_file(parsed.filepath)
+                if self._owns_keyword_index():
+                    await self.keyword_indexer.delete_file(parsed.filepath)
                 return
 
-            # Index in vector database
-            indexed_vector = await self.vector_indexer._index_chunks_batch(chunks)
+            # Diff chunks against the vector database (and its manifest);
+            # only new or edited chunks are embedded
+            indexed_vector = await self.vector_indexer.replace_file_chunks(
+                parsed.filepath, chunks
+            )
 
-            # Index in keyword database
+            # Replace chunks in keyword database, unless the vector
+            # indexer already keeps this one in sync
             indexed_keyword = 0
-            if self.keyword_indexer:
+            if self._owns_keyword_index():
+                await self.keyword_indexer.delete_file(parsed.filepath)
                 indexed_keyword = await self.keyword_indexer.index_chunks(chunks)
+            elif self.keyword_indexer:
+                indexed_keyword = len(chunks)
 
             duration_ms = int((time.time() - start_time) * 1000)
 
@@ -288,7 +310,7 @@ class CodebaseWatcher:
             await self.vector_indexer.delete_file(filepath_str)
 
             # Delete from keyword index
-            if self.keyword_indexer:
+            if self._owns_keyword_index():
                 await self.keyword_indexer.delete_file(filepath_str)
 
             logger.info(f"Deleted {filepath.name} from indices")
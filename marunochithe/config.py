@@ -119,6 +119,98 @@ class ChromaSettings(BaseSettings):
         return Path(self.path).expanduser()
 
 
+class IndexerSettings(BaseSettings):
+    """Codebase indexing configuration."""
+
+    workers: Optional[int] = Field(
+        default=None,
+        alias="MARUNOCHITHE_INDEX_WORKERS",
+        description="Parse/chunk worker processes (default: number of CPUs)"
+    )
+    vector_read_workers: int = Field(
+        default=4,
+        alias="MARUNOCHITHE_VECTOR_READ_WORKERS",
+        description="Threads serving vector store queries"
+    )
+    discovery_workers: int = Field(
+        default=1,
+        alias="MARUNOCHITHE_DISCOVERY_WORKERS",
+        description="Threads listing directories when finding code files"
+    )
+    vector_backend: str = Field(
+        default="auto",
+        alias="MARUNOCHITHE_VECTOR_BACKEND",
+        description="chroma (HNSW), exact (brute-force), mmap (memory-mapped, quantized) "
+                    "or auto (exact for small indexes)"
+    )
+    exact_search_max_chunks: int = Field(
+        default=100_000,
+        alias="MARUNOCHITHE_EXACT_SEARCH_MAX_CHUNKS",
+        description="Largest index searched exactly in auto mode"
+    )
+    exact_search_dtype: str = Field(
+        default="float32",
+        alias="MARUNOCHITHE_EXACT_SEARCH_DTYPE",
+        description="Exact search matrix precision: float32 or float16"
+    )
+    vector_quantization: str = Field(
+        default="int8",
+        alias="MARUNOCHITHE_VECTOR_QUANTIZATION",
+        description="Codes scanned by the mmap backend: none, int8 or binary"
+    )
+    chunk_cache_size: int = Field(
+        default=4096,
+        alias="MARUNOCHITHE_CHUNK_CACHE_SIZE",
+        description="Chunks kept in memory for hydrating search results, per index (0 disables)"
+    )
+    result_cache_size: int = Field(
+        default=1024,
+        alias="MARUNOCHITHE_RESULT_CACHE_SIZE",
+        description="Search results cached until the index changes (0 disables)"
+    )
+    shard_by_repo: bool = Field(
+        default=False,
+        alias="MARUNOCHITHE_SHARD_BY_REPO",
+        description=(
+            "Index each repository into its own collection and FTS5 database "
+            "(indexes built without it must be rebuilt)"
+        )
+    )
+    max_open_shards: int = Field(
+        default=8,
+        alias="MARUNOCHITHE_MAX_OPEN_SHARDS",
+        description="Repository shards kept open before idle ones are closed"
+    )
+    keyword_read_connections: int = Field(
+        default=4,
+        alias="MARUNOCHITHE_KEYWORD_READ_CONNECTIONS",
+        description="Read-only SQLite connections serving keyword searches, per index"
+    )
+
+
+class EmbeddingSettings(BaseSettings):
+    """Embedding model configuration for code search."""
+
+    provider: str = Field(
+        default="onnx",
+        alias="MARUNOCHITHE_EMBEDDING_PROVIDER",
+        description="onnx, sentence-transformers or ollama"
+    )
+    model: Optional[str] = Field(
+        default=None,
+        alias="MARUNOCHITHE_EMBEDDING_MODEL",
+        description="Model name for sentence-transformers/ollama"
+    )
+    device: str = Field(
+        default="cpu",
+        alias="MARUNOCHITHE_EMBEDDING_DEVICE"
+    )
+    batch_size: int = Field(
+        default=32,
+        alias="MARUNOCHITHE_EMBEDDING_BATCH_SIZE"
+    )
+
+
 class Settings(BaseSettings):
     """Main configuration container."""
 
@@ -127,6 +219,8 @@ class Settings(BaseSettings):
     benchai: BenchAISettings = Field(default_factory=BenchAISettings)
     server: ServerSettings = Field(default_factory=ServerSettings)
     chroma: ChromaSettings = Field(default_factory=ChromaSettings)
+    indexer: IndexerSettings = Field(default_factory=IndexerSettings)
+    embedding: EmbeddingSettings = Field(default_factory=EmbeddingSettings)
 
     # Development flags
     debug: bool = Field(default=False, alias="DEBUG")
@@ -1,8 +1,9 @@
 """Command-line interface for MarunochiAI."""
 
 import asyncio
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, List, Optional
 
 import typer
 from rich.console import Console
@@ -14,12 +15,14 @@ from ..config import load_settings
 from ..core.inference import InferenceEngine
 from ..core.tools import ToolRegistry
 from ..code_understanding import (
-    CodeParser,
-    CodeChunker,
     CodebaseIndexer,
     KeywordIndexer,
     HybridSearcher,
     CodebaseWatcher,
+    ShardManager,
+    EmbeddingProvider,
+    create_embedding_provider,
+    read_snapshot_header,
 )
 
 app = typer.Typer(
@@ -30,6 +33,21 @@ app = typer.Typer(
 
 console = Console()
 
+snapshot_app = typer.Typer(help="Export and import index snapshots")
+app.add_typer(snapshot_app, name="snapshot")
+
+
+def _create_embedding_provider() -> EmbeddingProvider:
+    """Create the embedding provider configured in settings."""
+    settings = load_settings()
+    return create_embedding_provider(
+        provider=settings.embedding.provider,
+        model_name=settings.embedding.model,
+        device=settings.embedding.device,
+        batch_size=settings.embedding.batch_size,
+        ollama_host=settings.ollama.host,
+    )
+
 
 @app.command()
 def chat(
@@ -228,6 +246,8 @@ def server(
 def index(
     codebase_path: str = typer.Argument(".", help="Path to codebase"),
     watch: bool = typer.Option(False, "--watch", "-w", help="Watch for file changes"),
+    workers: Optional[int] = typer.Option(None, "--workers", help="Parse worker processes (default: CPU count)"),
+    rebuild: bool = typer.Option(False, "--rebuild", help="Rebuild the whole index instead of indexing changes"),
 ):
     """
     Index codebase for semantic search.
@@ -235,20 +255,40 @@ def index(
     Examples:
         marunochithe index
         marunochithe index ~/MyProject --watch
+        marunochithe index ~/MyProject --workers 8
+        marunochithe index ~/MyProject --rebuild
     """
-    asyncio.run(_index(codebase_path, watch))
+    asyncio.run(_index(codebase_path, watch, workers, rebuild))
 
 
-async def _index(codebase_path: str, watch: bool):
+async def _index(
+    codebase_path: str,
+    watch: bool,
+    workers: Optional[int] = None,
+    rebuild: bool = False
+):
     """Internal async index handler."""
     try:
         console.print(f"\n[bold blue]Indexing codebase:[/bold blue] {codebase_path}")
 
-        # Initialize components
-        parser = CodeParser()
-        chunker = CodeChunker()
-        vector_indexer = CodebaseIndexer(collection_name="marunochithe_codebase")
-        keyword_indexer = KeywordIndexer()
+        # Initialize components (the vector indexer keeps the keyword index in sync)
+        shard_manager = None
+        if load_settings().indexer.shard_by_repo:
+            # The codebase gets its own shard
+            shard_manager = ShardManager(
+                num_workers=workers,
+                embedding_provider=_create_embedding_provider()
+            )
+            shard = await shard_manager.pin(codebase_path, create=True)
+            vector_indexer, keyword_indexer = shard.indexer, shard.keyword_indexer
+        else:
+            keyword_indexer = KeywordIndexer()
+            vector_indexer = CodebaseIndexer(
+                collection_name="marunochithe_codebase",
+                num_workers=workers,
+                keyword_indexer=keyword_indexer,
+                embedding_provider=_create_embedding_provider()
+            )
 
         with Progress(
             SpinnerColumn(),
@@ -257,28 +297,41 @@ async def _index(codebase_path: str, watch: bool):
         ) as progress:
             task = progress.add_task("Parsing and indexing files...", total=None)
 
-            # Index codebase
-            result = await vector_indexer.index_codebase(codebase_path)
-
-            # Also index in keyword DB
-            all_chunks = []
-            for filepath in Path(codebase_path).rglob("*.py"):
-                parsed = await parser.parse_file(str(filepath))
-                if parsed:
-                    chunks = await chunker.chunk_file(parsed)
-                    all_chunks.extend(chunks)
+            async def on_progress(status: dict) -> None:
+                progress.update(
+                    task,
+                    description=(
+                        f"Indexed {status['processed_files']}/{status['pending_files']} files, "
+                        f"{status['indexed_chunks']} chunks..."
+                    )
+                )
 
-            if all_chunks:
-                await keyword_indexer.index_chunks(all_chunks)
+            if rebuild:
+                # Build a new generation, then swap it in
+                result = await vector_indexer.reindex_codebase(codebase_path, on_progress=on_progress)
+            else:
+                # Index codebase (only added/changed files are processed)
+                result = await vector_indexer.index_codebase(codebase_path, on_progress=on_progress)
 
             progress.update(task, completed=True)
 
         # Display results
         console.print(f"\n[bold green]✓ Indexing complete![/bold green]")
         console.print(f"  Files indexed: {result['total_files']}")
+        console.print(
+            f"  Changes: {result['added_files']} added, {result['changed_files']} changed, "
+            f"{result['deleted_files']} deleted, {result['unchanged_files']} unchanged"
+        )
         console.print(f"  Total chunks: {result['total_chunks']}")
         console.print(f"  Duration: {result['duration_ms']}ms")
 
+        if not watch:
+            if shard_manager:
+                await shard_manager.close()
+            else:
+                await vector_indexer.close()
+                await keyword_indexer.close()
+
         # Start watcher if requested
         if watch:
             console.print(f"\n[bold yellow]Watching for changes...[/bold yellow]")
@@ -311,8 +364,9 @@ async def _index(codebase_path: str, watch: bool):
 def search(
     query: str = typer.Argument(..., help="Search query"),
     limit: int = typer.Option(5, "--limit", "-l", help="Max results"),
-    mode: str = typer.Option("hybrid", "--mode", "-m", help="Search mode (vector/keyword/hybrid)"),
+    mode: str = typer.Option("hybrid", "--mode", "-m", help="Search mode (vector/keyword/hybrid/graph/substring/regex)"),
     show_content: bool = typer.Option(True, "--content/--no-content", help="Show code content"),
+    repo: Optional[List[str]] = typer.Option(None, "--repo", "-r", help="Repository to search (repeatable, default: all)"),
 ):
     """
     Search codebase semantically.
@@ -321,27 +375,46 @@ def search(
         marunochithe search "authentication function"
         marunochithe search "database query" --limit 10
         marunochithe search "user management" --mode vector
+        marunochithe search "token refresh" --mode graph
+        marunochithe search "retry logic" --repo ~/MyProject
+        marunochithe search ".then(" --mode substring
+        marunochithe search "def \\w+_id_to_\\w+" --mode regex
     """
-    asyncio.run(_search(query, limit, mode, show_content))
+    asyncio.run(_search(query, limit, mode, show_content, repo or None))
 
 
-async def _search(query: str, limit: int, mode: str, show_content: bool):
+async def _search(
+    query: str,
+    limit: int,
+    mode: str,
+    show_content: bool,
+    repos: Optional[List[str]] = None
+):
     """Internal async search handler."""
     try:
         console.print(f"\n[bold blue]Searching for:[/bold blue] {query}")
         console.print(f"[dim]Mode: {mode} | Limit: {limit}[/dim]\n")
 
         # Initialize searcher
-        vector_indexer = CodebaseIndexer(collection_name="marunochithe_codebase")
-        keyword_indexer = KeywordIndexer()
-        searcher = HybridSearcher(
-            vector_indexer=vector_indexer,
-            keyword_indexer=keyword_indexer,
-            rrf_k=60
-        )
+        shard_manager = None
+        keyword_indexer = None
+        if load_settings().indexer.shard_by_repo:
+            shard_manager = ShardManager(embedding_provider=_create_embedding_provider())
+            searcher = HybridSearcher(shard_manager=shard_manager, rrf_k=60)
+        else:
+            vector_indexer = CodebaseIndexer(
+                collection_name="marunochithe_codebase",
+                embedding_provider=_create_embedding_provider()
+            )
+            keyword_indexer = KeywordIndexer()
+            searcher = HybridSearcher(
+                vector_indexer=vector_indexer,
+                keyword_indexer=keyword_indexer,
+                rrf_k=60
+            )
 
         # Search
-        results = await searcher.search(query, mode=mode, limit=limit)
+        results = await searcher.search(query, mode=mode, limit=limit, repos=repos)
 
         if not results:
             console.print("[yellow]No results found[/yellow]")
@@ -377,7 +450,10 @@ async def _search(query: str, limit: int, mode: str, show_content: bool):
 
             console.print()  # Blank line between results
 
-        await keyword_indexer.close()
+        if shard_manager:
+            await shard_manager.close()
+        if keyword_indexer:
+            await keyword_indexer.close()
 
     except Exception as e:
         console.print(f"[bold red]Error:[/bold red] {e}")
@@ -385,6 +461,109 @@ async def _search(query: str, limit: int, mode: str, show_content: bool):
         raise typer.Exit(code=1)
 
 
+@asynccontextmanager
+async def _open_indexer(codebase_path: str, create: bool = False) -> AsyncIterator[CodebaseIndexer]:
+    """Open the indexer serving a codebase (its shard when sharding is on), closing it afterwards."""
+    if load_settings().indexer.shard_by_repo:
+        shard_manager = ShardManager(embedding_provider=_create_embedding_provider())
+        try:
+            async with shard_manager.acquire(codebase_path, create=create) as shard:
+                yield shard.indexer
+        finally:
+            await shard_manager.close()
+        return
+
+    keyword_indexer = KeywordIndexer()
+    vector_indexer = CodebaseIndexer(
+        collection_name="marunochithe_codebase",
+        keyword_indexer=keyword_indexer,
+        embedding_provider=_create_embedding_provider()
+    )
+    try:
+        yield vector_indexer
+    finally:
+        await vector_indexer.close()
+        await keyword_indexer.close()
+
+
+@snapshot_app.command("export")
+def snapshot_export(
+    codebase_path: str = typer.Argument(..., help="Indexed codebase"),
+    output: str = typer.Argument(..., help="Snapshot file to write"),
+    float16: bool = typer.Option(False, "--float16", help="Store embeddings at half precision"),
+):
+    """
+    Export a codebase's index to a snapshot file.
+
+    Examples:
+        marunochithe snapshot export ~/MyProject myproject.snapshot
+    """
+    asyncio.run(_snapshot_export(codebase_path, output, float16))
+
+
+async def _snapshot_export(codebase_path: str, output: str, float16: bool):
+    """Internal async snapshot export handler."""
+    try:
+        async with _open_indexer(codebase_path) as indexer:
+            result = await indexer.export_snapshot(
+                output,
+                root=codebase_path,
+                dtype="float16" if float16 else "float32"
+            )
+
+        console.print(f"\n[bold green]✓ Snapshot written:[/bold green] {result['path']}")
+        console.print(f"  Chunks: {result['chunks']} from {result['files']} files")
+        console.print(f"  Size: {result['bytes'] / 1e6:.1f} MB")
+        console.print(f"  Duration: {result['duration_ms']}ms")
+
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        logger.exception("Snapshot export failed")
+        raise typer.Exit(code=1)
+
+
+@snapshot_app.command("import")
+def snapshot_import(
+    snapshot: str = typer.Argument(..., help="Snapshot file"),
+    root: Optional[str] = typer.Option(None, "--root", help="Codebase location on this machine (default: as exported)"),
+    index_changes: bool = typer.Option(True, "--index-changes/--no-index-changes", help="Index files that differ from the snapshot"),
+):
+    """
+    Load an index snapshot instead of indexing from scratch.
+
+    Examples:
+        marunochithe snapshot import myproject.snapshot
+        marunochithe snapshot import myproject.snapshot --root ~/src/MyProject
+    """
+    asyncio.run(_snapshot_import(snapshot, root, index_changes))
+
+
+async def _snapshot_import(snapshot: str, root: Optional[str], index_changes: bool):
+    """Internal async snapshot import handler."""
+    try:
+        codebase_path = root or read_snapshot_header(snapshot)['root']
+
+        async with _open_indexer(codebase_path, create=True) as indexer:
+            result = await indexer.import_snapshot(snapshot, root=root)
+
+            console.print("\n[bold green]✓ Snapshot imported[/bold green]")
+            console.print(f"  Chunks: {result['chunks']} from {result['files']} files")
+            console.print(f"  Root: {result['root']}")
+            console.print(f"  Duration: {result['duration_ms']}ms")
+
+            if index_changes and Path(codebase_path).is_dir():
+                changes = await indexer.index_codebase(codebase_path)
+                console.print(
+                    f"  Changes since export: {changes['added_files']} added, "
+                    f"{changes['changed_files']} changed, {changes['deleted_files']} deleted"
+                )
+
+    except Exception as e:
+        console.print(f"[bold red]Error:[/bold red] {e}")
+        logger.exception("Snapshot import failed")
+        raise typer.Exit(code=1)
+
+
 @app.command()
 def version():
     """Show MarunochiAI version."""
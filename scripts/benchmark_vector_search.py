@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+"""
+Vector Search Backend Benchmark for MarunochiAI
+
+Compares the exact (brute-force NumPy) backend and the memory-mapped
+quantized backend with ChromaDB's HNSW index, using the collection
+settings CodebaseIndexer uses:
+- Build time
+- Query latency (p50 / p95)
+- Recall@k of HNSW and the mmap backend against exact search
+- Memory scanned per query
+
+With --rss, instead measures the resident memory and upsert time of a
+vector_backend="chroma" collection (embeddings in ChromaDB's HNSW index)
+against a vector_backend="mmap" one (placeholders in ChromaDB, embeddings
+in the mmap store), each in a fresh process.
+
+Runs on synthetic clustered embeddings, so no server or model is needed:
+
+    python scripts/benchmark_vector_search.py --sizes 10000 50000 100000
+    python scripts/benchmark_vector_search.py --rss --sizes 50000
+"""
+
+import argparse
+import multiprocessing
+import tempfile
+import time
+from typing import Dict, List
+
+import chromadb
+import numpy as np
+from chromadb.config import Settings
+from rich.console import Console
+from rich.table import Table
+
+from marunochithe.code_understanding.exact_search import ExactVectorIndex
+from marunochithe.code_understanding.indexer import (
+    HNSW_METADATA,
+    MMAP_COLLECTION_METADATA,
+    PLACEHOLDER_EMBEDDING,
+)
+from marunochithe.code_understanding.mmap_store import MmapVectorIndex
+
+console = Console()
+
+
+def make_embeddings(n: int, dim: int, rng: np.random.Generator) -> np.ndarray:
+    """Clustered unit vectors, closer to real code embeddings than uniform noise."""
+    centers = rng.normal(size=(max(1, n // 200), dim))
+    vectors = centers[rng.integers(0, len(centers), size=n)]
+    vectors = vectors + 0.35 * rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).astype(np.float32)
+
+
+def percentile_ms(samples: List[float], q: float) -> float:
+    return float(np.percentile(samples, q) * 1000)
+
+
+def benchmark_size(n: int, args, rng: np.random.Generator) -> Dict:
+    """Build every backend over n vectors and query them."""
+    vectors = make_embeddings(n, args.dim, rng)
+    # Queries land near indexed code, as real searches do
+    queries = vectors[rng.integers(0, n, size=args.queries)]
+    queries = queries + 0.05 * rng.normal(size=queries.shape).astype(np.float32)
+    ids = [f"chunk{i}" for i in range(n)]
+
+    # Exact backend
+    start = time.perf_counter()
+    exact = ExactVectorIndex(dtype=args.dtype)
+    exact.upsert(ids, vectors)
+    exact_build = time.perf_counter() - start
+
+    exact_latency = []
+    exact_hits = []
+    for query in queries:
+        start = time.perf_counter()
+        hits = exact.search([query], args.k)[0]
+        exact_latency.append(time.perf_counter() - start)
+        exact_hits.append({chunk_id for chunk_id, _ in hits})
+
+    # Memory-mapped quantized backend
+    with tempfile.TemporaryDirectory() as tmp:
+        mmap_index = MmapVectorIndex(tmp, quantization=args.quantization)
+        mmap_index.upsert(ids, vectors)
+
+        mmap_latency = []
+        mmap_recall = []
+        for query, expected in zip(queries, exact_hits):
+            start = time.perf_counter()
+            hits = mmap_index.search([query], args.k)[0]
+            mmap_latency.append(time.perf_counter() - start)
+            mmap_recall.append(len({chunk_id for chunk_id, _ in hits} & expected) / len(expected))
+
+        mmap_mb = mmap_index.nbytes / 1e6
+        mmap_index.close()
+
+    # ChromaDB HNSW backend
+    with tempfile.TemporaryDirectory() as tmp:
+        client = chromadb.PersistentClient(
+            path=tmp,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        collection = client.create_collection(name="benchmark", metadata=HNSW_METADATA)
+
+        start = time.perf_counter()
+        step = client.get_max_batch_size()
+        for i in range(0, n, step):
+            collection.add(ids=ids[i:i + step], embeddings=vectors[i:i + step])
+        hnsw_build = time.perf_counter() - start
+
+        hnsw_latency = []
+        recall = []
+        for query, expected in zip(queries, exact_hits):
+            start = time.perf_counter()
+            result = collection.query(query_embeddings=[query], n_results=args.k)
+            hnsw_latency.append(time.perf_counter() - start)
+            recall.append(len(set(result['ids'][0]) & expected) / len(expected))
+
+    return {
+        "n": n,
+        "exact_build_s": exact_build,
+        "hnsw_build_s": hnsw_build,
+        "exact_p50_ms": percentile_ms(exact_latency, 50),
+        "exact_p95_ms": percentile_ms(exact_latency, 95),
+        "hnsw_p50_ms": percentile_ms(hnsw_latency, 50),
+        "hnsw_p95_ms": percentile_ms(hnsw_latency, 95),
+        "hnsw_recall": float(np.mean(recall)),
+        "exact_mb": exact.nbytes / 1e6,
+        "mmap_p50_ms": percentile_ms(mmap_latency, 50),
+        "mmap_p95_ms": percentile_ms(mmap_latency, 95),
+        "mmap_recall": float(np.mean(mmap_recall)),
+        "mmap_mb": mmap_mb,
+    }
+
+
+def vm_rss_mb() -> float:
+    """Resident set size of this process, from /proc (Linux only)."""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    raise RuntimeError("VmRSS not found in /proc/self/status")
+
+
+def measure_store_rss(store: str, n: int, args, results) -> None:
+    """
+    Store n chunks the way CodebaseIndexer does and report the RSS growth.
+
+    Runs in a child process so each store starts from the same baseline.
+
+    Args:
+        store: "chroma" (embeddings in HNSW) or "mmap" (placeholders in ChromaDB)
+        n: Number of chunks
+        args: Parsed command line arguments
+        results: Queue receiving (store, upsert seconds, RSS delta in MB)
+    """
+    rng = np.random.default_rng(args.seed)
+    vectors = make_embeddings(n, args.dim, rng)
+    ids = [f"chunk{i}" for i in range(n)]
+    documents = [f"def function_{i}(value):\n    return value + {i}\n" for i in range(n)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        client = chromadb.PersistentClient(
+            path=tmp,
+            settings=Settings(anonymized_telemetry=False)
+        )
+        metadata = MMAP_COLLECTION_METADATA if store == "mmap" else HNSW_METADATA
+        collection = client.create_collection(name="benchmark", metadata=metadata)
+        mmap_index = MmapVectorIndex(f"{tmp}/vectors", quantization=args.quantization)
+
+        baseline = vm_rss_mb()
+        start = time.perf_counter()
+        step = client.get_max_batch_size()
+        for i in range(0, n, step):
+            if store == "mmap":
+                collection.add(
+                    ids=ids[i:i + step],
+                    embeddings=[PLACEHOLDER_EMBEDDING] * len(ids[i:i + step]),
+                    documents=documents[i:i + step]
+                )
+                mmap_index.upsert(ids[i:i + step], vectors[i:i + step])
+            else:
+                collection.add(
+                    ids=ids[i:i + step],
+                    embeddings=vectors[i:i + step],
+                    documents=documents[i:i + step]
+                )
+        elapsed = time.perf_counter() - start
+
+        # Touch the index the way a search would
+        if store == "mmap":
+            mmap_index.search(vectors[:1], args.k)
+        else:
+            collection.query(query_embeddings=vectors[:1], n_results=args.k)
+
+        results.put((store, elapsed, vm_rss_mb() - baseline))
+        mmap_index.close()
+
+
+def benchmark_rss(args) -> None:
+    """Compare RSS and upsert time of chroma- and mmap-backed collections."""
+    table = Table(title=f"Collection memory, dim={args.dim}")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Store")
+    table.add_column("Upsert (s)", justify="right")
+    table.add_column("RSS growth (MB)", justify="right")
+
+    context = multiprocessing.get_context("spawn")
+    for n in args.sizes:
+        for store in ("chroma", "mmap"):
+            console.print(f"[cyan]Storing {n} chunks ({store})...[/cyan]")
+            results = context.Queue()
+            process = context.Process(target=measure_store_rss, args=(store, n, args, results))
+            process.start()
+            _, elapsed, rss = results.get()
+            process.join()
+            table.add_row(f"{n:,}", store, f"{elapsed:.1f}", f"{rss:+.0f}")
+
+    console.print(table)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark exact, mmap and HNSW vector search")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 50000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=100)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32")
+    parser.add_argument("--quantization", choices=["none", "int8", "binary"], default="int8")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument(
+        "--rss", action="store_true",
+        help="Measure memory of chroma- vs mmap-backed collections instead"
+    )
+    args = parser.parse_args()
+
+    if args.rss:
+        benchmark_rss(args)
+        return
+
+    rng = np.random.default_rng(args.seed)
+
+    table = Table(title=f"Exact ({args.dtype}) vs HNSW, dim={args.dim}, k={args.k}")
+    table.add_column("Chunks", justify="right")
+    table.add_column("Build exact/HNSW (s)", justify="right")
+    table.add_column("Exact p50/p95 (ms)", justify="right")
+    table.add_column("HNSW p50/p95 (ms)", justify="right")
+    table.add_column("HNSW recall@k", justify="right")
+    table.add_column("Exact matrix (MB)", justify="right")
+    table.add_column(f"Mmap {args.quantization} p50/p95 (ms)", justify="right")
+    table.add_column("Mmap recall@k", justify="right")
+    table.add_column("Mmap scanned (MB)", justify="right")
+
+    for n in args.sizes:
+        console.print(f"[cyan]Benchmarking {n} chunks...[/cyan]")
+        r = benchmark_size(n, args, rng)
+        table.add_row(
+            f"{r['n']:,}",
+            f"{r['exact_build_s']:.2f} / {r['hnsw_build_s']:.2f}",
+            f"{r['exact_p50_ms']:.2f} / {r['exact_p95_ms']:.2f}",
+            f"{r['hnsw_p50_ms']:.2f} / {r['hnsw_p95_ms']:.2f}",
+            f"{r['hnsw_recall']:.3f}",
+            f"{r['exact_mb']:.1f}",
+            f"{r['mmap_p50_ms']:.2f} / {r['mmap_p95_ms']:.2f}",
+            f"{r['mmap_recall']:.3f}",
+            f"{r['mmap_mb']:.1f}",
+        )
+
+    console.print(table)
+
+
+if __name__ == "__main__":
+    main()
@@ -162,3 +162,41 @@ async def test_chunk_to_dict(chunker, parsed_python_file):
         assert 'language' in chunk_dict
         assert 'chunk_type' in chunk_dict
         assert 'line_range' in chunk_dict
+
+
+@pytest.mark.asyncio
+async def test_chunk_ids_deterministic(chunker, parser, parsed_python_file):
+    """Test that chunk IDs are stable and only change with the chunk."""
+    first = await chunker.chunk_file(parsed_python_file)
+    second = await chunker.chunk_file(parsed_python_file)
+
+    assert [c.id for c in first] == [c.id for c in second]
+    assert len({c.id for c in first}) == len(first)
+
+    methods = {c.qualified_name: c.id for c in first if c.chunk_type == ChunkType.METHOD}
+    assert "Person.say_hello" in methods
+
+    # Edit one method; the other keeps its ID
+    filepath = Path(parsed_python_file.filepath)
+    filepath.write_text(filepath.read_text().replace("Say hello.", "Say hi."))
+    edited = await chunker.chunk_file(await parser.parse_file(str(filepath)))
+    edited_methods = {c.qualified_name: c.id for c in edited if c.chunk_type == ChunkType.METHOD}
+
+    assert edited_methods["Person.__init__"] == methods["Person.__init__"]
+    assert edited_methods["Person.say_hello"] != methods["Person.say_hello"]
+
+
+@pytest.mark.asyncio
+async def test_duplicate_chunks_get_distinct_ids(chunker, parser, tmp_path):
+    """Test that identical redefinitions don't share an ID."""
+    filepath = tmp_path / "dupes.py"
+    filepath.write_text('''def handler():
+    return 1
+
+def handler():
+    return 1
+''')
+
+    chunks = await chunker.chunk_file(await parser.parse_file(str(filepath)))
+
+    assert len({c.id for c in chunks}) == len(chunks)
@@ -0,0 +1,227 @@
+"""Tests for the import/call code graph."""
+
+import pytest
+
+from marunochithe.code_understanding.code_graph import CodeGraph
+from marunochithe.code_understanding.hybrid_searcher import HybridSearcher
+from marunochithe.code_understanding.indexer import CodebaseIndexer
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.models import ChunkType, CodeChunk, Language
+
+
+def chunk(chunk_id, filepath, name, chunk_type, calls="", imports="", qualified_name=None):
+    return CodeChunk(
+        id=chunk_id,
+        content=f"{chunk_type} {name}",
+        filepath=filepath,
+        language=Language.PYTHON,
+        chunk_type=ChunkType(chunk_type),
+        name=name,
+        qualified_name=qualified_name or name,
+        calls=calls.split(),
+        imports=imports.split(),
+    )
+
+
+async def edges(keyword_indexer):
+    """Stored edges, as (source, target, weight) chunk ID tuples."""
+    cursor = await keyword_indexer.db.execute(f"""
+        SELECT s.chunk_id, t.chunk_id, e.weight
+        FROM {keyword_indexer.graph_edges_table} e
+        JOIN {keyword_indexer.metadata_table} s ON s.id = e.source
+        JOIN {keyword_indexer.metadata_table} t ON t.id = e.target
+    """)
+    return sorted(await cursor.fetchall())
+
+
+def test_code_graph_updated():
+    """Test that edge changes patch a copy of the graph, duplicates included."""
+    graph = CodeGraph.build(None, "chunks", [(1, 2, 1.0), (2, 1, 1.0), (2, 3, 0.5)])
+
+    def edges(graph, node):
+        neighbors, weights = graph._node_edges(node)
+        return sorted(zip(neighbors.tolist(), weights.tolist()))
+
+    assert edges(graph, 2) == [(1, 1.0), (1, 1.0), (3, 0.5)]
+
+    updated = graph.updated([
+        (2, 1, 1.0, -1),
+        (2, 3, 0.5, -1), (2, 3, 0.5, 1),
+        (3, 7, 1.0, 1),
+    ])
+    assert edges(updated, 2) == [(1, 1.0), (3, 0.5)]
+    assert edges(updated, 1) == [(2, 1.0)]
+    assert edges(updated, 3) == [(2, 0.5), (7, 1.0)]
+    assert edges(updated, 7) == [(3, 1.0)]
+    assert set(updated.changes) == {1, 2, 3, 7}
+
+    # The original is untouched
+    assert edges(graph, 2) == [(1, 1.0), (1, 1.0), (3, 0.5)]
+    assert not graph.changes
+
+
+@pytest.mark.asyncio
+async def test_graph_resolves_calls_imports_and_containment(tmp_path):
+    """Test that stored references become edges between chunks."""
+    keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    await keyword_indexer.index_chunks([
+        chunk("app", "/src/pkg/app.py", "app.py", "file", imports="pkg.auth .models os"),
+        chunk("main", "/src/pkg/app.py", "main", "function", calls="login print"),
+        chunk("auth", "/src/pkg/auth.py", "auth.py", "file"),
+        chunk("login", "/src/pkg/auth.py", "login", "function", calls="User"),
+        chunk("models", "/src/pkg/models.py", "models.py", "file"),
+        chunk("User", "/src/pkg/models.py", "User", "class"),
+        chunk("save", "/src/pkg/models.py", "save", "method", qualified_name="User.save"),
+    ])
+    graph = await keyword_indexer.get_graph()
+
+    try:
+        assert set(await graph.neighbors("app")) == {"main", "auth", "models"}
+        assert set(await graph.neighbors("login")) == {"auth", "main", "User"}
+        assert set(await graph.neighbors("save")) == {"User"}
+        assert await graph.neighbors("unknown") == []
+
+        # Callees and callers rank above more distant code
+        ranked = await graph.expand(["main"], limit=10)
+        assert ranked[0][0] == "login"
+        assert "User" in [chunk_id for chunk_id, _ in ranked]
+        assert await graph.expand(["main"], limit=10, language="rust") == []
+    finally:
+        await keyword_indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_ambiguous_calls_prefer_local_definitions(tmp_path):
+    """Test that calls resolve to same-file definitions, and common names are skipped."""
+    chunks = [chunk("caller", "/src/a.py", "caller", "function", calls="get helper")]
+    chunks += [chunk(f"get{i}", f"/src/m{i}.py", "get", "method") for i in range(20)]
+    chunks += [
+        chunk("helper", "/src/a.py", "helper", "function"),
+        chunk("helper_b", "/src/b.py", "helper", "function"),
+    ]
+
+    keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await keyword_indexer.index_chunks(chunks)
+        graph = await keyword_indexer.get_graph()
+        assert await graph.neighbors("caller") == ["helper"]
+    finally:
+        await keyword_indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_graph_updates_incrementally(tmp_path):
+    """Test that writes leave the same edges as resolving everything again."""
+    keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        async with keyword_indexer.bulk_load():
+            await keyword_indexer.index_chunks([
+                chunk("app", "/src/app.py", "app.py", "file", imports="lib .util"),
+                chunk("main", "/src/app.py", "main", "function", calls="parse render"),
+                chunk("lib", "/src/lib.py", "lib.py", "file"),
+                chunk("parse", "/src/lib.py", "parse", "function"),
+            ] + [
+                chunk(f"render{i}", f"/src/r{i}.py", "render", "function") for i in range(8)
+            ])
+        graph = await keyword_indexer.get_graph()
+        assert set(await graph.neighbors("main")) >= {"app", "parse", "render0"}
+
+        # A ninth definition makes "render" too ambiguous to link
+        await keyword_indexer.index_chunks([
+            chunk("render8", "/src/r8.py", "render", "function"),
+        ])
+        # Graphs are snapshots; get_graph() patches in the changed edges
+        assert set(await graph.neighbors("main")) >= {"app", "parse", "render0"}
+        graph = await keyword_indexer.get_graph()
+        assert set(await graph.neighbors("main")) == {"app", "parse"}
+
+        # New files are linked to their importers, deleted ones unlinked
+        await keyword_indexer.index_chunks([
+            chunk("util", "/src/util.py", "util.py", "file"),
+            chunk("parse2", "/src/util.py", "parse", "function"),
+        ])
+        graph = await keyword_indexer.get_graph()
+        assert "util" in await graph.neighbors("app")
+        await keyword_indexer.delete_file("/src/lib.py")
+        await keyword_indexer.delete_chunks(["render8"])
+        graph = await keyword_indexer.get_graph()
+        assert set(await graph.neighbors("main")) == {"app", "parse2"} | {
+            f"render{i}" for i in range(8)
+        }
+
+        # A local definition takes over calls from the same file
+        await keyword_indexer.index_chunks([
+            chunk("parse3", "/src/app.py", "parse", "function"),
+        ])
+
+        incremental = await edges(keyword_indexer)
+        patched = await keyword_indexer.get_graph()
+        assert patched.changes
+
+        await keyword_indexer._rebuild_graph()
+        assert incremental == await edges(keyword_indexer)
+        assert ("main", "parse3", 1.0) in incremental
+
+        rebuilt = await keyword_indexer.get_graph()
+        assert not rebuilt.changes
+        for chunk_id in {source for source, _, _ in incremental}:
+            assert sorted(await patched.neighbors(chunk_id)) == sorted(
+                await rebuilt.neighbors(chunk_id)
+            )
+            assert dict(await patched.expand([chunk_id], 10)) == pytest.approx(
+                dict(await rebuilt.expand([chunk_id], 10))
+            )
+    finally:
+        await keyword_indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_graph_search_mode(tmp_path):
+    """Test that graph mode surfaces code called by the best matches."""
+    codebase = tmp_path / "code"
+    codebase.mkdir()
+    (codebase / "billing.py").write_text(
+        "from ledger import post_entry\n\n"
+        "def charge_invoice(invoice):\n"
+        "    \"\"\"Charge an invoice.\"\"\"\n"
+        "    return post_entry(invoice.total)\n"
+    )
+    (codebase / "ledger.py").write_text(
+        "def post_entry(amount):\n"
+        "    return amount\n"
+    )
+
+    keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    indexer = CodebaseIndexer(
+        collection_name="test_graph",
+        persist_directory=str(tmp_path / "vectors"),
+        keyword_indexer=keyword_indexer
+    )
+    try:
+        await indexer.index_codebase(str(codebase))
+        searcher = HybridSearcher(vector_indexer=indexer, keyword_indexer=keyword_indexer)
+
+        graph_scores = {
+            r.name: r.similarity
+            for r in await searcher.search("charge_invoice", mode="graph", limit=10)
+        }
+        hybrid_scores = {
+            r.name: r.similarity
+            for r in await searcher.search("charge_invoice", mode="hybrid", limit=10)
+        }
+        assert max(graph_scores, key=graph_scores.get) == "charge_invoice"
+        assert graph_scores["post_entry"] > hybrid_scores.get("post_entry", 0.0)
+
+        graph = await keyword_indexer.get_graph()
+        [charge_invoice] = await keyword_indexer.lookup_symbol("charge_invoice")
+        [post_entry] = await keyword_indexer.lookup_symbol("post_entry")
+        assert post_entry.chunk_id in await graph.neighbors(charge_invoice.chunk_id)
+
+        # Writes update the stored edges
+        await keyword_indexer.delete_file(str((codebase / "ledger.py").resolve()))
+        graph = await keyword_indexer.get_graph()
+        assert post_entry.chunk_id not in await graph.neighbors(charge_invoice.chunk_id)
+
+    finally:
+        await indexer.close()
+        await keyword_indexer.close()
@@ -0,0 +1,60 @@
+"""Tests for identifier-aware keyword tokenization."""
+
+import pytest
+
+from marunochithe.code_understanding.code_tokenizer import (
+    expand_identifiers,
+    split_identifier,
+)
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.models import CodeChunk, Language
+
+
+def test_split_identifier():
+    """Test camelCase, snake_case, acronym and digit boundaries."""
+    assert split_identifier("getUserById") == ["get", "user", "by", "id"]
+    assert split_identifier("get_user_by_id") == ["get", "user", "by", "id"]
+    assert split_identifier("HTTPServer2") == ["http", "server", "2"]
+    assert split_identifier("base64Encode") == ["base", "64", "encode"]
+    assert split_identifier("parse") == ["parse"]
+
+
+def test_expand_identifiers_keeps_original():
+    """Test that expanded text keeps the identifier and adds its parts."""
+    expanded = expand_identifiers("def getUserById(user_id): pass")
+    assert expanded.startswith("def getUserById(user_id): pass")
+    assert expanded.endswith("get user by id user id")
+    assert expand_identifiers("plain words") == "plain words"
+
+
+def chunk(chunk_id, name, content):
+    return CodeChunk(
+        id=chunk_id, name=name, content=content,
+        filepath=f"/src/{chunk_id}.py", language=Language.PYTHON
+    )
+
+
+@pytest.mark.asyncio
+async def test_identifier_queries_match_across_styles(tmp_path):
+    """Test that camelCase and snake_case identifiers find each other."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await indexer.index_chunks([
+            chunk("camel", "getUserById", "def getUserById(uid): return db.load(uid)"),
+            chunk("snake", "get_user_by_id", "def get_user_by_id(uid): return None"),
+            chunk("other", "render", "def render(template): return template"),
+        ])
+
+        for query in ("getUserById", "get_user_by_id", "user id"):
+            ids = {chunk_id for chunk_id, _ in await indexer.search(query)}
+            assert ids == {"camel", "snake"}, query
+
+        # The whole identifier still ranks its own spelling first
+        results = await indexer.search("get_user_by_id")
+        assert results[0][0] == "snake"
+
+        # Invalid syntax still fails softly
+        assert await indexer.search('bad "quote') == []
+
+    finally:
+        await indexer.close()
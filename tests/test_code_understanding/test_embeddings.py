@@ -0,0 +1,139 @@
+"""Tests for embedding providers and the embedding cache."""
+
+import pytest
+
+from marunochithe.code_understanding.embeddings import (
+    EmbeddingCache,
+    EmbeddingProvider,
+    content_hash,
+    create_embedding_provider,
+)
+from marunochithe.code_understanding.indexer import CodebaseIndexer
+
+
+class CountingProvider(EmbeddingProvider):
+    """Deterministic provider that records what it embeds."""
+
+    def __init__(self, model_id: str = "test:counting", batch_size: int = 4):
+        super().__init__(batch_size)
+        self.model_id = model_id
+        self.embedded = []
+        self.batches = 0
+
+    def _embed_batch(self, texts):
+        self.batches += 1
+        self.embedded.extend(texts)
+        return [[float(len(t) % 7) + 1.0, float(t.count("def")) + 1.0, 1.0] for t in texts]
+
+
+@pytest.fixture
+def temp_codebase(tmp_path):
+    """Create a temporary codebase."""
+    codebase = tmp_path / "codebase"
+    codebase.mkdir()
+
+    (codebase / "math_utils.py").write_text('''"""Math helpers."""
+
+def add(a, b):
+    """Add two numbers."""
+    return a + b
+
+def multiply(a, b):
+    """Multiply two numbers."""
+    return a * b
+''')
+
+    return codebase
+
+
+def test_provider_batches():
+    """Test that embed splits input into batch_size calls."""
+    provider = CountingProvider(batch_size=2)
+
+    vectors = provider.embed(["a", "bb", "ccc", "dddd", "e"])
+
+    assert len(vectors) == 5
+    assert provider.batches == 3
+
+
+def test_unknown_provider():
+    """Test that an unknown provider name is rejected."""
+    with pytest.raises(ValueError):
+        create_embedding_provider("does-not-exist")
+
+
+@pytest.mark.asyncio
+async def test_cache_roundtrip(tmp_path):
+    """Test storing and loading vectors by model and content hash."""
+    cache = EmbeddingCache(str(tmp_path / "cache.db"))
+    digest = content_hash("def foo(): pass")
+
+    await cache.put_many("model-a", [(digest, [0.5, 0.25, 1.0])])
+
+    assert await cache.get_many("model-a", [digest]) == {digest: [0.5, 0.25, 1.0]}
+    assert await cache.get_many("model-b", [digest]) == {}
+
+    await cache.clear("model-a")
+    assert await cache.get_many("model-a", [digest]) == {}
+
+    await cache.close()
+
+
+@pytest.mark.asyncio
+async def test_reindex_reuses_cached_embeddings(tmp_path, temp_codebase):
+    """Test that unchanged chunk text is never embedded twice."""
+    provider = CountingProvider()
+    indexer = CodebaseIndexer(
+        collection_name="test_embed_cache",
+        persist_directory=str(tmp_path / "db"),
+        embedding_provider=provider
+    )
+
+    await indexer.index_codebase(str(temp_codebase))
+    first_count = len(provider.embedded)
+    assert first_count > 0
+
+    # Clearing the index drops vectors, not the embedding cache
+    await indexer.clear_index()
+    result = await indexer.index_codebase(str(temp_codebase))
+
+    assert result['indexed_chunks'] == first_count
+    assert len(provider.embedded) == first_count
+
+    # Search embeds the query with the same provider
+    results = await indexer.search("add two numbers", limit=2)
+    assert len(results) > 0
+
+    await indexer.clear_index()
+    await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_model_change_rebuilds_index(tmp_path, temp_codebase):
+    """Test that switching models rebuilds the collection."""
+    db_path = str(tmp_path / "db")
+
+    indexer = CodebaseIndexer(
+        collection_name="test_embed_model",
+        persist_directory=db_path,
+        embedding_provider=CountingProvider("test:model-a")
+    )
+    await indexer.index_codebase(str(temp_codebase))
+    await indexer.close()
+
+    provider_b = CountingProvider("test:model-b")
+    indexer = CodebaseIndexer(
+        collection_name="test_embed_model",
+        persist_directory=db_path,
+        embedding_provider=provider_b
+    )
+
+    assert (await indexer.get_stats())['total_chunks'] == 0
+
+    result = await indexer.index_codebase(str(temp_codebase))
+    assert result['unchanged_files'] == 0
+    assert result['indexed_chunks'] > 0
+    assert len(provider_b.embedded) == result['indexed_chunks']
+
+    await indexer.clear_index()
+    await indexer.close()
@@ -0,0 +1,138 @@
+"""Tests for the exact vector search backend."""
+
+import numpy as np
+import pytest
+
+from marunochithe.code_understanding.exact_search import ExactVectorIndex
+from marunochithe.code_understanding.indexer import CodebaseIndexer
+
+
+def _brute_force(vectors, ids, query, k):
+    """Reference top-k by cosine similarity."""
+    matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    scores = matrix @ (query / np.linalg.norm(query))
+    order = np.argsort(-scores)[:k]
+    return [ids[i] for i in order]
+
+
+@pytest.fixture
+def temp_codebase(tmp_path):
+    """Create a temporary codebase."""
+    codebase = tmp_path / "codebase"
+    codebase.mkdir()
+
+    (codebase / "auth.py").write_text('''"""Authentication."""
+
+def login(username, password):
+    """Check user credentials."""
+    return username == "admin" and password == "secret"
+
+def logout(session):
+    """End a user session."""
+    session.clear()
+''')
+
+    (codebase / "strings.py").write_text('''"""String helpers."""
+
+def reverse(text):
+    """Reverse a string."""
+    return text[::-1]
+''')
+
+    return codebase
+
+
+@pytest.mark.parametrize("dtype", ["float32", "float16"])
+def test_search_matches_brute_force(dtype):
+    """Test top-k against a reference, across several blocks."""
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(500, 16)).astype(np.float32)
+    ids = [f"chunk{i}" for i in range(500)]
+
+    index = ExactVectorIndex(dtype=dtype, block_size=64)
+    index.upsert(ids, vectors)
+
+    queries = rng.normal(size=(3, 16)).astype(np.float32)
+    results = index.search(queries, k=10)
+
+    for query, hits in zip(queries, results):
+        expected = _brute_force(vectors, ids, query, 10)
+        found = [chunk_id for chunk_id, _ in hits]
+        # float16 rounding may swap near-ties
+        assert len(set(found) & set(expected)) >= (10 if dtype == "float32" else 9)
+        assert [score for _, score in hits] == sorted((score for _, score in hits), reverse=True)
+
+
+def test_upsert_and_delete():
+    """Test that replaced and deleted rows stay consistent."""
+    index = ExactVectorIndex()
+    index.upsert(["a", "b", "c"], [[1.0, 0.0], [0.0, 1.0], [1.0, 1.0]])
+
+    # Replace "a", delete "b" (moves "c" into its row)
+    index.upsert(["a"], [[0.0, -1.0]])
+    index.delete(["b", "missing"])
+
+    assert len(index) == 2
+    assert [chunk_id for chunk_id, _ in index.search([[1.0, 1.0]], k=5)[0]] == ["c", "a"]
+    assert index.search([[0.0, -1.0]], k=1)[0][0][0] == "a"
+
+    index.clear()
+    assert index.search([[1.0, 0.0]], k=3) == [[]]
+
+
+@pytest.mark.asyncio
+async def test_exact_backend_matches_chroma(tmp_path, temp_codebase):
+    """Test that exact and HNSW backends rank the same on a small index."""
+    indexer = CodebaseIndexer(
+        collection_name="test_exact_backend",
+        persist_directory=str(tmp_path / "db"),
+        vector_backend="exact"
+    )
+    await indexer.index_codebase(str(temp_codebase))
+
+    exact = await indexer.search("check user credentials", limit=3)
+    assert indexer.get_vector_backend_stats()['active'] == 'exact'
+
+    # Hits are hydrated through the chunk cache
+    hits = indexer.chunk_cache.hits
+    await indexer.search("check user credentials", limit=3)
+    assert indexer.chunk_cache.hits == hits + 3
+
+    indexer.vector_backend = "chroma"
+    hnsw = await indexer.search("check user credentials", limit=3)
+
+    assert [r.chunk_id for r in exact] == [r.chunk_id for r in hnsw]
+    for a, b in zip(exact, hnsw):
+        assert a.similarity == pytest.approx(b.similarity, abs=1e-4)
+
+    await indexer.clear_index()
+    await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_auto_backend_switches_by_size(tmp_path, temp_codebase):
+    """Test that auto mode uses HNSW once the index outgrows the limit."""
+    indexer = CodebaseIndexer(
+        collection_name="test_auto_backend",
+        persist_directory=str(tmp_path / "db"),
+        vector_backend="auto",
+        exact_search_max_chunks=100
+    )
+    await indexer.index_codebase(str(temp_codebase))
+
+    await indexer.search("reverse a string", limit=2)
+    assert indexer.get_vector_backend_stats()['active'] == 'exact'
+
+    # Writes keep the loaded index in sync
+    exact_size = len(indexer.vector_index)
+    (temp_codebase / "extra.py").write_text("def extra():\n    return 1\n")
+    await indexer.index_codebase(str(temp_codebase))
+    assert len(indexer.vector_index) > exact_size
+
+    indexer.exact_search_max_chunks = 1
+    results = await indexer.search("reverse a string", limit=2)
+    assert len(results) > 0
+    assert indexer.get_vector_backend_stats()['active'] == 'chroma'
+
+    await indexer.clear_index()
+    await indexer.close()
@@ -0,0 +1,98 @@
+"""Tests for FileDiscovery."""
+
+import pytest
+
+from marunochithe.code_understanding.file_discovery import (
+    FileDiscovery,
+    is_ignored,
+    parse_ignore_lines,
+)
+
+
+@pytest.fixture
+def temp_codebase(tmp_path):
+    """Create a codebase with excluded dirs and ignore files."""
+    codebase = tmp_path / "codebase"
+    (codebase / "src" / "pkg").mkdir(parents=True)
+    (codebase / "node_modules" / "dep").mkdir(parents=True)
+    (codebase / "generated").mkdir()
+    (codebase / "logs").mkdir()
+
+    (codebase / "main.py").write_text("print('main')")
+    (codebase / "notes.md").write_text("# notes")
+    (codebase / "src" / "app.ts").write_text("export const a = 1;")
+    (codebase / "src" / "pkg" / "core.py").write_text("x = 1")
+    (codebase / "src" / "pkg" / "core_pb2.py").write_text("x = 2")
+    (codebase / "src" / "pkg" / "keep_pb2.py").write_text("x = 3")
+    (codebase / "node_modules" / "dep" / "index.js").write_text("module.exports = {}")
+    (codebase / "generated" / "models.py").write_text("y = 1")
+    (codebase / "logs" / "rotate.py").write_text("z = 1")
+
+    (codebase / ".gitignore").write_text("# build output\ngenerated/\n*_pb2.py\n")
+    (codebase / "src" / "pkg" / ".gitignore").write_text("!keep_pb2.py\n")
+    (codebase / ".ignore").write_text("/logs\n")
+
+    return codebase
+
+
+def _relative(codebase, paths):
+    return sorted(str(p.relative_to(codebase)) for p in paths)
+
+
+def test_pattern_rules():
+    """Test anchoring, directory-only, wildcards and negation."""
+    rules = parse_ignore_lines([
+        "*.log",
+        "/build",
+        "docs/**/tmp",
+        "cache/",
+        "!important.log",
+    ])
+
+    assert is_ignored(rules, "a/b/debug.log", False)
+    assert not is_ignored(rules, "a/important.log", False)
+    assert is_ignored(rules, "build", True)
+    assert not is_ignored(rules, "src/build", True)
+    assert is_ignored(rules, "docs/tmp", True)
+    assert is_ignored(rules, "docs/a/b/tmp", True)
+    assert is_ignored(rules, "x/cache", True)
+    assert not is_ignored(rules, "x/cache", False)
+
+
+def test_find_files_prunes_and_ignores(temp_codebase):
+    """Test that excluded dirs and ignore rules are applied."""
+    files = FileDiscovery(temp_codebase, ['.py', '.ts', '.js']).find_files()
+
+    assert _relative(temp_codebase, files) == [
+        "main.py",
+        "src/app.ts",
+        "src/pkg/core.py",
+        "src/pkg/keep_pb2.py",
+    ]
+
+
+def test_find_files_without_ignore_files(temp_codebase):
+    """Test that ignore files can be disabled."""
+    files = FileDiscovery(temp_codebase, ['.py'], use_ignore_files=False).find_files()
+
+    relative = _relative(temp_codebase, files)
+    assert "generated/models.py" in relative
+    assert "logs/rotate.py" in relative
+    assert not any(p.startswith("node_modules") for p in relative)
+
+
+def test_threaded_walk_matches_serial(temp_codebase):
+    """Test that fanning out across threads finds the same files."""
+    discovery = FileDiscovery(temp_codebase, ['.py', '.ts', '.js'])
+
+    assert discovery.find_files(max_workers=4) == discovery.find_files()
+
+
+def test_matches_single_file(temp_codebase):
+    """Test that per-file checks agree with the walk."""
+    discovery = FileDiscovery(temp_codebase, ['.py', '.ts', '.js'])
+    found = set(discovery.find_files())
+
+    for path in temp_codebase.rglob("*"):
+        if path.is_file():
+            assert discovery.matches(path) == (path in found), path
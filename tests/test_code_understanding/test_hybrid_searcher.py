@@ -103,6 +103,7 @@ async def hybrid_searcher(tmp_path, temp_codebase):
 
     # Cleanup
     await vector_indexer.clear_index()
+    await vector_indexer.close()
     await keyword_indexer.clear_index()
     await keyword_indexer.close()
 
@@ -285,3 +286,161 @@ async def test_fallback_to_vector(tmp_path, temp_codebase):
     assert len(results) > 0
 
     await vector_indexer.clear_index()
+    await vector_indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_search_many_matches_single_queries(hybrid_searcher):
+    """Test that batched search returns the same results as one-by-one search."""
+    queries = ["authenticate_user", "database connection", "reverse string"]
+
+    for mode in ("vector", "keyword", "hybrid"):
+        batched = await hybrid_searcher.search_many(queries, mode=mode, limit=3)
+        assert len(batched) == len(queries)
+
+        for query, results in zip(queries, batched):
+            single = await hybrid_searcher.search(query, mode=mode, limit=3)
+            assert [r.chunk_id for r in results] == [r.chunk_id for r in single]
+
+
+@pytest.mark.asyncio
+async def test_search_many_invalid_keyword_query(hybrid_searcher):
+    """Test that one malformed FTS5 query does not fail the batch."""
+    batched = await hybrid_searcher.keyword_indexer.search_many(
+        ["authenticate_user", 'bad "quote'], limit=5
+    )
+
+    assert len(batched[0]) > 0
+    assert batched[1] == []
+
+
+@pytest.mark.asyncio
+async def test_substring_and_regex_modes(hybrid_searcher):
+    """Test exact-match search modes return full results."""
+    results = await hybrid_searcher.search("sqlite3.connect(", mode="substring", limit=5)
+    assert results and all("sqlite3.connect(" in r.content for r in results)
+
+    batches = await hybrid_searcher.search_many(
+        [r"def \w+_user\(", "no_such_fragment"], mode="regex", limit=5
+    )
+    assert {r.name for r in batches[0]} >= {"create_user", "delete_user"}
+    assert batches[1] == []
+
+    with pytest.raises(ValueError):
+        await hybrid_searcher.search("(", mode="regex")
+
+
+@pytest.mark.asyncio
+async def test_results_are_hydrated_from_chunk_cache(hybrid_searcher, temp_codebase):
+    """Test that repeated results come from the chunk cache until rewritten."""
+    cache = hybrid_searcher.vector_indexer.chunk_cache
+
+    first = await hybrid_searcher.search("authenticate user", mode="keyword", limit=5)
+    assert first
+    hits = cache.get_stats()['hits']
+
+    hybrid_searcher.result_cache.clear()
+    again = await hybrid_searcher.search("authenticate user", mode="keyword", limit=5)
+    assert [(r.chunk_id, r.content) for r in again] == [(r.chunk_id, r.content) for r in first]
+    assert cache.get_stats()['hits'] == hits + len(first)
+
+    assert any(r.filepath.endswith("main.py") for r in first)
+
+    # Deleted chunks leave the cache with the collection
+    await hybrid_searcher.vector_indexer.delete_file(str(temp_codebase / "main.py"))
+    chunks = await hybrid_searcher.vector_indexer.get_chunks([r.chunk_id for r in first])
+    assert not any(r.filepath.endswith("main.py") and r.chunk_id in chunks for r in first)
+
+
+@pytest.mark.asyncio
+async def test_result_cache_follows_index_writes(hybrid_searcher, temp_codebase):
+    """Test that repeated searches are cached until either index is written."""
+    cache = hybrid_searcher.result_cache
+
+    first = await hybrid_searcher.search("connect  database", limit=5)
+    assert first
+    again = await hybrid_searcher.search(" connect database ", limit=5)
+    assert [r.chunk_id for r in again] == [r.chunk_id for r in first]
+    assert cache.get_stats()['hits'] == 1
+
+    batched = await hybrid_searcher.search_many(["connect database", "reverse string"], limit=5)
+    assert [r.chunk_id for r in batched[0]] == [r.chunk_id for r in first]
+    assert cache.get_stats()['hits'] == 2
+
+    # A keyword index write alone invalidates
+    before = await hybrid_searcher.search("connect database", mode="keyword", limit=5)
+    assert any(r.filepath.endswith("database.py") for r in before)
+
+    await hybrid_searcher.keyword_indexer.delete_file(str(temp_codebase / "database.py"))
+    after = await hybrid_searcher.search("connect database", mode="keyword", limit=5)
+    assert not any(r.filepath.endswith("database.py") for r in after)
+    assert cache.get_stats()['hits'] == 2
+
+
+async def test_failed_keyword_search_is_not_cached(hybrid_searcher, monkeypatch):
+    """Test that a transient keyword index error is not served from the cache."""
+    def busy_reader():
+        raise RuntimeError("database is locked")
+
+    monkeypatch.setattr(hybrid_searcher.keyword_indexer, "_reader", busy_reader)
+    assert await hybrid_searcher.search("reverse string", mode="keyword") == []
+    assert hybrid_searcher.keyword_indexer.search_failures == 1
+
+    monkeypatch.undo()
+    assert await hybrid_searcher.search("reverse string", mode="keyword")
+
+
+@pytest.mark.asyncio
+async def test_symbol_queries_skip_retrieval(hybrid_searcher, monkeypatch):
+    """Test that defined identifiers are answered by symbol lookup alone."""
+    async def no_vector_search(*args, **kwargs):
+        raise AssertionError("vector search should not run")
+
+    monkeypatch.setattr(hybrid_searcher, "_vector_search", no_vector_search)
+    monkeypatch.setattr(hybrid_searcher, "_vector_search_many", no_vector_search)
+
+    results = await hybrid_searcher.search("UserManager.create_user")
+    assert [r.name for r in results] == ["create_user"]
+    assert results[0].similarity == 1.0
+
+    batched = await hybrid_searcher.search_many(["reverse_string", "connect_database"])
+    assert [[r.name for r in results] for results in batched] == [
+        ["reverse_string"], ["connect_database"]
+    ]
+
+    # Unknown identifiers fall back to full hybrid search
+    monkeypatch.undo()
+    assert await hybrid_searcher.search("authenticate", limit=3)
+
+
+
+@pytest.mark.asyncio
+async def test_plain_word_symbol_queries_use_full_search(hybrid_searcher, tmp_path):
+    """Test that a plain word naming a definition still gets hybrid results."""
+    from marunochithe.code_understanding.parser import CodeParser
+    from marunochithe.code_understanding.chunker import CodeChunker
+
+    auth = tmp_path / "auth.py"
+    auth.write_text(
+        "def login(username, password):\n"
+        "    return authenticate_user(username, password)\n"
+    )
+    parsed = await CodeParser().parse_file(str(auth))
+    await hybrid_searcher.keyword_indexer.index_chunks(await CodeChunker().chunk_file(parsed))
+
+    # Symbol lookup alone would answer with just the definition
+    assert await hybrid_searcher.keyword_indexer.lookup_symbol("login", 5)
+    results = await hybrid_searcher.search("login", limit=5)
+    assert len(results) > 1
+
+async def test_search_symbols(hybrid_searcher):
+    """Test typo-tolerant symbol search and its keyword index requirement."""
+    results = await hybrid_searcher.search_symbols("UserManger.create")
+    assert [r.name for r in results] == ["create_user"]
+
+    results = await hybrid_searcher.search_symbols("connect_databse")
+    assert results[0].name == "connect_database"
+
+    searcher = HybridSearcher(vector_indexer=hybrid_searcher.vector_indexer)
+    with pytest.raises(ValueError):
+        await searcher.search_symbols("UserManager")
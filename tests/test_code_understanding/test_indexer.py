@@ -1,5 +1,6 @@
 """Tests for CodebaseIndexer."""
 
+import asyncio
 import pytest
 import tempfile
 import shutil
@@ -70,6 +71,7 @@ async def indexer(tmp_path):
     # Cleanup
     try:
         await indexer.clear_index()
+        await indexer.close()
     except:
         pass
 
@@ -247,3 +249,205 @@ async def test_search_no_results(indexer, temp_codebase):
     # Should return results (even if not perfect matches)
     # or empty list if no results
     assert isinstance(results, list)
+
+
+@pytest.mark.asyncio
+async def test_reindex_skips_unchanged(indexer, temp_codebase):
+    """Test that re-indexing an unchanged codebase processes no files."""
+    first = await indexer.index_codebase(str(temp_codebase))
+    stats_before = await indexer.get_stats()
+
+    second = await indexer.index_codebase(str(temp_codebase))
+    stats_after = await indexer.get_stats()
+
+    assert first['added_files'] == 3
+    assert second['unchanged_files'] == 3
+    assert second['total_chunks'] == 0
+    # No duplicate chunks pile up
+    assert stats_after['total_chunks'] == stats_before['total_chunks']
+
+
+@pytest.mark.asyncio
+async def test_reindex_changed_and_deleted_files(indexer, temp_codebase):
+    """Test that re-indexing picks up changed and deleted files only."""
+    await indexer.index_codebase(str(temp_codebase))
+
+    (temp_codebase / "utils.py").write_text('''"""Updated utils."""
+
+def subtract(a: int, b: int) -> int:
+    """Subtract b from a."""
+    return a - b
+''')
+    (temp_codebase / "lib" / "helper.py").unlink()
+
+    result = await indexer.index_codebase(str(temp_codebase))
+    stats = await indexer.get_stats()
+
+    assert result['changed_files'] == 1
+    assert result['deleted_files'] == 1
+    assert result['unchanged_files'] == 1
+    assert stats['total_files'] == 2
+
+    results = await indexer.search("subtract", limit=10)
+    assert not any(r.name == 'multiply' for r in results)
+
+
+@pytest.mark.asyncio
+async def test_streaming_batches(tmp_path, temp_codebase):
+    """Test that chunks are flushed in fixed-size batches with progress reports."""
+    indexer = CodebaseIndexer(
+        collection_name="test_streaming",
+        persist_directory=str(tmp_path / "stream_chroma"),
+        batch_size=2
+    )
+    progress = []
+
+    async def on_progress(status):
+        progress.append(status)
+
+    result = await indexer.index_codebase(str(temp_codebase), on_progress=on_progress)
+    stats = await indexer.get_stats()
+
+    assert len(progress) > 1
+    assert progress[-1]['indexed_chunks'] == result['indexed_chunks']
+    assert result['indexed_chunks'] == result['total_chunks']
+    assert stats['total_chunks'] == result['total_chunks']
+
+    await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_index_file_diffs_chunks(indexer, temp_codebase):
+    """Test that re-indexing a file only replaces the chunks that changed."""
+    await indexer.index_codebase(str(temp_codebase))
+
+    main_file = str((temp_codebase / "main.py").resolve())
+
+    async def file_chunks():
+        results = await indexer.executor.read(
+            indexer.collection.get,
+            where={"filepath": main_file},
+            include=['metadatas']
+        )
+        return {m['qualified_name']: chunk_id for chunk_id, m in zip(results['ids'], results['metadatas'])}
+
+    before = await file_chunks()
+
+    # Change one method body
+    (temp_codebase / "main.py").write_text(
+        (temp_codebase / "main.py").read_text().replace("Greetings", "Salutations")
+    )
+    added = []
+    original = indexer._index_chunks_batch
+
+    async def tracking_index(chunks):
+        added.extend(chunks)
+        return await original(chunks)
+
+    indexer._index_chunks_batch = tracking_index
+    result = await indexer.index_file(main_file)
+    after = await file_chunks()
+
+    assert result['chunks_added'] == len(after)
+    assert set(after) == set(before)
+    assert after['hello'] == before['hello']
+    assert after['Greeter.greet'] != before['Greeter.greet']
+
+    # Unchanged chunks were not re-embedded
+    added_names = {c.qualified_name for c in added}
+    assert {'Greeter', 'Greeter.greet'} <= added_names
+    assert 'hello' not in added_names
+    assert 'main.py' not in added_names
+
+
+@pytest.mark.asyncio
+async def test_stats_counters_match_scan(indexer, temp_codebase):
+    """Test that maintained counters agree with a full metadata scan."""
+    await indexer.index_codebase(str(temp_codebase))
+    assert await indexer.get_stats() == await indexer._scan_stats()
+
+    # Edit one file, delete another
+    (temp_codebase / "main.py").write_text('''def only_function():
+    return 1
+''')
+    await indexer.index_file(str((temp_codebase / "main.py").resolve()))
+    await indexer.delete_file(str((temp_codebase / "utils.py").resolve()))
+
+    stats = await indexer.get_stats()
+    assert stats == await indexer._scan_stats()
+    assert stats['total_files'] == 2
+
+
+@pytest.mark.asyncio
+async def test_reindex_codebase_swaps_generation(tmp_path, temp_codebase, monkeypatch):
+    """Test that a full reindex builds a new generation and drops the old one."""
+    from marunochithe.code_understanding import indexer as indexer_module
+    from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+
+    monkeypatch.setattr(indexer_module, "GENERATION_GRACE_SECONDS", 0)
+
+    db_path = str(tmp_path / "test_chroma")
+    keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    indexer = CodebaseIndexer(
+        collection_name="test_collection",
+        persist_directory=db_path,
+        keyword_indexer=keyword_indexer
+    )
+
+    try:
+        await indexer.index_codebase(str(temp_codebase))
+        before = await indexer.get_stats()
+
+        seen = []
+
+        async def on_progress(status):
+            # The live generation keeps answering during the rebuild
+            seen.append(await indexer.search("add two numbers", limit=1))
+
+        result = await indexer.reindex_codebase(str(temp_codebase), on_progress=on_progress)
+
+        assert seen and all(results for results in seen)
+        assert result['generation'] == "test_collection__g1"
+        assert indexer.active_collection_name == "test_collection__g1"
+        assert await indexer.get_stats() == before
+        assert await indexer.search("add two numbers", limit=1)
+        assert await keyword_indexer.search("multiply", limit=1)
+        assert keyword_indexer.table_suffix == "_g1"
+
+        # The old generation is dropped in the background
+        await asyncio.gather(*indexer._cleanup_tasks)
+        names = [c.name for c in indexer.client.list_collections()]
+        assert names == ["test_collection__g1"]
+        assert not (Path(db_path) / "test_collection.manifest.db").exists()
+
+        cursor = await keyword_indexer.db.execute(
+            "SELECT name FROM sqlite_master WHERE name = 'code_fts'"
+        )
+        assert await cursor.fetchone() is None
+
+        # A new indexer picks up the active generation
+        await indexer.close()
+        await keyword_indexer.close()
+
+        keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+        indexer = CodebaseIndexer(
+            collection_name="test_collection",
+            persist_directory=db_path,
+            keyword_indexer=keyword_indexer
+        )
+        assert indexer.active_collection_name == "test_collection__g1"
+        assert (await indexer.index_codebase(str(temp_codebase)))['unchanged_files'] == 3
+        assert await keyword_indexer.search("multiply", limit=1)
+
+    finally:
+        await indexer.close()
+        await keyword_indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_reindex_codebase_rejects_concurrent_runs(indexer, temp_codebase):
+    """Test that only one full reindex runs at a time."""
+    async with indexer._reindex_lock:
+        assert indexer.reindex_running
+        with pytest.raises(RuntimeError):
+            await indexer.reindex_codebase(str(temp_codebase))
@@ -0,0 +1,268 @@
+"""Tests for KeywordIndexer storage and connection handling."""
+
+import asyncio
+
+import aiosqlite
+import pytest
+
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.models import ChunkType, CodeChunk, Language
+
+
+def make_chunk(chunk_id, content):
+    return CodeChunk(
+        id=chunk_id, name=chunk_id, content=content,
+        filepath=f"/src/{chunk_id}.py", language=Language.PYTHON
+    )
+
+
+@pytest.mark.asyncio
+async def test_searches_do_not_wait_for_writer(tmp_path):
+    """Test that readers see committed rows while a write is in progress."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"), read_connections=2)
+    try:
+        await indexer.index_chunks([make_chunk("parse", "def parse_config(path): pass")])
+
+        cursor = await indexer.db.execute("PRAGMA journal_mode")
+        assert (await cursor.fetchone())[0] == "wal"
+
+        # Uncommitted write holding the write lock
+        await indexer.db.execute("BEGIN IMMEDIATE")
+        await indexer.db.execute(
+            f"INSERT INTO {indexer.metadata_table} (chunk_id, content) VALUES ('load', 'parse_config')"
+        )
+
+        results = await asyncio.wait_for(
+            asyncio.gather(*(indexer.search("parse_config") for _ in range(8))),
+            timeout=5
+        )
+        assert all([chunk_id for chunk_id, _ in r] == ["parse"] for r in results)
+        assert (await indexer.get_stats())['total_chunks'] == 1
+
+        # Pool never grows past its limit
+        assert len(indexer._readers) == 2
+
+        await indexer.db.rollback()
+
+    finally:
+        await indexer.close()
+
+    assert indexer._readers == []
+
+
+@pytest.mark.asyncio
+async def test_search_without_reader_pool(tmp_path):
+    """Test that read_connections=0 searches on the write connection."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"), read_connections=0)
+    try:
+        await indexer.index_chunks([make_chunk("parse", "def parse_config(path): pass")])
+        assert [chunk_id for chunk_id, _ in await indexer.search("parse_config")] == ["parse"]
+        assert indexer._readers == []
+    finally:
+        await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_chunk_text_is_stored_once(tmp_path):
+    """Test that the FTS5 table keeps only its index and follows the chunk table."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await indexer.index_chunks([
+            make_chunk("parse", "def parse_config(path): pass"),
+            make_chunk("load", "def load_config(path): pass"),
+        ])
+
+        cursor = await indexer.db.execute(
+            "SELECT name FROM sqlite_master WHERE name LIKE 'code_fts%'"
+        )
+        assert "code_fts_content" not in [row[0] for row in await cursor.fetchall()]
+
+        # Re-indexing a chunk replaces its FTS5 entry
+        await indexer.index_chunks([make_chunk("parse", "def parse_settings(path): pass")])
+        assert await indexer.search("parse_config") == []
+        assert [chunk_id for chunk_id, _ in await indexer.search("settings")] == ["parse"]
+
+        await indexer.delete_file("/src/load.py")
+        assert await indexer.search("load_config") == []
+        assert (await indexer.get_stats())['total_chunks'] == 1
+
+        # Index and chunk table agree
+        await indexer.db.execute(
+            "INSERT INTO code_fts(code_fts, rank) VALUES ('integrity-check', 1)"
+        )
+
+    finally:
+        await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_legacy_tables_are_migrated(tmp_path):
+    """Test that indexes with text stored in the FTS5 table are migrated on open."""
+    db_path = str(tmp_path / "keyword.db")
+    async with aiosqlite.connect(db_path) as db:
+        await db.execute("""
+            CREATE VIRTUAL TABLE code_fts USING fts5(
+                chunk_id UNINDEXED, content, filepath UNINDEXED, name,
+                language UNINDEXED, chunk_type UNINDEXED,
+                tokenize='porter unicode61'
+            )
+        """)
+        await db.execute("""
+            CREATE TABLE chunk_metadata (
+                chunk_id TEXT PRIMARY KEY, filepath TEXT, name TEXT, language TEXT,
+                chunk_type TEXT, line_start INTEGER, line_end INTEGER, last_modified REAL
+            )
+        """)
+        await db.execute(
+            "INSERT INTO code_fts VALUES ('old', 'def loadConfigFile(path): pass', "
+            "'/src/old.py', 'loadConfigFile', 'python', 'function')"
+        )
+        await db.execute(
+            "INSERT INTO chunk_metadata VALUES ('old', '/src/old.py', 'loadConfigFile', "
+            "'python', 'function', 1, 1, 0)"
+        )
+        await db.commit()
+
+    indexer = KeywordIndexer(db_path=db_path)
+    try:
+        assert [chunk_id for chunk_id, _ in await indexer.search("config file")] == ["old"]
+        assert await indexer.get_stats() == {'total_chunks': 1, 'total_files': 1}
+
+        cursor = await indexer.db.execute(
+            f"SELECT content FROM {indexer.metadata_table} WHERE chunk_id = 'old'"
+        )
+        assert (await cursor.fetchone())[0] == "def loadConfigFile(path): pass"
+
+    finally:
+        await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_bulk_load(tmp_path):
+    """Test that a bulk load indexes everything once it finishes."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        async with indexer.bulk_load():
+            await indexer.index_chunks([
+                make_chunk(f"chunk{i}", f"def handler_{i}(request): return {i}")
+                for i in range(200)
+            ])
+            await indexer.index_chunks([make_chunk("chunk7", "def parse_config(path): pass")])
+
+        assert await indexer.get_stats() == {'total_chunks': 200, 'total_files': 200}
+        assert [chunk_id for chunk_id, _ in await indexer.search("parse_config")] == ["chunk7"]
+        assert await indexer.search("handler_7") == []
+        assert len(await indexer.search("handler", limit=500)) == 199
+
+        # Incremental upkeep is back
+        await indexer.delete_file("/src/chunk7.py")
+        assert await indexer.search("parse_config") == []
+        assert (await indexer.get_stats())['total_chunks'] == 199
+
+        await indexer.db.execute(
+            "INSERT INTO code_fts(code_fts, rank) VALUES ('integrity-check', 1)"
+        )
+
+    finally:
+        await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_interrupted_bulk_load_is_finished_on_open(tmp_path):
+    """Test that chunks of an interrupted bulk load become searchable on reopen."""
+    db_path = str(tmp_path / "keyword.db")
+    indexer = KeywordIndexer(db_path=db_path)
+    # The process dies before the FTS5 index is built
+    indexer._finish_bulk_load = lambda: asyncio.sleep(0)
+    try:
+        with pytest.raises(RuntimeError):
+            async with indexer.bulk_load():
+                await indexer.index_chunks([make_chunk("parse", "def parse_config(path): pass")])
+                await indexer.db.commit()
+                raise RuntimeError("killed")
+    finally:
+        await indexer.close()
+
+    indexer = KeywordIndexer(db_path=db_path)
+    try:
+        assert [chunk_id for chunk_id, _ in await indexer.search("parse_config")] == ["parse"]
+        assert (await indexer.get_stats())['total_chunks'] == 1
+    finally:
+        await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_substring_and_regex_search(tmp_path):
+    """Test exact substring and regex search over chunk content."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await indexer.index_chunks([
+            make_chunk("js", "fetch(url).then(res => res.json()).then(render)"),
+            make_chunk("py", "def user_id_to_name(uid): return names[uid]"),
+            make_chunk("other", "def Then(): pass"),
+        ])
+
+        assert await indexer.search_substring(".then(") == [("js", 2.0)]
+        assert await indexer.search_substring("_id_to_") == [("py", 1.0)]
+        assert await indexer.search_substring("THEN(") == []
+
+        # Too short for trigrams: scanned, then ranked by occurrences
+        assert [chunk_id for chunk_id, _ in await indexer.search_substring("(")] == ["js", "py", "other"]
+
+        assert await indexer.search_regex(r"\w+_id_to_\w+\(") == [("py", 1.0)]
+        assert {c for c, _ in await indexer.search_regex(r"(?i)\bthen\(")} == {"js", "other"}
+        assert await indexer.search_regex(r"names\[\w+\]", filter_language="rust") == []
+
+        with pytest.raises(ValueError):
+            await indexer.search_regex("unbalanced(")
+
+        # The trigram index follows deletes
+        await indexer.delete_file("/src/py.py")
+        assert await indexer.search_substring("_id_to_") == []
+
+    finally:
+        await indexer.close()
+
+
+@pytest.mark.asyncio
+async def test_lookup_symbol(tmp_path):
+    """Test exact symbol lookup by name and qualified name."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await indexer.index_chunks([
+            CodeChunk(
+                id="cls", name="UserService", qualified_name="UserService",
+                content="class UserService: ...", filepath="/src/users.py",
+                language=Language.PYTHON, chunk_type=ChunkType.CLASS,
+            ),
+            CodeChunk(
+                id="get", name="get", qualified_name="UserService.get",
+                content="def get(self, uid): ...", filepath="/src/users.py",
+                language=Language.PYTHON, chunk_type=ChunkType.METHOD,
+            ),
+            CodeChunk(
+                id="js", name="get", qualified_name="get",
+                content="function get(url) {}", filepath="/src/http.js",
+                language=Language.JAVASCRIPT, chunk_type=ChunkType.FUNCTION,
+            ),
+        ])
+
+        assert [r.chunk_id for r in await indexer.lookup_symbol("UserService")] == ["cls"]
+        assert [r.chunk_id for r in await indexer.lookup_symbol("UserService.get")] == ["get"]
+        assert [r.chunk_id for r in await indexer.lookup_symbol("get")] == ["js", "get"]
+        assert [r.chunk_id for r in await indexer.lookup_symbol("get", filter_language="python")] == ["get"]
+        assert await indexer.lookup_symbol("userservice") == []
+
+        result = (await indexer.lookup_symbol("UserService.get"))[0]
+        assert (result.filepath, result.content) == ("/src/users.py", "def get(self, uid): ...")
+
+        # Answered from the B-tree indexes
+        cursor = await indexer.db.execute(
+            f"EXPLAIN QUERY PLAN SELECT chunk_id FROM {indexer.metadata_table} "
+            "WHERE name = 'get' OR qualified_name = 'get'"
+        )
+        plan = " ".join(row[-1] for row in await cursor.fetchall())
+        assert "idx_symbol_name" in plan and "idx_symbol_qualified" in plan
+
+    finally:
+        await indexer.close()
@@ -0,0 +1,167 @@
+"""Tests for the memory-mapped quantized vector store."""
+
+import shutil
+
+import numpy as np
+import pytest
+
+from marunochithe.code_understanding.indexer import CodebaseIndexer
+from marunochithe.code_understanding.mmap_store import MmapVectorIndex
+
+
+def _clustered(n, dim, rng):
+    centers = rng.normal(size=(max(1, n // 50), dim))
+    vectors = centers[rng.integers(0, len(centers), size=n)] + 0.3 * rng.normal(size=(n, dim))
+    return vectors.astype(np.float32)
+
+
+def _reference(vectors, ids, query, k):
+    matrix = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    order = np.argsort(-(matrix @ (query / np.linalg.norm(query))))[:k]
+    return {ids[i] for i in order}
+
+
+@pytest.fixture
+def temp_codebase(tmp_path):
+    """Create a temporary codebase."""
+    codebase = tmp_path / "codebase"
+    codebase.mkdir()
+
+    (codebase / "auth.py").write_text('''"""Authentication."""
+
+def login(username, password):
+    """Check user credentials."""
+    return username == "admin" and password == "secret"
+
+def reverse(text):
+    """Reverse a string."""
+    return text[::-1]
+''')
+
+    return codebase
+
+
+@pytest.mark.parametrize("quantization", ["none", "int8", "binary"])
+def test_quantized_search_recall(tmp_path, quantization):
+    """Test that rescored candidates recover the exact top-k."""
+    rng = np.random.default_rng(1)
+    vectors = _clustered(3000, 128, rng)
+    ids = [f"chunk{i}" for i in range(3000)]
+
+    index = MmapVectorIndex(tmp_path / "store", quantization=quantization, block_size=512)
+    index.upsert(ids, vectors)
+
+    # Queries near the data, like real code search
+    queries = vectors[rng.integers(0, 3000, size=20)] + 0.1 * rng.normal(size=(20, 128))
+    recall = []
+    for query, hits in zip(queries, index.search(queries, k=10)):
+        found = {chunk_id for chunk_id, _ in hits}
+        recall.append(len(found & _reference(vectors, ids, query, 10)) / 10)
+
+    assert np.mean(recall) >= (1.0 if quantization == "none" else 0.9)
+
+    if quantization != "none":
+        assert index.nbytes < index.disk_bytes / 4
+
+    index.close()
+
+
+def test_flush_and_reopen(tmp_path):
+    """Test persistence, staleness on change, and meta checks."""
+    rng = np.random.default_rng(2)
+    vectors = rng.normal(size=(1500, 32)).astype(np.float32)
+    ids = [f"chunk{i}" for i in range(1500)]
+    meta = {'embedding_model': 'test'}
+
+    index = MmapVectorIndex(tmp_path / "store")
+    index.upsert(ids, vectors)
+    index.delete(["chunk0", "chunk7"])
+    index.flush(meta)
+    expected = index.search(vectors[:3], k=5)
+    index.close()
+
+    reopened = MmapVectorIndex(tmp_path / "store")
+    assert reopened.open(meta)
+    assert len(reopened) == 1498
+    assert reopened.search(vectors[:3], k=5) == expected
+
+    # A change after the flush invalidates the on-disk header
+    reopened.upsert(["new"], vectors[:1])
+    reopened.close()
+    assert not MmapVectorIndex(tmp_path / "store").open(meta)
+
+    assert not MmapVectorIndex(tmp_path / "store").open({'embedding_model': 'other'})
+    assert not MmapVectorIndex(tmp_path / "store", quantization="binary").open(meta)
+
+
+def test_deleting_last_row_invalidates_header(tmp_path):
+    """Test that deleting the last row, which moves nothing, still marks the store stale."""
+    rng = np.random.default_rng(3)
+    vectors = rng.normal(size=(10, 8)).astype(np.float32)
+    ids = [f"chunk{i}" for i in range(10)]
+    meta = {'embedding_model': 'test'}
+
+    index = MmapVectorIndex(tmp_path / "store")
+    index.upsert(ids, vectors)
+    index.flush(meta)
+
+    # Closed without flushing, as after a crash
+    index.delete(["chunk9"])
+    index.close()
+
+    reopened = MmapVectorIndex(tmp_path / "store")
+    reopened.open(meta)
+    assert "chunk9" not in {chunk_id for chunk_id, _ in reopened.search(vectors[9:], k=10)[0]}
+    reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_mmap_backend(tmp_path, temp_codebase):
+    """Test indexing and searching through the mmap backend, and reuse on restart."""
+    db_path = str(tmp_path / "db")
+
+    indexer = CodebaseIndexer(
+        collection_name="test_mmap_backend",
+        persist_directory=db_path,
+        vector_backend="mmap"
+    )
+    await indexer.index_codebase(str(temp_codebase))
+
+    mmap_results = await indexer.search("check user credentials", limit=3)
+    assert indexer.get_vector_backend_stats()['active'] == 'mmap'
+    assert mmap_results
+
+    # ChromaDB holds placeholders, not the embeddings
+    stored = indexer.collection.get(limit=1, include=['embeddings'])
+    assert len(stored['embeddings'][0]) == 1
+
+    # Metadata filters are applied to the mmap store
+    filtered = await indexer.search(
+        "check user credentials", limit=3, filter_metadata={"name": "reverse"}
+    )
+    assert [r.name for r in filtered] == ["reverse"]
+
+    await indexer.close()
+
+    indexer = CodebaseIndexer(
+        collection_name="test_mmap_backend",
+        persist_directory=db_path,
+        vector_backend="mmap"
+    )
+    results = await indexer.search("check user credentials", limit=3)
+    assert [r.chunk_id for r in results] == [r.chunk_id for r in mmap_results]
+    await indexer.close()
+
+    # A lost store is rebuilt from the documents and the embedding cache
+    shutil.rmtree(tmp_path / "db" / "test_mmap_backend.vectors")
+    indexer = CodebaseIndexer(
+        collection_name="test_mmap_backend",
+        persist_directory=db_path,
+        vector_backend="mmap"
+    )
+    results = await indexer.search("check user credentials", limit=3)
+    assert [r.chunk_id for r in results] == [r.chunk_id for r in mmap_results]
+
+    await indexer.clear_index()
+    assert not (tmp_path / "db" / "test_mmap_backend.vectors" / "index.json").exists()
+    await indexer.close()
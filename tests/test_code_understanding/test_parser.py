@@ -87,6 +87,24 @@ async def test_parse_imports(parser, temp_python_file):
     assert result is not None
     assert len(result.imports) >= 1
     assert any('import os' in imp for imp in result.imports)
+    assert result.imported_modules == ['os', 'typing', 'typing.List']
+
+
+@pytest.mark.asyncio
+async def test_parse_calls_and_js_imports(parser, tmp_path):
+    """Test extracting call sites and JavaScript import specifiers."""
+    source = tmp_path / "app.js"
+    source.write_text(
+        "import { render } from './view';\n"
+        "const api = require('./api');\n"
+        "function main() { const user = api.fetchUser(1); render(new Page(user)); }\n"
+    )
+
+    result = await parser.parse_file(str(source))
+
+    assert result.imported_modules == ['./view', './api']
+    main = next(f for f in result.functions if f.name == 'main')
+    assert main.calls == ['fetchUser', 'render', 'Page']
 
 
 @pytest.mark.asyncio
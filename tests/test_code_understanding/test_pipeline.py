@@ -0,0 +1,81 @@
+"""Tests for ParseChunkPipeline."""
+
+import pytest
+
+from marunochithe.code_understanding.chunker import CodeChunker
+from marunochithe.code_understanding.parser import CodeParser
+from marunochithe.code_understanding.pipeline import ParseChunkPipeline
+
+
+@pytest.fixture
+def temp_codebase(tmp_path):
+    """Create a temporary codebase with several modules."""
+    for i in range(6):
+        (tmp_path / f"module_{i}.py").write_text(f'''"""Module {i}."""
+
+def function_{i}(value: int) -> int:
+    """Return value plus {i}."""
+    return value + {i}
+
+class Handler{i}:
+    """Handler number {i}."""
+
+    def handle(self) -> int:
+        """Handle something."""
+        return {i}
+''')
+
+    return tmp_path
+
+
+async def _collect(pipeline, filepaths):
+    """Gather all (filepath, chunks) results from a pipeline."""
+    results = {}
+    async for batch in pipeline.iter_batches(filepaths):
+        for filepath, chunks in batch:
+            results[filepath] = chunks
+    return results
+
+
+@pytest.mark.asyncio
+async def test_serial_pipeline(temp_codebase):
+    """Test in-process parsing when below the parallel threshold."""
+    pipeline = ParseChunkPipeline(CodeParser(), CodeChunker(), num_workers=4, batch_size=2)
+    filepaths = sorted(str(p) for p in temp_codebase.glob("*.py"))
+
+    results = await _collect(pipeline, filepaths)
+
+    assert set(results) == set(filepaths)
+    assert all(chunks for chunks in results.values())
+
+
+@pytest.mark.asyncio
+async def test_parallel_matches_serial(temp_codebase):
+    """Test multi-process parsing produces the same chunks as serial."""
+    filepaths = sorted(str(p) for p in temp_codebase.glob("*.py"))
+
+    serial = ParseChunkPipeline(CodeParser(), CodeChunker(), num_workers=1)
+    parallel = ParseChunkPipeline(
+        CodeParser(), CodeChunker(),
+        num_workers=2, batch_size=2, min_parallel_files=1
+    )
+
+    serial_results = await _collect(serial, filepaths)
+    parallel_results = await _collect(parallel, filepaths)
+
+    assert set(parallel_results) == set(serial_results)
+    for filepath, chunks in serial_results.items():
+        serial_names = sorted(c.name for c in chunks)
+        parallel_names = sorted(c.name for c in parallel_results[filepath])
+        assert parallel_names == serial_names
+
+
+@pytest.mark.asyncio
+async def test_unparseable_file(tmp_path):
+    """Test that files which fail to parse are reported as None."""
+    missing = str(tmp_path / "missing.py")
+    pipeline = ParseChunkPipeline(CodeParser(), CodeChunker(), num_workers=1)
+
+    results = await _collect(pipeline, [missing])
+
+    assert results == {missing: None}
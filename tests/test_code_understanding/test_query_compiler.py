@@ -0,0 +1,77 @@
+"""Tests for the FTS5 query compiler."""
+
+import pytest
+
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.models import CodeChunk, Language
+from marunochithe.code_understanding.query_compiler import (
+    compile_query,
+    compile_regex,
+    compile_substring,
+    is_symbol_query,
+)
+
+
+def test_compile_query():
+    """Test phrases, prefixes, column filters, identifiers and operators."""
+    assert compile_query("load config") == '"load" AND "config"'
+    assert compile_query('"exact phrase"') == '"exact phrase"'
+    assert compile_query("load*") == '"load" *'
+    assert compile_query("getUserById") == '("getUserById" OR "get user by id")'
+    assert compile_query("name:parse") == 'name : "parse"'
+    assert compile_query("parse OR load NOT test") == '"parse" OR "load" NOT "test"'
+    assert compile_query("parse getUser") == '"parse" AND ("getUser" OR "get user")'
+    assert compile_query("os.path.join(") == '("os" AND "path" AND "join")'
+
+
+def test_compile_query_sanitizes_syntax():
+    """Test that stray operators and punctuation never reach FTS5."""
+    assert compile_query('bad "quote') == '"bad" AND "quote"'
+    assert compile_query("OR parse AND") == '"parse"'
+    assert compile_query("user-id") == '("user" AND "id")'
+    assert compile_query("( ) : - *") is None
+    assert compile_query("") is None
+
+
+def test_is_symbol_query():
+    """Test that only identifier-shaped queries take the symbol fast path."""
+    for query in ("parse_file", "HybridSearcher", "UserService.get", "base64", "HTTPServer"):
+        assert is_symbol_query(query)
+    for query in ("login", "Config", "authentication", "load config", "user-id"):
+        assert not is_symbol_query(query)
+
+
+@pytest.mark.asyncio
+async def test_punctuated_queries_use_keyword_index(tmp_path):
+    """Test that queries FTS5 would reject still find matches."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await indexer.index_chunks([
+            CodeChunk(
+                id="join", name="join_paths", filepath="/src/paths.py",
+                language=Language.PYTHON,
+                content="def join_paths(a, b): return os.path.join(a, b)",
+            ),
+        ])
+
+        for query in ("os.path.join(", "join_paths(a, b)", "name:join*", "-join", "{join}"):
+            assert [chunk_id for chunk_id, _ in await indexer.search(query)] == ["join"], query
+
+        batched = await indexer.search_many(["os.path.join(", "()", "paths"])
+        assert [len(results) for results in batched] == [1, 0, 1]
+
+    finally:
+        await indexer.close()
+
+
+def test_compile_regex_prefilter():
+    """Test that regexes compile to the literals every match contains."""
+    assert compile_regex(r"\.then\(") == '".then("'
+    assert compile_regex(r"user_id_to_\w+") == '"user_id_to_"'
+    assert compile_regex(r"get(User)+ById") == '"ById" AND "User" AND "get"'
+    assert compile_regex(r"(load|save)_config") == '"_config"'
+    assert compile_regex(r"a.b|xyz") is None
+    assert compile_substring("ab") is None
+
+    with pytest.raises(ValueError):
+        compile_regex("unbalanced(")
@@ -0,0 +1,136 @@
+"""Tests for per-repository index shards."""
+
+import pytest
+
+from marunochithe.code_understanding.hybrid_searcher import HybridSearcher
+from marunochithe.code_understanding.indexer import CodebaseIndexer
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.shard_manager import ShardManager
+from marunochithe.config import IndexerSettings
+
+
+@pytest.fixture
+def repos(tmp_path):
+    """Two unrelated repositories."""
+    billing = tmp_path / "billing"
+    billing.mkdir()
+    (billing / "invoice.py").write_text('''def compute_invoice_total(items):
+    """Sum invoice line items."""
+    return sum(item.price for item in items)
+''')
+
+    search = tmp_path / "search"
+    search.mkdir()
+    (search / "ranker.py").write_text('''def rank_documents(scores):
+    """Order documents by score."""
+    return sorted(scores, reverse=True)
+''')
+
+    return billing, search
+
+
+@pytest.fixture
+async def shard_manager(tmp_path):
+    """ShardManager with temporary storage."""
+    manager = ShardManager(
+        persist_directory=str(tmp_path / "chroma"),
+        keyword_directory=str(tmp_path / "keyword"),
+        max_open_shards=1,
+        num_workers=1
+    )
+    yield manager
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_repositories_get_separate_shards(shard_manager, repos):
+    """Test that each repository is indexed into its own shard."""
+    billing, search = repos
+
+    first = await shard_manager.index_codebase(str(billing))
+    second = await shard_manager.index_codebase(str(search))
+
+    assert first['shard'] != second['shard']
+    assert first['total_chunks'] > 0 and second['total_chunks'] > 0
+    assert shard_manager.list_shards() == {
+        first['shard']: str(billing.resolve()),
+        second['shard']: str(search.resolve()),
+    }
+
+    # Files resolve to the shard of their repository
+    assert shard_manager.resolve(str(billing / "invoice.py")) == first['shard']
+    assert shard_manager.resolve(str(billing.parent)) is None
+
+    # Only one idle shard stays open
+    assert len(shard_manager.open_shards()) == 1
+
+
+@pytest.mark.asyncio
+async def test_fan_out_search(shard_manager, repos):
+    """Test that searches merge shards and can be limited to some repos."""
+    billing, search = repos
+    await shard_manager.index_codebase(str(billing))
+    await shard_manager.index_codebase(str(search))
+
+    searcher = HybridSearcher(shard_manager=shard_manager)
+
+    results = await searcher.search("compute invoice total", limit=10)
+    filepaths = {r.filepath for r in results}
+    assert any(f.endswith("invoice.py") for f in filepaths)
+    assert any(f.endswith("ranker.py") for f in filepaths)
+
+    results = await searcher.search("rank documents", limit=10, repos=[str(search)])
+    assert results
+    assert all(r.filepath.endswith("ranker.py") for r in results)
+
+    batches = await searcher.search_many(
+        ["invoice", "documents"], mode="keyword", limit=5, repos=[str(billing)]
+    )
+    assert len(batches) == 2
+    assert all(r.filepath.endswith("invoice.py") for r in batches[0])
+    assert batches[1] == []
+
+    # Shards reopen from disk after eviction
+    assert len(shard_manager.open_shards()) == 1
+    reopened = ShardManager(
+        persist_directory=shard_manager.persist_directory,
+        keyword_directory=shard_manager.keyword_directory,
+        num_workers=1
+    )
+    try:
+        assert reopened.list_shards() == shard_manager.list_shards()
+    finally:
+        await reopened.close()
+
+
+@pytest.mark.asyncio
+async def test_unsharded_index_survives_upgrade(tmp_path, repos, monkeypatch):
+    """Test that an index built before sharding existed is still served by default."""
+    billing, _ = repos
+
+    def open_index():
+        keyword_indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+        return CodebaseIndexer(
+            collection_name="marunochithe_codebase",
+            persist_directory=str(tmp_path / "chroma"),
+            keyword_indexer=keyword_indexer,
+            num_workers=1
+        ), keyword_indexer
+
+    indexer, keyword_indexer = open_index()
+    await indexer.index_codebase(str(billing))
+    await indexer.close()
+    await keyword_indexer.close()
+
+    # Sharding is opt-in, so the server keeps using the existing index
+    monkeypatch.delenv("MARUNOCHITHE_SHARD_BY_REPO", raising=False)
+    assert not IndexerSettings().shard_by_repo
+
+    indexer, keyword_indexer = open_index()
+    try:
+        searcher = HybridSearcher(vector_indexer=indexer, keyword_indexer=keyword_indexer)
+        results = await searcher.search("compute invoice total", limit=5)
+        assert any(r.filepath.endswith("invoice.py") for r in results)
+    finally:
+        await indexer.close()
+        await keyword_indexer.close()
@@ -0,0 +1,117 @@
+"""Tests for index snapshot export/import."""
+
+import shutil
+
+import pytest
+
+from marunochithe.code_understanding.indexer import CodebaseIndexer
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.snapshot import (
+    SnapshotError,
+    read_snapshot,
+    read_snapshot_header,
+)
+
+
+@pytest.fixture
+def codebase(tmp_path):
+    """Small codebase to snapshot."""
+    root = tmp_path / "project"
+    root.mkdir()
+    (root / "orders.py").write_text('''def place_order(cart):
+    """Create an order from a cart."""
+    return {"items": list(cart)}
+
+
+class OrderQueue:
+    def pop_next(self):
+        return None
+''')
+    (root / "pricing.py").write_text('''def apply_discount(price, percent):
+    return price * (1 - percent / 100)
+''')
+    return root
+
+
+def make_indexer(directory, name="snapshot_test"):
+    """CodebaseIndexer with its own ChromaDB and keyword databases."""
+    keyword_indexer = KeywordIndexer(db_path=str(directory / "keyword.db"))
+    indexer = CodebaseIndexer(
+        collection_name=name,
+        persist_directory=str(directory / "chroma"),
+        keyword_indexer=keyword_indexer,
+        num_workers=1
+    )
+    return indexer, keyword_indexer
+
+
+@pytest.mark.asyncio
+async def test_export_import_roundtrip(tmp_path, codebase, monkeypatch):
+    """Test that an imported snapshot serves searches without re-indexing."""
+    source, source_keywords = make_indexer(tmp_path / "source")
+    try:
+        await source.index_codebase(str(codebase))
+        exported = await source.export_snapshot(str(tmp_path / "index.snapshot"))
+    finally:
+        await source.close()
+        await source_keywords.close()
+
+    header = read_snapshot_header(tmp_path / "index.snapshot")
+    assert header['root'] == str(codebase.resolve())
+    assert header['chunks'] == exported['chunks'] > 0
+    assert header['files'] == exported['files'] == 2
+
+    # Another machine, with the codebase at a different path
+    moved = tmp_path / "elsewhere" / "project"
+    shutil.copytree(codebase, moved)
+
+    target, target_keywords = make_indexer(tmp_path / "target")
+    try:
+        # Nothing may be parsed or embedded during the import
+        monkeypatch.setattr(target, "_embed_documents", None)
+        result = await target.import_snapshot(str(tmp_path / "index.snapshot"), root=str(moved))
+
+        assert result['chunks'] == exported['chunks']
+        assert result['root'] == str(moved.resolve())
+
+        results = await target.search("apply discount to price", limit=1)
+        assert results[0].filepath == str((moved / "pricing.py").resolve())
+        assert await target_keywords.search("place_order", limit=1)
+
+        stats = await target.get_stats()
+        assert stats['total_chunks'] == exported['chunks']
+        assert stats['total_files'] == 2
+
+        # The manifest came along, so nothing needs re-indexing
+        monkeypatch.undo()
+        changes = await target.index_codebase(str(moved))
+        assert changes['unchanged_files'] == 2
+        assert changes['indexed_chunks'] == 0
+
+    finally:
+        await target.close()
+        await target_keywords.close()
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_other_embedding_model(tmp_path, codebase):
+    """Test that snapshots from another embedding model are refused."""
+    indexer, keyword_indexer = make_indexer(tmp_path / "index")
+    try:
+        await indexer.index_codebase(str(codebase))
+        await indexer.export_snapshot(str(tmp_path / "index.snapshot"), dtype="float16")
+
+        snapshot = read_snapshot(tmp_path / "index.snapshot")
+        assert snapshot.embeddings.dtype.name == "float32"
+        assert len(snapshot.embeddings) == len(snapshot.ids)
+
+        indexer.embedding_provider.model_id = "other-model"
+        with pytest.raises(SnapshotError):
+            await indexer.import_snapshot(str(tmp_path / "index.snapshot"))
+
+        with pytest.raises(SnapshotError):
+            read_snapshot_header(tmp_path / "missing.snapshot")
+
+    finally:
+        await indexer.close()
+        await keyword_indexer.close()
@@ -0,0 +1,140 @@
+"""Tests for the fuzzy symbol name index."""
+
+import pytest
+
+from marunochithe.code_understanding.keyword_indexer import KeywordIndexer
+from marunochithe.code_understanding.models import ChunkType, CodeChunk, Language
+from marunochithe.code_understanding.symbol_index import SymbolIndex, bounded_edit_distance
+
+
+def test_bounded_edit_distance():
+    """Test banded edit distance with transpositions and prefixes."""
+    assert bounded_edit_distance("codebaseindxer", "codebaseindexer", 2) == 1
+    assert bounded_edit_distance("hybirdsearcher", "hybridsearcher", 1) == 1
+    assert bounded_edit_distance("parse", "parse", 0) == 0
+    assert bounded_edit_distance("parse", "phrase", 1) is None
+    assert bounded_edit_distance("parse", "phrase", 2) == 2
+    assert bounded_edit_distance("abc", "abcdef", 2) is None
+    assert bounded_edit_distance("hybrdsearch", "hybridsearcher", 1, prefix=True) == 1
+    assert bounded_edit_distance("hybrdsearch", "hybridsearcher", 0, prefix=True) is None
+
+
+def test_symbol_index_search():
+    """Test whole-name, prefix and misspelled matches and their ranking."""
+    index = SymbolIndex.build([
+        (1, "CodebaseIndexer", "CodebaseIndexer", "python"),
+        (2, "HybridSearcher", "HybridSearcher", "python"),
+        (3, "search", "HybridSearcher.search", "python"),
+        (4, "search_many", "HybridSearcher.search_many", "python"),
+        (5, "search", "search", "javascript"),
+        (6, "KeywordIndexer", "KeywordIndexer", "python"),
+    ])
+
+    assert index.search("CodebaseIndxer") == [(1, 1, True)]
+    assert index.search("hybridsearch") == [(2, 0, False), (3, 0, False), (4, 0, False)]
+    assert index.search("hybridsearcher.serch") == [(3, 1, True), (4, 1, False)]
+    assert index.search("search") == [(3, 0, True), (5, 0, True), (4, 0, False)]
+    assert index.search("search", language="javascript") == [(5, 0, True)]
+    assert index.search("search", language="rust") == []
+    assert index.search("sea", limit=1) == [(3, 0, False)]
+
+    # Short queries must be exact prefixes
+    assert [rowid for rowid, _, _ in index.search("ke")] == [6]
+    assert index.search("kx") == []
+    assert index.search("xyzzy") == []
+
+    assert SymbolIndex.build([]).search("anything") == []
+
+
+def test_symbol_index_updated():
+    """Test that an updated index searches like one built from the new rows."""
+    rows = {
+        1: (1, "CodebaseIndexer", "CodebaseIndexer", "python"),
+        2: (2, "HybridSearcher", "HybridSearcher", "python"),
+        3: (3, "search", "HybridSearcher.search", "python"),
+        4: (4, "search_many", "HybridSearcher.search_many", "python"),
+        5: (5, "search", "search", "javascript"),
+    }
+    index = SymbolIndex.build(rows.values())
+
+    changes = {
+        2: (2, "HybridRanker", "HybridRanker", "python"),
+        3: None,
+        6: (6, "search", "HybridRanker.search", "python"),
+    }
+    updated = index.updated(changes)
+    rebuilt = SymbolIndex.build(row for row in {**rows, **changes}.values() if row is not None)
+
+    for query in ("search", "sea", "hybrid", "hybridranker.serch", "codebaseindxer"):
+        assert updated.search(query) == rebuilt.search(query)
+    assert updated.search("search", language="python") == [(6, 0, True), (4, 0, False)]
+    assert updated.search("HybridSearcher") == [(4, 0, False)]
+
+    # The arrays are shared; the original index is unchanged
+    assert updated.keys is index.keys
+    assert index.search("HybridSearcher") == [(2, 0, True), (3, 0, False), (4, 0, False)]
+
+    # Changes accumulate
+    assert updated.updated({6: None}).search("search") == [(5, 0, True), (4, 0, False)]
+    assert SymbolIndex.build([]).updated({1: rows[1]}).search("codebase") == [(1, 0, False)]
+
+
+@pytest.mark.asyncio
+async def test_search_symbols(tmp_path):
+    """Test fuzzy symbol search over the keyword index and its rebuilds."""
+    indexer = KeywordIndexer(db_path=str(tmp_path / "keyword.db"))
+    try:
+        await indexer.index_chunks([
+            CodeChunk(
+                id="cls", name="UserService", qualified_name="UserService",
+                content="class UserService: ...", filepath="/src/users.py",
+                language=Language.PYTHON, chunk_type=ChunkType.CLASS,
+            ),
+            CodeChunk(
+                id="get", name="get_user", qualified_name="UserService.get_user",
+                content="def get_user(self, uid): ...", filepath="/src/users.py",
+                language=Language.PYTHON, chunk_type=ChunkType.METHOD,
+            ),
+        ])
+
+        results = await indexer.search_symbols("UsrService")
+        assert [r.chunk_id for r in results] == ["cls", "get"]
+        assert results[0].metadata == {'qualified_name': "UserService", 'distance': 1}
+        assert results[0].content == "class UserService: ..."
+        assert results[0].similarity > results[1].similarity
+
+        symbols = await indexer.get_symbol_index()
+        assert await indexer.get_symbol_index() is symbols
+
+        # Writes patch the index instead of rebuilding it
+        await indexer.index_chunks([
+            CodeChunk(
+                id="get", name="fetch_user", qualified_name="UserService.fetch_user",
+                content="def fetch_user(self, uid): ...", filepath="/src/users.py",
+                language=Language.PYTHON, chunk_type=ChunkType.METHOD,
+            ),
+        ])
+        assert [r.chunk_id for r in await indexer.search_symbols("fetch_usr")] == ["get"]
+        assert await indexer.search_symbols("get_user") == []
+        patched = await indexer.get_symbol_index()
+        assert patched is not symbols and patched.keys is symbols.keys
+
+        await indexer.delete_file("/src/users.py")
+        assert await indexer.search_symbols("UserService") == []
+        assert (await indexer.get_symbol_index()).keys is symbols.keys
+
+        # Too many changes to patch in: rebuilt
+        indexer._SYMBOL_CHANGES = 1
+        await indexer.index_chunks([
+            CodeChunk(
+                id=name, name=name, qualified_name=name, content=f"def {name}(): ...",
+                filepath="/src/users.py", language=Language.PYTHON,
+                chunk_type=ChunkType.FUNCTION,
+            )
+            for name in ("load_users", "save_users")
+        ])
+        assert [r.chunk_id for r in await indexer.search_symbols("load_users")] == ["load_users"]
+        assert (await indexer.get_symbol_index()).keys is not symbols.keys
+
+    finally:
+        await indexer.close()
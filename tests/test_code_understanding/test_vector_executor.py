@@ -0,0 +1,79 @@
+"""Tests for VectorStoreExecutor."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from marunochithe.code_understanding.vector_executor import VectorStoreExecutor
+
+
+@pytest.fixture
+def executor():
+    """Create executor and shut it down after the test."""
+    executor = VectorStoreExecutor(read_workers=2)
+    yield executor
+    executor.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_calls_run_off_event_loop(executor):
+    """Test that calls run on lane threads and return their result."""
+    result = await executor.read(lambda x, y=0: (threading.current_thread().name, x + y), 1, y=2)
+
+    thread_name, value = result
+    assert value == 3
+    assert thread_name.startswith("vector-read")
+
+
+@pytest.mark.asyncio
+async def test_reads_not_queued_behind_writes(executor):
+    """Test that a read completes while the write lane is busy."""
+    release = threading.Event()
+
+    write_task = asyncio.create_task(executor.write(release.wait, 5))
+    await asyncio.sleep(0.05)
+
+    start = time.perf_counter()
+    assert await executor.read(lambda: "ok") == "ok"
+    assert time.perf_counter() - start < 1.0
+
+    release.set()
+    await write_task
+
+
+@pytest.mark.asyncio
+async def test_stats_track_queue_and_wait(executor):
+    """Test queue depth and wait time reporting."""
+    release = threading.Event()
+
+    # Single write worker: the second call waits behind the first
+    first = asyncio.create_task(executor.write(release.wait, 5))
+    second = asyncio.create_task(executor.write(lambda: None))
+    await asyncio.sleep(0.05)
+
+    stats = executor.get_stats()
+    assert stats["write"]["active"] == 1
+    assert stats["write"]["queue_depth"] == 1
+
+    release.set()
+    await asyncio.gather(first, second)
+
+    stats = executor.get_stats()
+    assert stats["write"]["queue_depth"] == 0
+    assert stats["write"]["completed"] == 2
+    assert stats["write"]["max_wait_ms"] > 0
+    assert stats["read"]["completed"] == 0
+
+
+@pytest.mark.asyncio
+async def test_failed_calls_propagate(executor):
+    """Test that exceptions are raised to the caller and counted."""
+    def fail():
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        await executor.write(fail)
+
+    assert executor.get_stats()["write"]["failed"] == 1
@@ -54,10 +54,18 @@ async def watcher(tmp_path, temp_codebase):
     # Cleanup
     watcher.stop_watching()
     await vector_indexer.clear_index()
+    await vector_indexer.close()
     await keyword_indexer.clear_index()
     await keyword_indexer.close()
 
 
+async def _wait_for_reindex(watcher, delay):
+    """Wait out the debounce, then for the scheduled reindex to finish."""
+    await asyncio.sleep(delay)
+    if watcher._debounce_task:
+        await watcher._debounce_task
+
+
 @pytest.mark.asyncio
 async def test_should_watch(watcher, temp_codebase):
     """Test file filtering."""
@@ -121,7 +129,7 @@ async def test_file_created(watcher, temp_codebase):
     await watcher.on_file_created(new_file)
 
     # Wait for debounce
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Verify file was indexed
     results = await watcher.vector_indexer.search("new function", limit=5)
@@ -135,7 +143,7 @@ async def test_file_modified(watcher, temp_codebase):
     # Index initial file
     test_file = temp_codebase / "hello.py"
     await watcher.on_file_created(test_file)
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Modify file
     test_file.write_text('''"""Hello module - modified."""
@@ -151,7 +159,7 @@ def goodbye_world():
 
     # Handle modification
     await watcher.on_file_modified(test_file)
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Verify updated content is indexed
     results = await watcher.vector_indexer.search("goodbye", limit=5)
@@ -170,7 +178,7 @@ async def test_file_deleted(watcher, temp_codebase):
 ''')
 
     await watcher.on_file_created(test_file)
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Verify it was indexed
     results_before = await watcher.vector_indexer.search("delete_me", limit=5)
@@ -178,7 +186,7 @@ async def test_file_deleted(watcher, temp_codebase):
 
     # Delete file
     await watcher.on_file_deleted(test_file)
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Verify it was removed from index
     results_after = await watcher.vector_indexer.search("delete_me", limit=5)
@@ -186,6 +194,27 @@ async def test_file_deleted(watcher, temp_codebase):
     assert len(results_after) <= len(results_before)
 
 
+@pytest.mark.asyncio
+async def test_file_emptied(watcher, temp_codebase, monkeypatch):
+    """Test that a file left with nothing to index loses its indexed chunks."""
+    test_file = temp_codebase / "hello.py"
+    await watcher._reindex_file(test_file)
+    assert await watcher.keyword_indexer.search("hello_world", limit=5)
+
+    # Edited down to nothing the chunker keeps
+    test_file.write_text("")
+
+    async def no_chunks(parsed):
+        return []
+
+    monkeypatch.setattr(watcher.chunker, "chunk_file", no_chunks)
+    await watcher._reindex_file(test_file)
+
+    assert await watcher.keyword_indexer.search("hello_world", limit=5) == []
+    results = await watcher.vector_indexer.search("hello_world", limit=5)
+    assert all(r.name != "hello_world" for r in results)
+
+
 @pytest.mark.asyncio
 async def test_reindex_performance(watcher, temp_codebase):
     """Test that reindexing meets <100ms target."""
@@ -234,7 +263,7 @@ async def test_debouncing(watcher, temp_codebase):
     assert len(watcher._pending_changes) <= 1
 
     # Wait for debounce
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Should have processed
     assert len(watcher._pending_changes) == 0
@@ -260,7 +289,7 @@ def function_{i}():
         await watcher.on_file_created(filepath)
 
     # Wait for debounce and processing
-    await asyncio.sleep(0.3)
+    await _wait_for_reindex(watcher, 0.3)
 
     # Verify all were indexed (each file creates 2 chunks: file + function)
     stats = await watcher.vector_indexer.get_stats()
@@ -290,7 +319,7 @@ async def test_on_change_callback(watcher, temp_codebase):
 ''')
 
     await watcher.on_file_created(test_file)
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Verify callback was invoked
     assert len(callback_calls) > 0
@@ -308,7 +337,7 @@ async def test_keyword_indexer_integration(watcher, temp_codebase):
 ''')
 
     await watcher.on_file_created(test_file)
-    await asyncio.sleep(0.2)
+    await _wait_for_reindex(watcher, 0.2)
 
     # Search via keyword indexer
     if watcher.keyword_indexer:
@@ -332,3 +361,16 @@ async def test_excluded_directories(watcher, temp_codebase):
 
         # Should not watch these files
         assert not watcher._should_watch(test_file)
+
+
+@pytest.mark.asyncio
+async def test_should_watch_respects_gitignore(watcher, temp_codebase):
+    """Test that .gitignore rules apply, and are reloaded when changed."""
+    (temp_codebase / "generated.py").write_text("# generated")
+    assert watcher._should_watch(temp_codebase / "generated.py")
+
+    gitignore = temp_codebase / ".gitignore"
+    gitignore.write_text("generated.py\n")
+    await watcher.on_file_created(gitignore)
+
+    assert not watcher._should_watch(temp_codebase / "generated.py")